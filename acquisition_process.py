@@ -0,0 +1,752 @@
+"""
+별도 프로세스 수집
+수신/디코딩/로깅은 자식 프로세스의 CanEngine이 담당하고, 디코딩된 행과 슬롯별 최신값은
+공유 메모리 링 버퍼에 기록. GUI 프로세스는 알림 파이프로 깨어나 공유 메모리에서 행을 복사하므로
+창 이동/크기 조절/필터 편집 등 GUI 처리 시간이 수신 타이밍에 영향을 주지 않음.
+
+- 행 링: 헤더(누적 기록 행 수, 알림 대기 플래그) + 열 배열 (표시 시각, 경과 시간, 수신 시각, 값,
+  프레임 ID, 슬롯, 텍스트 ID, 채널)
+- 최신값 표: 슬롯별 (시각, 값, 텍스트 ID, 갱신 횟수). GUI가 늦어 링이 덮어써진 경우 이 표로 최신값 복구
+- 제어 파이프: 슬롯/텍스트 정의, 상태 알림, 통계, 명령 응답 (행보다 먼저 보내 순서 보장)
+- 알림 파이프: 읽는 쪽이 확인하기 전까지 한 번만 보냄 (파이프가 차서 수집 프로세스가 막히지 않음)
+"""
+
+import itertools
+import logging
+import multiprocessing
+import threading
+import time
+from multiprocessing import shared_memory
+from multiprocessing.connection import wait as wait_connections
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from can_engine import CHANNELS, CanEngine, EngineListener, ProcessingHandlerMixin
+from channel_config import ChannelRegistry
+from clock_sync import ClockSynchronizer
+from latency_histogram import RollingLatencyHistogram
+from latency_trace import LatencyTracer
+from latest_value_store import LatestValueStore
+from message_ring import MessageRingBuffer
+from radar_data import RadarDataManager
+from signal_filter import CompiledSignalFilter
+from signal_pyramid import DEFAULT_CAPACITY as SERIES_CAPACITY, SignalPyramidStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RING_CAPACITY = 1 << 18  # 행 수 (GUI가 약 1초 이상 멈춰도 버틸 만큼)
+DEFAULT_MAX_SLOTS = 1 << 16
+STATUS_INTERVAL = 0.5  # 자식 -> GUI 통계 전송 간격 (초)
+CALL_TIMEOUT = 5.0
+
+# 헤더 (int64) 필드
+_TOTAL, _CAPACITY, _MAX_SLOTS, _NOTIFY_PENDING = range(4)
+_HEADER_SIZE = 8
+_ROW_COLUMNS = (
+    ("timestamp", np.float64),  # 표시 시각 (경과 또는 Period)
+    ("elapsed", np.float64),    # 수신 시작 기준 경과 시간 (그래프)
+    ("rx_time", np.float64),    # 정렬된 드라이버 수신 시각 (perf_counter 기준, 프로세스 간 공통)
+    ("value", np.float64),
+    ("frame_id", np.uint32),
+    ("slot", np.int32),
+    ("text", np.int32),         # 텍스트 ID (-1 = 없음)
+    ("channel", np.uint16),
+)
+_LATEST_COLUMNS = (
+    ("timestamp", np.float64),
+    ("value", np.float64),
+    ("version", np.int64),      # 갱신 횟수 (0 = 미수신)
+    ("text", np.int32),
+)
+
+
+def _layout(columns, count: int, offset: int) -> Tuple[List[Tuple[str, np.dtype, int]], int]:
+    """열별 (이름, dtype, 시작 바이트) 배치와 끝 위치 (8바이트 정렬)"""
+    layout = []
+    for name, dtype in columns:
+        layout.append((name, np.dtype(dtype), offset))
+        offset += -(-count * np.dtype(dtype).itemsize // 8) * 8
+    return layout, offset
+
+
+class SharedRowRing:
+    """공유 메모리 행 링 + 슬롯별 최신값 표 (쓰는 쪽 하나, 읽는 쪽 하나)
+
+    name=None이면 새로 만들고, 이름을 주면 기존 영역에 연결 (용량은 헤더에서 읽음).
+    """
+
+    def __init__(self, capacity: int = DEFAULT_RING_CAPACITY, max_slots: int = DEFAULT_MAX_SLOTS,
+                 name: Optional[str] = None):
+        header_bytes = _HEADER_SIZE * 8
+        if name is None:
+            rows, end = _layout(_ROW_COLUMNS, capacity, header_bytes)
+            latest, end = _layout(_LATEST_COLUMNS, max_slots, end)
+            self.shm = shared_memory.SharedMemory(create=True, size=end)
+            self.owner = True
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+        self.header = np.ndarray(_HEADER_SIZE, dtype=np.int64, buffer=self.shm.buf)
+        if self.owner:
+            self.header[:] = 0
+            self.header[_CAPACITY] = capacity
+            self.header[_MAX_SLOTS] = max_slots
+        self.capacity = int(self.header[_CAPACITY])
+        self.max_slots = int(self.header[_MAX_SLOTS])
+        rows, end = _layout(_ROW_COLUMNS, self.capacity, header_bytes)
+        latest, _ = _layout(_LATEST_COLUMNS, self.max_slots, end)
+        self.rows = {column: np.ndarray(self.capacity, dtype=dtype, buffer=self.shm.buf, offset=offset)
+                     for column, dtype, offset in rows}
+        self.latest = {column: np.ndarray(self.max_slots, dtype=dtype, buffer=self.shm.buf, offset=offset)
+                       for column, dtype, offset in latest}
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def total(self) -> int:
+        return int(self.header[_TOTAL])
+
+    def close(self):
+        # numpy 뷰가 남아 있으면 close가 실패하므로 먼저 해제
+        self.header = None
+        self.rows = {}
+        self.latest = {}
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class SharedRowWriter:
+    """CanEngine.row_sink: 디코딩 행을 공유 메모리에 기록하고 새 슬롯/텍스트 정의를 제어 파이프로 전송
+
+    여러 수신 스레드와 명령 처리 스레드에서 호출되므로 기록/전송은 락 안에서 수행.
+    """
+
+    def __init__(self, ring: SharedRowRing, registry, control_conn, notify_conn):
+        self.ring = ring
+        self.registry = registry
+        self.control = control_conn
+        self.notify = notify_conn
+        self._lock = threading.Lock()
+        self._published_slots = 0
+        self._published_channels = 0
+        self._text_ids: Dict[object, int] = {}
+        self.rows_written = 0
+
+    def send(self, message):
+        with self._lock:
+            self.control.send(message)
+
+    def publish_slots(self):
+        with self._lock:
+            self._publish_slots()
+
+    def _publish_slots(self):
+        """새 슬롯 정의와 채널 표(ID 순서의 채널 이름)를 전송 (GUI 쪽 레지스트리의 채널 ID는 다를 수 있음)"""
+        registry = self.registry
+        count = len(registry)
+        channel_names = list(registry.channel_names)
+        if count == self._published_slots and len(channel_names) == self._published_channels:
+            return
+        start = self._published_slots
+        entries = [(registry.keys[slot], registry.frame_ids[slot], registry.integer[slot])
+                   for slot in range(start, count)]
+        self.control.send(("slots", start, entries, channel_names))
+        self._published_slots = count
+        self._published_channels = len(channel_names)
+
+    def _text_id(self, text) -> int:
+        if text is None:
+            return -1
+        text_id = self._text_ids.get(text)
+        if text_id is None:
+            text_id = self._text_ids[text] = len(self._text_ids)
+            self.control.send(("text", text_id, text))
+        return text_id
+
+    def append_frame(self, display_time: float, elapsed: float, rx_time: float, channel_id: int,
+                     frame_id: int, slots, values, texts):
+        count = len(slots)
+        with self._lock:
+            if (len(self.registry) != self._published_slots
+                    or len(self.registry.channel_names) != self._published_channels):
+                self._publish_slots()
+            ring = self.ring
+            rows = ring.rows
+            latest = ring.latest
+            capacity = ring.capacity
+            total = int(ring.header[_TOTAL])
+            text_ids = [self._text_id(text) for text in texts]
+            start = total % capacity
+            first = min(count, capacity - start)
+            for part, (a, b) in ((slice(0, first), (start, start + first)),
+                                 (slice(first, count), (0, count - first))):
+                if a == b:
+                    continue
+                rows["timestamp"][a:b] = display_time
+                rows["elapsed"][a:b] = elapsed
+                rows["rx_time"][a:b] = rx_time
+                rows["channel"][a:b] = channel_id
+                rows["frame_id"][a:b] = frame_id
+                rows["slot"][a:b] = slots[part]
+                rows["value"][a:b] = values[part]
+                rows["text"][a:b] = text_ids[part]
+            max_slots = ring.max_slots
+            for slot, value, text_id in zip(slots, values, text_ids):
+                if slot < max_slots:
+                    latest["timestamp"][slot] = display_time
+                    latest["value"][slot] = value
+                    latest["text"][slot] = text_id
+                    latest["version"][slot] += 1
+            # 행을 모두 쓴 뒤 누적 행 수 갱신 (읽는 쪽은 이 값까지만 읽음)
+            ring.header[_TOTAL] = total + count
+            self.rows_written += count
+            if not ring.header[_NOTIFY_PENDING]:
+                ring.header[_NOTIFY_PENDING] = 1
+                self.notify.send_bytes(b"\x01")
+
+
+def _compiled_filter(message_pattern, signal_pattern, mode):
+    return CompiledSignalFilter(message_pattern, signal_pattern, mode)
+
+
+def acquisition_main(dbc_path: str, channels, ring_name: str, control_conn, notify_conn, command_conn,
+                     max_messages: int = 20000):
+    """수집 프로세스 본체: CanEngine 실행, 명령 처리, 주기적 통계 전송"""
+    ring = SharedRowRing(name=ring_name)
+    engine = CanEngine(dbc_path, channels, max_messages=max_messages, cipv_pipeline=False)
+    engine.keep_local_rows = False
+    writer = SharedRowWriter(ring, engine.message_buffer.registry, control_conn, notify_conn)
+    engine.row_sink = writer
+    engine.subscribe(lambda event, info: writer.send(("event", event, info)))
+    engine.start_listeners()
+
+    commands = {
+        "connect": engine.connect,
+        "disconnect": engine.disconnect,
+        "start_receiving": engine.start_receiving,
+        "stop_receiving": engine.stop_receiving,
+        "start_replay": lambda *args: engine.start_replay(*args) is not None,
+        "stop_replay": engine.stop_replay,
+        "pause_replay": engine.pause_replay,
+        "resume_replay": engine.resume_replay,
+        "set_replay_speed": engine.set_replay_speed,
+        "set_replay_loop": engine.set_replay_loop,
+        "seek_replay": engine.seek_replay,
+        "start_logging": engine.start_logging,
+        "end_logging": engine.end_logging,
+        "set_delta_t_mode": engine.set_delta_t_mode,
+        "set_use_default_on_decode_error": engine.set_use_default_on_decode_error,
+        "reload_dbc": engine.reload_dbc,
+        "register_dbc_slots": engine.register_dbc_slots,
+        "set_signal_filter": lambda message, signal, mode, at_ingest: engine.set_signal_filter(
+            _compiled_filter(message, signal, mode), at_ingest),
+        "start_metrics_exporter": lambda *args: engine.start_metrics_exporter(*args) is not None,
+        "stop_metrics_exporter": engine.stop_metrics_exporter,
+        "get_latency_report": engine.get_latency_report,
+        "get_clock_alignment": engine.get_clock_alignment,
+    }
+    writer.send(("ready", None))
+    next_status = 0.0
+    try:
+        while True:
+            if command_conn.poll(0.05):
+                try:
+                    request_id, name, args = command_conn.recv()
+                except EOFError:
+                    break
+                if name == "shutdown":
+                    break
+                result, error = None, None
+                try:
+                    result = commands[name](*args)
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+                    logger.error(f"수집 프로세스 명령 실패 ({name}): {error}")
+                # 명령으로 등록된 슬롯 정의를 응답보다 먼저 전송
+                writer.publish_slots()
+                if request_id is not None:
+                    writer.send(("reply", request_id, result, error))
+            engine.poll_replay()
+            now = time.monotonic()
+            if now >= next_status:
+                status = engine.get_status()
+                status['rows_written'] = writer.rows_written
+                writer.send(("status", status))
+                next_status = now + STATUS_INTERVAL
+    finally:
+        engine.shutdown()
+        writer.publish_slots()
+        try:
+            writer.send(("event", "process_stopped", {}))
+        except (OSError, EOFError):
+            pass
+        engine.row_sink = None
+        ring.close()
+
+
+class AcquisitionClient(ProcessingHandlerMixin):
+    """GUI 프로세스 쪽 수집 클라이언트 (CanDataViewer에 CanEngine 대신 전달)
+
+    CanEngine과 같은 이름의 제어 메서드/저장소를 제공. 제어는 명령 파이프로 자식 프로세스에 전달하고,
+    읽기 스레드가 공유 메모리 행을 로컬 링 버퍼/최신값/시계열 저장소로 복사하며 처리 핸들러를 실행.
+    처리 핸들러 값은 숫자(열거형은 원시 값), 숫자가 아닌 값은 표시 텍스트.
+    """
+
+    def __init__(self, dbc_path: str, channels=CHANNELS, max_messages: int = 20000,
+                 ring_capacity: int = DEFAULT_RING_CAPACITY, max_slots: int = DEFAULT_MAX_SLOTS,
+                 start_method: str = "spawn", cipv_pipeline: bool = True,
+                 series_capacity: int = SERIES_CAPACITY):
+        self.dbc_path = dbc_path
+        self.channel_registry = ChannelRegistry.coerce(channels)
+        self.channels = self.channel_registry.labels
+        self.db = None  # DBC는 수집 프로세스에서만 로드
+        self.ring_capacity = ring_capacity
+        self.max_slots = max_slots
+        self.max_messages = max_messages
+        self._context = multiprocessing.get_context(start_method)
+        self.process = None
+        self.ring: Optional[SharedRowRing] = None
+        self._control = None
+        self._notify = None
+        self._command = None
+        self._command_lock = threading.Lock()
+        self._request_ids = itertools.count(1)
+        self._pending: Dict[int, list] = {}
+        self._reader = None
+        self._running = threading.Event()
+        self._ready = threading.Event()
+        self._listeners: List[EngineListener] = []
+
+        # CanEngine과 같은 이름의 GUI용 저장소 (읽기 스레드가 갱신)
+        self.message_buffer = MessageRingBuffer(max_messages)
+        self.latest_store = LatestValueStore(self.message_buffer.registry)
+        self.signal_series = SignalPyramidStore(capacity=series_capacity)
+        self.signal_filter = CompiledSignalFilter()
+        self.filter_at_ingest = False
+        self.latest_values = {}
+        self.processing_handlers = []
+        self.handler_latency = {ch: RollingLatencyHistogram() for ch in self.channels}
+        self.latency_tracer = LatencyTracer()
+        self.clock_sync = ClockSynchronizer()  # now()만 사용 (perf_counter는 프로세스 간 공통)
+        self.last_rx_timestamp = {ch: 0.0 for ch in self.channels}
+        self._texts: List[object] = []
+        self._channel_map = np.zeros(0, dtype=np.uint16)  # 수집 프로세스 채널 ID -> 로컬 채널 ID
+        self._read_total = 0
+        self._latest_versions = np.zeros(max_slots, dtype=np.int64)
+        self.dropped_rows = 0  # GUI가 늦어 링에서 덮어써진 행 수
+        self.radar_manager = RadarDataManager()
+        self.track_radar = False
+
+        # 자식 프로세스 상태 (알림으로 갱신)
+        self.receive_active = False
+        self.logging_active = False
+        self.delta_t_mode = False
+        self._replaying = False
+        self._replay_paused = False
+        self._connected = set()
+        self._status: Dict[str, object] = {'stats': {}, 'channels': {},
+                                           'latency': RollingLatencyHistogram().snapshot(), 'replay': None}
+        self.metrics_exporter = None
+        if cipv_pipeline:
+            self.setup_cipv_pipeline()
+
+    # ========= 프로세스 =========
+    def start(self, timeout: float = 30.0) -> bool:
+        """공유 메모리/파이프 생성 후 수집 프로세스 시작 (준비 완료까지 대기)"""
+        if self.process is not None:
+            return True
+        self.ring = SharedRowRing(self.ring_capacity, self.max_slots)
+        control_r, control_w = self._context.Pipe(duplex=False)
+        notify_r, notify_w = self._context.Pipe(duplex=False)
+        command_r, command_w = self._context.Pipe(duplex=False)
+        self.process = self._context.Process(
+            target=acquisition_main, name="can-acquisition", daemon=True,
+            args=(self.dbc_path, list(self.channel_registry), self.ring.name, control_w, notify_w, command_r, self.max_messages))
+        self.process.start()
+        # 자식 쪽 끝은 부모에서 닫아야 자식 종료 시 EOF 감지
+        control_w.close()
+        notify_w.close()
+        command_r.close()
+        self._control, self._notify, self._command = control_r, notify_r, command_w
+        self._running.set()
+        self._reader = threading.Thread(target=self._run, name="acquisition-client", daemon=True)
+        self._reader.start()
+        if not self._ready.wait(timeout):
+            logger.error("수집 프로세스가 시작되지 않았습니다.")
+            self.shutdown(timeout=1.0)
+            return False
+        return True
+
+    def shutdown(self, timeout: float = 5.0):
+        """수집 프로세스 종료 (로그 파일 마무리 포함) 및 공유 메모리 해제"""
+        if self.process is None:
+            return
+        try:
+            self._send("shutdown")
+        except (OSError, BrokenPipeError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(1.0)
+        self._running.clear()
+        if self._reader is not None:
+            self._reader.join(2.0)
+        for conn in (self._control, self._notify, self._command):
+            conn.close()
+        self.ring.close()
+        self.process = None
+
+    def _send(self, name: str, *args, request_id: Optional[int] = None):
+        with self._command_lock:
+            self._command.send((request_id, name, args))
+
+    def _call(self, name: str, *args, timeout: float = CALL_TIMEOUT):
+        """명령 전송 후 응답 대기 (자식 예외는 RuntimeError)"""
+        request_id = next(self._request_ids)
+        done = threading.Event()
+        slot = self._pending[request_id] = [done, None, None]
+        self._send(name, *args, request_id=request_id)
+        if not done.wait(timeout):
+            self._pending.pop(request_id, None)
+            raise TimeoutError(f"수집 프로세스 응답 없음: {name}")
+        if slot[2] is not None:
+            raise RuntimeError(slot[2])
+        return slot[1]
+
+    # ========= 구독 =========
+    def subscribe(self, listener: EngineListener):
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: EngineListener):
+        self._listeners = [l for l in self._listeners if l is not listener]
+
+    def _notify_listeners(self, event: str, info: Dict[str, object]):
+        for listener in list(self._listeners):
+            try:
+                listener(event, info)
+            except Exception as e:
+                logger.error(f"엔진 알림 처리 오류 ({event}): {e}")
+
+    # ========= 제어 (CanEngine과 같은 이름) =========
+    def connect(self, channel_label: str) -> bool:
+        return bool(self._call("connect", channel_label, timeout=120.0))
+
+    def disconnect(self, channel_label: str):
+        self._call("disconnect", channel_label)
+
+    def any_connected(self) -> bool:
+        return bool(self._connected)
+
+    def start_receiving(self) -> bool:
+        return bool(self._call("start_receiving"))
+
+    def stop_receiving(self):
+        self._call("stop_receiving")
+
+    def start_replay(self, path: str, speed: Optional[float] = 1.0, loop: bool = False) -> bool:
+        return bool(self._call("start_replay", path, speed, loop))
+
+    def stop_replay(self):
+        self._call("stop_replay")
+
+    @property
+    def replaying(self) -> bool:
+        return self._replaying
+
+    def replay_paused(self) -> bool:
+        return self._replaying and self._replay_paused
+
+    def pause_replay(self):
+        self._replay_paused = True
+        self._send("pause_replay")
+
+    def resume_replay(self):
+        self._replay_paused = False
+        self._send("resume_replay")
+
+    def set_replay_speed(self, speed: Optional[float]):
+        self._send("set_replay_speed", speed)
+
+    def set_replay_loop(self, loop: bool):
+        self._send("set_replay_loop", bool(loop))
+
+    def seek_replay(self, offset: float):
+        self._send("seek_replay", float(offset))
+
+    def poll_replay(self) -> bool:
+        """재생 종료는 수집 프로세스가 감지하여 알림으로 전달"""
+        return self._replaying
+
+    def start_logging(self, rate: str = "Event", method: str = "hold", directory: str = "") -> Optional[str]:
+        return self._call("start_logging", rate, method, directory)
+
+    def end_logging(self, wait: bool = False):
+        self._call("end_logging", wait, timeout=60.0 if wait else CALL_TIMEOUT)
+
+    def set_delta_t_mode(self, enabled: bool):
+        self.delta_t_mode = bool(enabled)
+        self._send("set_delta_t_mode", self.delta_t_mode)
+
+    def set_use_default_on_decode_error(self, enabled: bool):
+        self._send("set_use_default_on_decode_error", bool(enabled))
+
+    def reload_dbc(self, channel_label: str, path: str) -> bool:
+        return bool(self._call("reload_dbc", channel_label, path))
+
+    def register_dbc_slots(self, channel_label: str) -> List[int]:
+        """수집 프로세스 레지스트리에 DBC 신호 슬롯 등록 (슬롯 정의는 응답 전에 로컬에 반영됨)"""
+        return self._call("register_dbc_slots", channel_label)
+
+    def set_signal_filter(self, compiled: CompiledSignalFilter, at_ingest: bool = False):
+        """수집 프로세스에는 패턴을 보내 수신 시점 필터로 컴파일, 로컬에는 표시용으로 해석"""
+        self._call("set_signal_filter", compiled.message_pattern, compiled.signal_pattern, compiled.mode,
+                   bool(at_ingest))
+        compiled.resolve(self.message_buffer.registry)
+        self.filter_at_ingest = bool(at_ingest) and compiled.active
+        self.signal_filter = compiled
+
+    def start_metrics_exporter(self, port=9108, host="127.0.0.1"):
+        """수집 프로세스에서 메트릭 엔드포인트 실행 (GUI 갱신 지연은 포함하지 않음)"""
+        self._call("start_metrics_exporter", port, host)
+        return None
+
+    def stop_metrics_exporter(self):
+        self._call("stop_metrics_exporter")
+
+    def get_latency_report(self):
+        """수집 프로세스 단계(dequeue/decode) + GUI 프로세스 단계(transfer/handler/table/projection)"""
+        report = self._call("get_latency_report")
+        for ch, paths in self.latency_tracer.report().items():
+            report.setdefault(ch, {}).update(paths)
+        return report
+
+    def get_clock_alignment(self):
+        return self._call("get_clock_alignment")
+
+    def get_status(self) -> Dict[str, object]:
+        """수집 프로세스가 주기적으로 보내는 통계 (STATUS_INTERVAL 간격)"""
+        return self._status
+
+    def get_statistics(self) -> Dict[str, Dict]:
+        return self._status['stats']
+
+    def get_channel_status(self) -> Dict[str, Dict[str, object]]:
+        return self._status['channels']
+
+    # ========= 읽기 스레드 =========
+    def _run(self):
+        control, notify = self._control, self._notify
+        while self._running.is_set():
+            try:
+                ready = wait_connections([control, notify], timeout=0.5)
+                alive = True
+                if notify in ready:
+                    try:
+                        notify.recv_bytes()
+                    except EOFError:
+                        alive = False
+                    # 플래그를 먼저 내린 뒤 읽어야 그 사이 기록된 행이 다음 알림으로 전달됨
+                    self.ring.header[_NOTIFY_PENDING] = 0
+                # 수집 프로세스가 끝났어도 마지막 행까지 반영한 뒤 종료
+                if not self._consume_rows() or not alive:
+                    break
+            except OSError:
+                break
+            except Exception as e:
+                logger.error(f"수집 클라이언트 처리 오류: {e}")
+        self._drain_control()
+        self._fail_pending("수집 프로세스 종료")
+        self._running.clear()
+
+    def _drain_control(self) -> bool:
+        """대기 중인 제어 메시지를 모두 처리 (파이프가 닫혔으면 False)"""
+        control = self._control
+        try:
+            while control.poll():
+                self._handle_control(control.recv())
+        except (EOFError, OSError):
+            return False
+        return True
+
+    def _handle_control(self, message):
+        kind = message[0]
+        if kind == "slots":
+            _, start, entries, channel_names = message
+            registry = self.message_buffer.registry
+            # 로컬 레지스트리에 채널이 먼저 등록되었을 수 있으므로 채널 ID는 이름으로 대응
+            self._channel_map = np.array([registry.channel_id(name) for name in channel_names], dtype=np.uint16)
+            for offset, (key, frame_id, integer) in enumerate(entries):
+                slot = registry.slot(*key, frame_id, integer)
+                if slot != start + offset:
+                    logger.error(f"슬롯 번호 불일치: {key} {slot} != {start + offset}")
+            self.signal_filter.resolve(registry)
+        elif kind == "text":
+            _, text_id, text = message
+            if text_id >= len(self._texts):
+                self._texts.extend([None] * (text_id + 1 - len(self._texts)))
+            self._texts[text_id] = text
+        elif kind == "reply":
+            _, request_id, result, error = message
+            pending = self._pending.pop(request_id, None)
+            if pending is not None:
+                pending[1], pending[2] = result, error
+                pending[0].set()
+        elif kind == "status":
+            self._status = message[1]
+        elif kind == "event":
+            _, event, info = message
+            self._apply_event(event, info)
+            self._notify_listeners(event, info)
+        elif kind == "ready":
+            self._ready.set()
+
+    def _apply_event(self, event: str, info: Dict[str, object]):
+        if event == "connected":
+            self._connected.add(info.get("channel"))
+        elif event == "disconnected":
+            self._connected.discard(info.get("channel"))
+        elif event == "receive_started":
+            self.receive_active = True
+            self.signal_series.clear()
+        elif event == "receive_stopped":
+            self.receive_active = False
+        elif event == "logging_started":
+            self.logging_active = True
+        elif event == "logging_ended":
+            self.logging_active = False
+        elif event == "replay_started":
+            self._replaying = True
+            self._replay_paused = False
+        elif event == "replay_stopped":
+            self._replaying = False
+        elif event == "process_stopped":
+            self.receive_active = False
+            self._replaying = False
+
+    def _fail_pending(self, reason: str):
+        for request_id in list(self._pending):
+            pending = self._pending.pop(request_id, None)
+            if pending is not None:
+                pending[2] = reason
+                pending[0].set()
+
+    def _consume_rows(self) -> bool:
+        """공유 메모리에서 새 행을 복사해 로컬 저장소/핸들러에 반영 (파이프가 닫혔으면 False)"""
+        ring = self.ring
+        total = ring.total
+        # 누적 행 수를 읽은 뒤 제어 메시지를 비워야 그 행들이 참조하는 슬롯/텍스트 정의가 모두 반영됨
+        alive = self._drain_control()
+        start = self._read_total
+        if total == start:
+            return alive
+        capacity = ring.capacity
+        lost = max(total - capacity - start, 0)
+        start += lost
+        indices = np.arange(start, total) % capacity
+        rows = {column: array[indices] for column, array in ring.rows.items()}
+        # 복사하는 동안 덮어써진 앞쪽 행은 버림
+        overwritten = max(ring.total - capacity - start, 0)
+        if overwritten:
+            rows = {column: array[overwritten:] for column, array in rows.items()}
+            lost += overwritten
+        self._read_total = total
+        transfer_time = time.perf_counter()
+        if len(rows["slot"]):
+            self._apply_rows(rows, transfer_time)
+        if lost:
+            self.dropped_rows += lost
+            self._resync_latest()
+        return alive
+
+    def _apply_rows(self, rows: Dict[str, np.ndarray], transfer_time: float):
+        rows["channel"] = self._channel_map[rows["channel"]]
+        texts = np.empty(len(rows["slot"]), dtype=object)
+        text_ids = rows["text"]
+        with_text = np.flatnonzero(text_ids >= 0)
+        table = self._texts
+        for index in with_text.tolist():
+            texts[index] = table[text_ids[index]]
+        self.message_buffer.append_rows(rows["timestamp"], rows["channel"], rows["frame_id"], rows["slot"],
+                                        rows["value"], texts)
+        timestamps = rows["timestamp"].tolist()
+        slots = rows["slot"].tolist()
+        values = rows["value"].tolist()
+        text_list = texts.tolist()
+        self.latest_store.update_rows(timestamps, slots, values, text_list)
+        # 그래프 시계열 (숫자가 아닌 값/오류 행은 NaN이라 건너뜀)
+        self.signal_series.update_rows(rows["elapsed"].tolist(), slots, values)
+
+        # 채널별 최근 수신 시각과 전달 지연 (배치 마지막 행 기준)
+        registry = self.message_buffer.registry
+        channel_names = registry.channel_names
+        channels = rows["channel"]
+        rx_times = rows["rx_time"]
+        for channel_id in np.unique(channels).tolist():
+            label = channel_names[channel_id]
+            rx_time = float(rx_times[np.flatnonzero(channels == channel_id)[-1]])
+            self.last_rx_timestamp[label] = rx_time
+            self.latency_tracer.record(label, "transfer", rx_time, transfer_time)
+
+        if self.track_radar:
+            self._apply_radar_rows(rows)
+
+        # 최신값/처리 핸들러 (오류 행 제외)
+        keys = registry.keys
+        run_handlers = self._run_processing_handlers if self.processing_handlers else None
+        latest_values = self.latest_values
+        for channel_id, slot, value, text, rx_time in zip(channels.tolist(), slots, values, text_list,
+                                                           rx_times.tolist()):
+            if isinstance(text, tuple):
+                continue
+            label, message_name, signal_name, _ = keys[slot]
+            if value != value and text is not None:
+                value = text
+            latest_values[(label, signal_name)] = (value, rx_time)
+            if run_handlers is not None:
+                run_handlers(label, message_name, signal_name, value, rx_time)
+
+    def _apply_radar_rows(self, rows: Dict[str, np.ndarray]):
+        """레이더 프레임(ID 200-209) 행을 프레임 단위 신호 dict로 묶어 레이더 관리자에 반영"""
+        frame_ids = rows["frame_id"]
+        indices = np.flatnonzero((frame_ids >= 200) & (frame_ids <= 209))
+        if not len(indices):
+            return
+        keys = self.message_buffer.registry.keys
+        slots, values, rx_times = rows["slot"], rows["value"], rows["rx_time"]
+        current, signals = None, {}
+        for index in indices.tolist():
+            # 한 프레임의 행은 연속으로 기록되므로 (ID, 수신 시각)이 바뀌면 다음 프레임
+            frame = (int(frame_ids[index]), float(rx_times[index]))
+            if frame != current:
+                if current is not None:
+                    self._process_radar_data(current[0], signals, elapsed)
+                current, signals = frame, {}
+            elapsed = float(rows["elapsed"][index])
+            value = float(values[index])
+            if value == value:
+                signals[keys[int(slots[index])][2]] = value
+        self._process_radar_data(current[0], signals, elapsed)
+
+    def _resync_latest(self):
+        """링에서 놓친 행이 있으면 최신값 표에서 바뀐 슬롯을 다시 읽음"""
+        latest = self.ring.latest
+        count = min(len(self.message_buffer.registry), self.ring.max_slots)
+        versions = latest["version"][:count].copy()
+        changed = np.flatnonzero(versions != self._latest_versions[:count])
+        if not len(changed):
+            return
+        self._latest_versions[:count] = versions
+        table = self._texts
+        timestamps = latest["timestamp"][changed].tolist()
+        values = latest["value"][changed].tolist()
+        texts = [table[text_id] if text_id >= 0 else None for text_id in latest["text"][changed].tolist()]
+        self.latest_store.update_rows(timestamps, changed.tolist(), values, texts)
+        logger.warning(f"GUI 지연으로 공유 메모리 행 {self.dropped_rows}개를 놓쳐 최신값 {len(changed)}개를 복구")
@@ -0,0 +1,293 @@
+"""
+asyncio 기반 CAN 수집 엔진
+채널별 수신 스레드(can_listener_channel) 대신 하나의 이벤트 루프에서 N개 채널을 수신하고,
+디코딩된 배치를 async 반복/비동기 구독 핸들러로 전달
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+import can
+
+from tsmaster_can_processor import TSMasterCanProcessor, AdvancedCanMessage
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DecodedBatch:
+    """한 번의 드레인으로 디코딩된 채널 배치"""
+    channel: str
+    messages: List[AdvancedCanMessage] = field(default_factory=list)
+    dequeue_time: float = 0.0  # 드레인 시각 (time.perf_counter)
+
+
+AsyncBatchHandler = Callable[[DecodedBatch], Awaitable[None]]
+
+
+class _AsyncChannel:
+    """엔진 내부 채널 상태"""
+
+    def __init__(self, label: str, bus: can.BusABC, processor: TSMasterCanProcessor):
+        self.label = label
+        self.bus = bus
+        self.processor = processor
+        self.reader: Optional[can.AsyncBufferedReader] = None
+        self.notifier: Optional[can.Notifier] = None
+        self.task: Optional[asyncio.Task] = None
+        self.frames = 0
+        self.batches = 0
+        self.dropped_batches = 0  # 디코딩 실패/느린 반복자로 버린 배치
+
+
+class AsyncAcquisitionEngine:
+    """N채널 asyncio 수집 엔진
+
+    - 채널마다 AsyncBufferedReader + Notifier(loop=...) 사용. 버스가 fileno를 제공하면
+      (SocketCAN 등) Notifier가 루프에 직접 reader를 등록하므로 수신 스레드가 없음
+    - 깨어날 때마다 대기 프레임을 드레인하여 process_messages로 일괄 디코딩. DBC 디코딩은
+      CPU 작업이므로 디코딩 스레드 풀(decode_workers)에서 실행하여 이벤트 루프를 막지 않음
+      (채널마다 한 번에 한 배치만 디코딩하므로 처리기 상태는 공유되지 않음)
+    - 구독 핸들러는 배치마다 await 되므로 느린 소비자는 자연스럽게 역압(backpressure)을 검
+    - 버린 배치(디코딩 실패, 느린 반복자, 정지 시 종료 표시 자리)는 dropped_batches와 채널 통계에 집계
+    """
+
+    def __init__(self, batch_size: int = 512, queue_size: int = 1024, decode_workers: Optional[int] = None):
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.decode_workers = decode_workers  # None이면 채널 수 (최소 1)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.channels: Dict[str, _AsyncChannel] = {}
+        self.handlers: List[AsyncBatchHandler] = []
+        self._iter_queues: List[asyncio.Queue] = []
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.running = False
+        self.dropped_batches = 0
+
+    def add_channel(self, label: str, bus: can.BusABC, processor: TSMasterCanProcessor):
+        """채널 등록 (start 이후 등록 시 바로 수신 시작)"""
+        channel = _AsyncChannel(label, bus, processor)
+        self.channels[label] = channel
+        if self.running:
+            self._start_channel(channel)
+
+    async def remove_channel(self, label: str):
+        """채널 수신 중지 및 제거 (버스 종료는 호출자가 관리)"""
+        channel = self.channels.pop(label, None)
+        if channel is not None:
+            await self._stop_channel(channel)
+
+    def subscribe(self, handler: AsyncBatchHandler) -> Callable[[], None]:
+        """비동기 배치 핸들러 등록. 반환값을 호출하면 구독 해제"""
+        self.handlers.append(handler)
+
+        def unsubscribe():
+            if handler in self.handlers:
+                self.handlers.remove(handler)
+        return unsubscribe
+
+    async def batches(self) -> AsyncIterator[DecodedBatch]:
+        """디코딩된 배치 async 반복자 (async for batch in engine.batches())"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._iter_queues.append(queue)
+        try:
+            while True:
+                batch = await queue.get()
+                if batch is None:
+                    return
+                yield batch
+        finally:
+            if queue in self._iter_queues:
+                self._iter_queues.remove(queue)
+
+    async def start(self):
+        """현재 이벤트 루프에서 모든 채널 수신 시작 (일부 채널 시작 실패 시 모두 되돌리고 예외 전달)"""
+        self.loop = asyncio.get_running_loop()
+        workers = self.decode_workers or max(len(self.channels), 1)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="can-decode")
+        self.running = True
+        try:
+            for channel in self.channels.values():
+                self._start_channel(channel)
+        except Exception:
+            self.running = False
+            for channel in list(self.channels.values()):
+                await self._stop_channel(channel)
+            self._shutdown_executor()
+            raise
+        logger.info(f"asyncio 수집 엔진 시작 - 채널 수: {len(self.channels)}")
+
+    async def stop(self):
+        """모든 채널 수신 중지 및 반복자 종료"""
+        self.running = False
+        for channel in list(self.channels.values()):
+            await self._stop_channel(channel)
+        for queue in list(self._iter_queues):
+            try:
+                queue.put_nowait(None)
+            except asyncio.QueueFull:
+                queue.get_nowait()
+                self.dropped_batches += 1
+                queue.put_nowait(None)
+        self._shutdown_executor()
+        logger.info(f"asyncio 수집 엔진 종료 (버린 배치 {self.dropped_batches}개)")
+
+    def _shutdown_executor(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _start_channel(self, channel: _AsyncChannel):
+        channel.reader = can.AsyncBufferedReader()
+        channel.notifier = can.Notifier(channel.bus, [channel.reader], timeout=0.1, loop=self.loop)
+        channel.task = self.loop.create_task(self._channel_loop(channel))
+
+    async def _stop_channel(self, channel: _AsyncChannel):
+        if channel.notifier is not None:
+            channel.notifier.stop(timeout=0.5)
+            channel.notifier = None
+        if channel.reader is not None:
+            channel.reader.stop()
+        if channel.task is not None:
+            channel.task.cancel()
+            try:
+                await channel.task
+            except asyncio.CancelledError:
+                pass
+            channel.task = None
+
+    async def _channel_loop(self, channel: _AsyncChannel):
+        """채널 수신 루프: 대기 프레임 드레인 -> 일괄 디코딩 -> 팬아웃"""
+        buffer = channel.reader.buffer
+        batch_size = self.batch_size
+        while True:
+            first = await buffer.get()
+            frames = [first]
+            while len(frames) < batch_size and not buffer.empty():
+                frames.append(buffer.get_nowait())
+            dequeue_time = time.perf_counter()
+            try:
+                decoded = await self.loop.run_in_executor(self._executor, channel.processor.process_messages,
+                                                          frames)
+            except Exception as e:
+                channel.dropped_batches += 1
+                self.dropped_batches += 1
+                logger.error(f"배치 디코딩 오류({channel.label}, {len(frames)}프레임 버림): {e}")
+                continue
+            channel.frames += len(frames)
+            channel.batches += 1
+            await self._dispatch(DecodedBatch(channel.label, decoded, dequeue_time))
+
+    async def _dispatch(self, batch: DecodedBatch):
+        for queue in self._iter_queues:
+            if queue.full():
+                # 소비가 느린 반복자는 가장 오래된 배치를 버림 (수신 루프를 막지 않음)
+                dropped = queue.get_nowait()
+                self.dropped_batches += 1
+                channel = self.channels.get(dropped.channel) if dropped is not None else None
+                if channel is not None:
+                    channel.dropped_batches += 1
+            queue.put_nowait(batch)
+        if self.handlers:
+            results = await asyncio.gather(*(handler(batch) for handler in list(self.handlers)),
+                                           return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error(f"비동기 핸들러 오류({batch.channel}): {result}")
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """채널별 수신 프레임/배치 수와 버린 배치 수"""
+        return {label: {'frames': ch.frames, 'batches': ch.batches, 'dropped_batches': ch.dropped_batches}
+                for label, ch in self.channels.items()}
+
+
+class QtAsyncBridge:
+    """asyncio 엔진과 Qt 이벤트 루프 연결
+
+    엔진의 이벤트 루프를 별도 스레드에서 실행하고, 디코딩된 배치를 Qt 시그널(큐 연결)로
+    GUI 스레드에 전달. GUI 측에서 코루틴을 실행할 때는 run_coroutine 사용.
+    """
+
+    def __init__(self, engine: AsyncAcquisitionEngine):
+        from PyQt5 import QtCore
+
+        class _BatchSignal(QtCore.QObject):
+            batch_received = QtCore.pyqtSignal(object)
+
+        self.engine = engine
+        self.signals = _BatchSignal()
+        self.batch_received = self.signals.batch_received
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+        self.start_error: Optional[BaseException] = None
+
+    async def _emit(self, batch: DecodedBatch):
+        self.batch_received.emit(batch)
+
+    def start(self):
+        """엔진 루프 스레드 시작 (엔진 시작이 실패하면 스레드를 정리하고 예외 전달)"""
+        if self._thread is not None:
+            return
+        self._started.clear()
+        self.start_error = None
+        self._thread = threading.Thread(target=self._run_loop, daemon=True)
+        self._thread.start()
+        self._started.wait(timeout=2.0)
+        if self.start_error is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+            self.loop = None
+            raise self.start_error
+
+    def _run_loop(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self.loop = loop
+        unsubscribe = self.engine.subscribe(self._emit)
+        try:
+            loop.run_until_complete(self.engine.start())
+        except Exception as e:
+            logger.error(f"asyncio 엔진 시작 실패: {e}")
+            self.start_error = e
+            unsubscribe()
+            loop.close()
+            return
+        finally:
+            self._started.set()
+        loop.run_forever()
+
+    def run_coroutine(self, coro):
+        """GUI 스레드에서 엔진 루프로 코루틴 제출 (concurrent.futures.Future 반환)"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def call(self, fn, *args):
+        """엔진 루프 스레드에서 일반 함수 실행 (예: add_channel)"""
+        self.loop.call_soon_threadsafe(fn, *args)
+
+    def attach_viewer(self, viewer):
+        """디코딩 배치를 CanDataViewer 표시/로깅/핸들러 경로로 전달"""
+        def on_batch(batch: DecodedBatch):
+            processor = self.engine.channels[batch.channel].processor if batch.channel in self.engine.channels else None
+            if processor is not None:
+                viewer.add_processed_messages(batch.messages, processor, batch.channel, batch.dequeue_time)
+        self.batch_received.connect(on_batch)
+
+    def stop(self):
+        """엔진 정지 및 루프 스레드 종료"""
+        if self.loop is None:
+            return
+        future = asyncio.run_coroutine_threadsafe(self.engine.stop(), self.loop)
+        try:
+            future.result(timeout=2.0)
+        except Exception as e:
+            logger.error(f"asyncio 엔진 정지 실패: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
@@ -0,0 +1,385 @@
+"""
+기록 로그 일괄 디코딩 (오프라인)
+네이티브 기록(.canrec) / candump / ASC 로그를 DBC로 디코딩하여 메시지별 열 단위 테이블로 저장.
+기록을 시간 구간으로 나누어 프로세스 풀에서 디코딩하고, 결과는 구간 순서대로 이어 붙여 씀.
+동시에 처리 중인 구간 수를 제한하므로 기록 크기와 관계없이 메모리 사용량이 일정함.
+
+출력 형식:
+  npy     - 메시지별 폴더에 열(timestamp, channel, 신호)마다 .npy (np.load(..., mmap_mode="r")로 바로 조회)
+  npz     - 메시지별 .npz (npy로 쓴 뒤 묶음)
+  parquet - 메시지별 .parquet (pyarrow 설치 시)
+
+사용 예:
+  python bulk_decode.py drive.canrec candb_ex.dbc -o decoded --workers 4 --chunk-seconds 30
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import struct
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from recording_reader import open_recording
+from session_recording import FrameColumns
+from tsmaster_can_processor import TSMasterCanProcessor
+
+try:
+    import pyarrow
+    import pyarrow.parquet as pq
+except ImportError:
+    pyarrow = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_FORMATS = ("npy", "npz", "parquet")
+NPY_HEADER_SIZE = 128  # 고정 크기 헤더 (닫을 때 최종 행 수로 다시 씀)
+MANIFEST_NAME = "manifest.json"
+
+
+def load_message_definitions(dbc_path: str) -> Dict[int, Dict]:
+    """TSMasterCanProcessor의 DBC 메시지 정의 (처리 스레드는 바로 정지)"""
+    processor = TSMasterCanProcessor(dbc_path)
+    try:
+        if processor.db is None:
+            raise ValueError(f"DBC 파일을 읽을 수 없습니다: {dbc_path}")
+        return processor.get_message_definitions()
+    finally:
+        processor.shutdown()
+
+
+class SignalExtractor:
+    """신호 하나의 비트 추출기 (인텔/모토로라, 부호, float, 배율/오프셋을 배열 단위로 적용)"""
+
+    def __init__(self, signal):
+        self.name = signal.name
+        self.length = signal.length
+        self.is_signed = signal.is_signed
+        self.is_float = signal.is_float
+        self.scale = float(signal.scale)
+        self.offset = float(signal.offset)
+        if signal.byte_order == "little_endian":
+            first = signal.start // 8
+            last = (signal.start + signal.length - 1) // 8
+            self.byte_shifts = [(b, 8 * (b - first)) for b in range(first, last + 1)]
+            self.shift = signal.start % 8
+        else:
+            # 모토로라: start는 MSB 위치 (바이트 내 비트 번호는 LSB=0)
+            msb = (signal.start // 8) * 8 + (7 - signal.start % 8)
+            lsb = msb + signal.length - 1
+            first, last = msb // 8, lsb // 8
+            self.byte_shifts = [(b, 8 * (last - b)) for b in range(first, last + 1)]
+            self.shift = 7 - lsb % 8
+        self.end_byte = last + 1
+        # 64비트 창에 들어가지 않는 신호는 cantools로 디코딩
+        self.supported = len(self.byte_shifts) <= 8
+
+    def decode(self, data: np.ndarray) -> np.ndarray:
+        window = np.zeros(len(data), dtype=np.uint64)
+        for byte, shift in self.byte_shifts:
+            window |= data[:, byte].astype(np.uint64) << np.uint64(shift)
+        raw = window >> np.uint64(self.shift)
+        if self.length < 64:
+            raw &= np.uint64((1 << self.length) - 1)
+        if self.is_float:
+            values = (raw.astype(np.uint32).view(np.float32) if self.length == 32 else raw.view(np.float64))
+            values = values.astype(np.float64)
+        elif self.is_signed:
+            values = raw.view(np.int64)
+            if self.length < 64:
+                values = np.where(values >= (1 << (self.length - 1)), values - (1 << self.length), values)
+            values = values.astype(np.float64)
+        else:
+            values = raw.astype(np.float64)
+        return values * self.scale + self.offset
+
+
+class MessageDecoder:
+    """메시지 하나의 배열 디코더 (DLC 불일치는 처리기와 같이 DBC 길이로 0 채움/자름)"""
+
+    def __init__(self, message_def: Dict):
+        self.message = message_def['message']
+        self.name = self.message.name
+        self.length = int(message_def['expected_dlc'])
+        self.signals = [SignalExtractor(signal) for signal in self.message.signals]
+        self.vectorized = (not self.message.is_multiplexed()
+                           and all(s.supported and s.end_byte <= self.length for s in self.signals))
+
+    def decode(self, data: np.ndarray) -> Dict[str, np.ndarray]:
+        width = data.shape[1]
+        if width < self.length:
+            data = np.pad(data, ((0, 0), (0, self.length - width)))
+        data = data[:, :self.length]
+        if self.vectorized:
+            return {signal.name: signal.decode(data) for signal in self.signals}
+        # 멀티플렉스 등: 행 단위 cantools 디코딩 (해당 행에 없는 신호는 NaN)
+        columns = {signal.name: np.full(len(data), np.nan) for signal in self.signals}
+        for row, payload in enumerate(data):
+            try:
+                decoded = self.message.decode(payload.tobytes(), decode_choices=False)
+            except Exception:
+                continue
+            for name, value in decoded.items():
+                columns[name][row] = float(value)
+        return columns
+
+
+# (frame_id -> (timestamps, channels, {신호: 값})), 구간 프레임 수, 디코딩 안 된 프레임 수
+ChunkResult = Tuple[Dict[int, Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray]]], int, int]
+
+
+def decode_columns(columns: FrameColumns, decoders: Dict[int, MessageDecoder]) -> ChunkResult:
+    """열 배열 프레임을 메시지 ID별로 묶어 디코딩"""
+    ids = columns.ids & np.uint32(0x1FFFFFFF)
+    order = np.argsort(ids, kind="stable")
+    sorted_ids = ids[order]
+    keys, starts = np.unique(sorted_ids, return_index=True)
+    bounds = list(starts) + [len(order)]
+    results = {}
+    unknown = 0
+    for position, frame_id in enumerate(keys):
+        rows = order[bounds[position]:bounds[position + 1]]
+        decoder = decoders.get(int(frame_id))
+        if decoder is None:
+            unknown += len(rows)
+            continue
+        results[int(frame_id)] = (columns.timestamps[rows], columns.channels[rows],
+                                  decoder.decode(columns.data[rows]))
+    return results, len(columns), unknown
+
+
+# ---- 작업 프로세스 ----
+
+_worker_reader = None
+_worker_decoders: Dict[int, MessageDecoder] = {}
+
+
+def _init_worker(path: str, dbc_path: str):
+    global _worker_reader, _worker_decoders
+    logging.getLogger("tsmaster_can_processor").setLevel(logging.WARNING)
+    _worker_reader = open_recording(path)
+    _worker_decoders = {frame_id: MessageDecoder(definition)
+                        for frame_id, definition in load_message_definitions(dbc_path).items()}
+
+
+def _decode_range(start: Optional[float], end: Optional[float]) -> ChunkResult:
+    return decode_columns(_worker_reader.columns(start, end), _worker_decoders)
+
+
+# ---- 출력 ----
+
+def _npy_header(dtype: np.dtype, count: int) -> bytes:
+    header = repr({'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False, 'shape': (count,)})
+    header = header.encode("latin1")
+    padding = NPY_HEADER_SIZE - 10 - len(header) - 1
+    return b"\x93NUMPY\x01\x00" + struct.pack("<H", NPY_HEADER_SIZE - 10) + header + b" " * padding + b"\n"
+
+
+class NpyAppender:
+    """1차원 .npy 이어 쓰기 (데이터는 바로 파일로, 헤더의 행 수는 닫을 때 갱신)
+
+    메시지 x 신호 수만큼 파일이 생기므로 핸들은 쓸 때만 엶.
+    """
+
+    def __init__(self, path: str, dtype):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.count = 0
+        self.closed = False
+        with open(path, "wb") as file:
+            file.write(_npy_header(self.dtype, 0))
+
+    def append(self, values: np.ndarray):
+        with open(self.path, "ab") as file:
+            file.write(np.ascontiguousarray(values, dtype=self.dtype).tobytes())
+        self.count += len(values)
+
+    def close(self):
+        if self.closed:
+            return
+        with open(self.path, "r+b") as file:
+            file.write(_npy_header(self.dtype, self.count))
+        self.closed = True
+
+
+class NpyTableWriter:
+    """메시지별 폴더에 열마다 .npy (npz 형식이면 닫을 때 .npz로 묶음)"""
+
+    def __init__(self, out_dir: str, name: str, signal_names: List[str], bundle: bool = False):
+        self.directory = os.path.join(out_dir, name)
+        self.bundle_path = self.directory + ".npz" if bundle else None
+        os.makedirs(self.directory, exist_ok=True)
+        self.columns = {"timestamp": NpyAppender(os.path.join(self.directory, "timestamp.npy"), np.float64),
+                        "channel": NpyAppender(os.path.join(self.directory, "channel.npy"), np.uint8)}
+        for signal_name in signal_names:
+            self.columns[signal_name] = NpyAppender(os.path.join(self.directory, f"{signal_name}.npy"), np.float64)
+
+    def append(self, timestamps, channels, signals: Dict[str, np.ndarray]):
+        self.columns["timestamp"].append(timestamps)
+        self.columns["channel"].append(channels)
+        for name, values in signals.items():
+            self.columns[name].append(values)
+
+    def close(self) -> str:
+        for column in self.columns.values():
+            column.close()
+        if self.bundle_path is None:
+            return self.directory
+        with zipfile.ZipFile(self.bundle_path, "w", zipfile.ZIP_STORED, allowZip64=True) as bundle:
+            for name, column in self.columns.items():
+                bundle.write(column.path, f"{name}.npy")
+        shutil.rmtree(self.directory)
+        return self.bundle_path
+
+
+class ParquetTableWriter:
+    """메시지별 .parquet (구간마다 행 그룹 추가)"""
+
+    def __init__(self, out_dir: str, name: str, signal_names: List[str]):
+        self.path = os.path.join(out_dir, f"{name}.parquet")
+        fields = [pyarrow.field("timestamp", pyarrow.float64()), pyarrow.field("channel", pyarrow.uint8())]
+        fields += [pyarrow.field(signal_name, pyarrow.float64()) for signal_name in signal_names]
+        self.schema = pyarrow.schema(fields)
+        self._writer = pq.ParquetWriter(self.path, self.schema)
+
+    def append(self, timestamps, channels, signals: Dict[str, np.ndarray]):
+        arrays = [timestamps, channels] + [signals[field.name] for field in self.schema][2:]
+        self._writer.write_table(pyarrow.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self) -> str:
+        self._writer.close()
+        return self.path
+
+
+# ---- 일괄 디코딩 ----
+
+def _time_ranges(time_range: Tuple[float, float], chunk_seconds: float) -> List[Tuple[Optional[float], Optional[float]]]:
+    """[start, end) 구간 목록 (처음/끝 구간은 열린 구간이라 경계 밖 프레임도 빠지지 않음)"""
+    first, last = time_range
+    count = max(1, int(np.ceil((last - first) / chunk_seconds))) if chunk_seconds > 0 else 1
+    edges = [None] + [first + k * chunk_seconds for k in range(1, count)] + [None]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def bulk_decode(path: str, dbc_path: str, out_dir: str, fmt: str = "npy", workers: Optional[int] = None,
+                chunk_seconds: float = 30.0, max_pending: Optional[int] = None,
+                progress: bool = False) -> Dict:
+    """기록 로그 전체를 디코딩하여 out_dir에 메시지별 열 테이블로 저장, 통계(manifest) 반환
+
+    workers: 작업 프로세스 수 (None = CPU 수)
+    max_pending: 동시에 처리/대기 중인 구간 수 상한 (None = workers * 2)
+    """
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"지원하지 않는 출력 형식: {fmt} ({', '.join(OUTPUT_FORMATS)})")
+    if fmt == "parquet" and pq is None:
+        raise RuntimeError("parquet 출력에는 pyarrow가 필요합니다 (pip install pyarrow)")
+    workers = max(1, workers or os.cpu_count() or 1)
+    max_pending = max(1, max_pending or workers * 2)
+    os.makedirs(out_dir, exist_ok=True)
+
+    started = time.perf_counter()
+    # 텍스트 로그 사이드카 인덱스는 여기서 한 번 만들고 작업 프로세스는 읽기만 함
+    with open_recording(path) as reader:
+        channels = list(reader.channels)
+        ranges = _time_ranges(reader.time_range, chunk_seconds) if reader.frame_count else []
+    definitions = load_message_definitions(dbc_path)
+    signal_names = {frame_id: [signal.name for signal in definition['message'].signals]
+                    for frame_id, definition in definitions.items()}
+
+    writers: Dict[int, object] = {}
+    totals = {"frames": 0, "decoded": 0, "unknown": 0}
+    rows: Dict[int, int] = {}
+
+    def write(result: ChunkResult):
+        tables, frame_count, unknown = result
+        totals["frames"] += frame_count
+        totals["unknown"] += unknown
+        for frame_id, (timestamps, frame_channels, signals) in tables.items():
+            writer = writers.get(frame_id)
+            if writer is None:
+                name = definitions[frame_id]['message'].name
+                if fmt == "parquet":
+                    writer = ParquetTableWriter(out_dir, name, signal_names[frame_id])
+                else:
+                    writer = NpyTableWriter(out_dir, name, signal_names[frame_id], bundle=fmt == "npz")
+                writers[frame_id] = writer
+            writer.append(timestamps, frame_channels, signals)
+            rows[frame_id] = rows.get(frame_id, 0) + len(timestamps)
+            totals["decoded"] += len(timestamps)
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(path, dbc_path)) as pool:
+            pending = deque()
+            for number, (start, end) in enumerate(ranges, 1):
+                pending.append(pool.submit(_decode_range, start, end))
+                if len(pending) >= max_pending:
+                    write(pending.popleft().result())
+                if progress and number % max_pending == 0:
+                    elapsed = time.perf_counter() - started
+                    print(f"[{number}/{len(ranges)}] {totals['frames']}프레임, "
+                          f"{totals['frames'] / elapsed if elapsed > 0 else 0.0:.0f} frames/s")
+            while pending:
+                write(pending.popleft().result())
+    finally:
+        outputs = {frame_id: writer.close() for frame_id, writer in writers.items()}
+
+    elapsed = time.perf_counter() - started
+    manifest = {
+        "source": os.path.abspath(path),
+        "dbc": os.path.abspath(dbc_path),
+        "format": fmt,
+        "channels": channels,
+        "chunks": len(ranges),
+        "workers": workers,
+        "frames": totals["frames"],
+        "decoded_frames": totals["decoded"],
+        "unknown_frames": totals["unknown"],
+        "elapsed": elapsed,
+        "frames_per_sec": totals["frames"] / elapsed if elapsed > 0 else 0.0,
+        "messages": {
+            definitions[frame_id]['message'].name: {
+                "frame_id": frame_id,
+                "rows": rows[frame_id],
+                "path": os.path.relpath(outputs[frame_id], out_dir),
+                "units": {signal.name: signal.unit or "" for signal in definitions[frame_id]['message'].signals},
+            }
+            for frame_id in sorted(outputs)
+        },
+    }
+    with open(os.path.join(out_dir, MANIFEST_NAME), "w", encoding="utf-8") as file:
+        json.dump(manifest, file, ensure_ascii=False, indent=2)
+    logger.info(f"일괄 디코딩 완료: {totals['frames']}프레임, {len(outputs)}개 메시지, "
+                f"{manifest['frames_per_sec']:.0f} frames/s")
+    return manifest
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="기록 로그(.canrec/candump/ASC) 일괄 디코딩 -> 메시지별 열 테이블")
+    parser.add_argument("log", help="기록 파일 경로")
+    parser.add_argument("dbc", help="DBC 파일 경로")
+    parser.add_argument("-o", "--out", default=None, help="출력 폴더 (기본: <기록 파일>_decoded)")
+    parser.add_argument("-f", "--format", choices=OUTPUT_FORMATS, default="npy", help="출력 형식")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="작업 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--chunk-seconds", type=float, default=30.0, help="작업 단위 시간 구간 길이 (초)")
+    parser.add_argument("--max-pending", type=int, default=None, help="동시에 메모리에 두는 구간 수 상한")
+    args = parser.parse_args(argv)
+
+    out_dir = args.out or os.path.splitext(args.log)[0] + "_decoded"
+    manifest = bulk_decode(args.log, args.dbc, out_dir, fmt=args.format, workers=args.workers,
+                           chunk_seconds=args.chunk_seconds, max_pending=args.max_pending, progress=True)
+    print(f"{manifest['frames']}프레임 ({manifest['decoded_frames']} 디코딩, {manifest['unknown_frames']} 미정의 ID), "
+          f"{len(manifest['messages'])}개 메시지 -> {out_dir}")
+    print(f"소요 {manifest['elapsed']:.2f}s, {manifest['frames_per_sec']:.0f} frames/s ({manifest['workers']} workers)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+버스 일괄 수신기
+깨어날 때마다 대기 중인 프레임을 모두 꺼내 미리 할당된 배치 버퍼에 담아
+프로세서 배치 경로로 한 번에 넘기기 위해 사용
+"""
+
+import logging
+import queue
+from typing import List, Optional
+
+import can
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUFFER_FRAMES = 65536
+
+
+class BoundedBufferedReader(can.Listener):
+    """크기 제한 수신 버퍼 (can.BufferedReader 대체)
+
+    Notifier 스레드가 채우고 수신 스레드가 꺼냄. 처리가 밀려 가득 차면 가장 오래된 프레임을
+    버리고 dropped에 집계하여 메모리가 무한히 늘지 않도록 함.
+    """
+
+    def __init__(self, max_frames: int = DEFAULT_BUFFER_FRAMES):
+        self.buffer: queue.Queue = queue.Queue(maxsize=max_frames)
+        self.dropped = 0
+        self.is_stopped = False
+
+    def on_message_received(self, msg: can.Message):
+        if self.is_stopped:
+            return
+        try:
+            self.buffer.put_nowait(msg)
+        except queue.Full:
+            try:
+                self.buffer.get_nowait()
+                self.dropped += 1
+            except queue.Empty:
+                pass
+            self.buffer.put_nowait(msg)
+
+    def get_message(self, timeout: float = 0.5) -> Optional[can.Message]:
+        try:
+            if timeout <= 0:
+                return self.buffer.get_nowait()
+            return self.buffer.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def stop(self):
+        self.is_stopped = True
+
+
+class BatchReceiver:
+    """버스 하나에 대한 일괄 드레인 수신기
+
+    mode="native": 첫 프레임은 bus.recv(timeout)로 블로킹 대기, 이후 bus.recv(0)으로
+                   드라이버 수신 큐에 쌓인 프레임을 추가 스레드 없이 바로 드레인 (기본)
+    mode="notifier": python-can Notifier + 크기 제한 버퍼(BoundedBufferedReader, buffer_frames개) 사용.
+                     다른 Listener(레코더 등)와 같은 버스를 공유해야 할 때 사용.
+                     버퍼가 가득 차 버린 프레임 수는 get_stats()['dropped']
+    """
+
+    def __init__(self, bus: can.BusABC, batch_size: int = 512, mode: str = "native",
+                 buffer_frames: int = DEFAULT_BUFFER_FRAMES):
+        self.bus = bus
+        self.batch_size = batch_size
+        self.mode = mode
+        self.batch: List[Optional[can.Message]] = [None] * batch_size  # 재사용 배치 버퍼
+        self.reader = None
+        self.notifier = None
+        self.total_frames = 0
+        self.total_batches = 0
+        self.max_batch = 0
+        if mode == "notifier":
+            self.reader = BoundedBufferedReader(buffer_frames)
+            self.notifier = can.Notifier(bus, [self.reader], timeout=0.1)
+
+    def drain(self, timeout: float = 0.02) -> int:
+        """대기 프레임을 배치 버퍼로 드레인하고 개수를 반환 (첫 프레임은 최대 timeout 대기)"""
+        batch = self.batch
+        limit = self.batch_size
+        if self.reader is not None:
+            get = self.reader.get_message
+            first = get(timeout)
+            if first is None:
+                return 0
+            batch[0] = first
+            count = 1
+            while count < limit:
+                msg = get(0)
+                if msg is None:
+                    break
+                batch[count] = msg
+                count += 1
+        else:
+            recv = self.bus.recv
+            first = recv(timeout)
+            if first is None:
+                return 0
+            batch[0] = first
+            count = 1
+            while count < limit:
+                msg = recv(0)
+                if msg is None:
+                    break
+                batch[count] = msg
+                count += 1
+
+        self.total_frames += count
+        self.total_batches += 1
+        if count > self.max_batch:
+            self.max_batch = count
+        return count
+
+    def stop(self):
+        """Notifier 정지 (버스 자체는 호출자가 관리)"""
+        if self.notifier is not None:
+            try:
+                self.notifier.stop(timeout=0.5)
+            except Exception as e:
+                logger.debug(f"Notifier 정지 실패: {e}")
+            self.notifier = None
+        if self.reader is not None:
+            self.reader.stop()
+
+    def get_stats(self) -> dict:
+        """드레인 통계 (총 프레임, 배치 수, 평균/최대 배치 크기, 버퍼 초과로 버린 프레임)"""
+        return {
+            'frames': self.total_frames,
+            'batches': self.total_batches,
+            'average_batch': self.total_frames / self.total_batches if self.total_batches else 0.0,
+            'max_batch': self.max_batch,
+            'dropped': self.reader.dropped if self.reader is not None else 0,
+        }
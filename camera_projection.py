@@ -32,6 +32,10 @@ class CameraProjectionProcessor:
         self.rotation_matrix = np.eye(3)  # 회전 행렬
         self.translation_vector = np.array([0, 0, 0])  # 이동 벡터
         
+        # 종단 지연 예산 (버스 수신 -> projection 계산 완료)
+        self.latency_budget = 0.020  # 20ms
+        self.latency_report_interval = 5.0  # 보고 주기 (초)
+        
     def radar_to_camera_coords(self, radar_x, radar_y):
         """
         레이더 좌표를 카메라 픽셀 좌표로 변환
@@ -115,19 +119,26 @@ class CameraProjectionProcessor:
     
     def process_realtime_projection(self):
         """실시간 projection 처리"""
+        tracer = self.can_viewer.latency_tracer
+        last_projected_timestamp = None
+        last_report_time = time.time()
         while True:
             try:
                 # CH1에서 CIPV 데이터 가져오기
                 cipv_data = self.can_viewer.get_cipv_projection_data("CH1")
                 
-                if cipv_data["valid"]:
+                # 같은 프레임을 중복 투영하지 않도록 수신 시각이 바뀐 경우만 처리
+                if cipv_data["valid"] and cipv_data["timestamp"] != last_projected_timestamp:
                     radar_x = cipv_data["x"]
                     radar_y = cipv_data["y"]
                     obj_id = cipv_data["obj_id"]
-                    timestamp = cipv_data["timestamp"]
+                    timestamp = cipv_data["timestamp"]  # 드라이버 수신 시각
+                    last_projected_timestamp = timestamp
                     
                     # 카메라 픽셀 좌표로 변환
                     pixel_x, pixel_y = self.radar_to_camera_coords(radar_x, radar_y)
+                    # 종단 지연 기록 (버스 수신 -> projection 계산 완료)
+                    tracer.record("CH1", "projection", timestamp)
                     
                     # Z_r 계산 (피타고라스)
                     Z_r = np.sqrt(radar_x**2 + radar_y**2)
@@ -144,9 +155,20 @@ class CameraProjectionProcessor:
                     
                     # 이미지 표시 (실시간 확인용)
                     cv2.imshow("Radar to Camera Projection", image)
-                    cv2.waitKey(1)  # 1ms 대기 (실시간 표시)
+                cv2.waitKey(1)  # 1ms 대기 (실시간 표시)
+                
+                # 주기적으로 종단 지연 분포 보고
+                if time.time() - last_report_time >= self.latency_report_interval:
+                    last_report_time = time.time()
+                    self.print_latency_report()
                 
-                time.sleep(0.01)  # 10ms 간격으로 체크
+                # 새 CIPV 데이터 갱신 이벤트 대기 (최대 10ms, 폴링 지연 제거)
+                update_event = getattr(self.can_viewer, "cipv_update_event", None)
+                if update_event is not None:
+                    update_event.wait(0.01)
+                    update_event.clear()
+                else:
+                    time.sleep(0.01)
                 
             except KeyboardInterrupt:
                 print("Projection 처리 중단")
@@ -158,6 +180,17 @@ class CameraProjectionProcessor:
         # OpenCV 창 정리
         cv2.destroyAllWindows()
 
+    def print_latency_report(self):
+        """경로별 종단 지연 분포와 bus -> projection 예산 충족 여부 출력"""
+        tracer = self.can_viewer.latency_tracer
+        report = tracer.format_report()
+        if report:
+            print(report)
+        ok = tracer.within_budget("CH1", "projection", self.latency_budget)
+        if ok is not None:
+            status = "OK" if ok else "초과"
+            print(f"bus -> projection p99.9 예산 {self.latency_budget*1000:.0f}ms: {status}")
+
 def main():
     """메인 실행 함수"""
     # CAN 인터페이스 초기화
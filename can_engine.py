@@ -0,0 +1,1127 @@
+"""
+GUI 없이 동작하는 CAN 수집 엔진
+채널(버스 연결/수신 스레드), 채널별 TSMaster 처리기, 처리 핸들러, 로깅/재생, 최신값 저장소,
+CIPV 파이프라인을 소유. CanDataViewer는 이 엔진을 구독하는 얇은 화면이며,
+서버에서는 GUI 없이 `python can_engine.py --dbc ...`로 실행.
+"""
+
+import argparse
+import itertools
+import logging
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import can
+
+from bus_receiver import BatchReceiver
+from channel_config import (BITRATE, CHANNELS, DATA_BITRATE, INTERFACE_CANDIDATES,  # noqa: F401 (기존 import 경로 호환)
+                            PREFERRED_INTERFACES, ChannelConfig, ChannelRegistry)
+from clock_sync import ClockSynchronizer
+from interface_probe import DEFAULT_CACHE_PATH, PROBE_TIMEOUT, InterfaceCache, probe_interfaces
+from latency_histogram import RollingLatencyHistogram
+from latency_trace import LatencyTracer
+from latest_value_store import LatestValueStore
+from log_replay import LogReplayer, open_replay_source
+from message_ring import MessageRingBuffer, encode_value
+from metrics_exporter import MetricsExporter
+from radar_data import RadarDataManager
+from session_recording import SessionRecorder
+from signal_filter import CompiledSignalFilter
+from signal_pyramid import DEFAULT_CAPACITY as SERIES_CAPACITY, SignalPyramidStore
+from stream_logger import ChunkedCsvWriter, EventRowLogger, ResampledRowLogger
+from tsmaster_can_processor import MessageStatus, TSMasterCanProcessor
+
+logger = logging.getLogger(__name__)
+
+# 로그 방식: Event = 수신 시각마다 한 행, N Hz = 고정 주기 리샘플링, Raw frames = 원시 프레임 바이너리
+LOG_RATES = ("Event", "10 Hz", "50 Hz", "100 Hz", "Raw frames")
+
+# 엔진 상태 알림 콜백: callback(event, info) - 호출 스레드는 상태를 바꾼 스레드
+# 이벤트: connected/disconnected/receive_started/receive_stopped/logging_started/logging_ended/
+#         replay_started/replay_stopped
+EngineListener = Callable[[str, Dict[str, object]], None]
+
+
+def _to_int16(value: float, scale: float) -> int:
+    """물리값 -> 부호 있는 16비트 원시값 (범위 밖은 포화)"""
+    return max(-32768, min(32767, int(value / scale)))
+
+
+def _to_raw(value: float, scale: float = 0.1) -> int:
+    """물리값 -> 16비트 원시값 (2의 보수, 부호 없는 정수로 표현)"""
+    return _to_int16(value, scale) & 0xFFFF
+
+
+def is_integer_signal(sig_def) -> bool:
+    """DBC 신호의 물리값이 항상 정수인지 (정수 원시값, 정수 배율/오프셋)"""
+    return (not getattr(sig_def, 'is_float', False)
+            and float(sig_def.scale).is_integer() and float(sig_def.offset).is_integer())
+
+
+class ProcessingHandlerMixin:
+    """신호 단위 처리 핸들러와 CIPV 파이프라인 (CanEngine과 별도 프로세스 수집 클라이언트 공용)
+
+    사용하는 쪽이 channels, processing_handlers, handler_latency, latency_tracer, latest_values,
+    radar_manager를 준비.
+    """
+
+    # ========= CIPV 기반 RDR to CAM Projection =========
+    def setup_cipv_pipeline(self):
+        # 1) 아래 이름들을 DBC에 맞게 교체하세요
+        CIPV_MSG_NAME = "A_ADAS_DRV_01_10ms"      # CIPV 정보 메시지명
+        CIPV_SIGNAL_NAME = "ADAS_DRV_ICCCIPVFrRdrIDVal"          # CIPV 객체 번호 신호명
+        # CIPV_SIGNAL_NAME = "ADAS_DRV_EMCIPVFrRdrIDVal"          # CIPV 객체 번호 신호명
+
+        OBJ_BASE_NAME = "A_FR_RDR_Obj"       # 객체 메시지 접두어 (패턴 A)
+        OBJ_NAME_FORMAT = lambda obj_id: f"{OBJ_BASE_NAME}_{int(obj_id)}"  # 예: FR_RDR_OBJ_3
+        OBJ_HAS_ID_SIGNAL = False           # 패턴 B(단일 메시지에 ObjectID 신호 존재)면 True
+        OBJ_ID_SIGNAL_NAME = "ObjectID"    # 패턴 B에서 객체 번호 신호명
+
+        # 동적으로 신호 이름을 생성하는 함수
+        def get_pos_signals(obj_id):
+            """CIPV 객체 ID에 해당하는 위치 신호 이름들을 반환"""
+            if obj_id is None:
+                return None, None
+            # 01, 02, 03... 형태로 포맷팅 (2자리, 앞에 0 패딩)
+            id_str = f"{int(obj_id):02d}"
+            return f"FR_RDR_Obj_RelPosX{id_str}Val", f"FR_RDR_Obj_RelPosY{id_str}Val"
+
+        # 상태
+        self.cipv_id = {ch: None for ch in self.channels}
+        self.cipv_pos = {ch: {"x": None, "y": None, "ts": None} for ch in self.channels}
+
+        # 실시간 projection을 위한 데이터 저장소 (다른 파이썬 파일에서 접근 가능)
+        self.cipv_projection_data = {
+            ch: {"x": None, "y": None, "obj_id": None, "timestamp": None, "valid": False} for ch in self.channels
+        }
+        # projection 데이터 갱신 알림 (소비자가 폴링 대신 대기)
+        self.cipv_update_event = threading.Event()
+
+        def cipv_filter(ch, msg_name, sig_name, value, ts):
+            return msg_name == CIPV_MSG_NAME and sig_name == CIPV_SIGNAL_NAME
+
+        def cipv_handler(ch, msg_name, sig_name, value, ts):
+            try:
+                self.cipv_id[ch] = int(value) + 1 # CIPV 객체 아이디는 0부터 시작함
+            except Exception:
+                self.cipv_id[ch] = None
+
+        def obj_filter(ch, msg_name, sig_name, value, ts):
+            obj_id = self.cipv_id.get(ch)
+            if obj_id is None:
+                return False
+
+            # 동적으로 신호 이름 생성
+            pos_x_signal, pos_y_signal = get_pos_signals(obj_id)
+            if pos_x_signal is None or pos_y_signal is None:
+                return False
+
+            if not OBJ_HAS_ID_SIGNAL:
+                return msg_name == OBJ_NAME_FORMAT(obj_id) and sig_name in (pos_x_signal, pos_y_signal)
+            if sig_name not in (pos_x_signal, pos_y_signal):
+                return False
+            latest_obj_id = self.latest_values.get((ch, OBJ_ID_SIGNAL_NAME), (None, None))[0]
+            return latest_obj_id == obj_id
+
+        def obj_handler(ch, msg_name, sig_name, value, ts):
+            obj_id = self.cipv_id.get(ch)
+            if obj_id is None:
+                return
+
+            # 동적으로 신호 이름 생성
+            pos_x_signal, pos_y_signal = get_pos_signals(obj_id)
+            if pos_x_signal is None or pos_y_signal is None:
+                return
+
+            pos = self.cipv_pos[ch]
+            if sig_name == pos_x_signal:
+                pos["x"] = value
+            elif sig_name == pos_y_signal:
+                pos["y"] = value
+            pos["ts"] = ts
+
+            # x, y 데이터가 모두 있을 때 projection 데이터 업데이트
+            if pos["x"] is not None and pos["y"] is not None:
+                # 실시간 projection을 위한 데이터 저장 (다른 파이썬 파일에서 접근 가능)
+                self.cipv_projection_data[ch].update({
+                    "x": pos["x"],
+                    "y": pos["y"],
+                    "obj_id": self.cipv_id[ch],
+                    "timestamp": ts,
+                    "valid": True
+                })
+                self.cipv_update_event.set()
+
+                # 여기서 카메라 projection 처리 함수 호출 가능
+                # self.process_camera_projection(ch, pos["x"], pos["y"], self.cipv_id[ch])
+
+        # 등록
+        self.register_processing_handler(cipv_filter, cipv_handler)
+        self.register_processing_handler(obj_filter, obj_handler)
+
+    def get_cipv_projection_data(self, channel="CH1"):
+        """다른 파이썬 파일에서 CIPV projection 데이터에 접근하기 위한 메서드"""
+        return self.cipv_projection_data.get(channel, {
+            "x": None, "y": None, "obj_id": None, "timestamp": None, "valid": False
+        })
+
+    def get_all_cipv_projection_data(self):
+        """모든 채널의 CIPV projection 데이터 반환"""
+        return self.cipv_projection_data.copy()
+
+    def is_cipv_data_valid(self, channel="CH1"):
+        """특정 채널의 CIPV 데이터가 유효한지 확인"""
+        data = self.cipv_projection_data.get(channel, {})
+        return data.get("valid", False)
+
+    # ========= 데이터 처리 API =========
+    def register_processing_handler(self, filter_fn, handler):
+        """실시간 처리 핸들러 등록
+        filter_fn(ch, msg_name, sig_name, value, timestamp)->bool 가 True면 handler 호출
+        handler(ch, msg_name, sig_name, value, timestamp) 시그니처로 호출됨
+        """
+        self.processing_handlers.append((filter_fn, handler))
+
+    def unregister_processing_handler(self, handler):
+        self.processing_handlers = [(f, h) for (f, h) in self.processing_handlers if h is not handler]
+
+    def _run_processing_handlers(self, ch, msg_name, sig_name, value, timestamp):
+        latency = self.handler_latency.get(ch)
+        for f, h in list(self.processing_handlers):
+            try:
+                if f(ch, msg_name, sig_name, value, timestamp):
+                    self.latency_tracer.record(ch, "handler", timestamp)
+                    started = time.perf_counter()
+                    h(ch, msg_name, sig_name, value, timestamp)
+                    if latency is not None:
+                        finished = time.perf_counter()
+                        latency.record(finished - started, finished)
+            except Exception as e:
+                logger.error(f"Processing handler error: {e}")
+
+    # ========= 레이더 =========
+    def _process_radar_data(self, msg_id, signals, timestamp):
+        """레이더 데이터 처리 및 RadarDataManager 업데이트"""
+        try:
+            # 메시지 ID에서 객체 번호 추출 (200-209 -> 1-10)
+            object_id = msg_id - 199
+
+            # 신호 이름에서 데이터 추출
+            rel_pos_x = signals.get(f'RelPosX{object_id}')
+            rel_pos_y = signals.get(f'RelPosY{object_id}')
+            rel_vel_x = signals.get(f'RelVelX{object_id}')
+            rel_acc_x = signals.get(f'RelAccX{object_id}')
+
+            # 폴백: 이름이 다른 경우 숫자형 4개 값을 순서대로 매핑
+            if any(v is None for v in (rel_pos_x, rel_pos_y, rel_vel_x, rel_acc_x)):
+                numeric_values = [v for v in signals.values() if isinstance(v, (int, float))]
+                if len(numeric_values) >= 4:
+                    rel_pos_x = numeric_values[0] if rel_pos_x is None else rel_pos_x
+                    rel_pos_y = numeric_values[1] if rel_pos_y is None else rel_pos_y
+                    rel_vel_x = numeric_values[2] if rel_vel_x is None else rel_vel_x
+                    rel_acc_x = numeric_values[3] if rel_acc_x is None else rel_acc_x
+                # 부족하면 0으로
+                rel_pos_x = 0 if rel_pos_x is None else rel_pos_x
+                rel_pos_y = 0 if rel_pos_y is None else rel_pos_y
+                rel_vel_x = 0 if rel_vel_x is None else rel_vel_x
+                rel_acc_x = 0 if rel_acc_x is None else rel_acc_x
+
+            self.radar_manager.update_object(
+                object_id=object_id,
+                rel_pos_x=rel_pos_x,
+                rel_pos_y=rel_pos_y,
+                rel_vel_x=rel_vel_x,
+                rel_acc_x=rel_acc_x,
+                timestamp=timestamp
+            )
+        except Exception as e:
+            logger.error(f"레이더 데이터 처리 실패 (ID:{msg_id}): {e}")
+
+
+class CanEngine(ProcessingHandlerMixin):
+    """Qt 없이 동작하는 수집/디코딩/로깅 엔진
+
+    - 수신 스레드(can_listener_channel)와 재생 스레드는 add_can_messages()로 프레임을 넣고,
+      디코딩 결과는 링 버퍼/최신값 저장소/시계열 저장소/로거/처리 핸들러로 바로 반영
+    - 화면은 저장소만 읽고, 연결/수신/로깅 상태 변화는 subscribe()로 받은 알림으로 반영
+    """
+
+    def __init__(self, dbc_path: str, channels=CHANNELS, max_messages: int = 20000,
+                 cipv_pipeline: bool = True, interface_cache_path: Optional[str] = DEFAULT_CACHE_PATH,
+                 series_capacity: int = SERIES_CAPACITY):
+        """channels: 채널 라벨 목록, ChannelConfig 목록 또는 ChannelRegistry (채널 수 제한 없음)
+        series_capacity: 그래프 시계열의 신호별/레벨별 최대 보관 개수"""
+        self.dbc_path = dbc_path
+        self.channel_registry = ChannelRegistry.coerce(channels)
+        self.channels = self.channel_registry.labels
+        # 채널별 프로세서(채널 DBC, 없으면 기본 DBC) 및 버스
+        self.processors = {config.label: TSMasterCanProcessor(config.dbc or dbc_path)
+                           for config in self.channel_registry}
+        self.db = self.processors[self.channels[0]].db  # 기본 참조
+        self.buses: Dict[str, Optional[can.BusABC]] = {ch: None for ch in self.channels}
+        self.bus_channels: Dict[str, Optional[str]] = {ch: None for ch in self.channels}
+        self.bus_interfaces: Dict[str, Optional[str]] = {ch: None for ch in self.channels}
+        # 인터페이스 탐색: 채널별 마지막 성공 설정 캐시(None이면 사용 안 함), 후보별 최대 대기 시간,
+        # 채널별 (연결 소요 시간, 방식 cache/probe/fallback)
+        self.interface_cache: Optional[InterfaceCache] = (InterfaceCache(interface_cache_path)
+                                                          if interface_cache_path else None)
+        self.probe_timeout = PROBE_TIMEOUT
+        self.connect_times: Dict[str, Tuple[float, str]] = {}
+        self._listeners: List[EngineListener] = []
+        self._listener_threads: Dict[str, threading.Thread] = {}
+
+        self.receive_active = False
+        # 수신 스레드 깨우기용 이벤트 (고정 sleep 대신 대기)
+        self.receive_event = threading.Event()
+        self.bus_ready = {ch: threading.Event() for ch in self.channels}
+
+        # 시간축: 채널별 하드웨어 타임스탬프를 공통 단조 시계(perf_counter)로 정렬한 float64 초
+        self.clock_sync = ClockSynchronizer()
+        self.start_time = None
+        self.last_timestamp = None
+        self.delta_t_mode = False
+
+        self.logging_active = False
+        self.stream_logger = None
+        self.session_recorder = None  # 원시 프레임 바이너리 기록 (Raw frames 로그 방식)
+        self.replayer = None  # 기록 로그 재생 (수신 스레드 대신 프레임 주입)
+        self._unknown_labels = set()  # 처리기가 없어 버린 채널 라벨 (경고는 라벨마다 한 번)
+        # 스트리밍 로그 설정: fsync 간격(초, 0=청크마다, None=종료 시만), 파일 교체 기준
+        self.log_settings = {'fsync_interval': 5.0, 'max_bytes': 512 * 1024 * 1024, 'max_seconds': None}
+
+        # 더미 데이터 시뮬레이션 관련
+        self.dummy_simulation_active = False
+        self.dummy_simulation_thread = None
+
+        # 레이더 데이터 관리자 (track_radar일 때만 갱신)
+        self.radar_manager = RadarDataManager()
+        self.track_radar = False
+
+        # 수신 시점 필터 (숨김 신호는 버퍼 기록 생략)
+        self.signal_filter = CompiledSignalFilter()
+        self.filter_at_ingest = False
+
+        # 표시용 메시지 링 버퍼 (숫자 행, 수신 스레드 간 공유)
+        self.message_buffer = MessageRingBuffer(max_messages)
+        self._signal_slots = {}  # (channel, message_id) -> {signal: (slot, unit)}
+        # 신호별 최신값 저장소 (중복 제거/고정 표시 공용, 수신 시점에 갱신)
+        self.latest_store = LatestValueStore(self.message_buffer.registry)
+        # 신호별 다중 해상도 시계열 (1x/16x/256x 최소/최대/평균, 그래프가 구독한 슬롯만, 수신 시작 시 초기화)
+        self.signal_series = SignalPyramidStore(capacity=series_capacity)
+        # 채널별 마지막 수신 시간 모니터링
+        self.last_rx_time = {ch: 0.0 for ch in self.channels}
+        # 실시간 처리용: 최신값 저장소와 사용자 핸들러들
+        self.latest_values = {}  # key: (channel, signal_name) -> (value, timestamp)
+        self.processing_handlers = []  # list of (filter_fn, handler)
+        # 메트릭: 채널별 핸들러 실행 지연
+        self.handler_latency = {ch: RollingLatencyHistogram() for ch in self.channels}
+        self.metrics_exporter = None
+        # 종단 지연 추적 (버스 수신 타임스탬프 -> 각 처리 단계)
+        self.latency_tracer = LatencyTracer()
+        self.last_rx_timestamp = {ch: 0.0 for ch in self.channels}  # 채널별 최근 프레임의 드라이버 수신 시각
+        # 디코딩 행 추가 출력 (별도 프로세스 수집 시 공유 메모리 기록기), 로컬 저장소 사용 여부
+        self.row_sink = None
+        self.keep_local_rows = True
+
+        if cipv_pipeline:
+            self.setup_cipv_pipeline()
+
+    # ========= 구독 =========
+    def subscribe(self, listener: EngineListener):
+        """상태 변화 알림 등록 (GUI는 자체 스레드로 넘겨 처리)"""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: EngineListener):
+        self._listeners = [l for l in self._listeners if l is not listener]
+
+    def _notify(self, event: str, **info):
+        for listener in list(self._listeners):
+            try:
+                listener(event, info)
+            except Exception as e:
+                logger.error(f"엔진 알림 처리 오류 ({event}): {e}")
+
+    # ========= 채널 =========
+    def processor(self, channel_label: str) -> TSMasterCanProcessor:
+        return self.processors[channel_label]
+
+    def get_bus(self, channel_label: str) -> Optional[can.BusABC]:
+        return self.buses.get(channel_label)
+
+    def channel_config(self, channel_label: str) -> ChannelConfig:
+        return self.channel_registry[channel_label]
+
+    # 기존 2채널 속성 (CH1/CH2 라벨이 없으면 None)
+    @property
+    def tsmaster_processor_ch1(self):
+        return self.processors.get("CH1")
+
+    @property
+    def tsmaster_processor_ch2(self):
+        return self.processors.get("CH2")
+
+    @property
+    def can_interface_ch1(self):
+        return self.buses.get("CH1")
+
+    @property
+    def can_interface_ch2(self):
+        return self.buses.get("CH2")
+
+    @property
+    def can_channel_ch1(self):
+        return self.bus_channels.get("CH1")
+
+    @property
+    def can_channel_ch2(self):
+        return self.bus_channels.get("CH2")
+
+    def connect(self, channel_label: str, candidates: Optional[List[Tuple[str, str, bool]]] = None) -> bool:
+        """채널 버스 연결. 성공 여부 반환
+
+        마지막으로 성공한 설정(캐시)으로 먼저 연결하고, 실패하면 후보(채널 설정의 인터페이스 또는
+        우선/공통 후보)를 동시에 탐색. 모두 실패하면 Virtual CAN. 소요 시간은 connect_times에 기록.
+        """
+        started = time.perf_counter()
+        config = self.channel_registry[channel_label]
+        if candidates is None:
+            candidates = config.candidates()
+        # 다른 채널이 이미 사용 중인 장치는 후보에서 제외
+        in_use = {(self.bus_interfaces[ch], self.bus_channels[ch]) for ch in self.channels
+                  if ch != channel_label and self.buses[ch] is not None}
+        candidates = [tuple(candidate) for candidate in candidates if tuple(candidate[:2]) not in in_use]
+
+        def open_bus(candidate):
+            interface, channel, is_can_fd = candidate
+            return can.interface.Bus(channel=channel, interface=interface, **config.bus_kwargs(is_can_fd))
+
+        bus, candidate, source = None, None, "probe"
+        cache = self.interface_cache
+        cached = cache.get(channel_label) if cache is not None else None
+        if cached is not None and cached in candidates:
+            result = probe_interfaces([cached], open_bus, self.probe_timeout)
+            if result.bus is not None:
+                bus, candidate, source = result.bus, cached, "cache"
+            else:
+                logger.warning(f"{channel_label} 캐시된 인터페이스 연결 실패: {cached} ({result.errors.get(cached)}), "
+                               f"전체 후보를 탐색합니다.")
+                candidates = [c for c in candidates if c != cached]
+        if bus is None and candidates:
+            result = probe_interfaces(candidates, open_bus, self.probe_timeout)
+            bus, candidate = result.bus, result.candidate
+            for (interface, channel, is_can_fd), error in result.errors.items():
+                logger.warning(f"CAN 인터페이스 연결 실패: {interface} - {channel} (CAN FD: {is_can_fd}), 오류: {error}")
+            if bus is not None and cache is not None and candidate[0] != 'virtual':
+                # Virtual CAN은 항상 열리므로 캐시하지 않음 (다음 실행에서 실제 장치를 다시 탐색)
+                cache.store(channel_label, candidate, time.perf_counter() - started)
+
+        if bus is not None:
+            interface, channel, is_can_fd = candidate
+            logger.info(f"{channel_label} CAN{' FD' if is_can_fd else ''} 연결 성공: {interface} - {channel}")
+        else:
+            logger.warning("사용 가능한 CAN 인터페이스를 찾을 수 없습니다. Virtual CAN으로 연결을 시도합니다...")
+            interface, channel, source = 'virtual', 'channel-0', "fallback"
+            try:
+                bus = can.interface.Bus(channel=channel, interface=interface, bitrate=config.bitrate)
+                logger.info(f"{channel_label} Virtual CAN 연결 성공: {channel}")
+            except Exception as e:
+                logger.error(f"Virtual CAN 연결도 실패: {e}")
+                return False
+
+        connect_time = time.perf_counter() - started
+        self.connect_times[channel_label] = (connect_time, source)
+        logger.info(f"{channel_label} 연결 시간: {connect_time * 1000:.0f}ms ({source})")
+        self.buses[channel_label] = bus
+        self.bus_channels[channel_label] = channel
+        self.bus_interfaces[channel_label] = interface
+        # 자동 탐색 결과 Virtual CAN으로 연결된 경우 더미 데이터 시뮬레이션 시작
+        # (채널 설정에 virtual을 직접 지정한 경우는 다른 프로그램이 보내는 프레임을 그대로 수신)
+        if interface == 'virtual' and channel_label == self.channels[0] and not config.interface:
+            logger.info(f"{channel_label} Virtual CAN으로 연결됨. 더미 데이터 시뮬레이션을 시작합니다.")
+            self.start_dummy_data_simulation()
+        self.bus_ready[channel_label].set()
+        self._notify("connected", channel=channel_label, interface=interface, bus_channel=channel,
+                     connect_time=connect_time, source=source)
+        return True
+
+    def disconnect(self, channel_label: str):
+        """채널 버스 연결 해제 (수신 중이면 수신도 중지)"""
+        if self.dummy_simulation_active:
+            self.stop_dummy_data_simulation()
+        self.bus_ready[channel_label].clear()
+        bus = self.buses.get(channel_label)
+        if bus is not None:
+            self.buses[channel_label] = None
+            self.bus_channels[channel_label] = None
+            self.bus_interfaces[channel_label] = None
+            try:
+                bus.shutdown()
+            except Exception as e:
+                logger.error(f"{channel_label} 연결 해제 중 오류 발생: {e}")
+            logger.info(f"{channel_label} 연결 해제됨")
+        self._notify("disconnected", channel=channel_label)
+        if self.receive_active:
+            self.stop_receiving()
+
+    def any_connected(self) -> bool:
+        return any(bus is not None for bus in self.buses.values())
+
+    def start_listeners(self, batch_size: int = 512, mode: str = "native"):
+        """채널별 수신 스레드 시작 (이미 실행 중인 채널은 건너뜀)"""
+        for ch in self.channels:
+            thread = self._listener_threads.get(ch)
+            if thread is not None and thread.is_alive():
+                continue
+            thread = threading.Thread(target=can_listener_channel, args=(self, ch, batch_size, mode),
+                                      name=f"can-rx-{ch}", daemon=True)
+            self._listener_threads[ch] = thread
+            thread.start()
+
+    # ========= 수신 =========
+    def _begin_session(self):
+        self.receive_active = True
+        self.start_time = self.clock_sync.now()
+        self.last_timestamp = None
+        self.signal_series.clear()
+        self._notify("receive_started")
+
+    def start_receiving(self) -> bool:
+        if not self.any_connected():
+            logger.warning("CAN 인터페이스가 연결되지 않았습니다. 채널을 하나 이상 먼저 연결하세요.")
+            return False
+        if not self.receive_active:
+            self.receive_event.set()
+            self._begin_session()
+            logger.info("CAN 메시지 수신 시작")
+        return True
+
+    def stop_receiving(self):
+        if self.receive_active:
+            self.receive_active = False
+            self.receive_event.clear()
+            logger.info("CAN 메시지 수신 중지")
+            self._notify("receive_stopped")
+
+    def set_delta_t_mode(self, enabled: bool):
+        """표시 시각을 직전 프레임과의 간격(Period)으로 기록할지 여부"""
+        self.delta_t_mode = bool(enabled)
+        self.last_timestamp = None
+
+    def set_use_default_on_decode_error(self, enabled: bool):
+        for processor in self.processors.values():
+            processor.config['use_default_on_decode_error'] = bool(enabled)
+
+    def reload_dbc(self, channel_label: str, path: str) -> bool:
+        ok = self.processors[channel_label].reload_dbc(path)
+        if ok:
+            logger.info(f"{channel_label} DBC reloaded: {path}")
+        else:
+            logger.error(f"{channel_label} DBC reload failed: {path}")
+        return ok
+
+    # ========= 재생 =========
+    def start_replay(self, path: str, speed: Optional[float] = 1.0, loop: bool = False) -> Optional[LogReplayer]:
+        """기록 로그를 수신 경로(add_can_messages)로 재생. 인터페이스 연결 없이 동작"""
+        if self.replayer is not None:
+            self.stop_replay()
+        try:
+            source = open_replay_source(path)
+        except Exception as e:
+            logger.error(f"재생 파일을 열 수 없습니다: {path} ({e})")
+            return None
+        if not self.receive_active:
+            self._begin_session()
+        # 기록 시계는 실제 인터페이스 시계와 무관하므로 정렬 상태를 새로 시작
+        self.clock_sync.reset()
+        self.replayer = LogReplayer(source, self.add_can_messages, speed=speed, loop=loop, labels=self.channels)
+        self.replayer.start()
+        logger.info(f"로그 재생 시작: {path} ({'Max' if speed is None else f'{speed:g}x'})")
+        self._notify("replay_started", path=path)
+        return self.replayer
+
+    def stop_replay(self):
+        replayer, self.replayer = self.replayer, None
+        if replayer is None:
+            return
+        replayer.stop()
+        replayer.source.close()
+        stats = replayer.get_stats()
+        logger.info(f"로그 재생 종료: {stats['frames']}프레임, {stats['frames_per_sec']:.0f} frames/s, "
+                    f"반복 {stats['laps']}회")
+        self._notify("replay_stopped", stats=stats)
+
+    @property
+    def replaying(self) -> bool:
+        return self.replayer is not None
+
+    def replay_paused(self) -> bool:
+        return self.replayer is not None and self.replayer.paused
+
+    def pause_replay(self):
+        if self.replayer is not None:
+            self.replayer.pause()
+
+    def resume_replay(self):
+        if self.replayer is not None:
+            self.replayer.resume()
+
+    def set_replay_speed(self, speed: Optional[float]):
+        if self.replayer is not None:
+            self.replayer.set_speed(speed)
+
+    def set_replay_loop(self, loop: bool):
+        if self.replayer is not None:
+            self.replayer.loop = bool(loop)
+
+    def seek_replay(self, offset: float):
+        """재생 위치 이동 (offset: 기록 시작 기준 초, 일시정지 상태는 유지)"""
+        if self.replayer is not None:
+            self.replayer.seek(self.replayer.start_time + max(float(offset), 0.0))
+
+    def poll_replay(self) -> bool:
+        """재생이 끝났으면 정리 (재생 중이면 True)"""
+        if self.replayer is not None and not self.replayer.running:
+            self.stop_replay()
+        return self.replayer is not None
+
+    # ========= 로깅 =========
+    def start_logging(self, rate: str = "Event", method: str = "hold", directory: str = "") -> Optional[str]:
+        """로깅 시작 (rate: LOG_RATES, method: 리샘플링 보간 hold/linear). 파일 경로 반환"""
+        if not self.receive_active:
+            logger.warning("CAN 수신 먼저 시작하세요.")
+            return None
+        if self.logging_active:
+            logger.warning("이미 로깅 중입니다.")
+            return None
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        if rate == "Raw frames":
+            # 디코딩 전 원시 프레임을 바이너리 세션 형식으로 기록 (재생/사후 분석용)
+            filename = os.path.join(directory, stamp + "_can_rec.canrec")
+            # 프레임 시각은 clock_sync 기준 시계이므로 벽시계 변환 오프셋을 함께 저장
+            self.session_recorder = SessionRecorder(filename, wall_offset=time.time() - self.clock_sync.now())
+            self.session_recorder.start()
+            mode = "원시 프레임"
+        else:
+            filename = os.path.join(directory, stamp + "_can_log.csv")
+            integer_columns = [name for name, integer in self._log_column_types().items() if integer]
+            writer = ChunkedCsvWriter(filename, self.log_columns(), integer_columns=integer_columns,
+                                      **self.log_settings)
+            writer.start()
+            if rate == "Event":
+                self.stream_logger = EventRowLogger(writer)
+                mode = "이벤트"
+            else:
+                self.stream_logger = ResampledRowLogger(writer, float(rate.split()[0]), method)
+                mode = f"{rate} {method}"
+        self.logging_active = True
+        logger.info(f"로깅 시작: {filename} ({mode})")
+        self._notify("logging_started", path=filename, mode=mode)
+        return filename
+
+    def log_columns(self) -> List[str]:
+        """로그 열: 채널 DBC 신호 이름 (DBC 순, 중복 제거)"""
+        return list(self._log_column_types())
+
+    def _log_column_types(self) -> Dict[str, bool]:
+        """로그 열 이름 -> 정수 신호 여부 (같은 이름이 여러 DBC에 있으면 모두 정수일 때만)"""
+        columns = {}
+        for processor in self.processors.values():
+            for msg_def in processor.get_message_definitions().values():
+                for sig_name, sig_def in msg_def['signals'].items():
+                    columns[sig_name] = columns.get(sig_name, True) and is_integer_signal(sig_def)
+        return columns
+
+    def end_logging(self, wait: bool = False):
+        """로깅 종료 (wait=False면 남은 청크는 백그라운드에서 기록되므로 즉시 반환)"""
+        if not self.logging_active:
+            logger.warning("로깅 중이 아닙니다.")
+            return
+        self.logging_active = False
+        stream_logger, recorder = self.stream_logger, self.session_recorder
+        self.stream_logger = None
+        self.session_recorder = None
+        if recorder is not None:
+            recorder.close(wait=wait)
+            logger.info(f"로깅 종료. 파일 저장 중: {recorder.path} (버림 {recorder.dropped_frames}프레임)")
+        if stream_logger is not None:
+            stream_logger.close(wait=wait)
+            writer = stream_logger.writer
+            logger.info(f"로깅 종료. 파일 저장 중: {writer.path} "
+                        f"(기록 {writer.rows_written}행, 버림 {writer.dropped_chunks}청크 {writer.dropped_rows}행, "
+                        f"기록 실패 {writer.failed_chunks}청크)")
+            if getattr(stream_logger, 'late_samples', 0):
+                logger.warning(f"리샘플 격자 기록 후 도착한 샘플 {stream_logger.late_samples}개 "
+                               f"(허용 지연 {stream_logger.lateness * 1000:.0f}ms)")
+        self._notify("logging_ended")
+
+    # ========= 신호 슬롯/필터 =========
+    def register_dbc_slots(self, channel_label: str) -> List[int]:
+        """채널 DBC의 모든 신호를 링 버퍼 슬롯으로 등록 (DBC 순서의 슬롯 목록 반환)"""
+        registry = self.message_buffer.registry
+        slots = []
+        try:
+            defs = self.processors[channel_label].get_message_definitions()
+            for frame_id, msg_def in defs.items():
+                msg_name = msg_def['message'].name
+                for sig_name, sig_def in msg_def['signals'].items():
+                    unit = getattr(sig_def, 'unit', '') or ''
+                    slots.append(registry.slot(channel_label, msg_name, sig_name, unit, frame_id,
+                                               is_integer_signal(sig_def)))
+        except Exception as e:
+            logger.error(f"{channel_label} DBC 신호 슬롯 등록 실패: {e}")
+        return slots
+
+    def set_signal_filter(self, compiled: CompiledSignalFilter, at_ingest: bool = False):
+        """표시/수신 시점 필터 교체 (아직 수신되지 않은 DBC 신호도 미리 슬롯으로 등록하여 해석)"""
+        for ch in self.channels:
+            self.register_dbc_slots(ch)
+        compiled.resolve(self.message_buffer.registry)
+        self.filter_at_ingest = bool(at_ingest) and compiled.active
+        self.signal_filter = compiled
+
+    def start_metrics_exporter(self, port=9108, host="127.0.0.1"):
+        """Prometheus 메트릭 엔드포인트 시작 (선택 기능)"""
+        if self.metrics_exporter is not None:
+            return self.metrics_exporter
+        exporter = MetricsExporter(host=host, port=port)
+        for ch, processor in self.processors.items():
+            exporter.register_processor(ch, processor)
+        for ch, histogram in self.handler_latency.items():
+            exporter.register_latency("can_handler_latency_seconds",
+                                      "Processing handler execution time", histogram, {"channel": ch})
+        self.latency_tracer.register_metrics(exporter, list(self.channels))
+        exporter.register_gauge("can_gui_buffered_rows", "Rows buffered for the GUI table",
+                                lambda: len(self.message_buffer))
+        if exporter.start():
+            self.metrics_exporter = exporter
+        return self.metrics_exporter
+
+    def stop_metrics_exporter(self):
+        """메트릭 엔드포인트 종료"""
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.stop()
+            self.metrics_exporter = None
+
+    def get_latency_report(self):
+        """채널/경로별 종단 지연 분포 (버스 수신 -> dequeue/decode/handler/table/projection)"""
+        return self.latency_tracer.report()
+
+    def get_clock_alignment(self):
+        """채널별 시계 정렬 상태 (오프셋, 드리프트 ppm)"""
+        return self.clock_sync.status()
+
+    def get_statistics(self) -> Dict[str, Dict]:
+        """채널별 처리 통계"""
+        return {ch: processor.get_statistics() for ch, processor in self.processors.items()}
+
+    def get_channel_status(self) -> Dict[str, Dict[str, object]]:
+        """채널별 연결 상태와 수신 요약 (화면/CLI 채널별 표시용)"""
+        now = time.time()
+        result = {}
+        for ch in self.channels:
+            processor = self.processors[ch]
+            stats = processor.stats
+            last_rx = self.last_rx_time[ch]
+            result[ch] = {
+                'connected': self.buses[ch] is not None,
+                'interface': self.bus_interfaces[ch],
+                'bus_channel': self.bus_channels[ch],
+                'connect_time': self.connect_times.get(ch, (None, None))[0],
+                'connect_source': self.connect_times.get(ch, (None, None))[1],
+                'dbc': processor.dbc_path,
+                'total_messages': stats['total_messages'],
+                'invalid_messages': stats['invalid_messages'],
+                'messages_per_second': stats.get('messages_per_second', 0),
+                'queue_depth': processor.message_queue.qsize(),
+                'last_rx_age': now - last_rx if last_rx else None,
+            }
+        return result
+
+    def get_status(self) -> Dict[str, object]:
+        """화면 통계 표시용 요약 (채널별 통계/상태, 채널 병합 처리 지연, 재생 진행)"""
+        latency = RollingLatencyHistogram.merged_window(
+            [processor.processing_latency for processor in self.processors.values()],
+            now=time.perf_counter()).snapshot()
+        replayer = self.replayer
+        return {
+            'stats': self.get_statistics(),
+            'channels': self.get_channel_status(),
+            'latency': latency,
+            'replay': replayer.get_stats() if replayer is not None else None,
+        }
+
+    # ========= 더미 데이터 시뮬레이션 =========
+    def start_dummy_data_simulation(self):
+        """더미 데이터 시뮬레이션 시작 (직접 처리)"""
+        if not self.dummy_simulation_active:
+            self.dummy_simulation_active = True
+            self.dummy_simulation_thread = threading.Thread(target=self._dummy_simulation_worker, daemon=True)
+            self.dummy_simulation_thread.start()
+            logger.info("더미 데이터 시뮬레이션이 시작되었습니다.")
+
+    def stop_dummy_data_simulation(self):
+        """더미 데이터 시뮬레이션 중지"""
+        self.dummy_simulation_active = False
+        if self.dummy_simulation_thread:
+            self.dummy_simulation_thread.join(timeout=1)
+        logger.info("더미 데이터 시뮬레이션이 중지되었습니다.")
+
+    def _dummy_simulation_worker(self):
+        """더미 데이터 시뮬레이션 워커 (100/101/102 차량 메시지 + 200~209 레이더 객체, 100ms 간격)"""
+        channel_label = self.channels[0]
+        while self.dummy_simulation_active:
+            try:
+                current_time = time.time()
+                frames = [
+                    # 100 메시지 - 차량 속도 및 스티어링 앵글
+                    (100, self._create_vehicle_status_data(random.uniform(0, 250), random.uniform(-7800, 7800))),
+                    # 101 메시지 - 횡가속도
+                    (101, self._create_accel_data(random.uniform(-10, 10))),
+                    # 102 메시지 - 차선정보
+                    (102, self._create_lane_data([random.randint(0, 1) for _ in range(4)])),
+                ]
+                # 200~209 메시지 - 10개 레이더 객체
+                for i in range(200, 210):
+                    frames.append((i, self._create_radar_data(random.uniform(-100, 100), random.uniform(-50, 50),
+                                                              random.uniform(-20, 20), random.uniform(-5, 5))))
+                messages = [can.Message(arbitration_id=frame_id, data=data, is_extended_id=False,
+                                        timestamp=current_time) for frame_id, data in frames]
+                self.add_can_messages(messages, channel_label=channel_label)
+                logger.debug(f"더미 데이터 시뮬레이션 완료: {current_time:.3f}")
+                time.sleep(0.1)  # 100ms 간격
+            except Exception as e:
+                logger.error(f"더미 시뮬레이션 오류: {e}")
+                time.sleep(1)
+
+    @staticmethod
+    def _create_vehicle_status_data(speed, steering):
+        """차량 상태 데이터 생성 (8바이트): speed(2) + steering(2) + padding(4)"""
+        speed_raw = _to_int16(speed, 0.01)
+        steering_raw = _to_int16(steering, 0.1)
+        return speed_raw.to_bytes(2, 'little', signed=True) + steering_raw.to_bytes(2, 'little', signed=True) + bytes(4)
+
+    @staticmethod
+    def _create_accel_data(lat_accel):
+        """가속도 데이터 생성 (8바이트): lat_accel(2) + padding(6)"""
+        return _to_int16(lat_accel, 0.001).to_bytes(2, 'little', signed=True) + bytes(6)
+
+    @staticmethod
+    def _create_lane_data(lane_data):
+        """차선 데이터 생성 (8바이트): lane_data(4) + padding(4)"""
+        return bytes(lane_data) + bytes(4)
+
+    @staticmethod
+    def _create_radar_data(rel_pos_x, rel_pos_y, rel_vel_x, rel_acc_x):
+        """레이더 데이터 생성 (8바이트): x(2) + y(2) + vel(2) + acc(2)"""
+        return b"".join(_to_raw(value).to_bytes(2, 'little') for value in (rel_pos_x, rel_pos_y, rel_vel_x, rel_acc_x))
+
+    # ========= 수신 경로 =========
+    def add_can_message(self, msg, channel_label="CH1", dequeue_time=None):
+        """CAN 메시지 처리. dequeue_time은 수신 스레드가 버스에서 꺼낸 시각(time.perf_counter)"""
+        if not self.receive_active:
+            return
+        try:
+            # 세션 기록과 표시/로깅이 같은 (시계 정렬된) 수신 시각을 쓰도록 처리 전에 한 번만 정렬
+            rx_timestamp = self._align_timestamps((msg,), 1, channel_label, dequeue_time)[0]
+            recorder = self.session_recorder
+            if recorder is not None:
+                recorder.record(msg, channel_label, rx_timestamp)
+            # TSMaster 스타일 고급 CAN 데이터 처리기 사용
+            processor = self.processors[channel_label]
+            advanced_msg = processor.process_message(msg)
+            self._ingest_processed_message(advanced_msg, processor, channel_label, dequeue_time, rx_timestamp)
+        except Exception as e:
+            logger.error(f"CAN 메시지 처리 중 예외 발생 (ID:{msg.arbitration_id}): {e}")
+
+    def add_can_messages(self, messages, count=None, channel_label="CH1", dequeue_time=None):
+        """수신 배치 일괄 처리. messages는 재사용되는 배치 버퍼이며 앞의 count개만 유효"""
+        if not self.receive_active:
+            return
+        if count is None:
+            count = len(messages)
+        processor = self.processors.get(channel_label)
+        if processor is None:
+            if channel_label not in self._unknown_labels:
+                self._unknown_labels.add(channel_label)
+                logger.warning(f"등록되지 않은 채널 {channel_label}의 프레임은 처리하지 않습니다")
+            return
+
+        rx_timestamps = self._align_timestamps(messages, count, channel_label, dequeue_time)
+        recorder = self.session_recorder
+        if recorder is not None:
+            recorder.record_batch(messages, count, channel_label, rx_timestamps)
+        try:
+            processed = processor.process_messages(messages, count)
+        except Exception as e:
+            logger.error(f"CAN 배치 처리 중 예외 발생 ({channel_label}, {count}개): {e}")
+            return
+        self.add_processed_messages(processed, processor, channel_label, dequeue_time, rx_timestamps)
+
+    def add_processed_messages(self, processed, processor, channel_label="CH1", dequeue_time=None,
+                               rx_timestamps=None):
+        """이미 디코딩된 메시지 배치 반영 (asyncio 수집 엔진 등 외부 디코딩 경로용)
+
+        rx_timestamps는 processed와 같은 순서의 정렬된 수신 시각 (없으면 메시지별로 정렬)
+        """
+        if not self.receive_active:
+            return
+        ingest = self._ingest_processed_message
+        if rx_timestamps is None:
+            rx_timestamps = itertools.repeat(None)
+        for advanced_msg, rx_timestamp in zip(processed, rx_timestamps):
+            try:
+                ingest(advanced_msg, processor, channel_label, dequeue_time, rx_timestamp)
+            except Exception as e:
+                logger.error(f"CAN 메시지 처리 중 예외 발생 (ID:{advanced_msg.message_id}): {e}")
+
+    def _align_timestamps(self, messages, count, channel_label, dequeue_time):
+        """원시 프레임 앞 count개의 드라이버 수신 시각을 공통 기준 시계로 정렬 (채널 간 오프셋/드리프트 보정)"""
+        align = self.clock_sync.align
+        host_time = dequeue_time if dequeue_time is not None else self.clock_sync.now()
+        return [align(channel_label, getattr(messages[i], 'timestamp', None), host_time) for i in range(count)]
+
+    def _ingest_processed_message(self, advanced_msg, processor, channel_label, dequeue_time, rx_timestamp=None):
+        """디코딩된 메시지를 표시/로깅/핸들러 경로에 반영 (rx_timestamp는 이미 정렬된 수신 시각)"""
+        if rx_timestamp is None:
+            # 드라이버 수신 시각을 공통 기준 시계로 정렬 (채널 간 오프셋/드리프트 보정)
+            host_time = dequeue_time if dequeue_time is not None else self.clock_sync.now()
+            rx_timestamp = self.clock_sync.align(channel_label, advanced_msg.rx_timestamp, host_time)
+
+        # 종단 지연 추적: 정렬된 수신 시각 기준 dequeue/decode 단계 기록
+        if dequeue_time is not None:
+            self.latency_tracer.record(channel_label, "dequeue", rx_timestamp, dequeue_time)
+        self.latency_tracer.record(channel_label, "decode", rx_timestamp, advanced_msg.stage_times.get('decode'))
+        self.last_rx_timestamp[channel_label] = rx_timestamp
+
+        # 표시/로그용 시각은 float64 초로 저장하고 렌더링 시점에만 문자열로 변환
+        if self.start_time is not None:
+            elapsed_sec = rx_timestamp - self.start_time
+        else:
+            elapsed_sec = 0.0
+
+        if self.delta_t_mode:
+            if self.last_timestamp is None:
+                display_time = 0.0
+            else:
+                display_time = rx_timestamp - self.last_timestamp
+            self.last_timestamp = rx_timestamp
+        else:
+            display_time = elapsed_sec
+
+        # 채널 마지막 수신 시간 기록
+        self.last_rx_time[channel_label] = time.time()
+
+        # 메시지 상태에 따른 처리
+        buffer = self.message_buffer
+        channel_id = buffer.registry.channel_id(channel_label)
+        if advanced_msg.status == MessageStatus.VALID:
+            signal_slots = self._signal_slots_for(channel_label, advanced_msg)
+            ingest_filter = self.signal_filter if self.filter_at_ingest else None
+            slots = []
+            values = []
+            texts = []
+            for sig_name, val in advanced_msg.signals.items():
+                slot_unit = signal_slots.get(sig_name)
+                if slot_unit is None:
+                    slot_unit = self._register_signal_slot(processor, channel_label, advanced_msg, sig_name, val)
+                slot = slot_unit[0]
+                if ingest_filter is None or slot in ingest_filter.matched:
+                    number, text = encode_value(val)
+                    slots.append(slot)
+                    values.append(number)
+                    texts.append(text)
+                # 최신값 저장 및 사용자 핸들러 호출 (드라이버 수신 시각을 그대로 전달)
+                self.latest_values[(channel_label, sig_name)] = (val, rx_timestamp)
+                self._run_processing_handlers(channel_label, advanced_msg.message_name, sig_name, val, rx_timestamp)
+            if slots:
+                if self.keep_local_rows:
+                    buffer.append_frame(display_time, channel_id, advanced_msg.message_id, slots, values, texts)
+                    self.latest_store.update_frame(display_time, slots, values, texts)
+                    # 그래프 시계열은 Period 모드와 관계없이 수신 시작 기준 경과 시간으로 쌓음 (구독 슬롯만)
+                    self.signal_series.update_frame(elapsed_sec, slots, values)
+                sink = self.row_sink
+                if sink is not None:
+                    sink.append_frame(display_time, elapsed_sec, rx_timestamp, channel_id, advanced_msg.message_id,
+                                      slots, values, texts)
+
+            # 레이더 데이터 처리 (ID 200-209)
+            if self.track_radar and 200 <= advanced_msg.message_id <= 209:
+                self._process_radar_data(advanced_msg.message_id, advanced_msg.signals, elapsed_sec)
+
+            stream_logger = self.stream_logger
+            if stream_logger is not None:
+                stream_logger.log_frame(elapsed_sec, advanced_msg.signals)
+        else:
+            # 유효하지 않은 메시지도 표시 (상세한 오류 정보 포함)
+            status_info = f"{advanced_msg.status.value.upper()}"
+            error_info = f"{status_info}: {advanced_msg.error_message}" if advanced_msg.error_message else status_info
+            # 슬롯은 상태별로 하나만 등록하고 오류 상세는 행 텍스트로 보관
+            slot = buffer.registry.slot(channel_label, advanced_msg.message_name, status_info, "",
+                                        advanced_msg.message_id)
+            self.signal_filter.resolve(buffer.registry)
+            error_text = (error_info, f"DLC:{advanced_msg.dlc}, Retry:{advanced_msg.retry_count}")
+            if self.keep_local_rows:
+                buffer.append(display_time, channel_id, advanced_msg.message_id, slot, float('nan'), error_text)
+                self.latest_store.update(slot, display_time, float('nan'), error_text)
+            sink = self.row_sink
+            if sink is not None:
+                sink.append_frame(display_time, elapsed_sec, rx_timestamp, channel_id, advanced_msg.message_id,
+                                  (slot,), (float('nan'),), (error_text,))
+            logger.warning(f"CAN 메시지 처리 실패 - ID: {advanced_msg.message_id}, "
+                           f"상태: {advanced_msg.status.value}, 오류: {advanced_msg.error_message}")
+
+    def _signal_slots_for(self, channel_label, advanced_msg):
+        """(채널, 메시지 ID)별 신호 -> (슬롯, 단위) 캐시"""
+        key = (channel_label, advanced_msg.message_id)
+        signal_slots = self._signal_slots.get(key)
+        if signal_slots is None:
+            signal_slots = self._signal_slots.setdefault(key, {})
+        return signal_slots
+
+    def _register_signal_slot(self, processor, channel_label, advanced_msg, sig_name, val):
+        """신호 최초 수신 시 DBC 단위 조회 후 링 버퍼 슬롯 등록"""
+        unit = ""
+        try:
+            message_def = processor.get_message_definitions().get(advanced_msg.message_id)
+            if message_def:
+                sig_def = message_def['signals'].get(sig_name)
+                if sig_def is not None and getattr(sig_def, 'unit', None):
+                    unit = sig_def.unit or ""
+        except Exception:
+            unit = ""
+        slot = self.message_buffer.registry.slot(channel_label, advanced_msg.message_name, sig_name, unit,
+                                                 advanced_msg.message_id,
+                                                 isinstance(val, int) and not isinstance(val, bool))
+        # 필터는 새로 등록된 슬롯만 추가로 평가
+        self.signal_filter.resolve(self.message_buffer.registry)
+        slot_unit = (slot, unit)
+        self._signal_slots_for(channel_label, advanced_msg)[sig_name] = slot_unit
+        return slot_unit
+
+    # ========= 종료 =========
+    def shutdown(self):
+        """재생/로깅/수신/연결/메트릭 정리 (로그 파일은 모두 기록될 때까지 대기)"""
+        self.stop_replay()
+        if self.logging_active:
+            self.end_logging(wait=True)
+        self.stop_receiving()
+        for ch in self.channels:
+            if self.buses.get(ch) is not None:
+                self.disconnect(ch)
+        self.stop_metrics_exporter()
+
+
+def can_listener_channel(engine, channel_label, batch_size=512, mode="native"):
+    """채널별 CAN 메시지 수신 스레드
+
+    깨어날 때마다 대기 중인 프레임을 모두 드레인하여 배치 단위로 처리.
+    수신 중지/버스 미연결 상태에서는 이벤트를 기다리므로 재개 시 즉시 깨어남.
+    notifier 모드에서 수신 버퍼가 가득 차 버린 프레임은 늘어날 때마다 경고로 남김.
+    """
+    receiver = None
+    reported_drops = 0
+    while True:
+        try:
+            if not engine.receive_event.wait(timeout=0.5):
+                continue
+            bus = engine.get_bus(channel_label)
+            if not bus:
+                if receiver is not None:
+                    receiver.stop()
+                    receiver = None
+                engine.bus_ready[channel_label].wait(timeout=0.5)
+                continue
+            if receiver is None or receiver.bus is not bus:
+                if receiver is not None:
+                    receiver.stop()
+                receiver = BatchReceiver(bus, batch_size=batch_size, mode=mode)
+                reported_drops = 0
+            count = receiver.drain(timeout=0.02)  # 첫 프레임 최대 20ms 대기 후 일괄 드레인
+            if receiver.reader is not None and receiver.reader.dropped != reported_drops:
+                logger.warning(f"{channel_label} 수신 버퍼 초과로 {receiver.reader.dropped - reported_drops}프레임 버림 "
+                               f"(누적 {receiver.reader.dropped}프레임)")
+                reported_drops = receiver.reader.dropped
+            if count:
+                engine.add_can_messages(receiver.batch, count, channel_label=channel_label,
+                                        dequeue_time=time.perf_counter())
+        except Exception as e:
+            logger.error(f"CAN 수신 오류({channel_label}): {e}")
+            time.sleep(0.2)
+
+
+def _format_stats(engine: CanEngine) -> str:
+    parts = []
+    for ch, status in engine.get_channel_status().items():
+        source = f"{status['interface']}:{status['bus_channel']}" if status['connected'] else "-"
+        parts.append(f"{ch} [{source}] total {status['total_messages']}, "
+                     f"{status['messages_per_second']}/s, errors {status['invalid_messages']}")
+    replayer = engine.replayer
+    if replayer is not None:
+        replay = replayer.get_stats()
+        parts.append(f"replay {replay['offset']:.1f}s, {replay['frames_per_sec']:.0f} frames/s")
+    return " | ".join(parts)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="GUI 없이 CAN 수집/디코딩/로깅 실행 (서버/다중 인스턴스용)")
+    parser.add_argument("--dbc", default="sensor_data_20250915.dbc", help="DBC 파일 경로")
+    parser.add_argument("--channels", nargs="+", default=list(CHANNELS), help="연결할 채널 라벨")
+    parser.add_argument("--channel-config", default=None,
+                        help="채널 설정 JSON (채널별 인터페이스/비트레이트/CAN FD/DBC, 지정 시 --channels 무시)")
+    parser.add_argument("--probe-timeout", type=float, default=PROBE_TIMEOUT, help="인터페이스 후보별 연결 대기 시간 (초)")
+    parser.add_argument("--interface-cache", default=DEFAULT_CACHE_PATH,
+                        help="채널별 마지막 연결 설정 캐시 파일 (빈 문자열이면 사용 안 함)")
+    parser.add_argument("--replay", default=None, help="버스 대신 재생할 기록 파일 (.canrec/.log/.asc/.blf 등)")
+    parser.add_argument("--speed", default="1", help="재생 배속 (숫자 또는 max)")
+    parser.add_argument("--loop", action="store_true", help="재생 반복")
+    parser.add_argument("--log", choices=LOG_RATES, default=None, help="로그 방식 (지정 시 로깅)")
+    parser.add_argument("--log-method", choices=("hold", "linear"), default="hold", help="리샘플링 보간 방식")
+    parser.add_argument("--log-dir", default="", help="로그 저장 폴더")
+    parser.add_argument("--duration", type=float, default=None, help="실행 시간 (초, 기본: 중지/재생 끝까지)")
+    parser.add_argument("--stats-interval", type=float, default=5.0, help="통계 출력 간격 (초, 0=출력 안 함)")
+    parser.add_argument("--metrics-port", type=int, default=None, help="Prometheus 메트릭 포트")
+    args = parser.parse_args(argv)
+
+    channels = ChannelRegistry.load(args.channel_config) if args.channel_config else args.channels
+    engine = CanEngine(args.dbc, channels=channels, interface_cache_path=args.interface_cache or None)
+    engine.probe_timeout = args.probe_timeout
+    if args.metrics_port is not None:
+        engine.start_metrics_exporter(port=args.metrics_port)
+    if args.replay:
+        speed = None if args.speed.lower() == "max" else float(args.speed.rstrip("x"))
+        if engine.start_replay(args.replay, speed=speed, loop=args.loop) is None:
+            return 1
+    else:
+        for ch in engine.channels:
+            engine.connect(ch)
+        engine.start_listeners()
+        if not engine.start_receiving():
+            return 1
+    if args.log:
+        engine.start_logging(args.log, args.log_method, args.log_dir)
+
+    started = time.monotonic()
+    next_stats = started + args.stats_interval
+    try:
+        while True:
+            time.sleep(0.1)
+            now = time.monotonic()
+            if args.replay and not engine.poll_replay():
+                break
+            if args.duration is not None and now - started >= args.duration:
+                break
+            if args.stats_interval > 0 and now >= next_stats:
+                print(_format_stats(engine))
+                next_stats = now + args.stats_interval
+    except KeyboardInterrupt:
+        print("Ctrl+C로 종료합니다.")
+    print(_format_stats(engine))
+    engine.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,146 @@
+"""
+채널 설정 레지스트리
+채널(버스)마다 연결 인터페이스, 비트레이트, CAN FD 여부, DBC 파일을 지정.
+채널 수에 제한이 없으며 JSON 파일로 불러오고 저장 (예: CAN FD 버스 6개를 한 프로그램에서 수집).
+
+channels.json 예:
+{
+  "channels": [
+    {"label": "PT", "interface": "vector", "channel": "0", "fd": true, "dbc": "powertrain.dbc"},
+    {"label": "RADAR", "interface": "vector", "channel": "1", "fd": true, "data_bitrate": 5000000},
+    {"label": "CH3"}
+  ]
+}
+interface를 생략하면 채널별 우선 후보 -> 공통 후보 순으로 연결을 시도.
+"""
+
+import json
+import logging
+from dataclasses import asdict, dataclass, fields
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+CHANNELS = ("CH1", "CH2")
+BITRATE = 500000
+DATA_BITRATE = 2000000
+
+# 연결 후보 (interface, channel, CAN FD) - 채널별 우선 후보 다음 공통 목록을 순서대로 시도
+PREFERRED_INTERFACES = {
+    "CH1": [('vector', '3', True), ('vector', '3', False)],
+    "CH2": [('vector', '2', True), ('vector', '2', False)],
+}
+INTERFACE_CANDIDATES = [
+    # CAN FD 지원 인터페이스들
+    ('vector', '3', True),            # Vector CANoe/CANalyzer (CAN FD 지원)
+    ('ixxat', '0', True),             # IXXAT USB-to-CAN (CAN FD 지원)
+    ('socketcan', 'can0', True),      # SocketCAN (CAN FD 지원)
+    # 일반 CAN 인터페이스들
+    ('pcan', 'PCAN_USBBUS1', False),  # PEAK PCAN-USB (CAN만)
+    ('vector', '0', False),           # Vector CANoe/CANalyzer (CAN만)
+    ('ixxat', '0', False),            # IXXAT USB-to-CAN (CAN만)
+    ('socketcan', 'can0', False),     # SocketCAN (CAN만)
+    ('virtual', 'vcan0', False),      # Virtual CAN (테스트용)
+]
+
+Candidate = Tuple[str, str, bool]
+
+
+@dataclass
+class ChannelConfig:
+    """채널 하나의 연결/디코딩 설정 (interface가 None이면 후보 목록으로 자동 연결)"""
+    label: str
+    interface: Optional[str] = None
+    channel: Optional[str] = None
+    fd: bool = False
+    bitrate: int = BITRATE
+    data_bitrate: int = DATA_BITRATE
+    dbc: Optional[str] = None  # None이면 엔진 기본 DBC
+
+    def candidates(self) -> List[Candidate]:
+        """연결 시도 순서 (interface, channel, CAN FD)"""
+        if self.interface:
+            return [(self.interface, self.channel if self.channel is not None else '0', self.fd)]
+        return PREFERRED_INTERFACES.get(self.label, []) + INTERFACE_CANDIDATES
+
+    def bus_kwargs(self, is_can_fd: bool) -> Dict[str, object]:
+        """can.interface.Bus 추가 인자 (비트레이트, CAN FD 데이터 비트레이트)"""
+        if is_can_fd:
+            return {'bitrate': self.bitrate, 'fd': True, 'data_bitrate': self.data_bitrate}
+        return {'bitrate': self.bitrate}
+
+    def to_dict(self) -> Dict[str, object]:
+        """기본값이 아닌 항목만 (JSON 저장용)"""
+        defaults = ChannelConfig(self.label)
+        return {key: value for key, value in asdict(self).items()
+                if key == 'label' or value != getattr(defaults, key)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "ChannelConfig":
+        known = {field.name for field in fields(cls)}
+        unknown = set(data) - known
+        if unknown:
+            logger.warning(f"알 수 없는 채널 설정 항목 무시: {sorted(unknown)}")
+        config = cls(**{key: value for key, value in data.items() if key in known})
+        if config.channel is not None:
+            config.channel = str(config.channel)
+        return config
+
+
+class ChannelRegistry:
+    """채널 라벨 -> ChannelConfig (등록 순서 유지)"""
+
+    def __init__(self, configs: Iterable[ChannelConfig] = ()):
+        self._configs: Dict[str, ChannelConfig] = {}
+        for config in configs:
+            self.add(config)
+
+    @classmethod
+    def from_labels(cls, labels: Iterable[str]) -> "ChannelRegistry":
+        return cls(ChannelConfig(label) for label in labels)
+
+    @classmethod
+    def coerce(cls, channels: Union["ChannelRegistry", Iterable[Union[str, ChannelConfig]]]) -> "ChannelRegistry":
+        """레지스트리, 라벨 목록, ChannelConfig 목록(혼합 가능)을 레지스트리로 변환"""
+        if isinstance(channels, ChannelRegistry):
+            return channels
+        return cls(ChannelConfig(item) if isinstance(item, str) else item for item in channels)
+
+    @classmethod
+    def load(cls, path: str) -> "ChannelRegistry":
+        """JSON 파일 ({"channels": [...]} 또는 [...])에서 불러오기"""
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+        items = data.get("channels", []) if isinstance(data, dict) else data
+        registry = cls(ChannelConfig.from_dict(item) for item in items)
+        if not len(registry):
+            raise ValueError(f"채널 설정이 비어 있습니다: {path}")
+        return registry
+
+    def save(self, path: str):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"channels": [config.to_dict() for config in self]}, file, ensure_ascii=False, indent=2)
+
+    def add(self, config: ChannelConfig):
+        if config.label in self._configs:
+            raise ValueError(f"중복된 채널 라벨: {config.label}")
+        self._configs[config.label] = config
+
+    @property
+    def labels(self) -> Tuple[str, ...]:
+        return tuple(self._configs)
+
+    def get(self, label: str) -> Optional[ChannelConfig]:
+        return self._configs.get(label)
+
+    def __getitem__(self, label: str) -> ChannelConfig:
+        return self._configs[label]
+
+    def __contains__(self, label: str) -> bool:
+        return label in self._configs
+
+    def __iter__(self) -> Iterator[ChannelConfig]:
+        return iter(list(self._configs.values()))
+
+    def __len__(self):
+        return len(self._configs)
@@ -0,0 +1,143 @@
+"""
+채널별 하드웨어 타임스탬프 시계 정렬
+인터페이스가 제공하는 msg.timestamp를 공통 단조 시계(time.perf_counter)로 변환하여
+CH1/CH2 데이터를 같은 시간축에서 비교할 수 있도록 함
+"""
+
+import time
+from collections import deque
+from typing import Dict, Optional
+
+
+class ChannelClockEstimator:
+    """하드웨어 시계 -> 호스트 단조 시계 오프셋/드리프트 온라인 추정기
+
+    오프셋 표본 d = host_ts - hw_ts 는 (실제 오프셋 + 전달 지연)이며 지연은 항상 0 이상.
+    따라서 block_seconds 구간마다 d의 최솟값만 남기고, 최근 블록 최솟값들에
+    직선(오프셋 + 드리프트)을 맞춘 뒤 하한선이 되도록 내려서 사용한다.
+    프레임당 비용은 상수 시간이며 직선 맞춤은 블록 종료 시에만 수행.
+    """
+
+    def __init__(self, block_seconds: float = 1.0, history_blocks: int = 32,
+                 reset_threshold: float = 1.0, max_drift: float = 1e-3):
+        self.block_seconds = block_seconds
+        self.reset_threshold = reset_threshold  # 이 이상 어긋나면 시계 점프로 보고 재수렴
+        self.max_drift = max_drift  # 허용 드리프트 (s/s, 1e-3 = 1000ppm)
+        self.history = deque(maxlen=history_blocks)  # (hw_ts, 블록 최소 오프셋)
+        self.reset()
+
+    def reset(self):
+        """추정 상태 초기화"""
+        self.history.clear()
+        self.offset = None
+        self.drift = 0.0
+        self.reference_hw = 0.0
+        self.samples = 0
+        self._block_start = None
+        self._block_min = None  # (offset, hw_ts)
+
+    def estimate_offset(self, hw_ts: float) -> float:
+        """hw_ts 시점의 추정 오프셋"""
+        return self.offset + self.drift * (hw_ts - self.reference_hw)
+
+    def observe(self, hw_ts: float, host_ts: float):
+        """(하드웨어 시각, 호스트 수신 시각) 표본 반영"""
+        sample = host_ts - hw_ts
+        if self.offset is not None and abs(sample - self.estimate_offset(hw_ts)) > self.reset_threshold:
+            # 인터페이스 재연결/시계 리셋 등으로 인한 점프
+            self.reset()
+        self.samples += 1
+
+        if self._block_start is None:
+            self._block_start = host_ts
+        if self._block_min is None or sample < self._block_min[0]:
+            self._block_min = (sample, hw_ts)
+            if not self.history:
+                # 첫 블록 완료 전에는 현재까지의 최솟값을 바로 사용
+                self.offset = sample
+                self.reference_hw = hw_ts
+                self.drift = 0.0
+
+        if host_ts - self._block_start >= self.block_seconds:
+            self.history.append((self._block_min[1], self._block_min[0]))
+            self._block_start = host_ts
+            self._block_min = None
+            self._fit()
+
+    def _fit(self):
+        """블록 최솟값들에 최소제곱 직선을 맞추고 하한선으로 보정"""
+        n = len(self.history)
+        mean_hw = sum(hw for hw, _ in self.history) / n
+        mean_offset = sum(d for _, d in self.history) / n
+        drift = 0.0
+        if n >= 2:
+            sxx = sum((hw - mean_hw) ** 2 for hw, _ in self.history)
+            if sxx > 0:
+                sxy = sum((hw - mean_hw) * (d - mean_offset) for hw, d in self.history)
+                drift = sxy / sxx
+                if abs(drift) > self.max_drift:
+                    drift = 0.0
+        # 모든 블록 최솟값이 직선 위에 오도록 하향 보정 (지연 >= 0 가정)
+        excess = max(drift * (hw - mean_hw) + mean_offset - d for hw, d in self.history)
+        self.reference_hw = mean_hw
+        self.drift = drift
+        self.offset = mean_offset - max(0.0, excess)
+
+    def to_host(self, hw_ts: float) -> float:
+        """하드웨어 시각 -> 호스트 단조 시계 시각"""
+        if self.offset is None:
+            return hw_ts
+        return hw_ts + self.estimate_offset(hw_ts)
+
+
+class ClockSynchronizer:
+    """채널별 추정기를 묶어 공통 기준 시계(time.perf_counter)로 정렬"""
+
+    def __init__(self, **estimator_kwargs):
+        self.estimator_kwargs = estimator_kwargs
+        self.estimators: Dict[str, ChannelClockEstimator] = {}
+
+    @staticmethod
+    def now() -> float:
+        """공통 기준 시계 현재 시각"""
+        return time.perf_counter()
+
+    def _estimator(self, channel: str) -> ChannelClockEstimator:
+        estimator = self.estimators.get(channel)
+        if estimator is None:
+            estimator = self.estimators.setdefault(channel, ChannelClockEstimator(**self.estimator_kwargs))
+        return estimator
+
+    def align(self, channel: str, hw_ts: Optional[float], host_ts: Optional[float] = None) -> float:
+        """프레임의 하드웨어 타임스탬프를 기준 시계로 변환
+
+        host_ts는 수신 스레드가 프레임을 꺼낸 기준 시계 시각. 하드웨어 타임스탬프가
+        없으면 host_ts를 그대로 사용. 결과는 host_ts보다 늦지 않도록 제한.
+        """
+        if host_ts is None:
+            host_ts = time.perf_counter()
+        if not hw_ts:
+            return host_ts
+        estimator = self._estimator(channel)
+        estimator.observe(hw_ts, host_ts)
+        return min(estimator.to_host(hw_ts), host_ts)
+
+    def reset(self, channel: Optional[str] = None):
+        """채널(또는 전체) 추정 상태 초기화"""
+        if channel is None:
+            for estimator in self.estimators.values():
+                estimator.reset()
+        elif channel in self.estimators:
+            self.estimators[channel].reset()
+
+    def status(self) -> Dict[str, Dict[str, float]]:
+        """채널별 추정 오프셋/드리프트(ppm)/표본 수"""
+        result = {}
+        for channel, estimator in list(self.estimators.items()):
+            result[channel] = {
+                'offset': estimator.offset if estimator.offset is not None else 0.0,
+                'drift_ppm': estimator.drift * 1e6,
+                'samples': estimator.samples,
+                'blocks': len(estimator.history),
+            }
+        return result
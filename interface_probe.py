@@ -0,0 +1,176 @@
+"""
+CAN 인터페이스 동시 탐색 + 마지막 연결 설정 캐시
+연결 후보를 하나씩 순서대로 열면 드라이버마다 예외/타임아웃을 기다리느라 연결에 수 초가 걸리므로,
+같은 장치(interface, channel)를 쓰는 후보끼리만 순서대로 시도하고 장치끼리는 동시에 시도.
+결과는 후보 우선순위대로 판정 (우선순위가 높은 후보가 성공/실패/시간 초과로 끝나야 다음 후보 채택).
+
+성공한 설정은 채널별로 파일에 저장하여 다음 실행에서는 탐색 없이 바로 연결하고,
+캐시 설정으로 연결하지 못하면 그때 전체 후보를 탐색.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+import can
+
+from channel_config import Candidate
+
+logger = logging.getLogger(__name__)
+
+PROBE_TIMEOUT = 3.0  # 후보 하나를 여는 최대 대기 시간 (초)
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".can_interface_cache.json")
+
+BusOpener = Callable[[Candidate], can.BusABC]
+
+
+class ProbeResult(NamedTuple):
+    bus: Optional[can.BusABC]
+    candidate: Optional[Candidate]
+    elapsed: float                # 탐색 소요 시간 (초)
+    errors: Dict[Candidate, str]  # 실패/시간 초과 후보 -> 사유
+
+
+def _shutdown_quietly(bus: can.BusABC):
+    try:
+        bus.shutdown()
+    except Exception as e:
+        logger.debug(f"탐색용 버스 종료 실패: {e}")
+
+
+class _ProbeState:
+    """탐색 스레드와 판정 스레드가 공유하는 상태 (cond로 보호)"""
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.started: Dict[Candidate, float] = {}
+        self.results: Dict[Candidate, tuple] = {}  # candidate -> (bus, error)
+        self.abandoned = set()  # 시간 초과로 판정을 마친 후보 (늦게 열리면 바로 닫음)
+        self.done = False
+
+
+def _probe_group(group: List[Candidate], opener: BusOpener, state: _ProbeState):
+    """같은 장치를 쓰는 후보들을 순서대로 시도 (성공하면 같은 장치의 하위 후보는 시도하지 않음)"""
+    for candidate in group:
+        with state.cond:
+            if state.done or candidate in state.abandoned:
+                return
+            state.started[candidate] = time.perf_counter()
+        try:
+            bus, error = opener(candidate), None
+        except Exception as e:
+            bus, error = None, f"{type(e).__name__}: {e}"
+        with state.cond:
+            discard = state.done or candidate in state.abandoned
+            if not discard:
+                state.results[candidate] = (bus, error)
+                state.cond.notify_all()
+        if discard:
+            if bus is not None:
+                _shutdown_quietly(bus)
+            return
+        if bus is not None:
+            return
+
+
+def probe_interfaces(candidates: Sequence[Candidate], opener: BusOpener,
+                     timeout: float = PROBE_TIMEOUT) -> ProbeResult:
+    """후보를 장치별 스레드로 동시에 열어 우선순위가 가장 높은 성공 후보의 버스를 반환
+
+    채택되지 않은 버스는 닫고, 시간 초과된 시도는 나중에 열리더라도 탐색 스레드가 닫음.
+    """
+    started = time.perf_counter()
+    ordered = list(dict.fromkeys(tuple(candidate) for candidate in candidates))
+    groups: Dict[tuple, List[Candidate]] = {}
+    for candidate in ordered:
+        groups.setdefault(candidate[:2], []).append(candidate)
+
+    state = _ProbeState()
+    for key, group in groups.items():
+        threading.Thread(target=_probe_group, args=(group, opener, state),
+                         name=f"can-probe-{key[0]}-{key[1]}", daemon=True).start()
+
+    winner: Optional[Candidate] = None
+    errors: Dict[Candidate, str] = {}
+    with state.cond:
+        for candidate in ordered:
+            while candidate not in state.results and candidate not in state.abandoned:
+                attempt_started = state.started.get(candidate)
+                remaining = timeout if attempt_started is None else timeout - (time.perf_counter() - attempt_started)
+                if attempt_started is not None and remaining <= 0:
+                    # 드라이버가 응답하지 않는 장치: 같은 장치의 남은 후보도 포기
+                    group = groups[candidate[:2]]
+                    state.abandoned.update(group[group.index(candidate):])
+                    break
+                state.cond.wait(remaining)
+            if candidate in state.results:
+                bus, error = state.results[candidate]
+                if bus is not None:
+                    winner = candidate
+                    break
+                errors[candidate] = error
+            elif candidate in state.abandoned:
+                errors[candidate] = f"timeout ({timeout:g}s)" if candidate in state.started else "skipped"
+        state.done = True
+        extra = [bus for candidate, (bus, _) in state.results.items() if bus is not None and candidate != winner]
+    for bus in extra:
+        _shutdown_quietly(bus)
+    bus = state.results[winner][0] if winner is not None else None
+    return ProbeResult(bus, winner, time.perf_counter() - started, errors)
+
+
+class InterfaceCache:
+    """채널 라벨 -> 마지막으로 연결에 성공한 (interface, channel, CAN FD) 파일 캐시"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict[str, object]]] = None
+
+    def _load(self) -> Dict[str, Dict[str, object]]:
+        if self._entries is None:
+            try:
+                with open(self.path, encoding="utf-8") as file:
+                    self._entries = json.load(file).get("channels", {})
+            except FileNotFoundError:
+                self._entries = {}
+            except (OSError, ValueError, AttributeError) as e:
+                logger.warning(f"인터페이스 캐시를 읽을 수 없어 무시합니다: {self.path} ({e})")
+                self._entries = {}
+        return self._entries
+
+    def _save(self):
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump({"channels": self._entries}, file, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.warning(f"인터페이스 캐시 저장 실패: {self.path} ({e})")
+
+    def get(self, label: str) -> Optional[Candidate]:
+        with self._lock:
+            entry = self._load().get(label)
+        if not entry:
+            return None
+        return (entry["interface"], entry["channel"], bool(entry["fd"]))
+
+    def entry(self, label: str) -> Optional[Dict[str, object]]:
+        with self._lock:
+            entry = self._load().get(label)
+        return dict(entry) if entry else None
+
+    def store(self, label: str, candidate: Candidate, connect_time: float):
+        interface, channel, is_can_fd = candidate
+        with self._lock:
+            self._load()[label] = {"interface": interface, "channel": channel, "fd": bool(is_can_fd),
+                                   "connect_time": round(connect_time, 4), "updated": time.strftime("%Y-%m-%d %H:%M:%S")}
+            self._save()
+
+    def forget(self, label: str):
+        with self._lock:
+            if self._load().pop(label, None) is not None:
+                self._save()
@@ -0,0 +1,204 @@
+"""
+고정 메모리 로그 버킷 지연시간 히스토그램 (HDR 스타일)
+평균만으로는 가려지는 꼬리 지연(p99/p999/max)을 확인하기 위해 사용
+"""
+
+import time
+from array import array
+from typing import Dict, Iterable, Optional
+
+
+class LatencyHistogram:
+    """로그-선형 버킷 기반 지연시간 히스토그램 (내부 단위: 마이크로초)
+
+    - 값 v < 2^bits 는 1us 단위 선형 버킷
+    - 그 이상은 2의 거듭제곱 구간마다 2^(bits-1)개 버킷 (상대 오차 <= 2^-(bits-1))
+    - 기록은 O(1), 메모리는 버킷 수에 고정
+    - 단일 writer 가정: 락 없이 기록하며, 다른 스레드는 copy()로 스냅샷을 읽음
+    """
+
+    def __init__(self, significant_bits: int = 5, max_value_us: int = 60_000_000):
+        self.significant_bits = significant_bits
+        self.max_value_us = max_value_us
+        self._sub_count = 1 << significant_bits
+        self._half_count = self._sub_count >> 1
+        max_shift = max(0, max_value_us.bit_length() - significant_bits)
+        self.bucket_count = self._sub_count + max_shift * self._half_count
+        self.counts = array('Q', bytes(8 * self.bucket_count))
+        self.total_count = 0
+        self.total_sum_us = 0
+        self.min_us = None
+        self.max_us = 0
+
+    def _bucket_index(self, value_us: int) -> int:
+        """값 -> 버킷 인덱스"""
+        if value_us < self._sub_count:
+            return value_us
+        shift = value_us.bit_length() - self.significant_bits
+        index = self._sub_count + (shift - 1) * self._half_count + ((value_us >> shift) - self._half_count)
+        return min(index, self.bucket_count - 1)
+
+    def _bucket_upper_value(self, index: int) -> int:
+        """버킷 인덱스 -> 해당 버킷이 표현하는 최댓값 (us)"""
+        if index < self._sub_count:
+            return index
+        offset = index - self._sub_count
+        shift = offset // self._half_count + 1
+        top = offset % self._half_count + self._half_count
+        return ((top + 1) << shift) - 1
+
+    def record(self, seconds: float):
+        """지연시간 기록 (초 단위 입력)"""
+        self.record_us(int(seconds * 1_000_000))
+
+    def record_us(self, value_us: int):
+        """지연시간 기록 (마이크로초 단위 입력)"""
+        if value_us < 0:
+            value_us = 0
+        self.counts[self._bucket_index(value_us)] += 1
+        self.total_count += 1
+        self.total_sum_us += value_us
+        if value_us > self.max_us:
+            self.max_us = value_us
+        if self.min_us is None or value_us < self.min_us:
+            self.min_us = value_us
+
+    def reset(self):
+        """모든 버킷 초기화"""
+        self.counts = array('Q', bytes(8 * self.bucket_count))
+        self.total_count = 0
+        self.total_sum_us = 0
+        self.min_us = None
+        self.max_us = 0
+
+    def merge(self, other: 'LatencyHistogram') -> 'LatencyHistogram':
+        """다른 히스토그램을 누적 (버킷 구성이 같아야 함)"""
+        if other.bucket_count != self.bucket_count or other.significant_bits != self.significant_bits:
+            raise ValueError("버킷 구성이 다른 히스토그램은 병합할 수 없습니다")
+        counts = self.counts
+        for i, c in enumerate(other.counts):
+            if c:
+                counts[i] += c
+        self.total_count += other.total_count
+        self.total_sum_us += other.total_sum_us
+        if other.max_us > self.max_us:
+            self.max_us = other.max_us
+        if other.min_us is not None and (self.min_us is None or other.min_us < self.min_us):
+            self.min_us = other.min_us
+        return self
+
+    def copy(self) -> 'LatencyHistogram':
+        """동일 구성의 복사본 생성"""
+        clone = LatencyHistogram(self.significant_bits, self.max_value_us)
+        clone.counts = array('Q', self.counts)
+        clone.total_count = self.total_count
+        clone.total_sum_us = self.total_sum_us
+        clone.min_us = self.min_us
+        clone.max_us = self.max_us
+        return clone
+
+    @classmethod
+    def merged(cls, histograms: Iterable['LatencyHistogram']) -> Optional['LatencyHistogram']:
+        """여러 히스토그램(채널별 등)을 하나로 병합한 새 히스토그램 반환"""
+        result = None
+        for hist in histograms:
+            if result is None:
+                result = hist.copy()
+            else:
+                result.merge(hist)
+        return result
+
+    def percentile_us(self, percentile: float) -> int:
+        """백분위 값 (us). 버킷 상한값을 반환하되 관측 최댓값을 넘지 않음"""
+        if self.total_count == 0:
+            return 0
+        target = max(1, int(round(self.total_count * percentile / 100.0)))
+        running = 0
+        for index, count in enumerate(self.counts):
+            if count:
+                running += count
+                if running >= target:
+                    return min(self._bucket_upper_value(index), self.max_us)
+        return self.max_us
+
+    def percentile(self, percentile: float) -> float:
+        """백분위 값 (초)"""
+        return self.percentile_us(percentile) / 1_000_000
+
+    def mean(self) -> float:
+        """평균 (초)"""
+        if self.total_count == 0:
+            return 0.0
+        return self.total_sum_us / self.total_count / 1_000_000
+
+    def snapshot(self) -> Dict[str, float]:
+        """요약 통계 (초 단위)"""
+        return {
+            'count': self.total_count,
+            'mean': self.mean(),
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'p999': self.percentile(99.9),
+            'max': self.max_us / 1_000_000,
+        }
+
+
+class RollingLatencyHistogram:
+    """롤링 윈도우 지연시간 히스토그램
+
+    window_seconds 구간을 slot_count개의 슬롯 히스토그램으로 나누어 순환 사용.
+    기록 시점에 슬롯 경계를 넘으면 가장 오래된 슬롯을 비우고 재사용하므로
+    메모리는 고정이며 기록은 O(1) (슬롯 회전 시에만 O(버킷 수)).
+    now 인자는 모두 time.perf_counter 기준 (수신/처리 단계 시각과 같은 시계, 생략 시 기본값).
+    """
+
+    def __init__(self, window_seconds: float = 60.0, slot_count: int = 6,
+                 significant_bits: int = 5, max_value_us: int = 60_000_000):
+        self.window_seconds = window_seconds
+        self.slot_count = slot_count
+        self.slot_seconds = window_seconds / slot_count
+        self.slots = [LatencyHistogram(significant_bits, max_value_us) for _ in range(slot_count)]
+        self.slot_epochs = [-1] * slot_count
+        # 누적(전체 기간) 개수/합: 슬롯 회전으로 줄지 않음 (Prometheus summary _count/_sum용)
+        self.total_count = 0
+        self.total_sum_us = 0
+
+    def record(self, seconds: float, now: Optional[float] = None):
+        """지연시간 기록 (초 단위). now는 time.perf_counter 기준 현재 시각"""
+        if now is None:
+            now = time.perf_counter()
+        epoch = int(now / self.slot_seconds)
+        index = epoch % self.slot_count
+        if self.slot_epochs[index] != epoch:
+            self.slots[index].reset()
+            self.slot_epochs[index] = epoch
+        value_us = max(0, int(seconds * 1_000_000))
+        self.slots[index].record_us(value_us)
+        self.total_count += 1
+        self.total_sum_us += value_us
+
+    def window_histogram(self, now: Optional[float] = None) -> LatencyHistogram:
+        """현재 윈도우에 속한 슬롯을 병합한 히스토그램"""
+        if now is None:
+            now = time.perf_counter()
+        current_epoch = int(now / self.slot_seconds)
+        live = [hist for hist, epoch in zip(self.slots, self.slot_epochs)
+                if epoch >= 0 and current_epoch - epoch < self.slot_count]
+        merged = LatencyHistogram.merged(live)
+        if merged is None:
+            first = self.slots[0]
+            merged = LatencyHistogram(first.significant_bits, first.max_value_us)
+        return merged
+
+    def snapshot(self, now: Optional[float] = None) -> Dict[str, float]:
+        """윈도우 요약 통계 (초 단위)"""
+        return self.window_histogram(now).snapshot()
+
+    @staticmethod
+    def merged_window(histograms: Iterable['RollingLatencyHistogram'],
+                      now: Optional[float] = None) -> Optional[LatencyHistogram]:
+        """여러 롤링 히스토그램(채널별 프로세서 등)의 현재 윈도우를 병합"""
+        if now is None:
+            now = time.perf_counter()
+        return LatencyHistogram.merged(hist.window_histogram(now) for hist in histograms)
@@ -0,0 +1,94 @@
+"""
+버스 수신 시각부터 소비자까지의 구간별 지연 추적
+드라이버 수신 타임스탬프(msg.timestamp)를 기준으로 각 처리 단계까지의 지연 분포를 집계
+"""
+
+import time
+from typing import Dict, Optional
+
+from latency_histogram import RollingLatencyHistogram
+
+# 추적 단계 (파이프라인 순서)
+TRACE_STAGES = (
+    "dequeue",     # 수신 스레드가 버스에서 꺼낸 시각
+    "decode",      # 신호 디코딩 완료
+    "transfer",    # 수집 프로세스 -> GUI 프로세스 공유 메모리 전달 (별도 프로세스 수집 시)
+    "handler",     # 실시간 처리 핸들러 호출
+    "table",       # GUI 테이블 렌더링
+    "projection",  # CIPV 카메라 projection 계산 완료
+)
+
+
+def trace_path_name(stage: str) -> str:
+    """단계 이름 -> 경로 이름 (예: decode -> bus_to_decode)"""
+    return f"bus_to_{stage}"
+
+
+class LatencyTracer:
+    """채널/단계별 종단 지연 분포 집계기
+
+    각 (채널, 단계) 히스토그램은 해당 단계를 실행하는 스레드 하나만 기록하므로
+    락 없이 기록 가능. 수신 타임스탬프는 ClockSynchronizer로 정렬된 값이어야 하며
+    단계 시각과 같은 시간축(time.perf_counter)을 사용.
+    """
+
+    def __init__(self, window_seconds: float = 60.0):
+        self.window_seconds = window_seconds
+        self.histograms: Dict[tuple, RollingLatencyHistogram] = {}
+
+    def _histogram(self, channel: str, stage: str) -> RollingLatencyHistogram:
+        key = (channel, stage)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms.setdefault(key, RollingLatencyHistogram(self.window_seconds))
+        return histogram
+
+    def record(self, channel: str, stage: str, rx_timestamp: Optional[float],
+               stage_time: Optional[float] = None):
+        """단계 도달 시각 기록 (rx_timestamp가 없으면 무시)"""
+        if not rx_timestamp:
+            return
+        if stage_time is None:
+            stage_time = time.perf_counter()
+        self._histogram(channel, stage).record(stage_time - rx_timestamp, stage_time)
+
+    def report(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """채널 -> 경로 -> 요약 통계 (초)"""
+        now = time.perf_counter()
+        result = {}
+        for channel in sorted({channel for channel, _ in self.histograms}):
+            for stage in TRACE_STAGES:
+                histogram = self.histograms.get((channel, stage))
+                if histogram is not None:
+                    result.setdefault(channel, {})[trace_path_name(stage)] = histogram.snapshot(now)
+        return result
+
+    def within_budget(self, channel: str, stage: str, budget_seconds: float = 0.020,
+                      percentile: float = 99.9) -> Optional[bool]:
+        """지정 백분위 지연이 예산 이내인지 확인 (데이터 없으면 None)"""
+        histogram = self.histograms.get((channel, stage))
+        if histogram is None:
+            return None
+        window = histogram.window_histogram()
+        if window.total_count == 0:
+            return None
+        return window.percentile(percentile) <= budget_seconds
+
+    def format_report(self) -> str:
+        """콘솔 출력용 보고서 문자열"""
+        lines = []
+        for channel, paths in self.report().items():
+            for path, snapshot in paths.items():
+                lines.append(f"[{channel}] {path:<20} n={snapshot['count']:<7} "
+                             f"p50={snapshot['p50']*1000:.2f}ms p99={snapshot['p99']*1000:.2f}ms "
+                             f"p999={snapshot['p999']*1000:.2f}ms max={snapshot['max']*1000:.2f}ms")
+        return "\n".join(lines)
+
+    def register_metrics(self, exporter, channels):
+        """MetricsExporter에 경로별 종단 지연 summary 등록"""
+        for channel in channels:
+            for stage in TRACE_STAGES:
+                exporter.register_latency("can_e2e_latency_seconds",
+                                          "Latency from bus receive timestamp to pipeline stage",
+                                          self._histogram(channel, stage),
+                                          {"channel": channel, "path": trace_path_name(stage)})
@@ -0,0 +1,132 @@
+"""
+신호별 최신값 저장소
+(채널, 메시지, 신호, 단위) 슬롯마다 마지막 값을 수신 시점에 갱신하고,
+마지막 조회 이후 바뀐 슬롯을 dirty 집합으로 추적하여 테이블이 바뀐 행만 다시 그리도록 함
+"""
+
+import threading
+from typing import List, Optional, Set
+
+from message_ring import SignalSlotRegistry, format_signal_value
+from slot_order import ArrivalOrder, NameOrder
+
+
+class LatestValueStore:
+    """슬롯별 최신값 + dirty 플래그
+
+    - 수신 스레드: update()/update_frame()으로 O(신호 수) 갱신
+    - GUI 스레드: take_dirty()로 바뀐 슬롯 집합을 가져가고 row_tuple()로 보이는 행만 포맷
+    - 고정 표시(pin)용 슬롯은 DBC 기준으로 미리 등록하여 미수신 신호도 행으로 표시
+    - 행 순서(도착 순/이름순)는 슬롯이 추가될 때 갱신되므로 표시 시 정렬이 필요 없음
+      (GUI는 order_slots()로 뜬 스냅샷을 표시)
+    """
+
+    def __init__(self, registry: SignalSlotRegistry):
+        self.registry = registry
+        self._lock = threading.Lock()
+        self.timestamps: List[Optional[float]] = []
+        self.values: List[float] = []
+        self.texts: List[object] = []
+        self.received_order = ArrivalOrder()  # 한 번 이상 값이 들어온 슬롯 (최초 수신 순)
+        self.received_by_name = NameOrder(registry)
+        self.pinned_order = ArrivalOrder()    # 고정 표시 슬롯 (DBC 순)
+        self.pinned_by_name = NameOrder(registry)
+        self._dirty: Set[int] = set()
+
+    def _ensure(self, slot: int):
+        # 락 안에서 호출
+        grow = slot + 1 - len(self.timestamps)
+        if grow > 0:
+            self.timestamps.extend([None] * grow)
+            self.values.extend([0.0] * grow)
+            self.texts.extend([None] * grow)
+
+    def _set(self, slot: int, timestamp: float, value: float, text):
+        if slot >= len(self.timestamps):
+            self._ensure(slot)
+        if self.timestamps[slot] is None:
+            self.received_order.add(slot)
+            self.received_by_name.add(slot)
+        self.timestamps[slot] = timestamp
+        self.values[slot] = value
+        self.texts[slot] = text
+        self._dirty.add(slot)
+
+    def update(self, slot: int, timestamp: float, value: float, text=None):
+        """슬롯 하나 갱신"""
+        with self._lock:
+            self._set(slot, timestamp, value, text)
+
+    def update_frame(self, timestamp: float, slots: List[int], values: List[float], texts: List[object]):
+        """한 프레임의 신호들을 한 번의 락 획득으로 갱신"""
+        with self._lock:
+            for slot, value, text in zip(slots, values, texts):
+                self._set(slot, timestamp, value, text)
+
+    def update_rows(self, timestamps: List[float], slots: List[int], values: List[float], texts: List[object]):
+        """여러 프레임의 행을 한 번의 락 획득으로 갱신 (같은 슬롯은 마지막 행이 남음)"""
+        with self._lock:
+            for timestamp, slot, value, text in zip(timestamps, slots, values, texts):
+                self._set(slot, timestamp, value, text)
+
+    def pin(self, slot: int):
+        """고정 표시 슬롯 등록 (미수신이면 빈 값으로 표시)"""
+        with self._lock:
+            self._ensure(slot)
+            self.pinned_order.add(slot)
+            self.pinned_by_name.add(slot)
+
+    def clear_pins(self):
+        with self._lock:
+            self.pinned_order = ArrivalOrder()
+            self.pinned_by_name = NameOrder(self.registry)
+
+    def order(self, pinned: bool = False, by_name: bool = False):
+        """표시 행 순서 객체 (len/slot_at/row_of, 수신 스레드가 계속 추가하는 원본)"""
+        if pinned:
+            return self.pinned_by_name if by_name else self.pinned_order
+        return self.received_by_name if by_name else self.received_order
+
+    def order_slots(self, pinned: bool = False, by_name: bool = False) -> List[int]:
+        """표시 행 순서 스냅샷 (GUI 스레드용, 수신 스레드의 추가와 섞이지 않도록 락 안에서 복사)"""
+        with self._lock:
+            return self.order(pinned, by_name).slots()
+
+    def received_slots(self) -> List[int]:
+        """값이 들어온 슬롯 목록 (최초 수신 순)"""
+        return self.received_order.slots()
+
+    def pinned_slots(self) -> List[int]:
+        """고정 표시 슬롯 목록 (DBC 순)"""
+        return self.pinned_order.slots()
+
+    def received_count(self) -> int:
+        return len(self.received_order)
+
+    def pinned_count(self) -> int:
+        return len(self.pinned_order)
+
+    def take_dirty(self) -> Set[int]:
+        """마지막 호출 이후 갱신된 슬롯 집합을 가져가고 초기화"""
+        with self._lock:
+            dirty = self._dirty
+            self._dirty = set()
+        return dirty
+
+    def row_tuple(self, slot: int) -> tuple:
+        """슬롯 -> 표시용 튜플 (time, channel, message, signal, value, unit)"""
+        ch, msg, sig, unit = self.registry.keys[slot]
+        timestamp = self.timestamps[slot] if slot < len(self.timestamps) else None
+        if timestamp is None:
+            return ("", ch, msg, sig, "", unit)
+        text = self.texts[slot]
+        if isinstance(text, tuple):
+            sig = text[0]
+        return (timestamp, ch, msg, sig,
+                format_signal_value(self.registry.integer[slot], self.values[slot], text), unit)
+
+    def get(self, slot: int):
+        """슬롯 최신 (시각, 값, 텍스트) (미수신이면 None)"""
+        if slot >= len(self.timestamps) or self.timestamps[slot] is None:
+            return None
+        return self.timestamps[slot], self.values[slot], self.texts[slot]
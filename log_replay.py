@@ -0,0 +1,334 @@
+"""
+기록 로그 재생 엔진
+네이티브 세션 기록(.canrec), candump/ASC(인덱스 조회), BLF 등 python-can 지원 로그의 프레임을
+수신 스레드 대신 CanDataViewer.add_can_messages / TSMasterCanProcessor에 배치로 주입.
+원래 시간 간격(0.1~100배속) 또는 최대 속도로 재생하며 일시정지/탐색/반복을 지원.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import can
+
+from recording_reader import open_recording
+
+logger = logging.getLogger(__name__)
+
+MIN_SPEED = 0.1
+MAX_SPEED = 100.0
+REBASE_GAP = 0.001  # 반복/탐색 직후 첫 프레임과 마지막 주입 프레임 사이의 가상 수신 간격 (초)
+
+# deliver(messages, count, channel_label, dequeue_time)
+ReplaySink = Callable[[List[can.Message], int, str, float], None]
+
+
+class RecordingSource:
+    """인덱스 조회가 가능한 기록 (네이티브/candump/ASC) - 탐색 시 해당 시각부터 바로 읽음"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.reader = open_recording(path)
+        self.channels = list(self.reader.channels)
+
+    @property
+    def time_range(self) -> Tuple[float, float]:
+        return self.reader.time_range
+
+    def frames(self, start: Optional[float] = None) -> Iterator[Tuple[str, can.Message]]:
+        return self.reader.frames(start=start)
+
+    def close(self):
+        self.reader.close()
+
+
+class PythonCanSource:
+    """python-can LogReader 기록 (BLF, TRC, MF4 등) - 탐색 시 처음부터 읽으며 건너뜀"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.channels: List[str] = []
+        first = next(iter(can.LogReader(path)), None)
+        self._first_time = first.timestamp if first is not None else 0.0
+
+    @property
+    def time_range(self) -> Tuple[float, float]:
+        return (self._first_time, float("inf"))
+
+    def _channel(self, msg: can.Message) -> str:
+        channel = "CH1" if msg.channel is None else str(msg.channel)
+        if channel not in self.channels:
+            self.channels.append(channel)
+        return channel
+
+    def frames(self, start: Optional[float] = None) -> Iterator[Tuple[str, can.Message]]:
+        for msg in can.LogReader(self.path):
+            if start is not None and msg.timestamp < start:
+                continue
+            yield self._channel(msg), msg
+
+    def close(self):
+        pass
+
+
+PYTHON_CAN_SUFFIXES = (".blf", ".trc", ".mf4", ".csv", ".db")
+
+
+def open_replay_source(path: str):
+    """로그 형식에 맞는 재생 소스 (.canrec/candump/ASC는 인덱스 조회, 그 외는 python-can)"""
+    if path.lower().endswith(PYTHON_CAN_SUFFIXES):
+        return PythonCanSource(path)
+    return RecordingSource(path)
+
+
+def viewer_sink(viewer) -> ReplaySink:
+    """CanDataViewer 수신 경로 주입 (채널별 TSMaster 처리기 -> 표시/로깅/핸들러)"""
+    return viewer.add_can_messages
+
+
+def processor_sink(processors: Dict[str, object], handler: Optional[Callable] = None) -> ReplaySink:
+    """TSMasterCanProcessor 직접 주입 (GUI 없이 디코딩/벤치마크용)"""
+    def deliver(messages, count, channel_label, dequeue_time):
+        processor = processors.get(channel_label)
+        if processor is None:
+            return
+        processed = processor.process_messages(messages, count)
+        if handler is not None:
+            handler(channel_label, processed)
+    return deliver
+
+
+class LogReplayer:
+    """기록 로그 재생기
+
+    speed: 재생 배속 (0.1~100), None이면 최대 속도 (batch_size 단위로 연속 주입)
+    원래 간격 재생 시 batch_window 안에 도달하는 프레임을 채널별로 묶어 한 번에 주입.
+    channel_map: 기록 채널 이름 -> 뷰어 채널 라벨 (없으면 CH1/CH2는 그대로, 그 외는 등장 순서대로 CH1, CH2 ...)
+    labels: 수신 쪽 채널 라벨 목록. 지정하면 같은 이름의 기록 채널은 그대로, 그 외는 남은 라벨에 등장 순서대로 배정.
+            남은 라벨이 없는 기록 채널은 다른 버스 프레임이 한 처리기/시계 정렬에 섞이지 않도록
+            주입하지 않고 건너뜀 (경고 후 skipped_frames에 누적, channel_map으로 배정 가능)
+
+    주입 시 dequeue_time은 기록 시각을 1배속 기준 호스트 시계로 옮긴 가상 시각이므로
+    표시/로그 시각은 배속과 관계없이 기록상의 시간 간격을 유지함. 반복/탐색 시에는 기준점을
+    다시 잡아 가상 시각이 마지막 주입 시각 뒤로 이어지므로 되돌아가지 않음.
+    (재생 중 지연 추적 통계는 실제 버스 지연이 아님)
+    """
+
+    def __init__(self, source, sink: ReplaySink, speed: Optional[float] = 1.0, loop: bool = False,
+                 batch_size: int = 256, batch_window: float = 0.002,
+                 channel_map: Optional[Dict[str, str]] = None,
+                 on_finished: Optional[Callable[[], None]] = None,
+                 labels: Optional[Sequence[str]] = None):
+        self.source = source
+        self.sink = sink
+        self.loop = loop
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.channel_map: Dict[str, Optional[str]] = dict(channel_map or {})  # None: 건너뛰는 채널
+        self.labels = tuple(labels) if labels else ("CH1", "CH2")
+        self.on_finished = on_finished
+
+        self.start_time = source.time_range[0]  # 기록 첫 프레임 시각 (반복 재생 시작점)
+        self.position: Optional[float] = None  # 마지막으로 주입한 프레임의 기록 시각
+        self.frames_sent = 0
+        self.batches_sent = 0
+        self.skipped_frames = 0  # 배정할 수신 채널이 없어 건너뛴 프레임
+        self.laps = 0
+        self.active_time = 0.0
+        self.last_dequeue_time: Optional[float] = None  # 마지막으로 주입한 묶음의 가상 수신 시각
+
+        self._running = threading.Event()
+        self._resume = threading.Event()
+        self._resume.set()
+        self._wake = threading.Event()
+        self._seek_to: Optional[float] = None
+        self._restart_anchor = False
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.speed: Optional[float] = None
+        self.set_speed(speed)
+
+    # ---- 제어 ----
+
+    def set_speed(self, speed: Optional[float]):
+        """배속 변경 (None/0 = 최대 속도)"""
+        if speed:
+            speed = min(max(float(speed), MIN_SPEED), MAX_SPEED)
+        self.speed = speed or None
+        self._restart_anchor = True
+        self._wake.set()
+
+    def start(self):
+        if self.running:
+            return
+        self._running.set()
+        self._thread = threading.Thread(target=self._run, name="log-replay", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 2.0):
+        self._running.clear()
+        self._resume.set()
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def pause(self):
+        self._resume.clear()
+        self._wake.set()
+
+    def resume(self):
+        self._restart_anchor = True
+        self._resume.set()
+        self._wake.set()
+
+    @property
+    def paused(self) -> bool:
+        return not self._resume.is_set()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def seek(self, timestamp: float):
+        """기록 시각 timestamp부터 재생 (일시정지 상태는 유지)"""
+        with self._lock:
+            self._seek_to = timestamp
+        self._wake.set()
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            'frames': self.frames_sent,
+            'batches': self.batches_sent,
+            'laps': self.laps,
+            'position': self.position if self.position is not None else 0.0,
+            'offset': self.position - self.start_time if self.position is not None else 0.0,
+            'skipped': self.skipped_frames,
+            'frames_per_sec': self.frames_sent / self.active_time if self.active_time > 0 else 0.0,
+            'speed': self.speed or 0.0,
+        }
+
+    # ---- 재생 루프 ----
+
+    def _label(self, channel: str) -> Optional[str]:
+        """기록 채널 -> 수신 채널 라벨 (배정할 라벨이 없으면 None, 처음 한 번만 경고)"""
+        if channel in self.channel_map:
+            return self.channel_map[channel]
+        used = set(self.channel_map.values())
+        if channel in self.labels and channel not in used:
+            label = channel
+        else:
+            label = next((name for name in self.labels if name not in used), None)
+            if label is None:
+                logger.warning(f"기록 채널 {channel}에 배정할 수신 채널이 없어 해당 프레임은 재생하지 않습니다 "
+                               f"(channel_map으로 지정 가능)")
+        self.channel_map[channel] = label
+        return label
+
+    def _deliver(self, pending: Dict[str, List[can.Message]], host_base: float, record_base: float):
+        for label, messages in pending.items():
+            if messages:
+                # 가상 수신 시각: 묶음 마지막 프레임의 기록 시각 (1배속 기준)
+                dequeue_time = host_base + (messages[-1].timestamp - record_base)
+                self.last_dequeue_time = dequeue_time
+                try:
+                    self.sink(messages, len(messages), label, dequeue_time)
+                except Exception as e:
+                    logger.error(f"재생 프레임 주입 실패 ({label}, {len(messages)}개): {e}")
+                self.frames_sent += len(messages)
+                self.batches_sent += 1
+        pending.clear()
+
+    def _rebased(self, host_base: float) -> float:
+        """반복/탐색 후 기준 호스트 시각: 다음 프레임이 마지막 주입 시각 바로 뒤에 오도록 이동
+        (기록 기준 시각은 호출한 쪽에서 None으로 두어 다음 프레임 시각으로 다시 잡음)"""
+        if self.last_dequeue_time is None:
+            return host_base
+        return self.last_dequeue_time + REBASE_GAP
+
+    def _wait(self, seconds: float) -> bool:
+        """seconds 동안 대기 (제어 요청으로 깨어나면 True)"""
+        if seconds <= 0:
+            return False
+        woke = self._wake.wait(seconds)
+        self._wake.clear()
+        return woke
+
+    def _run(self):
+        start_time = self.start_time
+        host_base = time.perf_counter()
+        frames = self.source.frames(start_time)
+        anchor = None  # (기록 시각, 호스트 시각) 원래 간격 재생 기준점
+        pending: Dict[str, List[can.Message]] = {}
+        pending_count = 0
+        record_base = None
+        held = None  # 대기 중 제어 요청으로 깨어나 아직 주입하지 않은 프레임
+        active_since = time.perf_counter()
+        try:
+            while self._running.is_set():
+                with self._lock:
+                    seek_to, self._seek_to = self._seek_to, None
+                if seek_to is not None:
+                    pending.clear()
+                    pending_count = 0
+                    held = None
+                    frames = self.source.frames(seek_to)
+                    anchor = None
+                    host_base, record_base = self._rebased(host_base), None
+                if not self._resume.is_set():
+                    self._deliver(pending, host_base, record_base or 0.0)
+                    pending_count = 0
+                    self.active_time += time.perf_counter() - active_since
+                    self._resume.wait(0.2)
+                    active_since = time.perf_counter()
+                    anchor = None
+                    continue
+
+                item, held = (held, None) if held is not None else (next(frames, None), None)
+                if item is None:
+                    self._deliver(pending, host_base, record_base or 0.0)
+                    pending_count = 0
+                    if self.loop and self.frames_sent:
+                        self.laps += 1
+                        frames = self.source.frames(start_time)
+                        anchor = None
+                        host_base, record_base = self._rebased(host_base), None
+                        continue
+                    break
+                channel, msg = item
+                if record_base is None:
+                    record_base = msg.timestamp
+                if self._restart_anchor:
+                    self._restart_anchor = False
+                    anchor = None
+
+                if self.speed is not None:
+                    now = time.perf_counter()
+                    if anchor is None:
+                        anchor = (msg.timestamp, now)
+                    due = anchor[1] + (msg.timestamp - anchor[0]) / self.speed
+                    if due > now + self.batch_window:
+                        # 다음 프레임이 아직 이르면 모아 둔 배치를 주입하고 도달 시각까지 대기
+                        self._deliver(pending, host_base, record_base)
+                        pending_count = 0
+                        if self._wait(due - time.perf_counter()):
+                            # 일시정지/탐색/배속 변경 요청: 현재 프레임은 다음 반복에서 다시 판단
+                            held = item
+                            continue
+
+                label = self._label(channel)
+                if label is None:
+                    self.skipped_frames += 1
+                else:
+                    pending.setdefault(label, []).append(msg)
+                    pending_count += 1
+                self.position = msg.timestamp
+                if pending_count >= self.batch_size:
+                    self._deliver(pending, host_base, record_base)
+                    pending_count = 0
+        finally:
+            self.active_time += time.perf_counter() - active_since
+            self._running.clear()
+            logger.info(f"로그 재생 종료: {self.frames_sent}프레임, {self.laps}회 반복")
+            if self.on_finished is not None:
+                self.on_finished()
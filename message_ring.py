@@ -0,0 +1,266 @@
+"""
+GUI 메시지 링 버퍼
+디코딩된 신호 값을 숫자 행(시각, 채널, 프레임 ID, 신호 슬롯, 값)으로 미리 할당된
+NumPy 배열에 O(1)로 기록하고, 테이블 갱신 시에는 복사 없는 뷰로 읽음
+"""
+
+import math
+import threading
+from collections import namedtuple
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# 링 버퍼 구간 뷰 (각 필드는 NumPy 배열 뷰)
+RingView = namedtuple("RingView", ["timestamp", "channel", "frame_id", "slot", "value", "text"])
+
+
+class SignalSlotRegistry:
+    """(채널, 메시지, 신호, 단위) <-> 정수 슬롯 매핑
+
+    새 신호가 처음 등장할 때만 락을 잡고 등록하며, 이후 조회는 dict 조회 한 번.
+    슬롯 메타데이터 리스트는 추가만 되므로 읽기 측은 락 없이 인덱싱 가능.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._slots: Dict[tuple, int] = {}
+        self.keys: List[Tuple[str, str, str, str]] = []  # slot -> (channel, message, signal, unit)
+        self.frame_ids: List[int] = []
+        self.integer: List[bool] = []  # 정수 신호 여부 (표시 형식용)
+        self._channels: Dict[str, int] = {}
+        self.channel_names: List[str] = []
+        self._name_ranks: Optional[np.ndarray] = None
+
+    def channel_id(self, label: str) -> int:
+        """채널 이름 -> 정수 채널 ID"""
+        channel_id = self._channels.get(label)
+        if channel_id is None:
+            with self._lock:
+                channel_id = self._channels.get(label)
+                if channel_id is None:
+                    channel_id = len(self.channel_names)
+                    self.channel_names.append(label)
+                    self._channels[label] = channel_id
+        return channel_id
+
+    def slot(self, channel: str, message: str, signal: str, unit: str = "",
+             frame_id: int = 0, integer: bool = False) -> int:
+        """신호 슬롯 조회 (없으면 등록)"""
+        key = (channel, message, signal, unit)
+        slot = self._slots.get(key)
+        if slot is None:
+            self.channel_id(channel)
+            with self._lock:
+                slot = self._slots.get(key)
+                if slot is None:
+                    slot = len(self.keys)
+                    self.keys.append(key)
+                    self.frame_ids.append(frame_id)
+                    self.integer.append(integer)
+                    self._slots[key] = slot
+        return slot
+
+    def name_ranks(self) -> np.ndarray:
+        """슬롯 -> (메시지, 신호) 이름순 순위 배열 (슬롯이 추가될 때만 다시 계산)"""
+        ranks = self._name_ranks
+        if ranks is None or len(ranks) != len(self.keys):
+            keys = list(self.keys)
+            order = sorted(range(len(keys)), key=lambda slot: (keys[slot][1], keys[slot][2], slot))
+            ranks = np.empty(len(keys), dtype=np.int32)
+            ranks[order] = np.arange(len(keys), dtype=np.int32)
+            self._name_ranks = ranks
+        return ranks
+
+    def find(self, channel: str, message: str, signal: str, unit: str = "") -> Optional[int]:
+        """등록된 슬롯 조회 (없으면 None)"""
+        return self._slots.get((channel, message, signal, unit))
+
+    def key(self, slot: int) -> Tuple[str, str, str, str]:
+        return self.keys[slot]
+
+    def __len__(self):
+        return len(self.keys)
+
+
+def encode_value(val) -> Tuple[float, Optional[object]]:
+    """디코딩 값 -> (숫자 값, 표시 텍스트)
+
+    숫자는 텍스트 없이 저장. 열거형(NamedSignalValue)은 원시 값과 이름을 함께 저장하고,
+    그 외 비숫자 값은 NaN + 텍스트로 저장.
+    """
+    if isinstance(val, (int, float)):
+        return float(val), None
+    raw = getattr(val, 'value', None)
+    if isinstance(raw, (int, float)):
+        return float(raw), str(val)
+    return math.nan, str(val)
+
+
+def format_signal_value(integer: bool, value: float, text) -> str:
+    """숫자 행 값 표시 문자열 (텍스트가 있으면 텍스트 우선)"""
+    if text is not None:
+        return text[1] if isinstance(text, tuple) else text
+    if integer and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+class MessageRingBuffer:
+    """고정 용량 숫자 행 링 버퍼
+
+    - 쓰기: 락 안에서 배열 칸 덮어쓰기만 수행 (리스트 복사/재할당 없음)
+    - 읽기: segments()/views()가 최신 last_n 행을 최대 두 개의 연속 구간 뷰로 반환
+    - 뷰는 복사하지 않으므로 읽는 동안 가장 오래된 행이 덮어써질 수 있음.
+      표시 용도로 읽는 행 수(display_limit)가 용량보다 충분히 작으면 문제되지 않음
+    """
+
+    def __init__(self, capacity: int = 20000, registry: Optional[SignalSlotRegistry] = None):
+        self.capacity = capacity
+        self.registry = registry if registry is not None else SignalSlotRegistry()
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.channels = np.zeros(capacity, dtype=np.uint16)
+        self.frame_ids = np.zeros(capacity, dtype=np.uint32)
+        self.slots = np.zeros(capacity, dtype=np.int32)
+        self.values = np.zeros(capacity, dtype=np.float64)
+        self.texts = np.empty(capacity, dtype=object)  # 비숫자 값/오류 행 텍스트 (대부분 None)
+        self.total = 0  # 누적 기록 행 수 (다음 쓰기 위치 = total % capacity)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def append(self, timestamp: float, channel: int, frame_id: int, slot: int,
+               value: float, text=None):
+        """행 하나 기록 (O(1))"""
+        with self._lock:
+            i = self.total % self.capacity
+            self.timestamps[i] = timestamp
+            self.channels[i] = channel
+            self.frame_ids[i] = frame_id
+            self.slots[i] = slot
+            self.values[i] = value
+            self.texts[i] = text
+            self.total += 1
+
+    def append_frame(self, timestamp: float, channel: int, frame_id: int,
+                     slots: List[int], values: List[float], texts: List[Optional[object]]):
+        """한 프레임의 신호들을 한 번의 락 획득으로 기록"""
+        capacity = self.capacity
+        with self._lock:
+            i = self.total % capacity
+            for slot, value, text in zip(slots, values, texts):
+                self.timestamps[i] = timestamp
+                self.channels[i] = channel
+                self.frame_ids[i] = frame_id
+                self.slots[i] = slot
+                self.values[i] = value
+                self.texts[i] = text
+                i += 1
+                if i == capacity:
+                    i = 0
+            self.total += len(slots)
+
+    def append_rows(self, timestamps: np.ndarray, channels: np.ndarray, frame_ids: np.ndarray,
+                    slots: np.ndarray, values: np.ndarray, texts: np.ndarray):
+        """여러 프레임의 행 배열을 한 번에 기록 (texts는 object 배열, 용량보다 많으면 최신 행만)"""
+        count = len(slots)
+        capacity = self.capacity
+        with self._lock:
+            skip = max(count - capacity, 0)
+            start = (self.total + skip) % capacity
+            offset = skip
+            while offset < count:
+                n = min(count - offset, capacity - start)
+                part = slice(offset, offset + n)
+                target = slice(start, start + n)
+                self.timestamps[target] = timestamps[part]
+                self.channels[target] = channels[part]
+                self.frame_ids[target] = frame_ids[part]
+                self.slots[target] = slots[part]
+                self.values[target] = values[part]
+                self.texts[target] = texts[part]
+                offset += n
+                start = 0
+            self.total += count
+
+    def clear(self):
+        """모든 행 제거 (배열은 재사용)"""
+        with self._lock:
+            self.total = 0
+            self.texts[:] = None
+
+    def segments(self, last_n: Optional[int] = None) -> List[Tuple[int, int]]:
+        """최신 last_n 행의 물리 인덱스 구간 목록 (오래된 것 -> 최신 순, 최대 2개)"""
+        with self._lock:
+            total = self.total
+        size = min(total, self.capacity)
+        if last_n is None or last_n > size:
+            last_n = size
+        if last_n <= 0:
+            return []
+        end = total % self.capacity
+        start = end - last_n
+        if start >= 0:
+            return [(start, end)]
+        if end == 0:
+            return [(self.capacity + start, self.capacity)]
+        return [(self.capacity + start, self.capacity), (0, end)]
+
+    def views(self, last_n: Optional[int] = None) -> List[RingView]:
+        """최신 last_n 행의 복사 없는 구간 뷰 목록"""
+        return [RingView(self.timestamps[a:b], self.channels[a:b], self.frame_ids[a:b],
+                         self.slots[a:b], self.values[a:b], self.texts[a:b])
+                for a, b in self.segments(last_n)]
+
+    def select(self, last_n: Optional[int] = None, slots: Optional[np.ndarray] = None,
+               channel: Optional[int] = None) -> np.ndarray:
+        """최신 last_n 행 중 슬롯/채널 조건에 맞는 물리 인덱스 배열 (오래된 것 -> 최신 순)"""
+        parts = []
+        for a, b in self.segments(last_n):
+            mask = None
+            if slots is not None:
+                mask = np.isin(self.slots[a:b], slots)
+            if channel is not None:
+                channel_mask = self.channels[a:b] == channel
+                mask = channel_mask if mask is None else mask & channel_mask
+            parts.append(np.arange(a, b) if mask is None else np.flatnonzero(mask) + a)
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def physical_index(self, row: int, last_n: Optional[int] = None) -> int:
+        """최신 last_n 행 기준 논리 행 번호(0 = 가장 오래된 행) -> 배열 인덱스"""
+        size = len(self)
+        if last_n is None or last_n > size:
+            last_n = size
+        return (self.total - last_n + row) % self.capacity
+
+    def format_value(self, slot: int, value: float, text) -> str:
+        """값 표시 문자열"""
+        return format_signal_value(self.registry.integer[slot], value, text)
+
+    def format_row(self, index: int) -> tuple:
+        """물리 인덱스 행을 표시용 튜플 (time, channel, message, signal, value, unit)로 변환"""
+        slot = int(self.slots[index])
+        text = self.texts[index]
+        ch, msg, sig, unit = self.registry.keys[slot]
+        if isinstance(text, tuple):
+            sig = text[0]
+        return (float(self.timestamps[index]), ch, msg, sig,
+                self.format_value(slot, float(self.values[index]), text), unit)
+
+    def tail_rows(self, last_n: Optional[int] = None) -> List[tuple]:
+        """최신 last_n 행을 표시용 튜플 (time, channel, message, signal, value, unit)로 변환"""
+        keys = self.registry.keys
+        format_value = self.format_value
+        rows = []
+        for view in self.views(last_n):
+            for ts, slot, value, text in zip(view.timestamp.tolist(), view.slot.tolist(),
+                                             view.value.tolist(), view.text.tolist()):
+                ch, msg, sig, unit = keys[slot]
+                if isinstance(text, tuple):
+                    # 오류 행: (오류 정보, 상세) 텍스트를 신호/값 열에 표시
+                    sig = text[0]
+                rows.append((ts, ch, msg, sig, format_value(slot, value, text), unit))
+        return rows
@@ -0,0 +1,191 @@
+"""
+Prometheus/OpenMetrics 텍스트 포맷 메트릭 노출 엔드포인트
+GUI 없이 장시간 무인 운용 시 처리량/오류율을 외부에서 수집하기 위해 사용
+"""
+
+import threading
+import logging
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+from latency_histogram import RollingLatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# 요약(summary) 메트릭으로 노출할 백분위
+EXPORT_QUANTILES = (('0.5', 'p50'), ('0.9', 'p90'), ('0.99', 'p99'), ('0.999', 'p999'), ('1', 'max'))
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    """라벨 딕셔너리 -> {key="value",...}"""
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels.items():
+        escaped = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{key}="{escaped}"')
+    return "{" + ",".join(parts) + "}"
+
+
+class _MetricFamily:
+    """메트릭 패밀리 (HELP/TYPE 헤더 + 샘플들)"""
+
+    def __init__(self, name: str, metric_type: str, help_text: str):
+        self.name = name
+        self.metric_type = metric_type
+        self.help_text = help_text
+        self.samples: List[Tuple[str, Dict[str, str], float]] = []
+
+    def add(self, value: float, labels: Optional[Dict[str, str]] = None, suffix: str = ""):
+        self.samples.append((self.name + suffix, labels or {}, value))
+
+    def render(self, lines: List[str]):
+        lines.append(f"# HELP {self.name} {self.help_text}")
+        lines.append(f"# TYPE {self.name} {self.metric_type}")
+        for name, labels, value in self.samples:
+            lines.append(f"{name}{_format_labels(labels)} {float(value)!r}")
+
+
+class MetricsExporter:
+    """프로세서/뷰어 메트릭을 Prometheus 텍스트 포맷으로 노출하는 내장 HTTP 서버
+
+    모든 값은 프로세서가 미리 집계해 둔 카운터/히스토그램에서 읽으며,
+    스크레이프 시 메시지 히스토리를 순회하지 않음.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 9108):
+        self.host = host
+        self.port = port
+        self.processors = {}  # channel_label -> TSMasterCanProcessor
+        self.latency_sources = []  # (metric_name, help, RollingLatencyHistogram, labels)
+        self.gauge_sources = []  # (metric_name, help, fn() -> float, labels)
+        self._server = None
+        self._thread = None
+
+    def register_processor(self, channel_label: str, processor):
+        """채널 프로세서 등록"""
+        self.processors[channel_label] = processor
+
+    def register_latency(self, name: str, help_text: str, histogram: RollingLatencyHistogram,
+                         labels: Optional[Dict[str, str]] = None):
+        """롤링 지연 히스토그램을 summary 메트릭으로 등록"""
+        self.latency_sources.append((name, help_text, histogram, labels or {}))
+
+    def register_gauge(self, name: str, help_text: str, value_fn: Callable[[], float],
+                       labels: Optional[Dict[str, str]] = None):
+        """임의 게이지 등록 (value_fn은 가벼운 조회여야 함)"""
+        self.gauge_sources.append((name, help_text, value_fn, labels or {}))
+
+    def render(self) -> str:
+        """현재 메트릭을 텍스트 포맷으로 렌더링"""
+        families = {}
+
+        def family(name, metric_type, help_text):
+            if name not in families:
+                families[name] = _MetricFamily(name, metric_type, help_text)
+            return families[name]
+
+        for ch, processor in list(self.processors.items()):
+            stats = processor.get_statistics()
+            counters = processor.get_id_counters()
+            base = {"channel": ch}
+            family("can_frames_total", "counter", "Processed CAN frames").add(stats['total_messages'], base)
+            family("can_valid_frames_total", "counter", "Frames decoded as valid").add(stats['valid_messages'], base)
+            family("can_invalid_frames_total", "counter", "Frames rejected or failed").add(stats['invalid_messages'], base)
+            family("can_frames_per_second", "gauge", "Frame rate over the last second").add(stats['messages_per_second'], base)
+            family("can_queue_depth", "gauge", "Processor priority queue depth").add(stats.get('queue_depth', 0), base)
+
+            names = {msg_id: d['message'].name for msg_id, d in processor.get_message_definitions().items()}
+
+            def id_labels(msg_id):
+                return {"channel": ch, "frame_id": f"0x{msg_id:X}", "message": names.get(msg_id, f"Unknown_{msg_id}")}
+
+            frames = family("can_id_frames_total", "counter", "Processed frames per frame ID")
+            for msg_id, count in sorted(counters['frames'].items()):
+                frames.add(count, id_labels(msg_id))
+            rates = family("can_id_frames_per_second", "gauge", "Frame rate per frame ID over the last second")
+            for msg_id, rate in sorted(counters['frame_rates'].items()):
+                rates.add(rate, id_labels(msg_id))
+            dlc = family("can_dlc_mismatches_total", "counter", "DLC mismatches per frame ID")
+            for msg_id, count in sorted(counters['dlc_mismatches'].items()):
+                dlc.add(count, id_labels(msg_id))
+            errors = family("can_decode_errors_total", "counter", "Decode errors per frame ID")
+            for msg_id, count in sorted(counters['decoding_errors'].items()):
+                errors.add(count, id_labels(msg_id))
+
+            self._add_summary(family("can_processing_latency_seconds", "summary",
+                                     "Per-frame processing latency (quantiles over a rolling window)"),
+                              processor.processing_latency, base)
+
+        for name, help_text, histogram, labels in list(self.latency_sources):
+            self._add_summary(family(name, "summary", help_text), histogram, labels)
+
+        for name, help_text, value_fn, labels in list(self.gauge_sources):
+            try:
+                family(name, "gauge", help_text).add(value_fn(), labels)
+            except Exception as e:
+                logger.debug(f"게이지 수집 실패 - {name}: {e}")
+
+        lines = []
+        for fam in families.values():
+            fam.render(lines)
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _add_summary(fam: _MetricFamily, histogram: RollingLatencyHistogram, labels: Dict[str, str]):
+        """백분위는 롤링 윈도우, _sum/_count는 누적값 (Prometheus 규약상 단조 증가해야 rate()가 맞음)"""
+        snapshot = histogram.snapshot(time.perf_counter())
+        for quantile, key in EXPORT_QUANTILES:
+            fam.add(snapshot[key], dict(labels, quantile=quantile))
+        fam.add(histogram.total_sum_us / 1_000_000, labels, suffix="_sum")
+        fam.add(histogram.total_count, labels, suffix="_count")
+
+    def start(self) -> bool:
+        """백그라운드 스레드에서 HTTP 서버 시작"""
+        if self._server is not None:
+            return True
+        exporter = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                try:
+                    body = exporter.render().encode("utf-8")
+                except Exception as e:
+                    logger.error(f"메트릭 렌더링 실패: {e}")
+                    self.send_error(500)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # 스크레이프마다 콘솔 출력하지 않음
+
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), _Handler)
+            self._server.daemon_threads = True
+        except OSError as e:
+            logger.error(f"메트릭 엔드포인트 시작 실패 ({self.host}:{self.port}): {e}")
+            self._server = None
+            return False
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"메트릭 엔드포인트 시작: http://{self.host}:{self.port}/metrics")
+        return True
+
+    def stop(self):
+        """HTTP 서버 종료"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread:
+            self._thread.join(timeout=1)
+            self._thread = None
@@ -0,0 +1,387 @@
+"""
+대용량 기록 파일 읽기 (mmap + 인덱스)
+
+- 네이티브 세션 기록(.canrec): 파일 끝 청크 인덱스 사용 (session_recording.SessionReader)
+- candump(.log) / Vector ASC(.asc) 텍스트 로그: 처음 열 때 전체를 한 번 스캔하여
+  프레임별 (시각, ID, 채널, 데이터 위치)와 ID별 행 목록을 사이드카 파일(<로그>.cidx)에 저장.
+  이후에는 사이드카를 mmap으로 열어 시간/ID 범위 조회 시 해당 인덱스와 로그 줄의 페이지만 읽음.
+"""
+
+import binascii
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import can
+import numpy as np
+
+from session_recording import (FILE_MAGIC, FLAG_BRS, FLAG_EXTENDED, FLAG_FD, FLAG_REMOTE,
+                               FrameColumns, RecordedFrame, SessionReader)
+
+logger = logging.getLogger(__name__)
+
+SIDECAR_SUFFIX = ".cidx"
+SIDECAR_MAGIC = b"CANTIDX\x02"
+SIDECAR_HEADER = struct.Struct("<8sI")  # magic, 메타데이터 JSON 길이
+
+# 텍스트 로그 프레임 인덱스 (파일 순서)
+TEXT_INDEX_DTYPE = np.dtype([
+    ("t", "<f8"),
+    ("data_offset", "<u8"),  # 데이터 16진 문자열 시작 위치
+    ("id", "<u4"),
+    ("data_chars", "<u2"),   # 데이터 16진 문자열 길이
+    ("channel", "u1"),
+    ("flags", "u1"),
+    ("dlc", "u1"),           # 기록된 DLC (리모트 프레임은 데이터 없이 DLC만 있음)
+])
+
+# (1436509052.249713) can0 1F334455#1122334455667788 / 123##1AABB / 123#R / 123#R5
+# python-can CanutilsLogWriter는 끝에 방향 토큰을 붙임: ... 123#0011 R / T
+CANDUMP_LINE = re.compile(
+    rb"^\((\d+\.\d+)\)\s+(\S+)\s+([0-9A-Fa-f]{1,8})#(#[0-9A-Fa-f])?(R\d*|[0-9A-Fa-f]*)"
+    rb"(?:[ \t]+[A-Za-z]\w*)?[ \t\r]*$", re.M)
+# 0.012345 1  123x  Rx   d 8 01 02 03 04 05 06 07 08  Length = ... (데이터는 DLC 개수만큼만)
+ASC_CAN_LINE = re.compile(
+    rb"^\s*(\d+\.\d+)\s+(\d+)\s+([0-9A-Fa-f]+)(x?)\s+(?:Rx|Tx)\s+([dr])\s+([0-9A-Fa-f]+)((?:[ \t]+[0-9A-Fa-f]+\b)*)",
+    re.M)
+# 0.012345 CANFD 1 Rx 300 (이름) 1 0 f 64 00 01 ... 0 0 3000 ... (데이터는 DataLength 개수만큼만)
+ASC_FD_LINE = re.compile(
+    rb"^\s*(\d+\.\d+)\s+CANFD\s+(\d+)\s+(?:Rx|Tx)\s+([0-9A-Fa-f]+)(x?)\s+(?:[A-Za-z_]\w*\s+)?([01])\s+([01])\s+"
+    rb"([0-9A-Fa-f])\s+(\d+)((?:[ \t]+[0-9A-Fa-f]+\b)*)", re.M)
+ASC_TOKEN = re.compile(rb"[0-9A-Fa-f]+")
+ASC_BASE_DEC = re.compile(rb"^\s*base\s+dec", re.M | re.I)
+
+# 16진 문자 -> 값 (그 외 문자는 0)
+_HEX_VALUES = np.zeros(256, dtype=np.uint8)
+_HEX_VALUES[np.frombuffer(b"0123456789", np.uint8)] = np.arange(10)
+_HEX_VALUES[np.frombuffer(b"abcdef", np.uint8)] = np.arange(10, 16)
+_HEX_VALUES[np.frombuffer(b"ABCDEF", np.uint8)] = np.arange(10, 16)
+
+
+def detect_format(path: str) -> str:
+    """기록 파일 형식 판별: "native" / "candump" / "asc" """
+    with open(path, "rb") as file:
+        head = file.read(4096)
+    if head.startswith(FILE_MAGIC):
+        return "native"
+    if path.lower().endswith(".asc") or re.search(rb"^\s*(date|base)\s", head, re.M | re.I):
+        return "asc"
+    return "candump"
+
+
+def _scan_candump(view) -> Tuple[np.ndarray, List[str]]:
+    channels = {}
+    rows = []
+    for match in CANDUMP_LINE.finditer(view):
+        timestamp, channel, can_id, fd, data = match.groups()
+        flags = 0
+        if len(can_id) > 3:
+            flags |= FLAG_EXTENDED
+        if fd:
+            flags |= FLAG_FD
+            if int(fd[1:], 16) & 0x1:
+                flags |= FLAG_BRS
+        if data[:1] == b"R":
+            flags |= FLAG_REMOTE
+            data_start, data_chars = match.end(5), 0
+            dlc = int(data[1:]) if len(data) > 1 else 0
+        else:
+            data_start, data_chars = match.start(5), len(data)
+            dlc = len(data) // 2
+        channel_id = channels.setdefault(channel.decode(), len(channels))
+        rows.append((float(timestamp), data_start, int(can_id, 16), data_chars, channel_id, flags, dlc))
+    return np.array(rows, dtype=TEXT_INDEX_DTYPE), list(channels)
+
+
+def asc_base(view) -> int:
+    """ASC 헤더의 숫자 진법 (base dec이면 ID와 데이터 바이트 모두 10진수)"""
+    return 10 if ASC_BASE_DEC.search(view[:4096]) else 16
+
+
+def _data_chars(data: bytes, count: int) -> int:
+    """데이터 토큰 문자열에서 앞쪽 count개 토큰이 차지하는 길이 (뒤따르는 숫자 필드 제외)"""
+    if count <= 0:
+        return 0
+    end = 0
+    for number, token in enumerate(ASC_TOKEN.finditer(data), 1):
+        end = token.end()
+        if number == count:
+            break
+    return end
+
+
+def _scan_asc(view) -> Tuple[np.ndarray, List[str]]:
+    base = asc_base(view)
+    channels = {}
+    rows = []
+
+    def add(timestamp, channel, data_start, can_id, data_chars, flags, dlc):
+        channel_id = channels.setdefault(f"CH{int(channel)}", len(channels))
+        rows.append((float(timestamp), data_start, can_id, data_chars, channel_id, flags, dlc))
+
+    for match in ASC_CAN_LINE.finditer(view):
+        timestamp, channel, can_id, extended, kind, dlc, data = match.groups()
+        flags = (FLAG_EXTENDED if extended else 0) | (FLAG_REMOTE if kind == b"r" else 0)
+        dlc = int(dlc, 16)
+        length = 0 if kind == b"r" else min(dlc, 8)
+        add(timestamp, channel, match.start(7), int(can_id, base), _data_chars(data, length), flags, dlc)
+    for match in ASC_FD_LINE.finditer(view):
+        timestamp, channel, can_id, extended, brs, _, _, length, data = match.groups()
+        flags = FLAG_FD | (FLAG_EXTENDED if extended else 0) | (FLAG_BRS if brs == b"1" else 0)
+        length = int(length)
+        add(timestamp, channel, match.start(9), int(can_id, base), _data_chars(data, length), flags, length)
+    index = np.array(rows, dtype=TEXT_INDEX_DTYPE)
+    # CAN/CAN FD 줄을 따로 찾았으므로 파일 순서로 정렬
+    return index[np.argsort(index["data_offset"], kind="stable")], list(channels)
+
+
+class TextLogReader:
+    """candump / ASC 텍스트 로그 읽기 (사이드카 인덱스 + mmap)
+
+    사이드카 구조: [magic, 메타데이터 길이] [메타데이터 JSON] [프레임 인덱스] [ID순 행 번호]
+                   [ID 목록] [ID별 시작 위치]  (각 배열은 8바이트 정렬)
+    원본 크기/수정 시각이 달라지면 인덱스를 다시 만듦.
+    """
+
+    def __init__(self, path: str, fmt: Optional[str] = None, use_sidecar: bool = True):
+        self.path = path
+        self.format = fmt or detect_format(path)
+        self.sidecar_path = path + SIDECAR_SUFFIX
+        self.loaded_from_sidecar = False
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        # ASC 데이터 바이트 진법 (candump는 항상 16진)
+        self.data_base = asc_base(self._map) if self.format == "asc" and self._map is not None else 16
+        self._sidecar_file = None
+        self._sidecar_map = None
+        stat = os.stat(path)
+        self._source = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "format": self.format}
+        if not (use_sidecar and self._load_sidecar()):
+            self._build_index()
+            if use_sidecar:
+                self._save_sidecar()
+
+    # ---- 인덱스 생성/저장/로드 ----
+
+    def _build_index(self):
+        if self._map is None:
+            frames, channels = np.zeros(0, dtype=TEXT_INDEX_DTYPE), []
+        elif self.format == "asc":
+            frames, channels = _scan_asc(self._map)
+        else:
+            frames, channels = _scan_candump(self._map)
+        by_id = np.lexsort((frames["t"], frames["id"])).astype(np.uint64)
+        id_keys, id_starts = np.unique(frames["id"][by_id], return_index=True)
+        self.index = frames
+        self.by_id = by_id
+        self.id_keys = id_keys.astype(np.uint32)
+        self.id_starts = np.append(id_starts, len(frames)).astype(np.uint64)
+        self.channels = channels
+        self.monotonic = bool(len(frames) < 2 or np.all(np.diff(frames["t"]) >= 0))
+        logger.info(f"텍스트 로그 인덱스 생성: {self.path} ({len(frames)}프레임)")
+
+    def _meta(self) -> dict:
+        return dict(self._source, channels=self.channels, frames=len(self.index),
+                    ids=len(self.id_keys), monotonic=self.monotonic)
+
+    @staticmethod
+    def _aligned(position: int) -> int:
+        return (position + 7) & ~7
+
+    def _save_sidecar(self):
+        meta = json.dumps(self._meta()).encode("utf-8")
+        try:
+            with open(self.sidecar_path, "wb") as file:
+                file.write(SIDECAR_HEADER.pack(SIDECAR_MAGIC, len(meta)))
+                file.write(meta)
+                for array in (self.index, self.by_id, self.id_keys, self.id_starts):
+                    file.write(b"\0" * (self._aligned(file.tell()) - file.tell()))
+                    file.write(array.tobytes())
+        except OSError as e:
+            logger.warning(f"사이드카 인덱스 저장 실패 (메모리 인덱스로 계속): {e}")
+
+    def _load_sidecar(self) -> bool:
+        if not os.path.exists(self.sidecar_path):
+            return False
+        file = open(self.sidecar_path, "rb")
+        try:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            file.close()
+            return False
+        try:
+            magic, meta_size = SIDECAR_HEADER.unpack_from(mapped, 0)
+            meta = json.loads(mapped[SIDECAR_HEADER.size:SIDECAR_HEADER.size + meta_size]) if magic == SIDECAR_MAGIC else {}
+        except (struct.error, ValueError):
+            meta = {}
+        if not meta or any(meta.get(key) != value for key, value in self._source.items()):
+            mapped.close()
+            file.close()
+            logger.info(f"사이드카 인덱스가 원본과 맞지 않아 다시 생성: {self.sidecar_path}")
+            return False
+        position = SIDECAR_HEADER.size + meta_size
+        arrays = []
+        for dtype, count in ((TEXT_INDEX_DTYPE, meta["frames"]), (np.uint64, meta["frames"]),
+                             (np.uint32, meta["ids"]), (np.uint64, meta["ids"] + 1)):
+            position = self._aligned(position)
+            arrays.append(np.frombuffer(mapped, dtype=dtype, count=count, offset=position))
+            position += arrays[-1].nbytes
+        self.index, self.by_id, self.id_keys, self.id_starts = arrays
+        self.channels = meta["channels"]
+        self.monotonic = meta["monotonic"]
+        self._sidecar_file, self._sidecar_map = file, mapped
+        self.loaded_from_sidecar = True
+        return True
+
+    # ---- 조회 ----
+
+    def close(self):
+        self.index = self.by_id = self.id_keys = self.id_starts = None
+        for handle in (self._sidecar_map, self._map):
+            if handle is not None:
+                try:
+                    handle.close()
+                except BufferError:
+                    pass
+        if self._sidecar_file is not None:
+            self._sidecar_file.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.index)
+
+    @property
+    def time_range(self) -> Tuple[float, float]:
+        if not len(self.index):
+            return (0.0, 0.0)
+        times = self.index["t"]
+        if self.monotonic:
+            return float(times[0]), float(times[-1])
+        return float(times.min()), float(times.max())
+
+    def _id_rows(self, ids: Iterable[int]) -> np.ndarray:
+        """ID별 행 목록 (ID순 행 번호 배열에서 해당 구간만 읽음)"""
+        runs = []
+        for can_id in ids:
+            position = int(np.searchsorted(self.id_keys, can_id))
+            if position < len(self.id_keys) and self.id_keys[position] == can_id:
+                runs.append(self.by_id[int(self.id_starts[position]):int(self.id_starts[position + 1])])
+        return np.sort(np.concatenate(runs)) if runs else np.zeros(0, dtype=np.uint64)
+
+    def rows(self, start: Optional[float] = None, end: Optional[float] = None,
+             ids: Optional[Iterable[int]] = None) -> np.ndarray:
+        """조건에 맞는 프레임 행 번호 (파일 순서)"""
+        times = self.index["t"]
+        if self.monotonic:
+            low = 0 if start is None else int(np.searchsorted(times, start, side="left"))
+            high = len(times) if end is None else int(np.searchsorted(times, end, side="right"))
+        else:
+            low, high = 0, len(times)
+        id_list = list(ids) if ids is not None else None
+        if id_list is not None:
+            id_runs = sum(int(self.id_starts[p + 1] - self.id_starts[p])
+                          for p in np.searchsorted(self.id_keys, id_list)
+                          if p < len(self.id_keys) and self.id_keys[p] in id_list)
+            if id_runs < high - low:
+                # ID 구간이 더 작으면 ID순 행 목록에서 시작하여 시간 조건 적용
+                rows = self._id_rows(id_list)
+                row_times = times[rows.astype(np.int64)]
+                selected = np.ones(len(rows), dtype=bool)
+                if start is not None:
+                    selected &= row_times >= start
+                if end is not None:
+                    selected &= row_times <= end
+                return rows[selected].astype(np.int64)
+        rows = np.arange(low, high, dtype=np.int64)
+        selected = np.ones(len(rows), dtype=bool)
+        if not self.monotonic:
+            if start is not None:
+                selected &= times >= start
+            if end is not None:
+                selected &= times <= end
+        if id_list is not None:
+            selected &= np.isin(self.index["id"][low:high], np.asarray(id_list, dtype=np.uint32))
+        return rows[selected]
+
+    def data(self, row: int) -> bytes:
+        entry = self.index[row]
+        start = int(entry["data_offset"])
+        text = self._map[start:start + int(entry["data_chars"])]
+        if self.format == "asc":
+            return bytes(int(token, self.data_base) for token in text.split())
+        return binascii.unhexlify(text)
+
+    def columns(self, start: Optional[float] = None, end: Optional[float] = None) -> FrameColumns:
+        """[start, end) 구간 프레임을 열 배열로 읽음 (일괄 디코딩용, 16진 문자열을 mmap에서 한 번에 변환)"""
+        rows = self.rows(start, end)
+        if end is not None:
+            rows = rows[self.index["t"][rows] < end]
+        entries = self.index[rows]
+        offsets = entries["data_offset"].astype(np.int64)
+        chars = entries["data_chars"].astype(np.int64)
+        if self.format == "asc":
+            # " 01 02 03": 16진수 공백 한 칸 구분이면 3글자마다 1바이트, 그 외 줄(10진수 등)은 개별 변환
+            first, step = offsets + 1, 3
+            lengths = chars // 3
+            irregular = (np.flatnonzero(chars % 3 != 0) if self.data_base == 16
+                         else np.arange(len(rows), dtype=np.int64))
+        else:
+            first, step = offsets, 2
+            lengths = chars // 2
+            irregular = np.zeros(0, dtype=np.int64)
+        width = int(lengths.max()) if len(rows) else 0
+        data = np.zeros((len(rows), width), dtype=np.uint8)
+        if width and self._map is not None:
+            view = np.frombuffer(self._map, dtype=np.uint8)
+            positions = np.minimum(first[:, None] + np.arange(width) * step, len(view) - 2)
+            valid = np.arange(width) < lengths[:, None]
+            values = (_HEX_VALUES[view[positions]] << 4) | _HEX_VALUES[view[positions + 1]]
+            data[valid] = values[valid]
+            del view
+        if len(irregular):
+            payloads = [self.data(int(rows[i])) for i in irregular]
+            width = max(width, max(len(payload) for payload in payloads))
+            if width > data.shape[1]:
+                data = np.pad(data, ((0, 0), (0, width - data.shape[1])))
+            for i, payload in zip(irregular, payloads):
+                data[i] = 0
+                data[i, :len(payload)] = np.frombuffer(payload, dtype=np.uint8)
+                lengths[i] = len(payload)
+        return FrameColumns(entries["t"].copy(), entries["channel"].copy(), entries["id"].copy(),
+                            lengths.astype(np.uint8), data)
+
+    def query(self, start: Optional[float] = None, end: Optional[float] = None,
+              ids: Optional[Iterable[int]] = None) -> Iterator[RecordedFrame]:
+        """조건에 맞는 프레임 순회 (해당 줄의 데이터만 복원)"""
+        index = self.index
+        channels = self.channels
+        for row in self.rows(start, end, ids):
+            entry = index[row]
+            yield RecordedFrame(float(entry["t"]), channels[int(entry["channel"])], int(entry["id"]),
+                                int(entry["flags"]), memoryview(self.data(row)), int(entry["dlc"]))
+
+    def frames(self, start: Optional[float] = None, end: Optional[float] = None,
+               ids: Optional[Iterable[int]] = None) -> Iterator[Tuple[str, can.Message]]:
+        """조건에 맞는 (채널 이름, can.Message) 순회"""
+        for frame in self.query(start, end, ids):
+            yield frame.channel, frame.to_message()
+
+
+def open_recording(path: str, use_sidecar: bool = True):
+    """기록 파일 형식에 맞는 읽기 객체 (frame_count, time_range, channels, query() 공통 제공)"""
+    fmt = detect_format(path)
+    if fmt == "native":
+        return SessionReader(path)
+    return TextLogReader(path, fmt, use_sidecar=use_sidecar)
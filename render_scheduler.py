@@ -0,0 +1,108 @@
+"""
+적응형 GUI 갱신 스케줄러
+고정 500ms 타이머 대신 갱신 비용을 측정하여 CPU 예산에 맞게 간격을 조절하고,
+변경이 없으면 건너뛰며, 짧은 시간 안에 몰린 갱신 요청은 한 번으로 합침
+"""
+
+import time
+from typing import Callable, Optional
+
+from PyQt5 import QtCore
+
+
+class RenderBudget:
+    """갱신 간격 계산기 (Qt 비의존)
+
+    간격 = 평균 갱신 비용 / CPU 예산 을 [min_interval, max_interval]로 제한.
+    예) 예산 0.2, 갱신 20ms -> 100ms 간격. 변경 없이 건너뛴 틱이 이어지면
+    idle_backoff 배씩 늘려 유휴 버스에서 깨어나는 횟수를 줄임.
+    """
+
+    def __init__(self, min_interval: float = 0.05, max_interval: float = 0.5,
+                 cpu_budget: float = 0.2, smoothing: float = 0.2, idle_backoff: float = 1.5):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.cpu_budget = cpu_budget
+        self.smoothing = smoothing
+        self.idle_backoff = idle_backoff
+        self.average_cost = 0.0
+        self.last_cost = 0.0
+        self.interval = min_interval
+
+    def _clamp(self, interval: float) -> float:
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def rendered(self, cost: float) -> float:
+        """갱신 비용 반영 후 다음 간격 반환"""
+        self.last_cost = cost
+        if self.average_cost == 0.0:
+            self.average_cost = cost
+        else:
+            self.average_cost += self.smoothing * (cost - self.average_cost)
+        # 급격히 느려진 갱신은 평균을 기다리지 않고 바로 간격에 반영
+        self.interval = self._clamp(max(self.average_cost, cost) / self.cpu_budget)
+        return self.interval
+
+    def skipped(self) -> float:
+        """변경 없는 틱 후 다음 간격 반환"""
+        self.interval = self._clamp(self.interval * self.idle_backoff)
+        return self.interval
+
+
+class AdaptiveRenderScheduler:
+    """QTimer 기반 적응형 갱신 스케줄러
+
+    render: 실제 갱신 함수 (GUI 스레드)
+    has_changes: 마지막 갱신 이후 표시할 변경이 있는지 반환 (가벼워야 함)
+    request_refresh(): 정렬/필터/뷰 변경 등 즉시 반영이 필요한 요청. 이벤트 루프의 다음
+                       순회에 한 번만 갱신하므로 연속 요청은 합쳐짐
+    """
+
+    def __init__(self, render: Callable[[], None], has_changes: Callable[[], bool],
+                 budget: Optional[RenderBudget] = None, parent=None):
+        self.render = render
+        self.has_changes = has_changes
+        self.budget = budget if budget is not None else RenderBudget()
+        self.timer = QtCore.QTimer(parent)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self._tick)
+        self.forced = False
+        self.renders = 0
+        self.skipped = 0
+        self.coalesced = 0
+
+    def start(self):
+        self.timer.start(0)
+
+    def stop(self):
+        self.timer.stop()
+
+    def request_refresh(self):
+        """즉시 갱신 요청 (대기 중인 요청이 있으면 합침)"""
+        if self.forced:
+            self.coalesced += 1
+            return
+        self.forced = True
+        self.timer.start(0)
+
+    def _schedule(self, interval: float):
+        self.timer.start(int(interval * 1000))
+
+    def _tick(self):
+        if not self.forced and not self.has_changes():
+            self.skipped += 1
+            self._schedule(self.budget.skipped())
+            return
+        self.forced = False
+        started = time.perf_counter()
+        try:
+            self.render()
+        finally:
+            self.renders += 1
+            self._schedule(self.budget.rendered(time.perf_counter() - started))
+
+    def format_stats(self) -> str:
+        """통계 라벨용 갱신 타이밍 문자열"""
+        return (f"Refresh: {self.budget.last_cost*1000:.1f}ms "
+                f"(avg {self.budget.average_cost*1000:.1f}ms) every {self.budget.interval*1000:.0f}ms, "
+                f"skipped {self.skipped}")
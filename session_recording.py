@@ -0,0 +1,566 @@
+"""
+원시 CAN 프레임 바이너리 세션 기록 형식 (.canrec)
+
+파일 구조:
+  [파일 헤더] [청크 헤더 + 압축 청크] ... [푸터: 메타데이터 JSON + 청크 인덱스] [트레일러]
+
+청크는 최대 chunk_frames개 프레임을 열 단위로 저장한 뒤 zlib/lzma로 압축:
+  시간 델타(int32, 마이크로초) | 채널(u8) | 플래그(u8) | ID(u32) | 길이(u8) | 페이로드 연결
+청크 인덱스에는 청크별 위치, 시간 범위, ID 비트맵이 있어 전체를 읽지 않고 시간/ID로 탐색 가능.
+읽기는 mmap으로 하므로 조회에 필요한 청크의 페이지만 읽힘.
+"""
+
+import json
+import logging
+import lzma
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import can
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FILE_MAGIC = b"CANREC\x00\x01"
+FOOTER_MAGIC = b"CANIDX\x00\x01"
+FORMAT_VERSION = 1
+
+FILE_HEADER = struct.Struct("<8sHHI")  # magic, version, compression, reserved
+CHUNK_HEADER = struct.Struct("<4sIId")  # b"CHNK", 압축 크기, 프레임 수, 기준 시각
+TRAILER = struct.Struct("<QII8s")  # 푸터 위치, 청크 수, 메타데이터 길이, magic
+CHUNK_MAGIC = b"CHNK"
+
+COMPRESSIONS = {"none": 0, "zlib": 1, "lzma": 2}
+
+# 프레임 플래그 비트
+FLAG_EXTENDED = 0x01
+FLAG_REMOTE = 0x02
+FLAG_ERROR = 0x04
+FLAG_FD = 0x08
+FLAG_BRS = 0x10
+
+# ID 비트맵: 표준 ID는 그대로, 확장 ID는 11비트로 접어서 표시 (확장 ID는 거짓 양성 가능)
+ID_BITMAP_BITS = 2048
+INDEX_DTYPE = np.dtype([
+    ("offset", "<u8"),
+    ("size", "<u4"),
+    ("frames", "<u4"),
+    ("t_first", "<f8"),
+    ("t_last", "<f8"),
+    ("ids", "u1", (ID_BITMAP_BITS // 8,)),
+])
+
+TIME_SCALE = 1_000_000  # 마이크로초
+MAX_DELTA = 2 ** 31 - 1
+
+
+def id_buckets(ids: np.ndarray) -> np.ndarray:
+    """ID -> 비트맵 위치"""
+    ids = np.asarray(ids, dtype=np.uint32)
+    folded = ids ^ (ids >> 11) ^ (ids >> 22)
+    return np.where(ids <= 0x7FF, ids, folded & 0x7FF).astype(np.int64)
+
+
+def id_bitmap(ids: Iterable[int]) -> np.ndarray:
+    """ID 목록 -> 비트맵 바이트 배열"""
+    bits = np.zeros(ID_BITMAP_BITS, dtype=bool)
+    bits[id_buckets(np.fromiter(ids, dtype=np.uint32))] = True
+    return np.packbits(bits, bitorder="little")
+
+
+def message_flags(msg: can.Message) -> int:
+    flags = 0
+    if msg.is_extended_id:
+        flags |= FLAG_EXTENDED
+    if msg.is_remote_frame:
+        flags |= FLAG_REMOTE
+    if msg.is_error_frame:
+        flags |= FLAG_ERROR
+    if msg.is_fd:
+        flags |= FLAG_FD
+        if msg.bitrate_switch:
+            flags |= FLAG_BRS
+    return flags
+
+
+def _compress(data: bytes, compression: int) -> bytes:
+    if compression == 1:
+        return zlib.compress(data, 6)
+    if compression == 2:
+        return lzma.compress(data, preset=1)
+    return data
+
+
+def _decompress(data: memoryview, compression: int):
+    """압축 해제 (무압축 청크는 복사 없이 그대로 반환)"""
+    if compression == 1:
+        return zlib.decompress(data)
+    if compression == 2:
+        return lzma.decompress(data)
+    return data
+
+
+class RecordedFrame(NamedTuple):
+    """기록 파일에서 읽은 프레임 (data는 파일/청크 버퍼를 가리키는 memoryview)"""
+    timestamp: float
+    channel: str
+    arbitration_id: int
+    flags: int
+    data: memoryview
+    dlc: Optional[int] = None  # None이면 데이터 길이 (네이티브 기록의 리모트 프레임은 DLC 길이의 0 바이트)
+
+    def to_message(self) -> can.Message:
+        flags = self.flags
+        remote = bool(flags & FLAG_REMOTE)
+        return can.Message(
+            timestamp=self.timestamp,
+            arbitration_id=self.arbitration_id,
+            is_extended_id=bool(flags & FLAG_EXTENDED),
+            is_remote_frame=remote,
+            is_error_frame=bool(flags & FLAG_ERROR),
+            is_fd=bool(flags & FLAG_FD),
+            bitrate_switch=bool(flags & FLAG_BRS),
+            dlc=self.dlc if self.dlc is not None else len(self.data),
+            data=b"" if remote else bytes(self.data),
+            channel=self.channel,
+        )
+
+
+@dataclass
+class FrameColumns:
+    """프레임 열 묶음 (data: 행별 페이로드를 width 바이트로 0 채운 uint8 행렬)"""
+    timestamps: np.ndarray
+    channels: np.ndarray
+    ids: np.ndarray
+    lengths: np.ndarray
+    data: np.ndarray
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    @classmethod
+    def empty(cls) -> "FrameColumns":
+        return cls(np.zeros(0), np.zeros(0, np.uint8), np.zeros(0, np.uint32), np.zeros(0, np.uint8),
+                   np.zeros((0, 0), np.uint8))
+
+    @classmethod
+    def concat(cls, parts: List["FrameColumns"]) -> "FrameColumns":
+        parts = [part for part in parts if len(part)]
+        if not parts:
+            return cls.empty()
+        if len(parts) == 1:
+            return parts[0]
+        width = max(part.data.shape[1] for part in parts)
+        data = np.zeros((sum(len(part) for part in parts), width), dtype=np.uint8)
+        row = 0
+        for part in parts:
+            data[row:row + len(part), :part.data.shape[1]] = part.data
+            row += len(part)
+        return cls(np.concatenate([part.timestamps for part in parts]),
+                   np.concatenate([part.channels for part in parts]),
+                   np.concatenate([part.ids for part in parts]),
+                   np.concatenate([part.lengths for part in parts]), data)
+
+
+@dataclass
+class FrameBlock:
+    """복원된 청크의 프레임 열 (i번째 프레임 페이로드 = payload[starts[i]:starts[i]+lengths[i]])"""
+    timestamps: np.ndarray
+    channels: np.ndarray
+    flags: np.ndarray
+    ids: np.ndarray
+    lengths: np.ndarray
+    starts: np.ndarray
+    payload: memoryview
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def mask(self, start: Optional[float] = None, end: Optional[float] = None,
+             ids: Optional[Iterable[int]] = None) -> np.ndarray:
+        """시간 [start, end] 및 ID 조건에 맞는 프레임 위치"""
+        selected = np.ones(len(self), dtype=bool)
+        if start is not None:
+            selected &= self.timestamps >= start
+        if end is not None:
+            selected &= self.timestamps <= end
+        if ids is not None:
+            selected &= np.isin(self.ids, np.fromiter(ids, dtype=np.uint32))
+        return np.flatnonzero(selected)
+
+    def columns(self, rows: np.ndarray) -> FrameColumns:
+        """선택 행의 페이로드를 행렬로 모음 (행 단위 파이썬 루프 없음)"""
+        lengths = self.lengths[rows]
+        width = int(lengths.max()) if len(rows) else 0
+        payload = np.frombuffer(self.payload, dtype=np.uint8)
+        offsets = np.arange(width)
+        positions = self.starts[rows][:, None] + offsets
+        valid = offsets < lengths[:, None]
+        data = np.where(valid, payload[np.minimum(positions, max(len(payload) - 1, 0))], 0).astype(np.uint8)
+        return FrameColumns(self.timestamps[rows], self.channels[rows], self.ids[rows], lengths, data)
+
+    def data(self, i: int) -> memoryview:
+        start = int(self.starts[i])
+        return self.payload[start:start + int(self.lengths[i])]
+
+    def frame(self, i: int, channel: str) -> RecordedFrame:
+        return RecordedFrame(float(self.timestamps[i]), channel, int(self.ids[i]), int(self.flags[i]), self.data(i))
+
+    def message(self, i: int, channel: Optional[str] = None) -> can.Message:
+        return self.frame(i, channel).to_message()
+
+
+def encode_chunk(timestamps: np.ndarray, channels: np.ndarray, flags: np.ndarray, ids: np.ndarray,
+                 payloads: List[bytes]) -> Tuple[float, bytes]:
+    """프레임 열 -> (기준 시각, 비압축 청크 바이트)"""
+    base = float(timestamps[0])
+    offsets = np.round((timestamps - base) * TIME_SCALE).astype(np.int64)
+    deltas = np.diff(offsets, prepend=0).astype(np.int32)
+    lengths = np.fromiter(map(len, payloads), dtype=np.uint8, count=len(payloads))
+    data = b"".join((
+        deltas.tobytes(),
+        channels.astype(np.uint8).tobytes(),
+        flags.astype(np.uint8).tobytes(),
+        ids.astype("<u4").tobytes(),
+        lengths.tobytes(),
+        b"".join(payloads),
+    ))
+    return base, data
+
+
+def decode_chunk(data, count: int, base: float) -> FrameBlock:
+    """비압축 청크 바이트 -> FrameBlock (열 배열은 data를 복사하지 않고 참조)"""
+    position = 0
+
+    def column(dtype, itemsize):
+        nonlocal position
+        array = np.frombuffer(data, dtype=dtype, count=count, offset=position)
+        position += itemsize * count
+        return array
+
+    deltas = column("<i4", 4)
+    channels = column(np.uint8, 1)
+    flags = column(np.uint8, 1)
+    ids = column("<u4", 4)
+    lengths = column(np.uint8, 1)
+    starts = np.zeros(count, dtype=np.int64)
+    if count > 1:
+        np.cumsum(lengths[:-1], out=starts[1:])
+    timestamps = base + np.cumsum(deltas, dtype=np.int64) / TIME_SCALE
+    return FrameBlock(timestamps, channels, flags, ids, lengths, starts + position, memoryview(data))
+
+
+class SessionRecorder:
+    """원시 프레임 세션 기록기
+
+    수신 경로는 프레임 필드를 목록에 추가만 하고, chunk_frames개가 모이면 대기열로 넘김.
+    인코딩/압축/파일 기록과 푸터 작성은 백그라운드 스레드에서 수행.
+    대기열이 가득 차면 수신 경로를 막지 않고 해당 청크를 버리고 dropped_frames에 누적.
+    wall_offset은 기록 시각 -> 벽시계(epoch 초) 변환 오프셋으로 푸터에 저장
+    (기본값은 time.perf_counter 기준 시각을 기록한다고 보고 시작 시점의 time.time() - time.perf_counter()).
+    """
+
+    def __init__(self, path: str, compression: str = "zlib", chunk_frames: int = 4096,
+                 queue_chunks: int = 64, wall_offset: Optional[float] = None):
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"지원하지 않는 압축 방식: {compression}")
+        self.path = path
+        self.compression = compression
+        self.chunk_frames = chunk_frames
+        self.wall_offset = time.time() - time.perf_counter() if wall_offset is None else wall_offset
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_chunks)
+        self.channels: Dict[str, int] = {}
+        self.frames_written = 0
+        self.bytes_written = 0
+        self.dropped_frames = 0
+        self._lock = threading.Lock()
+        self._closing = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._index: List[tuple] = []
+        self._reset_pending()
+
+    def _reset_pending(self):
+        self._times: List[float] = []
+        self._chans: List[int] = []
+        self._flags: List[int] = []
+        self._ids: List[int] = []
+        self._data: List[bytes] = []
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="session-recorder", daemon=False)
+        self._thread.start()
+
+    def _channel_id(self, channel_label: str) -> int:
+        channel = self.channels.get(channel_label)
+        if channel is None:
+            channel = self.channels[channel_label] = len(self.channels)
+        return channel
+
+    def record(self, msg: can.Message, channel_label: str = "CH1", timestamp: Optional[float] = None):
+        """프레임 1개 기록 (수신 스레드)"""
+        self.record_batch((msg,), 1, channel_label, None if timestamp is None else (timestamp,))
+
+    def record_batch(self, messages, count: Optional[int] = None, channel_label: str = "CH1",
+                     timestamps: Optional[Sequence[float]] = None):
+        """수신 배치 기록. messages는 재사용 버퍼일 수 있으므로 필요한 필드만 복사
+
+        timestamps를 주면 msg.timestamp 대신 기록 (채널 간 시계 정렬된 시각 등, messages와 같은 순서)
+        """
+        if count is None:
+            count = len(messages)
+        with self._lock:
+            channel = self._channel_id(channel_label)
+            for i in range(count):
+                msg = messages[i]
+                self._times.append(msg.timestamp if timestamps is None else timestamps[i])
+                self._chans.append(channel)
+                self._flags.append(message_flags(msg))
+                self._ids.append(msg.arbitration_id)
+                # 리모트 프레임은 데이터가 없으므로 요청 DLC를 길이로 보존 (0 바이트 DLC개)
+                self._data.append(bytes(msg.dlc) if msg.is_remote_frame else bytes(msg.data))
+                if len(self._times) >= self.chunk_frames:
+                    self._submit_pending()
+
+    def _submit_pending(self):
+        if not self._times:
+            return
+        pending = (self._times, self._chans, self._flags, self._ids, self._data)
+        self._reset_pending()
+        try:
+            self.queue.put_nowait(pending)
+        except queue.Full:
+            self.dropped_frames += len(pending[0])
+            logger.warning(f"기록 지연으로 {len(pending[0])}프레임 버림 (누적 {self.dropped_frames}프레임)")
+
+    def close(self, wait: bool = False, timeout: Optional[float] = None):
+        """남은 프레임과 푸터를 기록하고 종료 (wait=False면 즉시 반환)"""
+        with self._lock:
+            self._submit_pending()
+        self._closing.set()
+        if wait:
+            self.join(timeout)
+
+    def join(self, timeout: Optional[float] = None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _write_chunk(self, file, pending):
+        times, chans, flags, ids, data = pending
+        timestamps = np.asarray(times, dtype=np.float64)
+        offsets = np.round((timestamps - timestamps[0]) * TIME_SCALE).astype(np.int64)
+        jumps = np.flatnonzero(np.abs(np.diff(offsets)) > MAX_DELTA)
+        if len(jumps):
+            # 시간 델타가 int32 범위를 넘는 간격에서 청크 분할
+            split = int(jumps[0]) + 1
+            self._write_chunk(file, tuple(column[:split] for column in pending))
+            self._write_chunk(file, tuple(column[split:] for column in pending))
+            return
+        id_array = np.asarray(ids, dtype=np.uint32)
+        base, raw = encode_chunk(timestamps, np.asarray(chans), np.asarray(flags), id_array, data)
+        stored = _compress(raw, COMPRESSIONS[self.compression])
+        offset = file.tell()
+        file.write(CHUNK_HEADER.pack(CHUNK_MAGIC, len(stored), len(times), base))
+        file.write(stored)
+        self._index.append((offset, len(stored), len(times), float(timestamps.min()),
+                            float(timestamps.max()), id_bitmap(id_array)))
+        self.frames_written += len(times)
+        self.bytes_written += CHUNK_HEADER.size + len(stored)
+
+    def _write_footer(self, file):
+        meta = json.dumps({
+            "version": FORMAT_VERSION,
+            "compression": self.compression,
+            "channels": sorted(self.channels, key=self.channels.get),
+            "frames": self.frames_written,
+            "dropped_frames": self.dropped_frames,
+            "wall_offset": self.wall_offset,
+        }).encode("utf-8")
+        index = np.zeros(len(self._index), dtype=INDEX_DTYPE)
+        for row, entry in enumerate(self._index):
+            index[row] = entry
+        footer_offset = file.tell()
+        file.write(meta)
+        file.write(index.tobytes())
+        file.write(TRAILER.pack(footer_offset, len(index), len(meta), FOOTER_MAGIC))
+
+    def _run(self):
+        with open(self.path, "wb") as file:
+            file.write(FILE_HEADER.pack(FILE_MAGIC, FORMAT_VERSION, COMPRESSIONS[self.compression], 0))
+            try:
+                while True:
+                    try:
+                        pending = self.queue.get(timeout=0.2)
+                    except queue.Empty:
+                        if self._closing.is_set():
+                            break
+                        continue
+                    try:
+                        self._write_chunk(file, pending)
+                    except Exception as e:
+                        logger.error(f"세션 청크 기록 실패: {e}")
+            finally:
+                self._write_footer(file)
+                file.flush()
+                os.fsync(file.fileno())
+        logger.info(f"세션 기록 종료: {self.frames_written}프레임, 청크 {len(self._index)}개, "
+                    f"{self.bytes_written} bytes, 버림 {self.dropped_frames}프레임")
+
+
+class SessionReader:
+    """세션 기록 파일 읽기 - mmap + 푸터 인덱스로 필요한 청크만 읽음
+
+    정상 종료되지 않아 푸터가 없는 파일은 청크 헤더를 따라가며 인덱스를 복구
+    (채널 이름은 CH1, CH2 ... 로 대체).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        magic, version, compression, _ = FILE_HEADER.unpack_from(self._view, 0)
+        if magic != FILE_MAGIC:
+            self.close()
+            raise ValueError(f"세션 기록 파일이 아닙니다: {path}")
+        self.version = version
+        self.compression = compression
+        footer_magic = None
+        if len(self._view) >= FILE_HEADER.size + TRAILER.size:
+            footer_offset, chunk_count, meta_size, footer_magic = TRAILER.unpack_from(
+                self._view, len(self._view) - TRAILER.size)
+        if footer_magic == FOOTER_MAGIC:
+            self.meta = json.loads(bytes(self._view[footer_offset:footer_offset + meta_size]).decode("utf-8"))
+            self.index = np.frombuffer(self._view, dtype=INDEX_DTYPE, count=chunk_count,
+                                       offset=footer_offset + meta_size)
+        else:
+            logger.warning(f"푸터 인덱스가 없어 청크 헤더로 복구합니다 (기록이 정상 종료되지 않음): {path}")
+            self.meta, self.index = self._scan_chunks()
+        self.channels: List[str] = self.meta["channels"]
+        # 기록 시각 + wall_offset = epoch 초 (푸터가 없거나 이전 형식이면 None)
+        self.wall_offset: Optional[float] = self.meta.get("wall_offset")
+
+    def _scan_chunks(self) -> Tuple[dict, np.ndarray]:
+        entries = []
+        channel_count = 0
+        position = FILE_HEADER.size
+        while position + CHUNK_HEADER.size <= len(self._view):
+            magic, size, count, base = CHUNK_HEADER.unpack_from(self._view, position)
+            end = position + CHUNK_HEADER.size + size
+            if magic != CHUNK_MAGIC or end > len(self._view):
+                break  # 기록 중단 지점 (마지막 청크가 잘린 경우)
+            block = decode_chunk(_decompress(self._view[position + CHUNK_HEADER.size:end], self.compression),
+                                 count, base)
+            entries.append((position, size, count, float(block.timestamps.min()),
+                            float(block.timestamps.max()), id_bitmap(block.ids)))
+            channel_count = max(channel_count, int(block.channels.max()) + 1)
+            position = end
+        index = np.zeros(len(entries), dtype=INDEX_DTYPE)
+        for row, entry in enumerate(entries):
+            index[row] = entry
+        meta = {
+            "version": self.version,
+            "compression": [name for name, code in COMPRESSIONS.items() if code == self.compression][0],
+            "channels": [f"CH{i + 1}" for i in range(channel_count)],
+            "frames": int(index["frames"].sum()),
+            "recovered": True,
+        }
+        return meta, index
+
+    def close(self):
+        self.index = None
+        try:
+            self._view.release()
+            self._map.close()
+        except BufferError:
+            # 조회 결과 memoryview/배열이 아직 남아 있으면 참조가 사라질 때 해제됨
+            pass
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def frame_count(self) -> int:
+        return int(self.index["frames"].sum())
+
+    def wall_time(self, timestamp: float) -> Optional[float]:
+        """기록 시각 -> 벽시계 시각 (epoch 초, 다른 기록과 맞추기용). 기준이 없으면 None"""
+        if self.wall_offset is None:
+            return None
+        return timestamp + self.wall_offset
+
+    @property
+    def start_epoch(self) -> Optional[float]:
+        """첫 프레임의 벽시계 시각 (epoch 초)"""
+        return self.wall_time(self.time_range[0])
+
+    @property
+    def time_range(self) -> Tuple[float, float]:
+        if not len(self.index):
+            return (0.0, 0.0)
+        return float(self.index["t_first"].min()), float(self.index["t_last"].max())
+
+    def chunks(self, start: Optional[float] = None, end: Optional[float] = None,
+               ids: Optional[Iterable[int]] = None) -> np.ndarray:
+        """조건에 걸칠 수 있는 청크 번호 (인덱스만 사용, 청크는 읽지 않음)"""
+        selected = np.ones(len(self.index), dtype=bool)
+        if start is not None:
+            selected &= self.index["t_last"] >= start
+        if end is not None:
+            selected &= self.index["t_first"] <= end
+        if ids is not None:
+            wanted = id_buckets(np.fromiter(ids, dtype=np.uint32))
+            bits = np.unpackbits(self.index["ids"], axis=1, bitorder="little")
+            selected &= bits[:, wanted].any(axis=1)
+        return np.flatnonzero(selected)
+
+    def read_chunk(self, chunk: int) -> FrameBlock:
+        """청크 복원 (무압축 파일은 mmap을 직접 참조하여 복사 없음)"""
+        offset = int(self.index[chunk]["offset"])
+        magic, size, count, base = CHUNK_HEADER.unpack_from(self._view, offset)
+        if magic != CHUNK_MAGIC:
+            raise ValueError(f"청크 헤더 손상: {chunk}번 청크")
+        start = offset + CHUNK_HEADER.size
+        return decode_chunk(_decompress(self._view[start:start + size], self.compression), count, base)
+
+    def query(self, start: Optional[float] = None, end: Optional[float] = None,
+              ids: Optional[Iterable[int]] = None) -> Iterator[RecordedFrame]:
+        """조건에 맞는 프레임 순회 (청크 기록 순서, data는 청크 버퍼의 memoryview)"""
+        id_list = list(ids) if ids is not None else None
+        for chunk in self.chunks(start, end, id_list):
+            block = self.read_chunk(int(chunk))
+            for i in block.mask(start, end, id_list):
+                yield block.frame(int(i), self.channels[int(block.channels[i])])
+
+    def frames(self, start: Optional[float] = None, end: Optional[float] = None,
+               ids: Optional[Iterable[int]] = None) -> Iterator[Tuple[str, can.Message]]:
+        """조건에 맞는 (채널 이름, can.Message) 순회"""
+        for frame in self.query(start, end, ids):
+            yield frame.channel, frame.to_message()
+
+    def columns(self, start: Optional[float] = None, end: Optional[float] = None) -> FrameColumns:
+        """[start, end) 구간 프레임을 열 배열로 읽음 (일괄 디코딩용, 기록 순서)"""
+        parts = []
+        for chunk in self.chunks(start, end):
+            block = self.read_chunk(int(chunk))
+            selected = np.ones(len(block), dtype=bool)
+            if start is not None:
+                selected &= block.timestamps >= start
+            if end is not None:
+                selected &= block.timestamps < end
+            parts.append(block.columns(np.flatnonzero(selected)))
+        return FrameColumns.concat(parts)
@@ -0,0 +1,102 @@
+"""
+컴파일된 메시지/신호 필터
+필터 적용 시 패턴을 한 번 컴파일하여 일치하는 (프레임 ID, 신호 슬롯) 키 집합으로 변환하고,
+이후 표시/수신 경로에서는 정수 집합 조회 또는 NumPy isin 마스크로만 판정
+"""
+
+import fnmatch
+import re
+import threading
+from typing import Callable, Optional, Set, Tuple
+
+import numpy as np
+
+from message_ring import SignalSlotRegistry
+
+FILTER_MODES = ("substring", "wildcard", "regex")
+
+
+def compile_pattern(pattern: str, mode: str = "substring") -> Optional[Callable[[str], bool]]:
+    """이름 패턴 -> 일치 함수 (대소문자 무시, 빈 패턴은 None)
+
+    substring: 부분 일치 (기존 동작)
+    wildcard:  fnmatch 형식 (*, ?, [...]) 전체 일치. 예) RadarObj*, RelPos?1
+    regex:     정규식 부분 검색 (잘못된 패턴은 re.error 발생)
+    """
+    pattern = pattern.strip()
+    if not pattern:
+        return None
+    if mode == "regex":
+        compiled = re.compile(pattern, re.IGNORECASE)
+        return lambda name: compiled.search(name) is not None
+    if mode == "wildcard":
+        compiled = re.compile(fnmatch.translate(pattern), re.IGNORECASE)
+        return lambda name: compiled.match(name) is not None
+    needle = pattern.lower()
+    return lambda name: needle in name.lower()
+
+
+class CompiledSignalFilter:
+    """슬롯 레지스트리 기준으로 해석된 필터
+
+    resolve()는 마지막 해석 이후 새로 등록된 슬롯만 평가하므로, 신호가 처음 등장할 때
+    한 번씩만 이름 비교를 수행. 일치 결과는 슬롯 집합/배열로 보관.
+    """
+
+    def __init__(self, message_pattern: str = "", signal_pattern: str = "", mode: str = "substring"):
+        self.message_pattern = message_pattern.strip()
+        self.signal_pattern = signal_pattern.strip()
+        self.mode = mode
+        self._message_match = compile_pattern(message_pattern, mode)
+        self._signal_match = compile_pattern(signal_pattern, mode)
+        self.active = self._message_match is not None or self._signal_match is not None
+        self.matched: Set[int] = set()  # 일치 슬롯
+        self.keys: Set[Tuple[int, int]] = set()  # (frame_id, slot)
+        self._evaluated = 0
+        self._slot_array: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+    def matches(self, message: str, signal: str) -> bool:
+        """이름 일치 여부"""
+        if self._message_match is not None and not self._message_match(message):
+            return False
+        if self._signal_match is not None and not self._signal_match(signal):
+            return False
+        return True
+
+    def resolve(self, registry: SignalSlotRegistry):
+        """새로 등록된 슬롯을 평가하여 일치 집합 갱신"""
+        if self._evaluated >= len(registry):
+            return
+        with self._lock:
+            keys = registry.keys
+            frame_ids = registry.frame_ids
+            end = len(keys)
+            added = False
+            for slot in range(self._evaluated, end):
+                _, message, signal, _ = keys[slot]
+                if self.matches(message, signal):
+                    self.matched.add(slot)
+                    self.keys.add((frame_ids[slot], slot))
+                    added = True
+            self._evaluated = end
+            if added:
+                self._slot_array = None
+
+    def allows(self, slot: int) -> bool:
+        """슬롯 표시 여부 (비활성 필터는 모두 허용)"""
+        return not self.active or slot in self.matched
+
+    def slot_array(self) -> np.ndarray:
+        """일치 슬롯 정렬 배열 (isin 마스크용)"""
+        array = self._slot_array
+        if array is None:
+            array = np.array(sorted(self.matched), dtype=np.int32)
+            self._slot_array = array
+        return array
+
+    def mask(self, slots: np.ndarray) -> np.ndarray:
+        """슬롯 배열에 대한 표시 마스크"""
+        if not self.active:
+            return np.ones(len(slots), dtype=bool)
+        return np.isin(slots, self.slot_array())
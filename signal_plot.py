@@ -0,0 +1,344 @@
+"""
+실시간 신호 그래프 패널
+다중 해상도 저장소(SignalPyramidStore)에서 보이는 구간을 읽어 픽셀 열마다 최소/최대 2점으로 줄인 뒤
+선택 신호별 가로 띠(lane)에 QPainter로 그림 (별도 그래프 라이브러리 없음).
+조회/줄이기/폴리곤 생성은 그래프 작업 스레드에서 최대 30fps로 하고, GUI 스레드는 완성된 폴리곤만 그림.
+예) 1kHz 신호 60초(6만 점) -> 16x 레벨 3750 구간 -> 폭 1500px 기준 약 3000점
+"""
+
+import logging
+import threading
+import time
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+from message_ring import SignalSlotRegistry
+from signal_pyramid import SeriesSlice, SignalPyramidStore, decimate_to_pixels
+
+logger = logging.getLogger(__name__)
+
+# (표시 이름, 최근 구간 길이 초) - None은 전체 세션
+PLOT_WINDOWS = [("10 s", 10.0), ("60 s", 60.0), ("10 min", 600.0), ("1 h", 3600.0), ("All", None)]
+PLOT_FPS = 30
+MAX_LANES = 6
+POINTS_PER_PIXEL = 4  # 줄이기 전에 읽는 점 수 상한 (픽셀당), 이 안에 들어오는 가장 세밀한 레벨을 읽음
+LANE_COLORS = ["#1e50b4", "#c0392b", "#27ae60", "#8e44ad", "#d35400", "#16a085"]
+MARGIN_LEFT = 64
+MARGIN = 16
+LANE_GAP = 8
+
+
+class PlotLane(NamedTuple):
+    title: str
+    low: float
+    high: float
+    polygon: QtGui.QPolygonF  # 위젯 좌표 폴리라인
+    points: int
+    factor: int  # 읽은 레벨의 구간당 원시 샘플 수
+
+
+class PlotFrame(NamedTuple):
+    x_range: Tuple[float, float]
+    size: Tuple[int, int]  # 만들 때 기준 위젯 크기
+    lanes: List[PlotLane]
+    build_time: float
+
+
+def lane_rects(width: int, height: int, count: int) -> List[QtCore.QRectF]:
+    """신호별 그래프 영역 (위에서 아래로 같은 높이)"""
+    if count <= 0:
+        return []
+    plot_width = max(width - MARGIN_LEFT - MARGIN, 1)
+    lane_height = max((height - 2 * MARGIN - LANE_GAP * (count - 1)) / count, 1)
+    return [QtCore.QRectF(MARGIN_LEFT, MARGIN + i * (lane_height + LANE_GAP), plot_width, lane_height)
+            for i in range(count)]
+
+
+def _polygon(xs: np.ndarray, ys: np.ndarray) -> QtGui.QPolygonF:
+    """좌표 배열 -> QPolygonF (점마다 QPointF를 만들지 않고 내부 버퍼에 바로 씀)"""
+    polygon = QtGui.QPolygonF(len(xs))
+    if len(xs):
+        pointer = polygon.data()
+        pointer.setsize(len(xs) * 16)
+        buffer = np.frombuffer(pointer, dtype=np.float64)
+        buffer[0::2] = xs
+        buffer[1::2] = ys
+    return polygon
+
+
+def build_lane(series: Optional[SeriesSlice], x0: float, x1: float, rect: QtCore.QRectF, title: str) -> PlotLane:
+    """조회 결과 -> 픽셀 열별 최소/최대 폴리라인 (열마다 2점, 이웃 열과 이어지도록 순서를 번갈아 바꿈)"""
+    factor = series.factor if series is not None else 1
+    columns, lows, highs = decimate_to_pixels(series, x0, x1, int(rect.width()))
+    if not len(columns):
+        return PlotLane(title, 0.0, 1.0, QtGui.QPolygonF(), 0, factor)
+    low, high = float(lows.min()), float(highs.max())
+    if high - low < 1e-12:
+        low, high = low - 1.0, high + 1.0
+    xs = np.repeat(rect.left() + columns + 0.5, 2)
+    pairs = np.empty((len(columns), 2))
+    pairs[:, 0] = lows
+    pairs[:, 1] = highs
+    pairs[1::2] = pairs[1::2, ::-1]
+    ys = rect.bottom() - (pairs.ravel() - low) * (rect.height() / (high - low))
+    return PlotLane(title, low, high, _polygon(xs, ys), len(xs), factor)
+
+
+class PlotWorker:
+    """그래프 프레임 생성 스레드
+
+    설정(신호, 구간, 크기)이나 저장소 내용이 바뀐 경우에만 최대 fps회/초 프레임을 만듦.
+    수신 스레드와는 저장소 조회 시 구간 복사 동안만 락을 공유함.
+    """
+
+    def __init__(self, store: SignalPyramidStore, registry: SignalSlotRegistry, fps: float = PLOT_FPS):
+        self.store = store
+        self.registry = registry
+        self.period = 1.0 / fps
+        self.frame: Optional[PlotFrame] = None
+        self.frame_number = 0
+        self._lock = threading.Lock()
+        self._config = None
+        self._config_version = 0
+        self._active = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def configure(self, slots: Sequence[int], window: Optional[float], width: int, height: int):
+        with self._lock:
+            self._config = (list(slots), window, width, height)
+            self._config_version += 1
+
+    def resume(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="plot-worker", daemon=True)
+            self._thread.start()
+        self._active.set()
+
+    def pause(self):
+        self._active.clear()
+
+    def stop(self, timeout: float = 1.0):
+        self._stop.set()
+        self._active.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def title(self, slot: int) -> str:
+        channel, message, signal, unit = self.registry.keys[slot]
+        return f"{channel} / {message}.{signal}" + (f" [{unit}]" if unit else "")
+
+    def _run(self):
+        built = None
+        while not self._stop.is_set():
+            self._active.wait()
+            started = time.perf_counter()
+            with self._lock:
+                config, key = self._config, (self._config_version, self.store.version)
+            if config is not None and key != built:
+                built = key
+                try:
+                    self.frame = self.build(config)
+                    self.frame_number += 1
+                except Exception as e:
+                    logger.error(f"그래프 프레임 생성 실패: {e}")
+            self._stop.wait(max(self.period - (time.perf_counter() - started), 0.001))
+
+    def build(self, config) -> PlotFrame:
+        started = time.perf_counter()
+        slots, window, width, height = config
+        ranges = [r for r in (self.store.time_range(slot) for slot in slots) if r is not None]
+        if not ranges:
+            return PlotFrame((0.0, 1.0), (width, height), [], time.perf_counter() - started)
+        end = max(r[1] for r in ranges)
+        start = min(r[0] for r in ranges) if window is None else end - window
+        end = max(end, start + 1e-3)
+        lanes = []
+        for slot, rect in zip(slots, lane_rects(width, height, len(slots))):
+            series = self.store.query(slot, start, end, max_points=int(rect.width()) * POINTS_PER_PIXEL)
+            lanes.append(build_lane(series, start, end, rect, self.title(slot)))
+        return PlotFrame((start, end), (width, height), lanes, time.perf_counter() - started)
+
+
+class SignalPlotCanvas(QtWidgets.QWidget):
+    """작업 스레드가 만든 PlotFrame 그리기"""
+
+    resized = QtCore.pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumHeight(160)
+        self.frame: Optional[PlotFrame] = None
+        self.paint_time = 0.0
+
+    def set_frame(self, frame: Optional[PlotFrame]):
+        self.frame = frame
+        self.update()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.resized.emit()
+
+    def paintEvent(self, event):
+        started = time.perf_counter()
+        painter = QtGui.QPainter(self)
+        painter.fillRect(self.rect(), QtCore.Qt.white)
+        frame = self.frame
+        if frame is None or not frame.lanes:
+            painter.setPen(QtGui.QColor("#999999"))
+            painter.drawText(self.rect(), QtCore.Qt.AlignCenter, "No data")
+            return
+        if frame.size != (self.width(), self.height()):
+            # 크기가 바뀐 직후에는 이전 크기 기준 프레임을 늘려 그림 (다음 프레임에서 다시 만듦)
+            painter.scale(self.width() / max(frame.size[0], 1), self.height() / max(frame.size[1], 1))
+        width, height = frame.size
+        painter.setFont(QtGui.QFont("Arial", 8))
+        rects = lane_rects(width, height, len(frame.lanes))
+        for index, (lane, rect) in enumerate(zip(frame.lanes, rects)):
+            painter.setPen(QtGui.QColor("#bbbbbb"))
+            painter.setBrush(QtCore.Qt.NoBrush)
+            painter.drawRect(rect)
+            painter.setPen(QtGui.QPen(QtGui.QColor(LANE_COLORS[index % len(LANE_COLORS)]), 1.0))
+            painter.drawPolyline(lane.polygon)
+            painter.setPen(QtGui.QColor("#333333"))
+            painter.drawText(QtCore.QRectF(0, rect.top() - 4, MARGIN_LEFT - 4, 14),
+                             QtCore.Qt.AlignRight, f"{lane.high:.4g}")
+            painter.drawText(QtCore.QRectF(0, rect.bottom() - 10, MARGIN_LEFT - 4, 14),
+                             QtCore.Qt.AlignRight, f"{lane.low:.4g}")
+            painter.drawText(QtCore.QRectF(rect.left() + 4, rect.top() + 1, rect.width() - 8, 14),
+                             QtCore.Qt.AlignLeft, f"{lane.title}  ({lane.points} pts, {lane.factor}x)")
+        x0, x1 = frame.x_range
+        axis = QtCore.QRectF(MARGIN_LEFT, height - MARGIN + 1, max(width - MARGIN_LEFT - MARGIN, 1), 14)
+        painter.drawText(axis, QtCore.Qt.AlignLeft, f"{x0:.1f}s")
+        painter.drawText(axis, QtCore.Qt.AlignRight, f"{x1:.1f}s")
+        painter.drawText(axis, QtCore.Qt.AlignCenter,
+                         f"build {frame.build_time * 1000:.1f}ms, paint {self.paint_time * 1000:.1f}ms")
+        painter.end()
+        self.paint_time = time.perf_counter() - started
+
+
+class SignalPlotWidget(QtWidgets.QWidget):
+    """선택 신호 실시간 그래프 (신호 추가/초기화, 표시 구간 선택)
+
+    store는 슬롯 번호를 키로 쓰고 registry로 (채널, 메시지, 신호, 단위) 이름을 찾음.
+    추가한 신호가 없으면 콤보에서 고른 신호 하나를 그림. 그리는 슬롯만 store에 구독하므로
+    신호는 추가한 시점부터 쌓임. 숨김 상태에서는 구독을 해제하고 작업 스레드도 멈춤.
+    """
+
+    def __init__(self, store: SignalPyramidStore, registry: SignalSlotRegistry, parent=None,
+                 fps: float = PLOT_FPS):
+        super().__init__(parent)
+        self.store = store
+        self.registry = registry
+        self.lanes: List[int] = []
+        self._subscribed: set = set()
+        self.worker = PlotWorker(store, registry, fps)
+
+        self.signal_combo = QtWidgets.QComboBox(self)
+        self.signal_combo.setMinimumWidth(320)
+        self.btn_add = QtWidgets.QPushButton("Add", self)
+        self.btn_clear = QtWidgets.QPushButton("Clear", self)
+        self.window_combo = QtWidgets.QComboBox(self)
+        self.window_combo.addItems([name for name, _ in PLOT_WINDOWS])
+        self.window_combo.setCurrentIndex(1)
+        self.canvas = SignalPlotCanvas(self)
+
+        controls = QtWidgets.QHBoxLayout()
+        controls.addWidget(QtWidgets.QLabel("Signal:"))
+        controls.addWidget(self.signal_combo)
+        controls.addWidget(self.btn_add)
+        controls.addWidget(self.btn_clear)
+        controls.addWidget(QtWidgets.QLabel("Window:"))
+        controls.addWidget(self.window_combo)
+        controls.addStretch(1)
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(controls)
+        layout.addWidget(self.canvas)
+
+        self._known_keys = 0
+        self._drawn_frame = 0
+        self._ticks = 0
+        self._list_every = max(int(fps), 1)  # 신호 목록은 약 1초마다 확인
+        self.signal_combo.currentIndexChanged.connect(lambda _: self._configure())
+        self.window_combo.currentIndexChanged.connect(lambda _: self._configure())
+        self.btn_add.clicked.connect(self.add_current_signal)
+        self.btn_clear.clicked.connect(self.clear_signals)
+        self.canvas.resized.connect(self._configure)
+        # GUI 스레드는 새 프레임이 있을 때만 다시 그림
+        self.timer = QtCore.QTimer(self)
+        self.timer.setInterval(int(1000 / fps))
+        self.timer.timeout.connect(self._poll)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._update_signal_list()
+        self._configure()
+        self.worker.resume()
+        self.timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.timer.stop()
+        self.worker.pause()
+        self._subscribe([])
+
+    def add_current_signal(self):
+        slot = self.signal_combo.currentData()
+        if slot is not None and slot not in self.lanes and len(self.lanes) < MAX_LANES:
+            self.lanes.append(slot)
+            self._configure()
+
+    def clear_signals(self):
+        self.lanes = []
+        self._configure()
+
+    def plotted_slots(self) -> List[int]:
+        if self.lanes:
+            return list(self.lanes)
+        slot = self.signal_combo.currentData()
+        return [slot] if slot is not None else []
+
+    def _configure(self):
+        window = PLOT_WINDOWS[self.window_combo.currentIndex()][1]
+        slots = self.plotted_slots()
+        self._subscribe(slots if self.isVisible() else [])
+        self.worker.configure(slots, window, self.canvas.width(), self.canvas.height())
+
+    def _subscribe(self, slots: Sequence[int]):
+        """그리는 슬롯만 store에 구독 (빠진 슬롯은 해제)"""
+        wanted = set(slots)
+        for slot in self._subscribed - wanted:
+            self.store.unsubscribe(slot)
+        for slot in wanted - self._subscribed:
+            self.store.subscribe(slot)
+        self._subscribed = wanted
+
+    def _update_signal_list(self):
+        # 시계열은 구독한 슬롯만 쌓이므로 목록은 레지스트리의 전체 슬롯에서 만듦
+        count = len(self.registry.keys)
+        if count == self._known_keys:
+            return
+        self._known_keys = count
+        current = self.signal_combo.currentData()
+        self.signal_combo.blockSignals(True)
+        self.signal_combo.clear()
+        for label, slot in sorted((self.worker.title(slot), slot) for slot in range(count)):
+            self.signal_combo.addItem(label, slot)
+        if current is not None:
+            index = self.signal_combo.findData(current)
+            if index >= 0:
+                self.signal_combo.setCurrentIndex(index)
+        self.signal_combo.blockSignals(False)
+        if current is None:
+            self._configure()
+
+    def _poll(self):
+        self._ticks += 1
+        if self._ticks % self._list_every == 0:
+            self._update_signal_list()
+        if self.worker.frame_number != self._drawn_frame:
+            self._drawn_frame = self.worker.frame_number
+            self.canvas.set_frame(self.worker.frame)
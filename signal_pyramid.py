@@ -0,0 +1,316 @@
+"""
+신호별 다중 해상도 시계열 저장소
+수신 시점에 원시 값(1x)과 함께 16x, 256x 구간의 최소/최대/평균을 점진적으로 쌓아 두어,
+여러 시간짜리 세션도 확대/축소 배율과 관계없이 수천 점만 읽어 그래프를 그릴 수 있게 함.
+그래프가 구독한 슬롯만 쌓으므로 그래프를 열지 않으면 수신 경로 비용과 메모리가 들지 않음.
+"""
+
+import threading
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_FACTORS = (16, 16)  # 레벨 간 배율: 1x -> 16x -> 256x
+DEFAULT_CAPACITY = 1 << 16  # 레벨별 최대 보관 개수 (초과 시 오래된 1/4 삭제, 신호당 최대 약 6MB)
+
+
+class SeriesSlice(NamedTuple):
+    """조회 결과 (원시 레벨이면 t_start/t_end와 min/max/mean이 같은 배열)"""
+    level: int
+    factor: int  # 구간 하나에 들어간 원시 샘플 수
+    t_start: np.ndarray
+    t_end: np.ndarray
+    vmin: np.ndarray
+    vmax: np.ndarray
+    vmean: np.ndarray
+
+    def __len__(self):
+        return len(self.t_start)
+
+
+def decimate_to_pixels(series: SeriesSlice, x0: float, x1: float,
+                       width: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """픽셀 열별 최소/최대 (열 번호, 최소, 최대) - 화면 폭보다 촘촘한 점은 열마다 2개 값으로 줄임
+
+    구간은 시작 시각이 속한 열에 넣음 (구간 폭이 픽셀 폭 이하가 되는 레벨에서 읽는 것을 전제).
+    """
+    empty = np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0)
+    if series is None or not len(series) or width <= 0:
+        return empty
+    valid = np.isfinite(series.vmin) & np.isfinite(series.vmax)
+    if not valid.all():
+        series = SeriesSlice(series.level, series.factor, *(array[valid] for array in series[2:]))
+        if not len(series):
+            return empty
+    scale = width / max(x1 - x0, 1e-12)
+    columns = np.floor((series.t_start - x0) * scale).astype(np.int64)
+    np.clip(columns, 0, width - 1, out=columns)
+    starts = np.flatnonzero(np.r_[True, columns[1:] != columns[:-1]])
+    return (columns[starts], np.minimum.reduceat(series.vmin, starts),
+            np.maximum.reduceat(series.vmax, starts))
+
+
+class _Columns:
+    """추가만 하는 float64 열 묶음 (2배씩 늘리고, 용량 초과 시 앞쪽 1/4 삭제)"""
+
+    def __init__(self, names: Sequence[str], capacity: int):
+        self.names = tuple(names)
+        self.capacity = max(capacity, 64)
+        self.size = 0
+        self.dropped = 0  # 앞에서 버린 개수
+        self.data = [np.empty(min(1024, self.capacity)) for _ in self.names]
+        self.allocated = len(self.data[0])
+
+    def append(self, values: Tuple[float, ...]):
+        if self.size == self.allocated:
+            self._make_room()
+        size = self.size
+        for array, value in zip(self.data, values):
+            array[size] = value
+        self.size = size + 1
+
+    def _make_room(self):
+        if self.allocated < self.capacity:
+            self.allocated = min(self.allocated * 2, self.capacity)
+            for i, array in enumerate(self.data):
+                grown = np.empty(self.allocated)
+                grown[:self.size] = array[:self.size]
+                self.data[i] = grown
+            return
+        drop = self.size // 4
+        for array in self.data:
+            array[:self.size - drop] = array[drop:self.size]
+        self.size -= drop
+        self.dropped += drop
+
+    def column(self, name: str) -> np.ndarray:
+        return self.data[self.names.index(name)][:self.size]
+
+
+class SignalPyramid:
+    """신호 하나의 다중 해상도 시계열
+
+    level 0 = 원시 (t, v), level k = level k-1의 factors[k-1]개 구간을 묶은 (t_start, t_end, min, max, mean).
+    구간은 채워지는 즉시 상위 레벨로 접어 올리므로 추가 비용은 O(1),
+    아직 덜 찬 마지막 구간은 조회 시 하위 레벨 꼬리에서 계산.
+    시각은 단조 증가로 가정 (되돌아간 시각은 직전 시각으로 맞춤).
+    """
+
+    def __init__(self, factors: Sequence[int] = DEFAULT_FACTORS, capacity: int = DEFAULT_CAPACITY):
+        self.factors = tuple(factors)
+        self.raw = _Columns(("t", "v"), capacity)
+        self.levels = [_Columns(("t_start", "t_end", "vmin", "vmax", "vmean"), capacity) for _ in self.factors]
+        self._pending = [0] * (len(self.factors) + 1)  # 레벨별 상위로 아직 접지 않은 개수
+        self.last_time: Optional[float] = None
+        self.count = 0
+
+    def append(self, timestamp: float, value: float):
+        if self.last_time is not None and timestamp < self.last_time:
+            timestamp = self.last_time
+        self.last_time = timestamp
+        self.count += 1
+        self.raw.append((timestamp, value))
+        self._pending[0] += 1
+        level = 0
+        while level < len(self.factors) and self._pending[level] == self.factors[level]:
+            self._fold(level)
+            level += 1
+
+    def _fold(self, level: int):
+        """level의 마지막 factor개를 상위 레벨 구간 하나로 묶음"""
+        factor = self.factors[level]
+        if level == 0:
+            t = self.raw.column("t")[-factor:]
+            v = self.raw.column("v")[-factor:]
+            bucket = (t[0], t[-1], v.min(), v.max(), v.mean())
+        else:
+            below = self.levels[level - 1]
+            bucket = (below.column("t_start")[-factor], below.column("t_end")[-1],
+                      below.column("vmin")[-factor:].min(), below.column("vmax")[-factor:].max(),
+                      below.column("vmean")[-factor:].mean())
+        self._pending[level] = 0
+        self.levels[level].append(bucket)
+        self._pending[level + 1] += 1
+
+    def factor(self, level: int) -> int:
+        """level 구간 하나의 원시 샘플 수"""
+        return int(np.prod(self.factors[:level])) if level else 1
+
+    def _open_bucket(self, level: int) -> Optional[Tuple[float, float, float, float, float, int]]:
+        """level의 아직 덜 찬 마지막 구간 (t_start, t_end, min, max, mean, 원시 샘플 수)"""
+        if level == 0:
+            return None
+        pending = self._pending[level - 1]
+        parts = []
+        if pending:
+            if level == 1:
+                t = self.raw.column("t")[-pending:]
+                v = self.raw.column("v")[-pending:]
+                parts.append((t[0], t[-1], v.min(), v.max(), v.mean(), pending))
+            else:
+                below = self.levels[level - 2]
+                weight = self.factor(level - 1)
+                parts.append((below.column("t_start")[-pending], below.column("t_end")[-1],
+                              below.column("vmin")[-pending:].min(), below.column("vmax")[-pending:].max(),
+                              below.column("vmean")[-pending:].mean(), pending * weight))
+        tail = self._open_bucket(level - 1)
+        if tail is not None:
+            parts.append(tail)
+        if not parts:
+            return None
+        count = sum(part[5] for part in parts)
+        return (parts[0][0], parts[-1][1], min(part[2] for part in parts), max(part[3] for part in parts),
+                sum(part[4] * part[5] for part in parts) / count, count)
+
+    def time_range(self) -> Optional[Tuple[float, float]]:
+        """보관 중인 가장 이른 시각 ~ 마지막 시각 (원시 레벨에서 삭제된 구간도 상위 레벨 기준으로 포함)"""
+        if self.last_time is None:
+            return None
+        first = self.raw.column("t")[0]
+        for level in self.levels:
+            if level.size:
+                first = min(first, level.column("t_start")[0])
+        return float(first), float(self.last_time)
+
+    def _range(self, level: int, start: Optional[float], end: Optional[float]) -> Tuple[int, int, bool]:
+        """level에서 [start, end]와 겹치는 구간 범위와 start까지 보관하고 있는지 여부"""
+        columns = self.raw if level == 0 else self.levels[level - 1]
+        starts = columns.column("t" if level == 0 else "t_start")
+        ends = columns.column("t" if level == 0 else "t_end")
+        low = 0 if start is None else int(np.searchsorted(ends, start, side="left"))
+        high = columns.size if end is None else int(np.searchsorted(starts, end, side="right"))
+        covered = columns.dropped == 0 or (start is not None and columns.size and starts[0] <= start)
+        return low, high, bool(covered)
+
+    def query(self, start: Optional[float] = None, end: Optional[float] = None,
+              max_points: int = 2000) -> SeriesSlice:
+        """[start, end] 구간을 max_points 이하로 표현하는 가장 세밀한 레벨에서 읽음 (복사본)"""
+        top = len(self.factors)
+        for level in range(top + 1):
+            low, high, covered = self._range(level, start, end)
+            if (covered and high - low <= max_points) or level == top:
+                break
+        if level == 0:
+            t = self.raw.column("t")[low:high].copy()
+            v = self.raw.column("v")[low:high].copy()
+            return SeriesSlice(0, 1, t, t, v, v, v)
+        columns = self.levels[level - 1]
+        names = ("t_start", "t_end", "vmin", "vmax", "vmean")
+        arrays = [columns.column(name)[low:high] for name in names]
+        bucket = self._open_bucket(level)
+        if bucket is not None and (end is None or bucket[0] <= end) and (start is None or bucket[1] >= start):
+            arrays = [np.append(array, value) for array, value in zip(arrays, bucket[:5])]
+        else:
+            arrays = [array.copy() for array in arrays]
+        return SeriesSlice(level, self.factor(level), *arrays)
+
+    def tail(self, count: int) -> List[Tuple[float, float]]:
+        """최근 원시 샘플 count개 (시각, 값)"""
+        if count <= 0:
+            return []
+        t = self.raw.column("t")[-count:]
+        v = self.raw.column("v")[-count:]
+        return list(zip(t.tolist(), v.tolist()))
+
+
+class SignalPyramidStore:
+    """슬롯(또는 신호 이름)별 SignalPyramid 묶음
+
+    - 그래프: subscribe()/unsubscribe()로 그릴 슬롯을 등록 (구독이 모두 해제되면 해당 시계열 삭제)
+    - 수신 스레드: update_frame()으로 한 프레임의 구독 중인 숫자 신호를 한 번의 락 획득으로 추가
+      (NaN은 건너뜀, 구독이 없으면 락 없이 바로 반환). track_all=True면 모든 슬롯을 쌓음
+    - GUI 스레드: query()로 보이는 구간만 복사해 읽음
+    """
+
+    def __init__(self, factors: Sequence[int] = DEFAULT_FACTORS, capacity: int = DEFAULT_CAPACITY,
+                 track_all: bool = False):
+        self.factors = tuple(factors)
+        self.capacity = capacity
+        self.track_all = track_all
+        self._lock = threading.Lock()
+        self._series: Dict[object, SignalPyramid] = {}
+        self._subscribers: Dict[object, int] = {}
+        self._active: frozenset = frozenset()  # 수신 스레드가 락 없이 읽는 구독 키 집합
+        self.version = 0  # 추가될 때마다 증가 (그래프 갱신 필요 여부 판단용)
+
+    def subscribe(self, key: object):
+        with self._lock:
+            self._subscribers[key] = self._subscribers.get(key, 0) + 1
+            self._active = frozenset(self._subscribers)
+
+    def unsubscribe(self, key: object):
+        with self._lock:
+            count = self._subscribers.get(key, 0) - 1
+            if count > 0:
+                self._subscribers[key] = count
+                return
+            self._subscribers.pop(key, None)
+            self._active = frozenset(self._subscribers)
+            if not self.track_all:
+                self._series.pop(key, None)
+            self.version += 1
+
+    @property
+    def subscribed(self) -> frozenset:
+        return self._active
+
+    def update_frame(self, timestamp: float, keys: Sequence[object], values: Sequence[float]):
+        active = self._active
+        track_all = self.track_all
+        if not active and not track_all:
+            return
+        with self._lock:
+            series = self._series
+            for key, value in zip(keys, values):
+                if value != value or not (track_all or key in active):
+                    continue
+                pyramid = series.get(key)
+                if pyramid is None:
+                    pyramid = series[key] = SignalPyramid(self.factors, self.capacity)
+                pyramid.append(timestamp, value)
+            self.version += 1
+
+    def update_rows(self, timestamps: Sequence[float], keys: Sequence[object], values: Sequence[float]):
+        """여러 프레임의 (시각, 키, 값) 행을 한 번의 락 획득으로 추가 (NaN/미구독 슬롯은 건너뜀)"""
+        active = self._active
+        track_all = self.track_all
+        if not active and not track_all:
+            return
+        with self._lock:
+            series = self._series
+            for timestamp, key, value in zip(timestamps, keys, values):
+                if value != value or not (track_all or key in active):
+                    continue
+                pyramid = series.get(key)
+                if pyramid is None:
+                    pyramid = series[key] = SignalPyramid(self.factors, self.capacity)
+                pyramid.append(timestamp, value)
+            self.version += 1
+
+    def update(self, key: object, timestamp: float, value: float):
+        self.update_frame(timestamp, (key,), (value,))
+
+    def keys(self) -> List[object]:
+        with self._lock:
+            return list(self._series)
+
+    def query(self, key: object, start: Optional[float] = None, end: Optional[float] = None,
+              max_points: int = 2000) -> Optional[SeriesSlice]:
+        with self._lock:
+            pyramid = self._series.get(key)
+            return pyramid.query(start, end, max_points) if pyramid is not None else None
+
+    def time_range(self, key: object) -> Optional[Tuple[float, float]]:
+        with self._lock:
+            pyramid = self._series.get(key)
+            return pyramid.time_range() if pyramid is not None else None
+
+    def tail(self, key: object, count: int = 100) -> List[Tuple[float, float]]:
+        with self._lock:
+            pyramid = self._series.get(key)
+            return pyramid.tail(count) if pyramid is not None else []
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+            self.version += 1
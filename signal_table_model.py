@@ -0,0 +1,222 @@
+"""
+메인 신호 테이블 모델
+QTableView가 화면에 보이는 셀만 data()로 요청하므로, 행 데이터는 링 버퍼에 그대로 두고
+표시 시점에 해당 행만 문자열로 변환
+"""
+
+from typing import Iterable, List, Optional
+
+from PyQt5 import QtCore
+
+from message_ring import MessageRingBuffer
+from slot_order import SlotSequence
+
+TABLE_HEADERS = ['Timestamp', 'Channel', 'Message', 'Signal', 'Value', 'Unit']
+
+
+def format_timestamp(ts) -> str:
+    """float 초 -> 표시 문자열 (미수신 고정 행은 빈 문자열)"""
+    if ts is None or ts == "":
+        return ""
+    return f"{ts:.3f}"
+
+
+class SignalTableModel(QtCore.QAbstractTableModel):
+    """링 버퍼 기반 테이블 모델
+
+    표시 소스 (refresh마다 하나를 선택):
+    - show_tail(): 링 버퍼 최신 limit 행을 그대로 표시 (복사/정렬 없음)
+    - show_indices(): 링 버퍼 물리 인덱스 목록 표시 (필터/중복 제거 결과)
+    - show_slots(): 최신값 저장소 슬롯 순서 스냅샷 표시 (중복 제거/고정 표시). 순서는 저장소가
+      유지하므로 정렬 없이 GUI 스레드에서 목록만 복사하며, 이전 스냅샷과 비교해 끝/앞 추가는
+      rowsInserted로, 그 외 순서 변경은 layoutChanged로 알림. 이후 update_slots()로 값이 바뀐
+      슬롯의 행만 알림
+    - show_rows(): 표시용 튜플 목록 표시
+    변경은 rowsInserted/rowsRemoved/dataChanged 범위로 알리며, 뷰는 보이는 셀만 다시 요청.
+    """
+
+    TAIL, INDICES, ROWS, SLOTS = range(4)
+    MAX_CHANGED_RUNS = 32  # 이보다 조각나면 dataChanged를 한 범위로 합침
+
+    def __init__(self, ring: MessageRingBuffer, parent=None):
+        super().__init__(parent)
+        self.ring = ring
+        self._mode = self.TAIL
+        self._count = 0
+        self._tail_total = 0  # show_tail 시점의 링 버퍼 누적 행 수
+        self._reverse = False
+        self._indices: List[int] = []
+        self._rows: List[tuple] = []
+        self._store = None
+        self._order: Optional[SlotSequence] = None  # 표시 행 순서 슬롯 스냅샷 (역순 적용 후)
+
+    # Qt 모델 인터페이스
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else self._count
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(TABLE_HEADERS)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return TABLE_HEADERS[section]
+        return None
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if role != QtCore.Qt.DisplayRole or not index.isValid():
+            return None
+        row = self.row_tuple(index.row())
+        if row is None:
+            return None
+        column = index.column()
+        if column == 0:
+            return format_timestamp(row[0])
+        value = row[column]
+        return value if isinstance(value, str) else str(value)
+
+    def row_tuple(self, row: int) -> Optional[tuple]:
+        """표시 행 번호 -> (time, channel, message, signal, value, unit)"""
+        if row < 0 or row >= self._count:
+            return None
+        if self._mode == self.ROWS:
+            return self._rows[row]
+        if self._mode == self.SLOTS:
+            return self._store.row_tuple(self._order.slot_at(row))
+        if self._reverse and self._mode == self.TAIL:
+            row = self._count - 1 - row
+        if self._mode == self.INDICES:
+            return self.ring.format_row(self._indices[row])
+        return self.ring.format_row((self._tail_total - self._count + row) % self.ring.capacity)
+
+    # 표시 소스 갱신
+    def show_tail(self, limit: int, reverse: bool = False):
+        """링 버퍼 최신 limit 행 표시 (reverse=True면 최신 행이 위)"""
+        total = self.ring.total
+        count = min(limit, len(self.ring))
+        if (self._mode == self.TAIL and self._reverse == reverse and self._count == count
+                and self._tail_total == total):
+            return  # 변경 없음
+        appended = total - self._tail_total
+        # 기존 행이 그대로 유지되는 경우(버퍼가 limit에 도달하기 전 추가만 발생)는 삽입만 알림
+        append_only = (self._mode == self.TAIL and self._reverse == reverse
+                       and 0 < appended and count - self._count == appended)
+        self._mode = self.TAIL
+        self._reverse = reverse
+        self._indices = []
+        self._rows = []
+        self._order = None
+        if append_only:
+            first = 0 if reverse else self._count
+            self.beginInsertRows(QtCore.QModelIndex(), first, first + appended - 1)
+            self._tail_total = total
+            self._count = count
+            self.endInsertRows()
+            return
+        self._tail_total = total
+        self._resize(count)
+
+    def show_indices(self, indices: List[int]):
+        """링 버퍼 물리 인덱스 목록 표시"""
+        self._mode = self.INDICES
+        self._indices = indices
+        self._rows = []
+        self._order = None
+        self._resize(len(indices))
+
+    def show_slots(self, store, order, reverse: bool = False):
+        """최신값 저장소 슬롯 표시 (order: 슬롯 목록 스냅샷 또는 순서 객체, 행 구성이 바뀔 때만 호출)
+
+        순서 객체를 받으면 그 시점 목록을 복사하므로, 이후 수신 스레드가 슬롯을 추가해도
+        다음 show_slots() 전까지 표시 행은 바뀌지 않음.
+        """
+        slots = list(order) if isinstance(order, list) else order.slots()
+        if reverse:
+            slots.reverse()
+        previous = self._order.slots() if self._mode == self.SLOTS and self._store is store else None
+        self._mode = self.SLOTS
+        self._store = store
+        self._reverse = reverse
+        self._indices = []
+        self._rows = []
+        if previous is None or slots[:len(previous)] == previous:
+            # 처음 표시하거나 끝에만 추가된 경우
+            self._order = SlotSequence(slots)
+            self._resize(len(slots))
+            return
+        added = len(slots) - len(previous)
+        if added > 0 and slots[added:] == previous:
+            # 앞에만 추가된 경우 (역순 도착 순서)
+            self.beginInsertRows(QtCore.QModelIndex(), 0, added - 1)
+            self._order = SlotSequence(slots)
+            self._count = len(slots)
+            self.endInsertRows()
+            self.dataChanged.emit(self.index(added, 0), self.index(self._count - 1, len(TABLE_HEADERS) - 1),
+                                  [QtCore.Qt.DisplayRole])
+            return
+        # 순서가 바뀐 경우 (이름순 중간 삽입, 필터 변경 등): 선택/현재 셀은 같은 슬롯을 따라감
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        moved = [previous[index.row()] if index.row() < len(previous) else None for index in persistent]
+        self._order = SlotSequence(slots)
+        self._count = len(slots)
+        row_of = self._order.row_of
+        targets = []
+        for index, slot in zip(persistent, moved):
+            row = row_of(slot) if slot is not None else None
+            targets.append(self.index(row, index.column()) if row is not None else QtCore.QModelIndex())
+        self.changePersistentIndexList(persistent, targets)
+        self.layoutChanged.emit()
+
+    def update_slots(self, dirty: Iterable[int]):
+        """값이 바뀐 슬롯의 행만 dataChanged로 알림"""
+        if self._mode != self.SLOTS:
+            return
+        count = self._count
+        row_of = self._order.row_of
+        rows = []
+        for slot in dirty:
+            row = row_of(slot)
+            if row is not None and row < count:
+                rows.append(row)
+        if not rows:
+            return
+        rows.sort()
+        last_column = len(TABLE_HEADERS) - 1
+        runs = []
+        start = prev = rows[0]
+        for row in rows[1:]:
+            if row != prev + 1:
+                runs.append((start, prev))
+                start = row
+            prev = row
+        runs.append((start, prev))
+        if len(runs) > self.MAX_CHANGED_RUNS:
+            runs = [(rows[0], rows[-1])]
+        for first, last in runs:
+            self.dataChanged.emit(self.index(first, 0), self.index(last, last_column),
+                                  [QtCore.Qt.DisplayRole])
+
+    def show_rows(self, rows: List[tuple]):
+        """표시용 튜플 목록 표시"""
+        self._mode = self.ROWS
+        self._rows = rows
+        self._indices = []
+        self._order = None
+        self._reverse = False
+        self._resize(len(rows))
+
+    def _resize(self, count: int):
+        """행 수 변경을 삽입/삭제로 알리고 남은 행은 dataChanged로 갱신"""
+        old = self._count
+        if count > old:
+            self.beginInsertRows(QtCore.QModelIndex(), old, count - 1)
+            self._count = count
+            self.endInsertRows()
+        elif count < old:
+            self.beginRemoveRows(QtCore.QModelIndex(), count, old - 1)
+            self._count = count
+            self.endRemoveRows()
+        unchanged = min(old, count)
+        if unchanged > 0:
+            self.dataChanged.emit(self.index(0, 0), self.index(unchanged - 1, len(TABLE_HEADERS) - 1),
+                                  [QtCore.Qt.DisplayRole])
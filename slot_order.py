@@ -0,0 +1,96 @@
+"""
+신호 슬롯 표시 순서
+최신값 테이블의 행 순서를 슬롯이 추가될 때마다 갱신하여, 갱신 틱마다 전체 정렬하지 않도록 함.
+모든 순서 객체는 len(), slot_at(row), row_of(slot) 인터페이스를 제공
+"""
+
+import bisect
+from typing import Dict, List, Optional
+
+from message_ring import SignalSlotRegistry
+
+
+class SlotSequence:
+    """고정 슬롯 목록 순서 (필터/채널 뷰 결과 등)"""
+
+    def __init__(self, slots: List[int]):
+        self._slots = slots
+        self._rows: Optional[Dict[int, int]] = None
+
+    def __len__(self):
+        return len(self._slots)
+
+    def slot_at(self, row: int) -> int:
+        return self._slots[row]
+
+    def row_of(self, slot: int) -> Optional[int]:
+        if self._rows is None:
+            # 값 변경 알림이 처음 필요할 때 한 번만 구성
+            self._rows = {s: row for row, s in enumerate(self._slots)}
+        return self._rows.get(slot)
+
+    def slots(self) -> List[int]:
+        return list(self._slots)
+
+
+class ArrivalOrder:
+    """추가 순서 (최초 수신 순/DBC 순) - 추가만 발생하므로 행 번호가 바뀌지 않음"""
+
+    def __init__(self):
+        self._slots: List[int] = []
+        self._rows: Dict[int, int] = {}
+
+    def add(self, slot: int):
+        if slot not in self._rows:
+            self._rows[slot] = len(self._slots)
+            self._slots.append(slot)
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, slot):
+        return slot in self._rows
+
+    def slot_at(self, row: int) -> int:
+        return self._slots[row]
+
+    def row_of(self, slot: int) -> Optional[int]:
+        return self._rows.get(slot)
+
+    def slots(self) -> List[int]:
+        return list(self._slots)
+
+
+class NameOrder:
+    """(메시지, 신호) 이름순 - 새 슬롯은 bisect로 제자리에 삽입"""
+
+    def __init__(self, registry: SignalSlotRegistry):
+        self.registry = registry
+        self._keys: List[tuple] = []  # (message, signal, slot) 정렬 목록
+        self._members = set()
+
+    def _key(self, slot: int) -> tuple:
+        _, message, signal, _ = self.registry.keys[slot]
+        return (message, signal, slot)
+
+    def add(self, slot: int):
+        if slot not in self._members:
+            self._members.add(slot)
+            bisect.insort(self._keys, self._key(slot))
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, slot):
+        return slot in self._members
+
+    def slot_at(self, row: int) -> int:
+        return self._keys[row][2]
+
+    def row_of(self, slot: int) -> Optional[int]:
+        if slot not in self._members:
+            return None
+        return bisect.bisect_left(self._keys, self._key(slot))
+
+    def slots(self) -> List[int]:
+        return [key[2] for key in self._keys]
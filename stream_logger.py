@@ -0,0 +1,405 @@
+"""
+스트리밍 CSV 로거
+수신 경로에서는 고정 폭 숫자 청크에 행을 채우기만 하고, 청크 단위 CSV 변환/기록은
+백그라운드 스레드에서 수행. 메모리는 대기 청크 수로 제한되며 로그 종료는 즉시 반환
+"""
+
+import bisect
+import io
+import logging
+import math
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from message_ring import encode_value
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LogChunk:
+    """기록 대기 청크 (rows개 행 유효)"""
+    timestamps: np.ndarray
+    values: np.ndarray  # (rows, 열 수) float64, 값 없음 = NaN
+    texts: Dict[Tuple[int, int], str] = field(default_factory=dict)  # (행, 열) -> 열거형 이름 등
+
+    @property
+    def rows(self) -> int:
+        return len(self.timestamps)
+
+
+class ChunkedCsvWriter:
+    """백그라운드 청크 CSV 기록기
+
+    fsync_interval: 이 간격(초)마다 os.fsync (0 = 청크마다, None = 파일 닫을 때만)
+    max_bytes / max_seconds: 파일 크기/기록 시간 초과 시 다음 파일(_001, _002 ...)로 교체
+    queue_chunks: 대기 청크 최대 수. 기록이 밀려 가득 차면 수신 경로를 막지 않고 청크를 버림
+    integer_columns: 정수 형식으로 기록할 열 (정수 DBC 신호, 나머지는 실수 형식)
+    버린 청크(대기열 초과 + 기록 실패)는 dropped_chunks/dropped_rows, 그중 기록 실패는 failed_chunks로 집계.
+    기록 중 add_column()으로 열이 늘면 다음 청크부터 늘어난 헤더의 새 파일로 교체.
+    """
+
+    def __init__(self, path: str, columns: List[str], fsync_interval: Optional[float] = 5.0,
+                 max_bytes: Optional[int] = None, max_seconds: Optional[float] = None,
+                 queue_chunks: int = 16, integer_columns: Iterable[str] = ()):
+        self.path = path
+        self.columns = list(columns)
+        self.integer_columns = set(integer_columns)
+        self.fsync_interval = fsync_interval
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_chunks)
+        self.files: List[str] = []
+        self.rows_written = 0
+        self.bytes_written = 0
+        self.dropped_rows = 0
+        self.dropped_chunks = 0
+        self.failed_chunks = 0
+        self._closing = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._file = None
+        self._file_columns = 0  # 현재 파일 헤더의 신호 열 수
+        self._file_bytes = 0
+        self._file_opened = 0.0
+        self._last_fsync = 0.0
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="csv-log-writer", daemon=False)
+        self._thread.start()
+
+    def submit(self, chunk: LogChunk) -> bool:
+        """청크 기록 요청 (대기열이 가득 차면 버리고 False)"""
+        try:
+            self.queue.put_nowait(chunk)
+            return True
+        except queue.Full:
+            self.dropped_rows += chunk.rows
+            self.dropped_chunks += 1
+            logger.warning(f"로그 기록 지연으로 {chunk.rows}행 버림 (누적 {self.dropped_rows}행)")
+            return False
+
+    def add_column(self, name: str) -> int:
+        """로그 시작 시 목록에 없던 신호 열 추가 (수신 스레드, 열 번호 반환)"""
+        self.columns.append(name)
+        return len(self.columns) - 1
+
+    def close(self, wait: bool = False, timeout: Optional[float] = None):
+        """남은 청크 기록 후 종료 (wait=False면 즉시 반환)"""
+        self._closing.set()
+        if wait:
+            self.join(timeout)
+
+    def join(self, timeout: Optional[float] = None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _part_path(self, part: int) -> str:
+        if part == 0:
+            return self.path
+        stem, ext = os.path.splitext(self.path)
+        return f"{stem}_{part:03d}{ext}"
+
+    def _open_next(self):
+        self._close_file()
+        path = self._part_path(len(self.files))
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self.files.append(path)
+        columns = list(self.columns)
+        header = ",".join(["Timestamp"] + columns) + "\n"
+        self._file.write(header)
+        self._file_columns = len(columns)
+        self._file_bytes = len(header)
+        self._file_opened = time.monotonic()
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+
+    def _needs_rotation(self) -> bool:
+        if self.max_bytes is not None and self._file_bytes >= self.max_bytes:
+            return True
+        if self.max_seconds is not None and time.monotonic() - self._file_opened >= self.max_seconds:
+            return True
+        return False
+
+    def format_chunk(self, chunk: LogChunk, width: Optional[int] = None) -> str:
+        """청크 -> CSV 텍스트 (헤더 제외, width: 헤더 열 수, 청크가 좁으면 빈 값으로 채움)"""
+        values = chunk.values
+        if width is None:
+            width = values.shape[1]
+        if values.shape[1] < width:
+            values = np.hstack([values, np.full((len(values), width - values.shape[1]), np.nan)])
+        frame = pd.DataFrame(values, columns=self.columns[:width])
+        for name in self.integer_columns.intersection(frame.columns):
+            # 정수 신호는 "3.0"이 아니라 "3"으로 기록 (값 없음은 빈 칸)
+            frame[name] = frame[name].round().astype("Int64")
+        if chunk.texts:
+            frame = frame.astype(object)
+            for (row, column), text in chunk.texts.items():
+                frame.iat[row, column] = text
+        frame.insert(0, "Timestamp", chunk.timestamps)
+        buffer = io.StringIO()
+        frame.to_csv(buffer, header=False, index=False)
+        return buffer.getvalue()
+
+    def _write(self, chunk: LogChunk):
+        if self._file is None or chunk.values.shape[1] > self._file_columns or self._needs_rotation():
+            self._open_next()
+        text = self.format_chunk(chunk, self._file_columns)
+        self._file.write(text)
+        self._file.flush()
+        self._file_bytes += len(text)
+        self.bytes_written += len(text)
+        self.rows_written += chunk.rows
+        if self.fsync_interval is not None:
+            now = time.monotonic()
+            if now - self._last_fsync >= self.fsync_interval:
+                os.fsync(self._file.fileno())
+                self._last_fsync = now
+
+    def _run(self):
+        try:
+            self._open_next()
+            while True:
+                try:
+                    chunk = self.queue.get(timeout=0.2)
+                except queue.Empty:
+                    if self._closing.is_set():
+                        break
+                    continue
+                try:
+                    self._write(chunk)
+                except Exception as e:
+                    self.failed_chunks += 1
+                    self.dropped_chunks += 1
+                    self.dropped_rows += chunk.rows
+                    logger.error(f"로그 청크 기록 실패로 {chunk.rows}행 버림 "
+                                 f"(실패 {self.failed_chunks}청크, 누적 {self.dropped_rows}행): {e}")
+        finally:
+            self._close_file()
+            logger.info(f"로그 기록 종료: {self.rows_written}행, {self.bytes_written} bytes, 파일 {self.files}"
+                        f" (버림 {self.dropped_chunks}청크 {self.dropped_rows}행)")
+
+
+class EventRowLogger:
+    """이벤트 기반 와이드 행 로거 (기존 CSV 형식)
+
+    새 타임스탬프마다 직전까지의 신호 유지값(sample-and-hold)을 한 행으로 기록하고,
+    이후 해당 프레임의 신호로 유지값을 갱신. 열은 로그 시작 시 DBC 신호 목록이며,
+    목록에 없던 신호(로깅 중 DBC 교체 등)가 들어오면 열을 뒤에 추가.
+    """
+
+    def __init__(self, writer: ChunkedCsvWriter, chunk_rows: int = 2048):
+        self.writer = writer
+        self.chunk_rows = chunk_rows
+        self.index = {name: column for column, name in enumerate(writer.columns)}
+        self.current = np.full(len(writer.columns), np.nan)
+        self.current_texts: Dict[int, str] = {}
+        self.last_time: Optional[float] = None
+        self._lock = threading.Lock()
+        self._new_chunk()
+
+    def _new_chunk(self):
+        self._timestamps = np.empty(self.chunk_rows, dtype=np.float64)
+        self._values = np.empty((self.chunk_rows, len(self.writer.columns)), dtype=np.float64)
+        self._texts: Dict[Tuple[int, int], str] = {}
+        self._row = 0
+
+    def _emit_row(self, timestamp: float):
+        row = self._row
+        self._timestamps[row] = timestamp
+        self._values[row] = self.current
+        for column, text in self.current_texts.items():
+            self._texts[(row, column)] = text
+        self._row = row + 1
+        if self._row == self.chunk_rows:
+            self._flush()
+
+    def _flush(self):
+        if self._row:
+            self.writer.submit(LogChunk(self._timestamps[:self._row], self._values[:self._row], self._texts))
+            self._new_chunk()
+
+    def _add_column(self, name: str) -> int:
+        """새 신호 열 추가 (채우던 청크는 기존 열 수로 먼저 넘김, 락 안에서 호출)"""
+        self._flush()
+        column = self.writer.add_column(name)
+        self.index[name] = column
+        self.current = np.append(self.current, np.nan)
+        self._new_chunk()
+        return column
+
+    def log_frame(self, timestamp: float, signals: dict):
+        """디코딩된 프레임 기록 (수신 스레드)"""
+        index = self.index
+        with self._lock:
+            if self.last_time is None or timestamp > self.last_time:
+                # 첫 행(아직 유지값이 없는 빈 행)은 기록하지 않음
+                if self.last_time is not None:
+                    self._emit_row(timestamp)
+                self.last_time = timestamp
+            for name, val in signals.items():
+                column = index.get(name)
+                if column is None:
+                    column = self._add_column(name)
+                number, text = encode_value(val)
+                self.current[column] = number
+                if text is not None:
+                    self.current_texts[column] = text
+                elif column in self.current_texts:
+                    del self.current_texts[column]
+
+    def close(self, wait: bool = False):
+        """마지막 유지값 행을 기록하고 종료 요청"""
+        with self._lock:
+            if self.last_time is not None:
+                self._emit_row(self.last_time)
+            self._flush()
+        self.writer.close(wait)
+
+
+RESAMPLE_METHODS = ("hold", "linear")
+
+
+class ResampledRowLogger:
+    """고정 주기 리샘플링 로거
+
+    신호별로 (시각, 값) 샘플을 모아 두었다가 flush_interval마다 k/rate_hz 격자 시각의 값을
+    벡터 연산으로 한꺼번에 계산하여 기록. 행 수가 가장 빠른 메시지가 아니라 주기로 결정됨.
+
+    method="hold": 격자 시각 이전의 마지막 값 유지
+    method="linear": 앞뒤 샘플 사이 선형 보간 (아직 다음 샘플이 없으면 마지막 값 유지,
+                     열거형 등 텍스트 값 신호와 정수 신호는 항상 유지)
+
+    채널마다 도착 지연이 달라 한 채널이 먼저 앞서가도 다른 채널 샘플이 빠지지 않도록,
+    격자는 가장 늦은 샘플 시각보다 lateness(기본 리샘플 한 주기) 이전까지만 기록.
+    이미 기록된 격자 시각 이하로 도착한 샘플은 late_samples로 집계 (이후 격자에만 반영).
+    """
+
+    def __init__(self, writer: ChunkedCsvWriter, rate_hz: float, method: str = "hold",
+                 flush_interval: float = 1.0, lateness: Optional[float] = None):
+        if rate_hz <= 0:
+            raise ValueError(f"리샘플링 주기는 0보다 커야 합니다: {rate_hz}")
+        if method not in RESAMPLE_METHODS:
+            raise ValueError(f"지원하지 않는 보간 방식: {method}")
+        self.writer = writer
+        self.rate_hz = rate_hz
+        self.method = method
+        self.flush_interval = flush_interval
+        self.lateness = 1.0 / rate_hz if lateness is None else lateness
+        self.late_samples = 0
+        self.index = {name: column for column, name in enumerate(writer.columns)}
+        count = len(writer.columns)
+        # 신호별 샘플 버퍼 (이전 격자 구간의 마지막 샘플 1개를 앞에 남겨 둠)
+        self._times: List[List[float]] = [[] for _ in range(count)]
+        self._values: List[List[float]] = [[] for _ in range(count)]
+        self._texts: List[List[Optional[str]]] = [[] for _ in range(count)]
+        self._has_text = [False] * count
+        self._stepped = [name in writer.integer_columns for name in writer.columns]  # 보간하지 않는 열
+        self.next_tick: Optional[int] = None  # 다음에 기록할 격자 번호 k (시각 = k / rate_hz)
+        self.last_time: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _tick_time(self, tick: int) -> float:
+        return tick / self.rate_hz
+
+    def _add_column(self, name: str) -> int:
+        """로그 시작 시 목록에 없던 신호 열 추가 (락 안에서 호출)"""
+        column = self.writer.add_column(name)
+        self.index[name] = column
+        self._times.append([])
+        self._values.append([])
+        self._texts.append([])
+        self._has_text.append(False)
+        self._stepped.append(False)
+        return column
+
+    def log_frame(self, timestamp: float, signals: dict):
+        """디코딩된 프레임 기록 (수신 스레드)"""
+        index = self.index
+        with self._lock:
+            if self.next_tick is None:
+                self.next_tick = math.ceil(timestamp * self.rate_hz)
+            late = timestamp <= self._tick_time(self.next_tick - 1)
+            for name, val in signals.items():
+                column = index.get(name)
+                if column is None:
+                    column = self._add_column(name)
+                if late:
+                    self.late_samples += 1
+                number, text = encode_value(val)
+                times = self._times[column]
+                if times and timestamp < times[-1]:
+                    # 채널 간 도착 순서가 뒤바뀐 샘플은 제자리에 삽입
+                    pos = bisect.bisect_right(times, timestamp)
+                    times.insert(pos, timestamp)
+                    self._values[column].insert(pos, number)
+                    self._texts[column].insert(pos, text)
+                else:
+                    times.append(timestamp)
+                    self._values[column].append(number)
+                    self._texts[column].append(text)
+                if text is not None:
+                    self._has_text[column] = True
+            if self.last_time is None or timestamp > self.last_time:
+                self.last_time = timestamp
+            horizon = self.last_time - self.lateness
+            if horizon - self._tick_time(self.next_tick) >= self.flush_interval:
+                self._emit_until(horizon)
+
+    def _emit_until(self, until: float):
+        """until 이하의 남은 격자 시각을 한 청크로 계산하여 기록"""
+        last_tick = math.floor(until * self.rate_hz)
+        if last_tick < self.next_tick:
+            return
+        grid = np.arange(self.next_tick, last_tick + 1, dtype=np.float64) / self.rate_hz
+        values = np.full((len(grid), len(self.writer.columns)), np.nan)
+        texts: Dict[Tuple[int, int], str] = {}
+        for column, times in enumerate(self._times):
+            if not times:
+                continue
+            times_arr = np.asarray(times)
+            values_arr = np.asarray(self._values[column])
+            # 격자 시각 이하의 마지막 샘플 위치 (-1 = 아직 샘플 없음)
+            held = np.searchsorted(times_arr, grid, side="right") - 1
+            valid = held >= 0
+            if self.method == "linear" and not self._has_text[column] and not self._stepped[column]:
+                column_values = np.interp(grid, times_arr, values_arr)
+            else:
+                column_values = values_arr[np.maximum(held, 0)]
+            values[:, column] = np.where(valid, column_values, np.nan)
+            if self._has_text[column]:
+                column_texts = self._texts[column]
+                for row in np.flatnonzero(valid):
+                    text = column_texts[held[row]]
+                    if text is not None:
+                        texts[(int(row), column)] = text
+            # 마지막 격자 시각 이전 샘플은 하나만 남기고 정리
+            keep = max(int(held[-1]), 0)
+            if keep:
+                del times[:keep]
+                del self._values[column][:keep]
+                del self._texts[column][:keep]
+        self.writer.submit(LogChunk(grid, values, texts))
+        self.next_tick = last_tick + 1
+
+    def close(self, wait: bool = False):
+        """마지막 샘플 시각까지의 격자를 기록하고 종료 요청"""
+        with self._lock:
+            if self.last_time is not None:
+                self._emit_until(self.last_time)
+        self.writer.close(wait)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+별도 프로세스 수집 테스트 스크립트
+공유 메모리 링이 덮어써졌을 때 최신값 표로 복구되는지, 수집 프로세스에서 최대 속도로 재생한 행이
+GUI 쪽 링 버퍼/최신값/시계열/처리 핸들러/상태 알림으로 빠짐없이 전달되는지 확인
+"""
+
+import os
+import tempfile
+import time
+from multiprocessing import Pipe
+from acquisition_process import AcquisitionClient, SharedRowRing, SharedRowWriter
+from message_ring import SignalSlotRegistry
+from test_log_replay import _write_candump
+
+
+def test_ring_overrun_resync():
+    """링 용량을 넘겨 기록 -> 놓친 행 수 집계, 최신값은 표에서 복구, 이후 행은 정상 전달"""
+    print("=== 공유 메모리 링 덮어쓰기 테스트 ===")
+    registry = SignalSlotRegistry()
+    ring = SharedRowRing(capacity=64, max_slots=16)
+    control_r, control_w = Pipe(duplex=False)
+    notify_r, notify_w = Pipe(duplex=False)
+    writer = SharedRowWriter(ring, registry, control_w, notify_w)
+    client = AcquisitionClient("candb_ex.dbc", max_slots=16, cipv_pipeline=False)
+    client.ring, client._control, client._notify = ring, control_r, notify_r
+    try:
+        speed = registry.slot("CH1", "VehicleStatus", "VehicleSpeed", "km/h", 0x100)
+        gear = registry.slot("CH1", "VehicleStatus", "Gear", "", 0x100, True)
+        channel_id = registry.channel_id("CH1")
+        client.signal_series.subscribe(speed)  # 그래프가 그리는 슬롯만 시계열에 쌓음
+        handled = []
+        client.register_processing_handler(lambda ch, msg, sig, value, ts: sig == "VehicleSpeed",
+                                           lambda ch, msg, sig, value, ts: handled.append(value))
+
+        # 알림은 읽는 쪽이 확인할 때까지 한 번만 전송
+        for i in range(100):
+            writer.append_frame(i * 0.01, i * 0.01, 100.0 + i * 0.01, channel_id, 0x100,
+                                [speed, gear], [float(i), float("nan")], [None, "DRIVE"])
+        assert ring.total == 200 and notify_r.poll() and notify_r.recv_bytes() == b"\x01" and not notify_r.poll()
+        ring.header[3] = 0
+
+        assert client._consume_rows()
+        print(f"놓친 행: {client.dropped_rows}, 핸들러 호출: {len(handled)}")
+        assert client.dropped_rows == 200 - 64 and handled == [float(i) for i in range(68, 100)]
+        assert client.latest_store.get(speed)[1] == 99.0 and client.latest_store.get(gear)[2] == "DRIVE"
+        assert client.latest_values[("CH1", "Gear")][0] == "DRIVE"
+        assert len(client.message_buffer) == 64
+
+        # 이후 행은 빠짐없이 전달
+        writer.append_frame(1.0, 1.0, 101.0, channel_id, 0x100, [speed], [123.0], [None])
+        assert client._consume_rows()
+        assert client.dropped_rows == 136 and handled[-1] == 123.0 and client.latest_store.get(speed)[1] == 123.0
+        assert client.signal_series.tail(speed, 1000)[-1] == (1.0, 123.0)
+        assert client.signal_series.keys() == [speed]
+        assert client.last_rx_timestamp["CH1"] == 101.0
+    finally:
+        for conn in (control_r, control_w, notify_r, notify_w):
+            conn.close()
+        ring.close()
+
+
+def test_client_replay():
+    """수집 프로세스 재생 -> GUI 쪽 저장소/핸들러/알림 (엔진 단독 실행과 같은 결과)"""
+    print("=== 수집 프로세스 재생 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "drive.log")
+        _write_candump(path, 2.0)
+        client = AcquisitionClient("candb_ex.dbc", ring_capacity=1 << 12)
+        # GUI가 행 도착 전에 채널을 먼저 등록해도 (채널 보기 필터) 채널 ID는 이름으로 대응
+        client.message_buffer.registry.channel_id("CH2")
+        events = []
+        client.subscribe(lambda event, info: events.append(event))
+        speeds = []
+        client.register_processing_handler(lambda ch, msg, sig, value, ts: sig == "VehicleSpeed",
+                                           lambda ch, msg, sig, value, ts: speeds.append((ch, value)))
+        client.signal_series.track_all = True
+        client.track_radar = True
+        assert client.start()
+        try:
+            started = time.perf_counter()
+            assert client.start_replay(path, speed=None)
+            deadline = time.monotonic() + 30.0
+            while "replay_stopped" not in events and time.monotonic() < deadline:
+                time.sleep(0.01)
+            elapsed = time.perf_counter() - started
+            # 통계는 주기적으로 전달되므로 마지막 값이 올 때까지 대기
+            while client.get_statistics().get('CH2', {}).get('total_messages') != 2000 \
+                    and time.monotonic() < deadline:
+                time.sleep(0.05)
+            stats = client.get_statistics()
+            print(f"CH1 {stats['CH1']['total_messages']}프레임, CH2 {stats['CH2']['total_messages']}프레임 "
+                  f"({elapsed:.2f}s), 놓친 행: {client.dropped_rows}, 알림: {events}")
+
+            assert stats['CH1']['total_messages'] == 600 and stats['CH2']['total_messages'] == 2000
+            assert events == ["receive_started", "replay_started", "replay_stopped"]
+            assert not client.replaying and client.receive_active
+            assert client.dropped_rows == 0
+            assert len(speeds) == 200 and speeds[-1] == ("CH1", 1.99)
+            assert client.latest_values[("CH2", "RelPosX10")][0] == -1000.0
+            assert client.radar_manager.get_object_by_id(10).rel_pos_x == -1000.0
+            slot = client.message_buffer.registry.find("CH1", "VehicleStatus", "VehicleSpeed", "km/h")
+            assert client.latest_store.get(slot)[1] == 1.99
+            assert len(client.signal_series.tail(slot, 1000)) == 200
+            assert client.message_buffer.total == client.get_status()['rows_written']
+            buffer = client.message_buffer
+            names, keys = buffer.registry.channel_names, buffer.registry.keys
+            assert names[:2] == ["CH2", "CH1"]
+            rows = buffer.select()
+            assert len(rows) and all(names[channel] == keys[slot][0]
+                                     for channel, slot in zip(buffer.channels[rows].tolist(),
+                                                              buffer.slots[rows].tolist()))
+            assert client.last_rx_timestamp["CH1"] > 0 and client.last_rx_timestamp["CH2"] > 0
+
+            # DBC 슬롯 등록은 응답 전에 로컬 레지스트리에 반영
+            slots = client.register_dbc_slots("CH2")
+            keys = client.message_buffer.registry.keys
+            assert slots and all(keys[s][0] == "CH2" for s in slots)
+            report = client.get_latency_report()
+            assert "transfer" in str(report.get("CH1", {}))
+        finally:
+            client.shutdown()
+        assert client.process is None
+
+
+if __name__ == "__main__":
+    test_ring_overrun_resync()
+    test_client_replay()
+    print("\n=== 테스트 완료 ===")
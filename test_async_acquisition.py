@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+asyncio 수집 엔진 테스트 스크립트
+두 개의 Virtual CAN 채널을 하나의 이벤트 루프에서 수신하고
+async 반복자/비동기 구독 핸들러로 디코딩 배치가 전달되는지,
+디코딩이 이벤트 루프를 막지 않는지, 버린 배치 집계와 시작 실패 시 정리를 확인
+"""
+
+import asyncio
+import os
+import time
+import can
+from async_acquisition import AsyncAcquisitionEngine, QtAsyncBridge
+from tsmaster_can_processor import TSMasterCanProcessor, MessageStatus
+
+
+async def _run_engine(total):
+    engine = AsyncAcquisitionEngine(batch_size=128)
+    buses = {}
+    for label in ("CH1", "CH2"):
+        tx = can.interface.Bus(channel=f"async_{label}", interface='virtual')
+        rx = can.interface.Bus(channel=f"async_{label}", interface='virtual')
+        buses[label] = (tx, rx)
+        engine.add_channel(label, rx, TSMasterCanProcessor("candb_ex.dbc"))
+
+    handled = {"CH1": 0, "CH2": 0}
+
+    async def handler(batch):
+        await asyncio.sleep(0)
+        handled[batch.channel] += len(batch.messages)
+
+    engine.subscribe(handler)
+    iterated = {"CH1": 0, "CH2": 0}
+    valid = 0
+
+    async def consume():
+        nonlocal valid
+        async for batch in engine.batches():
+            iterated[batch.channel] += len(batch.messages)
+            valid += sum(1 for m in batch.messages if m.status == MessageStatus.VALID)
+            if sum(iterated.values()) >= 2 * total:
+                return
+
+    consumer = asyncio.ensure_future(consume())
+    await asyncio.sleep(0)
+    await engine.start()
+    try:
+        for i in range(total):
+            for label, (tx, _) in buses.items():
+                tx.send(can.Message(arbitration_id=100, data=bytes([i % 256, 0, 0, 0, 0, 0, 0, 0]),
+                                    is_extended_id=False))
+        await asyncio.wait_for(consumer, timeout=10.0)
+    finally:
+        await engine.stop()
+        for tx, rx in buses.values():
+            tx.shutdown()
+            rx.shutdown()
+    return engine, handled, iterated, valid
+
+
+def test_async_engine():
+    """2채널 asyncio 수신/디코딩/팬아웃 테스트"""
+    print("=== asyncio 수집 엔진 테스트 ===")
+    total = 500
+    engine, handled, iterated, valid = asyncio.run(_run_engine(total))
+    stats = engine.get_stats()
+    print(f"반복자 수신: {iterated}, 핸들러 수신: {handled}, 유효: {valid}")
+    print(f"채널 통계: {stats}")
+    assert iterated == {"CH1": total, "CH2": total}
+    assert handled == {"CH1": total, "CH2": total}
+    assert valid == 2 * total
+    assert all(s['batches'] <= s['frames'] for s in stats.values())
+    assert engine.dropped_batches == 0 and all(s['dropped_batches'] == 0 for s in stats.values())
+
+
+class SlowProcessor:
+    """디코딩에 시간이 걸리고, 지정한 ID는 디코딩에 실패하는 처리기"""
+
+    def process_messages(self, frames):
+        time.sleep(0.1)
+        if any(frame.arbitration_id == 0x7FF for frame in frames):
+            raise ValueError("decode failed")
+        return list(frames)
+
+
+async def _run_slow_decode():
+    engine = AsyncAcquisitionEngine(batch_size=16)
+    tx = can.interface.Bus(channel="async_slow", interface='virtual')
+    rx = can.interface.Bus(channel="async_slow", interface='virtual')
+    engine.add_channel("CH1", rx, SlowProcessor())
+    gaps = []
+
+    async def ticker():
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(0.005)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    await engine.start()
+    ticks = asyncio.ensure_future(ticker())
+    try:
+        for arbitration_id in (100, 0x7FF, 100):
+            tx.send(can.Message(arbitration_id=arbitration_id, data=bytes(8), is_extended_id=False))
+            await asyncio.sleep(0.15)
+        deadline = time.perf_counter() + 5.0
+        while engine.get_stats()["CH1"]['batches'] < 2 and time.perf_counter() < deadline:
+            await asyncio.sleep(0.01)
+    finally:
+        ticks.cancel()
+        await engine.stop()
+        tx.shutdown()
+        rx.shutdown()
+    return engine, max(gaps)
+
+
+def test_decode_off_loop():
+    """디코딩은 스레드 풀에서 실행 (루프 지연 없음), 디코딩 실패 배치는 집계"""
+    engine, worst_gap = asyncio.run(_run_slow_decode())
+    stats = engine.get_stats()["CH1"]
+    print(f"100ms 디코딩 중 루프 최대 간격: {worst_gap * 1000:.1f}ms, 채널 통계: {stats}")
+    assert worst_gap < 0.08
+    assert stats['batches'] == 2 and stats['dropped_batches'] == 1 and engine.dropped_batches == 1
+
+
+def test_start_failure_rollback():
+    """일부 채널 시작 실패 시 이미 시작한 채널을 정리하고, 브리지는 예외를 전달"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    rx = can.interface.Bus(channel="async_fail", interface='virtual')
+    try:
+        # 같은 버스는 두 Notifier에 등록할 수 없으므로 두 번째 채널 시작이 실패
+        engine = AsyncAcquisitionEngine()
+        engine.add_channel("CH1", rx, SlowProcessor())
+        engine.add_channel("CH2", rx, SlowProcessor())
+        bridge = QtAsyncBridge(engine)
+        try:
+            bridge.start()
+            raise AssertionError("시작 실패가 전달되지 않음")
+        except ValueError as e:
+            print(f"시작 실패 전달: {e}")
+        assert not engine.running and bridge._thread is None and bridge.loop is None
+        assert all(ch.notifier is None and ch.task is None for ch in engine.channels.values())
+        assert not engine.handlers
+
+        # 실패한 채널을 빼면 같은 엔진으로 다시 시작 가능
+        del engine.channels["CH2"]
+        bridge.start()
+        try:
+            assert engine.running and engine.channels["CH1"].notifier is not None
+        finally:
+            bridge.stop()
+    finally:
+        rx.shutdown()
+
+
+if __name__ == "__main__":
+    test_async_engine()
+    test_decode_off_loop()
+    test_start_failure_rollback()
+    print("\n=== 테스트 완료 ===")
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+일괄 디코딩 테스트 스크립트
+배열 신호 추출기(인텔/모토로라, 부호, float)를 cantools 결과와 비교하고,
+candump/네이티브 기록을 프로세스 풀로 디코딩한 열 테이블(npy mmap/npz)을 확인
+"""
+
+import json
+import os
+import tempfile
+import numpy as np
+import can
+import cantools
+from bulk_decode import MessageDecoder, bulk_decode, load_message_definitions
+from session_recording import SessionRecorder
+
+# 모토로라/부호/float/멀티플렉스 신호를 포함한 테스트 DBC
+TEST_DBC = """VERSION ""
+
+BU_: ECU
+
+BO_ 300 Mixed: 8 ECU
+ SG_ BeSigned : 7|12@0- (0.5,-10) [-1034|1013.5] "m" ECU
+ SG_ LeSigned : 18|10@1- (1,0) [-512|511] "" ECU
+ SG_ BeOdd : 37|7@0+ (1,0) [0|127] "" ECU
+ SG_ LeWide : 50|14@1+ (0.001,5) [5|21.383] "s" ECU
+
+BO_ 301 FloatMsg: 8 ECU
+ SG_ Value : 0|32@1- (1,0) [-1E+38|1E+38] "" ECU
+ SG_ Counter : 39|8@0+ (1,0) [0|255] "" ECU
+
+BO_ 302 Muxed: 8 ECU
+ SG_ Selector M : 0|8@1+ (1,0) [0|255] "" ECU
+ SG_ A m0 : 8|16@1+ (1,0) [0|65535] "" ECU
+ SG_ B m1 : 8|16@1+ (0.1,0) [0|6553.5] "" ECU
+
+SIG_VALTYPE_ 301 Value : 1;
+"""
+
+
+def _expected(message, payloads):
+    """cantools 행 단위 디코딩 결과 (없는 신호는 NaN)"""
+    columns = {signal.name: [] for signal in message.signals}
+    for payload in payloads:
+        decoded = message.decode(bytes(payload), decode_choices=False)
+        for name in columns:
+            columns[name].append(float(decoded.get(name, np.nan)))
+    return {name: np.array(values) for name, values in columns.items()}
+
+
+def test_signal_extractors():
+    """배열 디코딩 == cantools 디코딩"""
+    print("=== 배열 신호 추출 테스트 ===")
+    rng = np.random.default_rng(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        dbc_path = os.path.join(tmp, "test.dbc")
+        with open(dbc_path, "w") as file:
+            file.write(TEST_DBC)
+        definitions = load_message_definitions(dbc_path)
+        for frame_id, definition in sorted(definitions.items()):
+            decoder = MessageDecoder(definition)
+            data = rng.integers(0, 256, size=(2000, 8), dtype=np.uint8)
+            if frame_id == 301:
+                data[:, :4] = np.frombuffer(rng.normal(0, 1e3, 2000).astype("<f4").tobytes(), np.uint8).reshape(-1, 4)
+            if frame_id == 302:
+                data[:, 0] = rng.integers(0, 2, 2000)
+            decoded = decoder.decode(data)
+            expected = _expected(definition['message'], data)
+            for name, values in expected.items():
+                assert np.allclose(decoded[name], values, equal_nan=True, rtol=1e-7), (frame_id, name)
+            print(f"{definition['message'].name}: 신호 {len(decoded)}개 일치 (배열 디코딩: {decoder.vectorized})")
+
+        # DLC가 짧은 프레임은 0으로 채워 디코딩
+        decoder = MessageDecoder(definitions[300])
+        short = decoder.decode(np.array([[0x12, 0x34]], dtype=np.uint8))
+        assert short["BeSigned"][0] == _expected(definitions[300]['message'], [b"\x12\x34" + bytes(6)])["BeSigned"][0]
+
+
+def _traffic(seconds, period=0.01):
+    """candb_ex.dbc 100/101/102 + 미정의 ID 0x7FF"""
+    frames = []
+    for tick in range(int(seconds / period)):
+        t = 1700000000 + tick * period
+        for can_id in (100, 101, 102):
+            frames.append((t, can_id, bytes([(tick + can_id) % 256, tick % 7, 3, 0, (tick * 3) % 256, 0, 9, 1])))
+        if tick % 10 == 0:
+            frames.append((t + 0.0005, 0x7FF, bytes(2)))
+    return frames
+
+
+def test_bulk_decode_outputs():
+    """candump/네이티브 기록 -> 프로세스 풀 디코딩 -> npy/npz"""
+    frames = _traffic(60.0)
+    db = cantools.database.load_file("candb_ex.dbc")
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, "drive.log")
+        with open(log_path, "w") as file:
+            for t, can_id, data in frames:
+                file.write(f"({t:.6f}) can0 {can_id:03X}#{data.hex().upper()}\n")
+        rec_path = os.path.join(tmp, "drive.canrec")
+        recorder = SessionRecorder(rec_path, chunk_frames=1000)
+        recorder.start()
+        for t, can_id, data in frames:
+            recorder.record(can.Message(timestamp=t, arbitration_id=can_id, data=data), "CH1")
+        recorder.close(wait=True)
+
+        for path, fmt in ((log_path, "npy"), (rec_path, "npz")):
+            out_dir = os.path.join(tmp, f"out_{fmt}")
+            manifest = bulk_decode(path, "candb_ex.dbc", out_dir, fmt=fmt, workers=2, chunk_seconds=7.0)
+            print(f"{os.path.basename(path)} -> {fmt}: {manifest['frames']}프레임, {manifest['chunks']}구간, "
+                  f"{manifest['frames_per_sec']:.0f} frames/s")
+            assert manifest['frames'] == len(frames) and manifest['unknown_frames'] == 600
+            with open(os.path.join(out_dir, "manifest.json"), encoding="utf-8") as file:
+                assert json.load(file)["decoded_frames"] == len(frames) - 600
+
+            for can_id in (100, 101, 102):
+                message = db.get_message_by_frame_id(can_id)
+                source = [(t, data) for t, i, data in frames if i == can_id]
+                expected = _expected(message, [data for _, data in source])
+                entry = manifest['messages'][message.name]
+                assert entry['rows'] == len(source)
+                if fmt == "npy":
+                    table = {name: np.load(os.path.join(out_dir, entry['path'], f"{name}.npy"), mmap_mode="r")
+                             for name in ["timestamp"] + list(expected)}
+                    assert isinstance(table["timestamp"], np.memmap)
+                else:
+                    table = dict(np.load(os.path.join(out_dir, entry['path'])))
+                # 구간 순서대로 이어 붙였으므로 시간 순서 유지
+                assert np.allclose(table["timestamp"], [t for t, _ in source], atol=1e-6)
+                for name, values in expected.items():
+                    assert np.allclose(table[name], values), (message.name, name)
+
+
+if __name__ == "__main__":
+    test_signal_extractors()
+    test_bulk_decode_outputs()
+    print("\n=== 테스트 완료 ===")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+일괄 수신기 테스트 스크립트
+Virtual CAN 버스에서 대기 프레임이 배치 단위로 모두 드레인되는지, notifier 버퍼가 크기 제한을 넘으면
+오래된 프레임을 버리고 집계하는지, 배치 안의 잘못된 프레임이 나머지 처리를 막지 않는지 확인
+"""
+
+import time
+import can
+from bus_receiver import BatchReceiver
+from tsmaster_can_processor import MessageStatus, TSMasterCanProcessor
+
+
+def _drain_all(receiver, expected):
+    received = []
+    while len(received) < expected:
+        count = receiver.drain(timeout=0.5)
+        if count == 0:
+            break
+        received.extend(receiver.batch[:count])
+    return received
+
+
+def test_batch_drain():
+    """native/notifier 모드 일괄 드레인 테스트"""
+    print("=== 일괄 수신 드레인 테스트 ===")
+    for mode in ("native", "notifier"):
+        channel = f"batch_drain_{mode}"
+        tx = can.interface.Bus(channel=channel, interface='virtual')
+        rx = can.interface.Bus(channel=channel, interface='virtual')
+        receiver = BatchReceiver(rx, batch_size=256, mode=mode)
+        try:
+            total = 2000
+            for i in range(total):
+                tx.send(can.Message(arbitration_id=0x200 + (i % 10), data=i.to_bytes(4, 'little'),
+                                    is_extended_id=False))
+            received = _drain_all(receiver, total)
+            stats = receiver.get_stats()
+            print(f"[{mode}] 수신: {len(received)}, 통계: {stats}")
+            assert len(received) == total
+            assert [int.from_bytes(m.data, 'little') for m in received] == list(range(total))
+            assert stats['max_batch'] <= 256
+            assert stats['batches'] < total  # 프레임마다 깨어나지 않음
+        finally:
+            receiver.stop()
+            tx.shutdown()
+            rx.shutdown()
+
+
+def test_bounded_notifier_buffer():
+    """notifier 버퍼가 가득 차면 가장 오래된 프레임을 버리고 집계"""
+    tx = can.interface.Bus(channel="batch_bounded", interface='virtual')
+    rx = can.interface.Bus(channel="batch_bounded", interface='virtual')
+    receiver = BatchReceiver(rx, batch_size=512, mode="notifier", buffer_frames=100)
+    try:
+        for i in range(300):
+            tx.send(can.Message(arbitration_id=0x200, data=i.to_bytes(4, 'little'), is_extended_id=False))
+        deadline = time.monotonic() + 5.0
+        while receiver.reader.dropped < 200 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        received = _drain_all(receiver, 300)
+        stats = receiver.get_stats()
+        print(f"버퍼 100프레임: 수신 {len(received)}, 버림 {stats['dropped']}")
+        assert len(received) == 100 and stats['dropped'] == 200
+        assert [int.from_bytes(m.data, 'little') for m in received] == list(range(200, 300))
+    finally:
+        receiver.stop()
+        tx.shutdown()
+        rx.shutdown()
+
+
+class BrokenFrame:
+    """data 접근 시 예외가 나는 프레임"""
+    arbitration_id = 100
+    timestamp = 1.0
+
+    @property
+    def data(self):
+        raise RuntimeError("corrupt frame")
+
+
+def test_batch_isolates_errors():
+    """배치 안 한 프레임의 예외는 해당 프레임만 ERROR로 표시"""
+    processor = TSMasterCanProcessor("candb_ex.dbc")
+    good = can.Message(arbitration_id=100, data=bytes(8), is_extended_id=False, timestamp=1.0)
+    batch = [good, BrokenFrame(), good]
+    processed = processor.process_messages(batch)
+    print(f"배치 처리 결과: {[m.status.value for m in processed]}")
+    assert [m.status for m in processed] == [MessageStatus.VALID, MessageStatus.ERROR, MessageStatus.VALID]
+    assert processed[1].message_id == 100 and "corrupt frame" in processed[1].error_message
+    assert processor.stats['processing_errors'] == 1
+
+
+if __name__ == "__main__":
+    test_batch_drain()
+    test_bounded_notifier_buffer()
+    test_batch_isolates_errors()
+    print("\n=== 테스트 완료 ===")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+GUI 없는 수집 엔진 테스트 스크립트
+Qt 없이 import/실행되는지, 재생 프레임이 처리 핸들러/최신값 저장소/시계열/로그로 반영되는지,
+헤드리스 CLI가 재생 + 로깅 후 종료되는지 확인
+"""
+
+import csv
+import glob
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from can_engine import CanEngine, main
+from test_log_replay import _write_candump
+
+
+def test_no_qt_import():
+    """엔진 모듈은 PyQt5를 불러오지 않음 (디스플레이 없는 서버용)"""
+    code = "import sys, can_engine; print('PyQt5' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "False"
+
+
+def test_replay_into_engine():
+    """재생 -> 엔진 수신 경로 (핸들러, 최신값, 시계열, 이벤트 로그, 상태 알림)"""
+    print("=== 엔진 재생 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "drive.log")
+        _write_candump(path, 2.0)
+        engine = CanEngine("candb_ex.dbc")
+        engine.signal_series.track_all = True
+        engine.track_radar = True  # 레이더 화면 없이도 레이더 상태 갱신
+        events = []
+        engine.subscribe(lambda event, info: events.append(event))
+        speeds = []
+        engine.register_processing_handler(lambda ch, msg, sig, value, ts: sig == "VehicleSpeed",
+                                           lambda ch, msg, sig, value, ts: speeds.append((ch, value)))
+
+        started = time.perf_counter()
+        assert engine.start_replay(path, speed=None) is not None
+        assert engine.start_logging("Event", directory=tmp) is not None
+        while engine.poll_replay():
+            time.sleep(0.01)
+        engine.end_logging(wait=True)
+        elapsed = time.perf_counter() - started
+        stats = engine.get_statistics()
+        print(f"CH1 {stats['CH1']['total_messages']}프레임, CH2 {stats['CH2']['total_messages']}프레임 "
+              f"({elapsed:.2f}s), 알림: {events}")
+
+        assert stats['CH1']['total_messages'] == 600 and stats['CH2']['total_messages'] == 2000
+        assert len(speeds) == 200 and speeds[-1] == ("CH1", 1.99)  # tick 199 * 0.01
+        assert engine.latest_values[("CH2", "RelPosX10")][0] == -1000.0
+        assert engine.radar_manager.get_object_by_id(10) is not None
+        assert engine.radar_manager.get_object_by_id(10).rel_pos_x == -1000.0
+        slot = engine.message_buffer.registry.find("CH1", "VehicleStatus", "VehicleSpeed", "km/h")
+        assert engine.latest_store.get(slot)[1] == 1.99
+        assert len(engine.signal_series.tail(slot, 1000)) == 200
+        assert events == ["receive_started", "replay_started", "logging_started", "replay_stopped", "logging_ended"]
+
+        log_files = glob.glob(os.path.join(tmp, "*_can_log.csv"))
+        with open(log_files[0], newline="") as file:
+            rows = list(csv.reader(file))
+        assert len(rows) > 1 and "VehicleSpeed" in rows[0]
+        engine.shutdown()
+
+
+def test_headless_cli():
+    """CLI: 최대 속도 재생 + 원시 프레임 기록 후 재생 끝에서 종료"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "drive.log")
+        _write_candump(path, 1.0)
+        code = main(["--dbc", "candb_ex.dbc", "--replay", path, "--speed", "max",
+                     "--log", "Raw frames", "--log-dir", tmp, "--stats-interval", "0"])
+        assert code == 0
+        recordings = glob.glob(os.path.join(tmp, "*_can_rec.canrec"))
+        assert len(recordings) == 1 and os.path.getsize(recordings[0]) > 0
+
+
+if __name__ == "__main__":
+    test_no_qt_import()
+    test_replay_into_engine()
+    test_headless_cli()
+    print("\n=== 테스트 완료 ===")
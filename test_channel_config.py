@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+채널 설정 레지스트리 테스트 스크립트
+JSON 설정 저장/불러오기, 채널별 연결 후보, 채널 수 제한 없는 엔진(채널별 DBC/수신 스레드/통계),
+재생 채널 라벨 배정을 확인
+"""
+
+import json
+import os
+import tempfile
+import time
+import can
+from can_engine import CanEngine
+from channel_config import INTERFACE_CANDIDATES, ChannelConfig, ChannelRegistry
+from log_replay import LogReplayer
+
+
+def test_registry_roundtrip():
+    """JSON 저장 -> 불러오기 (기본값 생략, 순서 유지, 중복 라벨 거부)"""
+    print("=== 채널 설정 저장/불러오기 테스트 ===")
+    registry = ChannelRegistry([
+        ChannelConfig("PT", interface="vector", channel="0", fd=True, dbc="powertrain.dbc"),
+        ChannelConfig("RADAR", interface="vector", channel="1", fd=True, data_bitrate=5000000),
+        ChannelConfig("CH3"),
+    ])
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "channels.json")
+        registry.save(path)
+        with open(path, encoding="utf-8") as file:
+            saved = json.load(file)
+        print(saved)
+        assert saved["channels"][2] == {"label": "CH3"}
+        loaded = ChannelRegistry.load(path)
+    assert loaded.labels == ("PT", "RADAR", "CH3")
+    assert loaded["RADAR"].data_bitrate == 5000000 and loaded["PT"].dbc == "powertrain.dbc"
+
+    # 인터페이스 지정 시 그 후보만, 생략 시 채널별 우선 후보 + 공통 후보
+    assert loaded["PT"].candidates() == [("vector", "0", True)]
+    assert loaded["RADAR"].bus_kwargs(True) == {"bitrate": 500000, "fd": True, "data_bitrate": 5000000}
+    assert ChannelConfig("CH1").candidates()[:2] == [("vector", "3", True), ("vector", "3", False)]
+    assert loaded["CH3"].candidates() == INTERFACE_CANDIDATES
+    try:
+        loaded.add(ChannelConfig("PT"))
+        assert False, "중복 라벨 허용됨"
+    except ValueError:
+        pass
+    assert ChannelRegistry.coerce(["CH1", ChannelConfig("X", interface="virtual")]).labels == ("CH1", "X")
+
+
+def test_six_virtual_channels():
+    """CAN FD 버스 6개를 한 엔진에서 수신 (채널별 수신 스레드/통계/DBC)"""
+    print("=== 6채널 수신 테스트 ===")
+    labels = [f"BUS{i}" for i in range(6)]
+    configs = [ChannelConfig(label, interface="virtual", channel=f"test_six_{label}", fd=True) for label in labels]
+    configs[5].dbc = "candb_ex.dbc"
+    engine = CanEngine("candb_ex.dbc", channels=configs, cipv_pipeline=False)
+    senders = [can.interface.Bus(channel=config.channel, interface="virtual") for config in configs]
+    try:
+        assert engine.channels == tuple(labels)
+        for label in labels:
+            assert engine.connect(label)
+        engine.start_listeners()
+        assert engine.start_receiving()
+        for index, sender in enumerate(senders):
+            for tick in range(10 * (index + 1)):
+                sender.send(can.Message(arbitration_id=100, data=bytes([tick, 0, 0, 0, 0, 0, 0, 0]),
+                                        is_extended_id=False))
+        deadline = time.monotonic() + 10.0
+        expected = {label: 10 * (index + 1) for index, label in enumerate(labels)}
+        while time.monotonic() < deadline:
+            status = engine.get_channel_status()
+            if all(status[label]['total_messages'] == count for label, count in expected.items()):
+                break
+            time.sleep(0.05)
+        status = engine.get_channel_status()
+        for label in labels:
+            print(label, status[label])
+        assert all(status[label]['total_messages'] == expected[label] for label in labels)
+        assert all(status[label]['connected'] and status[label]['interface'] == "virtual" for label in labels)
+        assert status["BUS5"]['dbc'] == "candb_ex.dbc"
+        # 채널별 수신 스레드
+        assert sorted(engine._listener_threads) == sorted(labels)
+        # 신호 슬롯은 채널 라벨별로 분리
+        registry = engine.message_buffer.registry
+        assert {key[0] for key in registry.keys} == set(labels)
+        # 설정에 virtual을 직접 지정했으므로 더미 데이터 시뮬레이션은 시작하지 않음
+        assert not engine.dummy_simulation_active
+    finally:
+        engine.shutdown()
+        for sender in senders:
+            sender.shutdown()
+
+
+def test_replay_labels():
+    """재생 채널 배정: 같은 이름은 그대로, 나머지는 남은 라벨에 등장 순서대로 (남는 채널은 건너뜀)"""
+    replayer = LogReplayer.__new__(LogReplayer)
+    replayer.channel_map = {}
+    replayer.labels = ("PT", "RADAR", "CH3")
+    assert [replayer._label(name) for name in ("can0", "RADAR", "can2", "can3")] == ["PT", "RADAR", "CH3", None]
+    # 기본 라벨 (기존 동작)
+    replayer.channel_map = {}
+    replayer.labels = ("CH1", "CH2")
+    assert [replayer._label(name) for name in ("can0", "CH1", "can1")] == ["CH1", "CH2", None]
+
+
+if __name__ == "__main__":
+    test_registry_roundtrip()
+    test_six_virtual_channels()
+    test_replay_labels()
+    print("\n=== 테스트 완료 ===")
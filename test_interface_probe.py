@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+인터페이스 동시 탐색/연결 캐시 테스트 스크립트
+후보를 동시에 열어 전체 탐색 시간이 가장 느린 후보 수준인지, 우선순위가 높은 후보가 채택되는지,
+응답 없는 드라이버는 시간 초과 후 늦게 열린 버스까지 닫히는지, 캐시 설정으로 바로 연결하고
+실패 시 탐색으로 넘어가는지 확인
+"""
+
+import os
+import tempfile
+import threading
+import time
+from can_engine import CanEngine
+from channel_config import ChannelConfig
+from interface_probe import InterfaceCache, probe_interfaces
+
+
+class FakeBus:
+    def __init__(self, candidate):
+        self.candidate = candidate
+        self.closed = False
+
+    def shutdown(self):
+        self.closed = True
+
+
+class FakeDrivers:
+    """후보별 (지연 시간, 성공 여부) 시뮬레이션, 같은 장치 동시 열기 감지"""
+
+    def __init__(self, behavior):
+        self.behavior = behavior
+        self.buses = []
+        self.open_devices = set()
+        self.conflicts = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, candidate):
+        delay, ok = self.behavior[candidate]
+        with self.lock:
+            if candidate[:2] in self.open_devices:
+                self.conflicts += 1
+            self.open_devices.add(candidate[:2])
+        time.sleep(delay)
+        with self.lock:
+            self.open_devices.discard(candidate[:2])
+        if not ok:
+            raise OSError(f"{candidate} 없음")
+        bus = FakeBus(candidate)
+        with self.lock:
+            self.buses.append(bus)
+        return bus
+
+
+def test_parallel_priority():
+    """실패 후보 대기 시간이 누적되지 않고, 느려도 우선순위가 높은 성공 후보를 채택"""
+    print("=== 동시 탐색 테스트 ===")
+    candidates = [("vector", "3", True), ("vector", "3", False), ("ixxat", "0", True),
+                  ("pcan", "PCAN_USBBUS1", False), ("socketcan", "can0", False)]
+    drivers = FakeDrivers({
+        ("vector", "3", True): (0.3, False),
+        ("vector", "3", False): (0.3, False),
+        ("ixxat", "0", True): (0.4, False),
+        ("pcan", "PCAN_USBBUS1", False): (0.5, True),
+        ("socketcan", "can0", False): (0.05, True),
+    })
+    result = probe_interfaces(candidates, drivers, timeout=2.0)
+    print(f"채택: {result.candidate}, {result.elapsed * 1000:.0f}ms, 실패: {list(result.errors)}")
+    assert result.candidate == ("pcan", "PCAN_USBBUS1", False) and result.bus.candidate == result.candidate
+    # 순차 시도였다면 0.3 + 0.3 + 0.4 + 0.5 = 1.5초
+    assert result.elapsed < 0.9
+    assert len(result.errors) == 3 and drivers.conflicts == 0
+    # 채택되지 않은 버스는 닫힘
+    others = [bus for bus in drivers.buses if bus is not result.bus]
+    assert others and all(bus.closed for bus in others) and not result.bus.closed
+
+
+def test_probe_timeout():
+    """응답 없는 드라이버는 시간 초과로 건너뛰고, 늦게 열린 버스는 닫힘"""
+    candidates = [("vector", "0", True), ("vector", "0", False), ("socketcan", "can0", False)]
+    drivers = FakeDrivers({
+        ("vector", "0", True): (1.0, True),
+        ("vector", "0", False): (0.0, True),
+        ("socketcan", "can0", False): (0.1, True),
+    })
+    result = probe_interfaces(candidates, drivers, timeout=0.3)
+    print(f"채택: {result.candidate}, {result.elapsed * 1000:.0f}ms, 실패: {result.errors}")
+    assert result.candidate == ("socketcan", "can0", False)
+    assert result.errors[("vector", "0", True)].startswith("timeout")
+    assert result.errors[("vector", "0", False)] == "skipped"
+    assert result.elapsed < 0.6
+    time.sleep(1.0)
+    late = [bus for bus in drivers.buses if bus.candidate == ("vector", "0", True)]
+    assert len(late) == 1 and late[0].closed
+
+    # 모두 실패
+    drivers = FakeDrivers({("pcan", "x", False): (0.0, False)})
+    result = probe_interfaces([("pcan", "x", False)], drivers)
+    assert result.bus is None and result.candidate is None and "없음" in result.errors[("pcan", "x", False)]
+
+
+def test_engine_cache():
+    """캐시 설정으로 바로 연결, 캐시가 맞지 않으면 탐색으로 연결, 캐시 저장/삭제"""
+    print("=== 연결 캐시 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.json")
+        cache = InterfaceCache(path)
+        cache.store("CH1", ("virtual", "probe_cached", False), 0.5)
+        assert InterfaceCache(path).get("CH1") == ("virtual", "probe_cached", False)
+
+        engine = CanEngine("candb_ex.dbc", channels=[ChannelConfig("CH1")], cipv_pipeline=False,
+                           interface_cache_path=path)
+        events = []
+        engine.subscribe(lambda event, info: events.append((event, info)))
+        candidates = [("no_such_interface", "0", True), ("virtual", "probe_cached", False)]
+        try:
+            assert engine.connect("CH1", candidates)
+            info = events[-1][1]
+            print(f"캐시 연결: {info}")
+            assert info["source"] == "cache" and info["bus_channel"] == "probe_cached"
+            assert engine.get_channel_status()["CH1"]["connect_source"] == "cache"
+            engine.disconnect("CH1")
+
+            # 캐시 설정이 후보에 없으면(설정 변경) 탐색
+            assert engine.connect("CH1", [("no_such_interface", "0", True), ("virtual", "probe_other", False)])
+            info = events[-1][1]
+            assert info["source"] == "probe" and info["bus_channel"] == "probe_other"
+            assert info["connect_time"] < 2.0
+            # Virtual CAN 탐색 결과는 캐시하지 않음
+            assert InterfaceCache(path).get("CH1") == ("virtual", "probe_cached", False)
+            engine.disconnect("CH1")
+        finally:
+            engine.shutdown()
+        cache.forget("CH1")
+        assert InterfaceCache(path).get("CH1") is None
+
+
+if __name__ == "__main__":
+    test_parallel_priority()
+    test_probe_timeout()
+    test_engine_cache()
+    print("\n=== 테스트 완료 ===")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+지연시간 히스토그램 테스트 스크립트
+백분위 정확도, 채널 병합, 롤링 윈도우 만료를 확인
+"""
+
+import random
+from latency_histogram import LatencyHistogram, RollingLatencyHistogram
+
+
+def test_latency_percentiles():
+    """백분위 정확도 테스트 (상대 오차 1/16 이내)"""
+    print("=== 지연시간 백분위 테스트 ===")
+    hist = LatencyHistogram()
+    values_us = [random.randint(10, 200_000) for _ in range(20000)]
+    for v in values_us:
+        hist.record_us(v)
+
+    values_us.sort()
+    for p in (50, 90, 99, 99.9):
+        exact = values_us[max(0, int(round(len(values_us) * p / 100.0)) - 1)]
+        approx = hist.percentile_us(p)
+        print(f"p{p}: 정확값={exact}us, 히스토그램={approx}us")
+        assert abs(approx - exact) <= exact / 16 + 1
+
+    snapshot = hist.snapshot()
+    print(f"요약: {snapshot}")
+    assert snapshot['count'] == len(values_us)
+    assert snapshot['max'] == values_us[-1] / 1_000_000
+
+
+def test_latency_merge():
+    """채널별 히스토그램 병합 테스트"""
+    print("\n=== 히스토그램 병합 테스트 ===")
+    ch1 = LatencyHistogram()
+    ch2 = LatencyHistogram()
+    for _ in range(1000):
+        ch1.record(0.0001)
+    ch2.record(0.05)
+
+    merged = LatencyHistogram.merged([ch1, ch2])
+    print(f"병합 결과: {merged.snapshot()}")
+    assert merged.total_count == 1001
+    assert merged.max_us == 50000
+    assert ch1.total_count == 1000  # 원본은 변경되지 않음
+
+
+def test_rolling_window():
+    """롤링 윈도우 만료 테스트"""
+    print("\n=== 롤링 윈도우 테스트 ===")
+    rolling = RollingLatencyHistogram(window_seconds=10.0, slot_count=5)
+    rolling.record(0.5, now=100.0)  # 오래된 스톨
+    for i in range(100):
+        rolling.record(0.001, now=105.0 + i * 0.01)
+
+    in_window = rolling.snapshot(now=106.0)
+    expired = rolling.snapshot(now=112.0)
+    print(f"윈도우 내: max={in_window['max']*1000:.1f}ms, 만료 후: max={expired['max']*1000:.1f}ms")
+    assert in_window['max'] == 0.5
+    assert expired['count'] == 100
+    assert expired['max'] < 0.5
+    # 누적 개수/합은 윈도우가 지나도 줄지 않음
+    assert rolling.total_count == 101 and rolling.total_sum_us == 500_000 + 100 * 1000
+
+
+if __name__ == "__main__":
+    test_latency_percentiles()
+    test_latency_merge()
+    test_rolling_window()
+    print("\n=== 테스트 완료 ===")
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+최신값 저장소 테스트 스크립트
+수신 시점 갱신, dirty 추적, 고정 표시 슬롯, 중복 제거 표시 갱신이 바뀐 행만 알리는지 확인
+"""
+
+import os
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import random
+from types import SimpleNamespace
+from PyQt5 import QtCore
+from can_interface import CanDataViewer
+from message_ring import SignalSlotRegistry
+from latest_value_store import LatestValueStore
+from signal_filter import CompiledSignalFilter
+from signal_table_model import SignalTableModel
+from message_ring import MessageRingBuffer
+
+app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+def test_latest_values_and_dirty():
+    """최신값/dirty 슬롯 테스트"""
+    print("=== 최신값 저장소 테스트 ===")
+    registry = SignalSlotRegistry()
+    store = LatestValueStore(registry)
+    speed = registry.slot("CH1", "VehicleStatus", "Speed", "km/h", 100, integer=True)
+    accel = registry.slot("CH1", "VehicleAccel", "AccelX", "m/s^2", 101)
+    pinned_only = registry.slot("CH2", "LaneInfo", "LaneType", "", 102)
+    store.pin(pinned_only)
+
+    store.update_frame(0.1, [speed, accel], [10.0, 0.5], [None, None])
+    store.update(speed, 0.2, 12.0)
+    assert store.take_dirty() == {speed, accel}
+    assert store.take_dirty() == set()
+    assert store.received_slots() == [speed, accel]
+    assert store.row_tuple(speed) == (0.2, "CH1", "VehicleStatus", "Speed", "12", "km/h")
+    assert store.row_tuple(pinned_only) == ("", "CH2", "LaneInfo", "LaneType", "", "")
+    assert store.pinned_slots() == [pinned_only]
+
+
+def test_collapsed_refresh_touches_dirty_rows():
+    """3000개 신호 중복 제거 표시: 행 구성이 그대로면 재구성 없이 바뀐 슬롯의 행만 dataChanged로 알림"""
+    ring = MessageRingBuffer(capacity=1000)
+    store = LatestValueStore(ring.registry)
+    model = SignalTableModel(ring)
+    slots = [ring.registry.slot("CH1", f"Msg{i // 8}", f"Sig{i}", "", i // 8) for i in range(3000)]
+    for slot in slots:
+        store.update(slot, 0.0, 0.0)
+    # 뷰어의 표시 갱신 경로(_refresh_latest_view)를 위젯 없이 실행
+    combo = SimpleNamespace(currentText=lambda: "All")
+    viewer = SimpleNamespace(latest_store=store, table_model=model, message_buffer=ring, view_channel=combo,
+                             signal_filter=CompiledSignalFilter(), filter_active=False, sort_by_name=False,
+                             sort_reverse=False, _latest_layout_key=None)
+    CanDataViewer._refresh_latest_view(viewer, False)
+    assert model.rowCount() == 3000
+
+    events = []
+    model.dataChanged.connect(lambda tl, br, roles: events.extend(range(tl.row(), br.row() + 1)))
+    for signal in (model.layoutChanged, model.modelReset, model.rowsInserted, model.rowsRemoved):
+        signal.connect(lambda *args: events.append("layout"))
+    rng = random.Random(34)
+    for tick in range(1, 51):
+        dirty = rng.sample(range(3000), 10)
+        for row in dirty:
+            store.update(slots[row], tick * 0.1, float(tick))
+        events.clear()
+        CanDataViewer._refresh_latest_view(viewer, False)
+        assert sorted(events) == sorted(dirty), (tick, events)
+        assert model.index(dirty[0], 4).data() == f"{float(tick)}"
+    # 바뀐 값이 없으면 알림 없음
+    events.clear()
+    CanDataViewer._refresh_latest_view(viewer, False)
+    assert events == []
+    print("3000개 신호 중 tick마다 바뀐 10행만 알림 (재구성 없음)")
+
+if __name__ == "__main__":
+    test_latest_values_and_dirty()
+    test_collapsed_refresh_touches_dirty_rows()
+    print("\n=== 테스트 완료 ===")
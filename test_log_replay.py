@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+로그 재생 엔진 테스트 스크립트
+최대 속도 재생(TSMaster 처리기 주입), 배속 재생 시간, 일시정지/탐색/반복, 반복/탐색 후 가상 수신 시각 연속성,
+BLF 재생을 확인
+"""
+
+import os
+import tempfile
+import threading
+import time
+import can
+from log_replay import LogReplayer, open_replay_source, processor_sink
+from tsmaster_can_processor import TSMasterCanProcessor
+
+
+def _write_candump(path, seconds, period=0.01):
+    """CH1(can0): 100/101/102, CH2(can1): 200~209 레이더 (period 주기)"""
+    with open(path, "w") as file:
+        for tick in range(int(seconds / period)):
+            t = 1700000000 + tick * period
+            file.write(f"({t:.6f}) can0 064#{tick % 256:02X}00000000000000\n")
+            for can_id in (101, 102):
+                file.write(f"({t:.6f}) can0 {can_id:03X}#0000000000000000\n")
+            for obj in range(200, 210):
+                file.write(f"({t + 0.001:.6f}) can1 {obj:03X}#0000000000000000\n")
+
+
+class Collector:
+    """주입된 배치 수집 싱크"""
+
+    def __init__(self):
+        self.frames = []
+        self.dequeue_times = []
+        self.lock = threading.Lock()
+
+    def __call__(self, messages, count, channel_label, dequeue_time):
+        with self.lock:
+            self.dequeue_times.append((channel_label, dequeue_time))
+            self.frames.extend((channel_label, msg.timestamp, msg.arbitration_id) for msg in messages[:count])
+
+    def __len__(self):
+        with self.lock:
+            return len(self.frames)
+
+    def monotonic(self) -> bool:
+        """채널별 가상 수신 시각이 되돌아가지 않는지"""
+        for label in {label for label, _ in self.dequeue_times}:
+            times = [t for l, t in self.dequeue_times if l == label]
+            if times != sorted(times):
+                return False
+        return True
+
+
+def _wait_until(condition, timeout=10.0):
+    deadline = time.perf_counter() + timeout
+    while not condition() and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_max_speed_into_processor():
+    """최대 속도 재생 -> TSMaster 처리기 디코딩"""
+    print("=== 최대 속도 재생 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "drive.log")
+        _write_candump(path, 10.0)
+        processors = {"CH1": TSMasterCanProcessor("candb_ex.dbc"), "CH2": TSMasterCanProcessor("candb_ex.dbc")}
+        decoded = {"CH1": 0, "CH2": 0}
+
+        def handler(label, processed):
+            decoded[label] += len(processed)
+
+        source = open_replay_source(path)
+        replayer = LogReplayer(source, processor_sink(processors, handler), speed=None, batch_size=512)
+        replayer.start()
+        assert _wait_until(lambda: not replayer.running, 60)
+        stats = replayer.get_stats()
+        print(f"재생 {stats['frames']}프레임, {stats['batches']}배치, {stats['frames_per_sec']:.0f} frames/s, "
+              f"채널 매핑 {replayer.channel_map}")
+        assert stats['frames'] == 13000 and decoded == {"CH1": 3000, "CH2": 10000}
+        assert replayer.channel_map == {"can0": "CH1", "can1": "CH2"}
+        source.close()
+
+
+def test_scaled_timing_pause_seek_loop():
+    """배속 재생 시간 및 일시정지/탐색/반복 테스트"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "drive.log")
+        _write_candump(path, 2.0)
+        source = open_replay_source(path)
+        start = source.time_range[0]
+
+        # 2초 기록을 10배속 -> 약 0.2초
+        sink = Collector()
+        replayer = LogReplayer(source, sink, speed=10.0)
+        started = time.perf_counter()
+        replayer.start()
+        assert _wait_until(lambda: not replayer.running)
+        wall = time.perf_counter() - started
+        print(f"10배속 재생 시간: {wall:.3f}s (기록 2.0s)")
+        assert 0.15 < wall < 0.6 and len(sink) == 2600
+        assert [f[1] for f in sink.frames if f[0] == "CH1"] == sorted(f[1] for f in sink.frames if f[0] == "CH1")
+
+        # 일시정지 중에는 주입 없음, 탐색 후 해당 시각부터 재개
+        sink = Collector()
+        replayer = LogReplayer(source, sink, speed=1.0)
+        replayer.start()
+        assert _wait_until(lambda: len(sink) > 50)
+        replayer.pause()
+        time.sleep(0.05)
+        paused_count = len(sink)
+        time.sleep(0.2)
+        assert len(sink) == paused_count
+        replayer.seek(start + 1.5)
+        replayer.resume()
+        assert _wait_until(lambda: len(sink) > paused_count)
+        resumed = sink.frames[paused_count]
+        print(f"일시정지 {paused_count}프레임에서 정지, 탐색 후 첫 프레임 {resumed[1] - start:.3f}s")
+        assert resumed[1] >= start + 1.5
+        # 뒤로 탐색해도 가상 수신 시각은 되돌아가지 않음
+        seek_count = len(sink)
+        replayer.seek(start + 0.2)
+        assert _wait_until(lambda: any(f[1] < start + 1.0 for f in sink.frames[seek_count:]))
+        replayer.stop()
+        assert sink.monotonic()
+
+        # 최대 속도 반복 재생
+        sink = Collector()
+        replayer = LogReplayer(source, sink, speed=None, loop=True)
+        replayer.start()
+        assert _wait_until(lambda: replayer.laps >= 2)
+        replayer.stop()
+        assert not replayer.running and len(sink) >= 2 * 2600
+        assert sink.monotonic()
+        source.close()
+
+
+def test_blf_replay():
+    """python-can BLF 기록 재생"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "drive.blf")
+        writer = can.BLFWriter(path)
+        for i in range(500):
+            writer.on_message_received(can.Message(timestamp=1000.0 + i * 0.001, arbitration_id=100 + i % 3,
+                                                   data=bytes(8), channel=1))
+        writer.stop()
+        sink = Collector()
+        source = open_replay_source(path)
+        replayer = LogReplayer(source, sink, speed=None)
+        replayer.start()
+        assert _wait_until(lambda: not replayer.running)
+        print(f"BLF 재생: {len(sink)}프레임, 채널 매핑 {replayer.channel_map}")
+        assert len(sink) == 500 and {f[0] for f in sink.frames} == {"CH1"}
+
+
+def test_extra_log_channels():
+    """수신 채널보다 기록 채널이 많으면 남는 채널은 다른 채널에 섞지 않고 건너뜀 (channel_map으로 배정 가능)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "three.log")
+        with open(path, "w") as file:
+            for tick in range(30):
+                file.write(f"({1000 + tick * 0.01:.6f}) can{tick % 3} 064#0000000000000000\n")
+        sink = Collector()
+        source = open_replay_source(path)
+        replayer = LogReplayer(source, sink, speed=None, labels=["CH1", "CH2"])
+        replayer.start()
+        assert _wait_until(lambda: not replayer.running)
+        source.close()
+        print(f"채널 매핑: {replayer.channel_map}, 건너뜀: {replayer.skipped_frames}")
+        assert replayer.channel_map == {"can0": "CH1", "can1": "CH2", "can2": None}
+        assert len(sink) == 20 and replayer.skipped_frames == 10
+        assert replayer.get_stats()['skipped'] == 10
+
+        # channel_map으로 지정하면 남는 채널도 지정한 라벨로 재생
+        sink = Collector()
+        source = open_replay_source(path)
+        replayer = LogReplayer(source, sink, speed=None, labels=["CH1", "CH2"],
+                               channel_map={"can0": "CH1", "can1": "CH2", "can2": "CH2"})
+        replayer.start()
+        assert _wait_until(lambda: not replayer.running)
+        source.close()
+        assert len(sink) == 30 and replayer.skipped_frames == 0
+
+if __name__ == "__main__":
+    test_max_speed_into_processor()
+    test_scaled_timing_pause_seek_loop()
+    test_blf_replay()
+    test_extra_log_channels()
+    print("\n=== 테스트 완료 ===")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+메시지 링 버퍼 테스트 스크립트
+용량 초과 시 덮어쓰기, 최신 구간 뷰, 표시 행 변환, 동시 기록을 확인
+"""
+
+import threading
+from message_ring import MessageRingBuffer, encode_value
+
+
+def test_ring_wraparound():
+    """용량 초과 후 최신 행만 남는지 테스트"""
+    print("=== 링 버퍼 덮어쓰기 테스트 ===")
+    ring = MessageRingBuffer(capacity=100)
+    ch = ring.registry.channel_id("CH1")
+    slot = ring.registry.slot("CH1", "VehicleStatus", "Speed", "km/h", 100, integer=True)
+    for i in range(250):
+        ring.append(float(i), ch, 100, slot, float(i))
+
+    assert len(ring) == 100
+    views = ring.views(60)
+    assert len(views) == 2  # 물리 배열 끝에서 감기는 구간
+    values = [v for view in views for v in view.value.tolist()]
+    assert values == [float(i) for i in range(190, 250)]
+    assert views[0].value.base is ring.values  # 복사 없는 뷰
+
+    rows = ring.tail_rows(3)
+    print(f"최근 3행: {rows}")
+    assert rows[-1] == (249.0, "CH1", "VehicleStatus", "Speed", "249", "km/h")
+    assert ring.physical_index(0, 60) == 190 % 100
+
+
+def test_text_and_error_rows():
+    """열거형/오류 행 표시 테스트"""
+    ring = MessageRingBuffer(capacity=10)
+    ch = ring.registry.channel_id("CH2")
+    slot = ring.registry.slot("CH2", "LaneInfo", "LaneType", "", 102)
+    number, text = encode_value("Dashed")
+    ring.append(1.0, ch, 102, slot, number, text)
+    err_slot = ring.registry.slot("CH2", "Unknown", "ERROR", "", 0x7FF)
+    ring.append(2.0, ch, 0x7FF, err_slot, float('nan'), ("ERROR: bad frame", "DLC:3, Retry:0"))
+    rows = ring.tail_rows()
+    assert rows[0][4] == "Dashed"
+    assert rows[1][3:5] == ("ERROR: bad frame", "DLC:3, Retry:0")
+
+
+def test_concurrent_writers():
+    """두 수신 스레드 동시 기록 시 행 유실이 없는지 테스트"""
+    ring = MessageRingBuffer(capacity=50000)
+    slots = {ch: ring.registry.slot(ch, "VehicleAccel", "AccelX", "m/s^2", 101) for ch in ("CH1", "CH2")}
+
+    def writer(ch):
+        ch_id = ring.registry.channel_id(ch)
+        for i in range(10000):
+            ring.append_frame(float(i), ch_id, 101, [slots[ch]] * 2, [1.0, 2.0], [None, None])
+
+    threads = [threading.Thread(target=writer, args=(ch,)) for ch in slots]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert ring.total == 40000
+    assert len(ring.tail_rows()) == 40000
+
+
+if __name__ == "__main__":
+    test_ring_wraparound()
+    test_text_and_error_rows()
+    test_concurrent_writers()
+    print("\n=== 테스트 완료 ===")
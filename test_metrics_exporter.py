@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+메트릭 엔드포인트 테스트 스크립트
+프로세서 카운터가 Prometheus 텍스트 포맷으로 노출되는지,
+지연 summary의 _sum/_count가 롤링 윈도우가 지나도 누적값으로 유지되는지 확인
+"""
+
+import time
+import can
+import urllib.request
+from latency_histogram import RollingLatencyHistogram
+from tsmaster_can_processor import TSMasterCanProcessor
+from metrics_exporter import MetricsExporter
+
+
+def test_metrics_exporter():
+    """메트릭 렌더링 및 HTTP 스크레이프 테스트"""
+    print("=== 메트릭 엔드포인트 테스트 ===")
+    processor = TSMasterCanProcessor("candb_ex.dbc")
+
+    for _ in range(5):
+        processor.process_message(can.Message(arbitration_id=200, data=bytes(8), is_extended_id=False))
+    # DLC 불일치 메시지 (4바이트)
+    processor.process_message(can.Message(arbitration_id=100, data=bytes(4), is_extended_id=False))
+
+    exporter = MetricsExporter(port=0)  # 임의 포트
+    exporter.register_processor("CH1", processor)
+    stale = RollingLatencyHistogram(window_seconds=10.0)
+    stale.record(0.002, now=time.perf_counter() - 60.0)  # 윈도우 밖 기록
+    stale.record(0.003, now=time.perf_counter())
+    exporter.register_latency("test_latency_seconds", "Test latency", stale)
+    assert exporter.start()
+    try:
+        url = f"http://127.0.0.1:{exporter.port}/metrics"
+        body = urllib.request.urlopen(url, timeout=2).read().decode("utf-8")
+        print(body)
+        assert 'can_frames_total{channel="CH1"} 6.0' in body
+        assert 'can_id_frames_total{channel="CH1",frame_id="0xC8",message="RadarObj1"} 5.0' in body
+        assert 'can_dlc_mismatches_total{channel="CH1",frame_id="0x64",message="VehicleStatus"} 1.0' in body
+        assert 'can_processing_latency_seconds_count{channel="CH1"} 6.0' in body
+        assert 'test_latency_seconds_count 2.0' in body and 'test_latency_seconds_sum 0.005' in body
+        assert 'test_latency_seconds{quantile="1"} 0.003' in body
+    finally:
+        exporter.stop()
+        processor.shutdown()
+
+
+if __name__ == "__main__":
+    test_metrics_exporter()
+    print("\n=== 테스트 완료 ===")
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+기록 파일 읽기 테스트 스크립트
+candump/ASC 사이드카 인덱스 생성·재사용·갱신, 시간/ID 범위 조회, python-can으로 쓴 로그와 10진 ASC,
+리모트 프레임 DLC, 네이티브 기록 mmap 조회를 확인
+"""
+
+import os
+import tempfile
+import time
+import can
+from recording_reader import open_recording
+from session_recording import SessionRecorder
+
+
+def _frames(count):
+    """10ms 주기 100~102, 50ms 주기 200~209 모의 트래픽"""
+    frames = []
+    for tick in range(count):
+        t = tick * 0.01
+        for offset, can_id in enumerate((0x100, 0x101, 0x102)):
+            frames.append((t + offset * 0.0001, can_id, bytes([tick % 256, offset, 0, 0, 0, 0, 0, 0])))
+        if tick % 5 == 0:
+            for obj in range(10):
+                frames.append((t + 0.001 + obj * 0.0001, 0x200 + obj, bytes([obj, tick % 256, 0x7F, 1])))
+    return frames
+
+
+def _write_candump(path, frames):
+    with open(path, "w") as file:
+        for t, can_id, data in frames:
+            file.write(f"({1700000000 + t:.6f}) can0 {can_id:03X}#{data.hex().upper()}\n")
+        file.write(f"({1700000000 + frames[-1][0] + 0.01:.6f}) can0 18FEF100#0102030405060708\n")
+
+
+def _write_asc(path, frames):
+    with open(path, "w") as file:
+        file.write("date Mon Oct 19 10:00:00.000 am 2026\nbase hex  timestamps absolute\n"
+                   "no internal events logged\nBegin Triggerblock Mon Oct 19 10:00:00.000 am 2026\n")
+        for t, can_id, data in frames:
+            payload = " ".join(f"{b:02X}" for b in data)
+            file.write(f"   {t:.6f} 1  {can_id:X}             Rx   d {len(data)} {payload}  Length = 0 BitCount = 0\n")
+        t = frames[-1][0] + 0.01
+        file.write(f"   {t:.6f} CANFD   2 Rx        300                                   1 0 f 64 "
+                   + " ".join(f"{b:02X}" for b in range(64)) + "  0    0      0        0 0 0 0 0\n")
+        file.write("End TriggerBlock\n")
+
+
+def _expected(frames, start, end, ids):
+    return [(t, can_id, data) for t, can_id, data in frames if start <= t <= end and can_id in ids]
+
+
+def test_text_logs():
+    """candump / ASC 인덱스 및 범위 조회 테스트"""
+    print("=== 텍스트 로그 인덱스 테스트 ===")
+    frames = _frames(20000)
+    radar = range(0x200, 0x20A)
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, writer, base in (("drive.log", _write_candump, 1700000000), ("drive.asc", _write_asc, 0)):
+            path = os.path.join(tmp, name)
+            writer(path, frames)
+
+            started = time.perf_counter()
+            with open_recording(path) as reader:
+                build_time = time.perf_counter() - started
+                assert not reader.loaded_from_sidecar and os.path.exists(reader.sidecar_path)
+                assert reader.frame_count == len(frames) + 1
+            started = time.perf_counter()
+            with open_recording(path) as reader:
+                load_time = time.perf_counter() - started
+                assert reader.loaded_from_sidecar
+                selected = list(reader.query(base + 120.0, base + 180.0, radar))
+                expected = _expected(frames, 120.0, 180.0, radar)
+                assert [(f.arbitration_id, bytes(f.data)) for f in selected] == [(i, d) for _, i, d in expected]
+                assert all(abs(f.timestamp - base - t) < 1e-6 for f, (t, _, _) in zip(selected, expected))
+                last = list(reader.frames(ids=[0x18FEF100, 0x300]))
+                assert len(last) == 1 and (last[0][1].is_extended_id or last[0][1].is_fd)
+                print(f"{reader.format}: {reader.frame_count}프레임, 인덱스 생성 {build_time*1000:.1f}ms, "
+                      f"사이드카 로드 {load_time*1000:.2f}ms, 구간 조회 {len(selected)}프레임, 채널 {reader.channels}")
+
+            # 원본이 바뀌면 인덱스 재생성
+            with open(path, "a") as file:
+                file.write("\n")
+            with open_recording(path) as reader:
+                assert not reader.loaded_from_sidecar
+
+
+def _messages():
+    return [
+        can.Message(timestamp=1.0, arbitration_id=0x123, data=bytes(range(8)), is_extended_id=False, channel=0),
+        can.Message(timestamp=1.1, arbitration_id=0x321, is_remote_frame=True, dlc=5, is_extended_id=False,
+                    channel=0),
+        can.Message(timestamp=1.2, arbitration_id=0x1234567, data=bytes(range(12)), is_fd=True,
+                    bitrate_switch=True, channel=0, is_rx=False),
+        can.Message(timestamp=1.3, arbitration_id=0x456, data=bytes([0xFF, 0, 0x10]), is_extended_id=False,
+                    channel=0),
+    ]
+
+
+def test_python_can_logs():
+    """python-can Logger로 쓴 candump/ASC (방향 토큰, 뒤따르는 숫자 필드), 10진 ASC, 리모트 프레임 DLC"""
+    print("=== python-can 로그 호환 테스트 ===")
+    messages = _messages()
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ("written.log", "written.asc"):
+            path = os.path.join(tmp, name)
+            logger = can.Logger(path)
+            for msg in messages:
+                logger.on_message_received(msg)
+            logger.stop()
+            with open_recording(path, use_sidecar=False) as reader:
+                read = [msg for _, msg in reader.frames()]
+            print(f"{name}: {[(hex(m.arbitration_id), m.dlc, bytes(m.data).hex()) for m in read]}")
+            assert [(m.arbitration_id, bytes(m.data), m.is_remote_frame, m.is_fd) for m in read] == \
+                [(m.arbitration_id, bytes(m.data), m.is_remote_frame, m.is_fd) for m in messages]
+            # python-can candump 기록은 리모트 프레임 DLC를 쓰지 않음 (123#R)
+            assert read[1].dlc == (5 if name.endswith(".asc") else 0)
+
+        # candump 리모트 DLC (123#R5), 10진 ASC (DLC/DataLength만큼만 데이터, 뒤 필드 무시)
+        path = os.path.join(tmp, "remote.log")
+        with open(path, "w") as file:
+            file.write("(1.000000) can0 321#R5 R\n(1.100000) can0 123#0102 T\n")
+        with open_recording(path, use_sidecar=False) as reader:
+            read = [msg for _, msg in reader.frames()]
+        assert read[0].is_remote_frame and read[0].dlc == 5 and bytes(read[1].data) == b"\x01\x02"
+
+        path = os.path.join(tmp, "decimal.asc")
+        with open(path, "w") as file:
+            file.write("date Mon Oct 19 10:00:00.000 am 2026\nbase dec  timestamps absolute\n"
+                       "Begin Triggerblock Mon Oct 19 10:00:00.000 am 2026\n"
+                       "   0.100000 1  291             Rx   d 3 255 0 16 12 34  Length = 0 BitCount = 64\n"
+                       "   0.200000 1  801             Rx   r 5\n"
+                       "   0.300000 CANFD   1 Rx        768   1 0 9 12 " + " ".join(str(b) for b in range(12))
+                       + "  0    0     3000        0 0 0 0 0\n"
+                       "End TriggerBlock\n")
+        with open_recording(path, use_sidecar=False) as reader:
+            read = [msg for _, msg in reader.frames()]
+            columns = reader.columns()
+        assert [(m.arbitration_id, bytes(m.data), m.dlc) for m in read] == \
+            [(291, bytes([255, 0, 16]), 3), (801, b"", 5), (768, bytes(range(12)), 12)]
+        assert read[1].is_remote_frame and columns.lengths.tolist() == [3, 0, 12]
+        assert bytes(columns.data[2, :12]) == bytes(range(12))
+
+
+def test_native_recording():
+    """네이티브 기록 mmap 조회 및 푸터 없는 파일 복구 테스트"""
+    frames = _frames(5000)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "drive.canrec")
+        recorder = SessionRecorder(path, compression="none", chunk_frames=1000)
+        recorder.start()
+        for t, can_id, data in frames:
+            recorder.record(can.Message(timestamp=t, arbitration_id=can_id, data=data), "CH1")
+        recorder.close(wait=True)
+
+        radar = range(0x200, 0x20A)
+        with open_recording(path) as reader:
+            selected = list(reader.query(20.0, 30.0, radar))
+            assert [bytes(f.data) for f in selected] == [d for _, _, d in _expected(frames, 20.0, 30.0, radar)]
+            # 무압축 청크의 데이터는 mmap을 그대로 가리킴
+            assert isinstance(selected[0].data, memoryview) and selected[0].data.readonly
+            del selected
+
+        # 푸터가 잘린 기록 (비정상 종료) -> 청크 헤더로 인덱스 복구
+        with open(path, "r+b") as file:
+            file.truncate(os.path.getsize(path) - 100)
+        with open_recording(path) as reader:
+            print(f"복구된 청크: {len(reader.index)}, 프레임: {reader.frame_count}")
+            assert reader.meta.get("recovered") and reader.frame_count == len(frames)
+            assert len(list(reader.query(ids=[0x100]))) == 5000
+
+        # 리모트 프레임 DLC 보존
+        path = os.path.join(tmp, "remote.canrec")
+        recorder = SessionRecorder(path, compression="none")
+        recorder.start()
+        for msg in _messages():
+            recorder.record(msg, "CH1")
+        recorder.close(wait=True)
+        with open_recording(path) as reader:
+            read = [msg for _, msg in reader.frames()]
+        assert read[1].is_remote_frame and read[1].dlc == 5 and bytes(read[1].data) == b""
+        assert bytes(read[2].data) == bytes(range(12)) and read[2].is_fd
+
+
+if __name__ == "__main__":
+    test_text_logs()
+    test_python_can_logs()
+    test_native_recording()
+    print("\n=== 테스트 완료 ===")
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+적응형 갱신 스케줄러 테스트 스크립트
+갱신 비용에 따른 간격 조절, 변경 없는 틱 건너뛰기, 갱신 요청 합치기를 확인
+"""
+
+import os
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import time
+from PyQt5 import QtCore
+from render_scheduler import RenderBudget, AdaptiveRenderScheduler
+
+app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+def test_budget_interval():
+    """비용/예산 기반 간격 계산 테스트"""
+    print("=== 갱신 예산 테스트 ===")
+    budget = RenderBudget(min_interval=0.05, max_interval=0.5, cpu_budget=0.2)
+    assert budget.rendered(0.001) == 0.05   # 가벼운 갱신은 최소 간격
+    assert abs(budget.rendered(0.04) - 0.2) < 1e-9  # 느려진 갱신은 즉시 반영
+    for _ in range(50):
+        budget.rendered(0.2)
+    assert budget.interval == 0.5           # 최대 간격 제한
+    budget = RenderBudget(min_interval=0.05, max_interval=0.5)
+    intervals = [budget.skipped() for _ in range(10)]
+    print(f"유휴 간격 증가: {[round(i, 3) for i in intervals]}")
+    assert intervals[0] > 0.05 and intervals[-1] == 0.5
+
+
+def test_scheduler_skip_and_coalesce():
+    """변경 없는 틱 건너뛰기 및 요청 합치기 테스트"""
+    renders = []
+    state = {"changed": False}
+    scheduler = AdaptiveRenderScheduler(lambda: renders.append(time.perf_counter()),
+                                        lambda: state["changed"],
+                                        RenderBudget(min_interval=0.01, max_interval=0.02))
+    scheduler.start()
+    end = time.perf_counter() + 0.2
+    while time.perf_counter() < end:
+        app.processEvents()
+        time.sleep(0.002)
+    assert not renders and scheduler.skipped > 0
+
+    for _ in range(5):
+        scheduler.request_refresh()
+    end = time.perf_counter() + 0.05
+    while time.perf_counter() < end:
+        app.processEvents()
+        time.sleep(0.002)
+    print(f"갱신: {len(renders)}, 건너뜀: {scheduler.skipped}, 합쳐진 요청: {scheduler.coalesced}")
+    assert len(renders) == 1 and scheduler.coalesced == 4
+    print(scheduler.format_stats())
+    scheduler.stop()
+
+
+if __name__ == "__main__":
+    test_budget_interval()
+    test_scheduler_skip_and_coalesce()
+    print("\n=== 테스트 완료 ===")
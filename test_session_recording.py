@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+세션 기록 형식 테스트 스크립트
+원시 프레임 왕복 복원, 인덱스 기반 시간/ID 탐색, CSV 대비 파일 크기,
+엔진 기록 시 채널별 하드웨어 시계가 공통 기준 시계로 정렬되어 저장되고 벽시계로 변환되는지 확인
+"""
+
+import glob
+import os
+import tempfile
+import time
+import can
+import pandas as pd
+from can_engine import CanEngine
+from session_recording import SessionReader, SessionRecorder
+
+
+def _drive_frames(count):
+    """주기 메시지 모의 트래픽 (100~102: 10ms, 200~209: 50ms 레이더, 확장 ID 1개, FD 1개)"""
+    frames = []
+    for tick in range(count):
+        t = 1000.0 + tick * 0.01
+        speed = (tick // 10) % 200
+        frames.append(("CH1", can.Message(timestamp=t, arbitration_id=100,
+                                          data=bytes([speed, 0, tick % 4, 0, 0, 0, 0, 0]))))
+        frames.append(("CH1", can.Message(timestamp=t + 0.0002, arbitration_id=101,
+                                          data=bytes([0x10, speed // 2, 0, 0, 0, 0, 0, 0]))))
+        frames.append(("CH1", can.Message(timestamp=t + 0.0004, arbitration_id=102,
+                                          data=bytes([0, 0, 0, 0, 0, 0, 0, tick % 16]))))
+        if tick % 5 == 0:
+            for obj in range(10):
+                frames.append(("CH2", can.Message(timestamp=t + 0.001 + obj * 0.0001, arbitration_id=200 + obj,
+                                                  data=bytes([obj, (tick // 50) % 256, 0x7F, 0, 1, 0, 0, 0]))))
+        if tick % 100 == 0:
+            frames.append(("CH2", can.Message(timestamp=t + 0.003, arbitration_id=0x18FEF100,
+                                              is_extended_id=True, data=bytes(range(8)))))
+            frames.append(("CH2", can.Message(timestamp=t + 0.004, arbitration_id=0x300, is_fd=True,
+                                              bitrate_switch=True, data=bytes(range(64)))))
+    return frames
+
+
+def test_round_trip_and_seek():
+    """왕복 복원 및 시간/ID 탐색 테스트"""
+    print("=== 세션 기록 왕복/탐색 테스트 ===")
+    frames = _drive_frames(3000)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "drive.canrec")
+        recorder = SessionRecorder(path, chunk_frames=1000)
+        recorder.start()
+        for label, msg in frames:
+            recorder.record(msg, label)
+        recorder.close(wait=True)
+
+        with SessionReader(path) as reader:
+            print(f"프레임: {reader.frame_count}, 청크: {len(reader.index)}, 채널: {reader.channels}, "
+                  f"시간: {reader.time_range}")
+            assert reader.frame_count == len(frames) and reader.channels == ["CH1", "CH2"]
+            restored = list(reader.frames())
+            for (label, msg), (read_label, read_msg) in zip(frames, restored):
+                assert label == read_label
+                assert msg.arbitration_id == read_msg.arbitration_id and msg.data == read_msg.data
+                assert msg.is_extended_id == read_msg.is_extended_id and msg.is_fd == read_msg.is_fd
+                assert abs(msg.timestamp - read_msg.timestamp) < 1e-6
+
+            # 10초 구간 + 레이더 ID만: 일부 청크만 읽음
+            radar = range(200, 210)
+            chunks = reader.chunks(1010.0, 1012.0, radar)
+            selected = list(reader.frames(1010.0, 1012.0, radar))
+            expected = [msg for label, msg in frames
+                        if 1010.0 <= msg.timestamp <= 1012.0 and msg.arbitration_id in radar]
+            print(f"구간/ID 조회: {len(selected)}프레임, 청크 {len(chunks)}/{len(reader.index)}개 읽음")
+            assert len(selected) == len(expected) and len(chunks) < len(reader.index)
+
+            # 확장 ID는 비트맵에서 접혀도 결과는 정확해야 함
+            extended = list(reader.frames(ids=[0x18FEF100]))
+            assert len(extended) == 30 and all(msg.is_extended_id for _, msg in extended)
+
+
+def test_size_against_csv():
+    """동일 프레임 CSV 대비 크기 비교"""
+    frames = _drive_frames(6000)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "drive.canrec")
+        recorder = SessionRecorder(path)
+        recorder.start()
+        for label, msg in frames:
+            recorder.record(msg, label)
+        recorder.close(wait=True)
+
+        csv_path = os.path.join(tmp, "drive.csv")
+        pd.DataFrame({
+            "Timestamp": [msg.timestamp for _, msg in frames],
+            "Channel": [label for label, _ in frames],
+            "ID": [hex(msg.arbitration_id) for _, msg in frames],
+            "DLC": [msg.dlc for _, msg in frames],
+            "Data": [msg.data.hex(" ") for _, msg in frames],
+        }).to_csv(csv_path, index=False)
+        ratio = os.path.getsize(csv_path) / os.path.getsize(path)
+        print(f"CSV {os.path.getsize(csv_path)} bytes / 세션 기록 {os.path.getsize(path)} bytes = {ratio:.1f}배")
+        assert ratio >= 10
+
+
+def test_engine_records_aligned_time():
+    """엔진 기록: 채널마다 다른 하드웨어 시계 -> 파일에는 표시/로깅과 같은 정렬된 시각"""
+    print("=== 세션 기록 시계 정렬 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = CanEngine("candb_ex.dbc", cipv_pipeline=False)
+        engine.receive_active = True  # 버스 없이 수신 경로만 사용
+        assert engine.start_logging("Raw frames", directory=tmp) is not None
+        host_base = engine.clock_sync.now()
+        wall_base = time.time()
+        hw_base = {"CH1": 1000.0, "CH2": 50000.0}  # 인터페이스별 시계 원점이 다름
+        for tick in range(200):
+            t = tick * 0.01
+            for label in ("CH1", "CH2"):
+                msg = can.Message(timestamp=hw_base[label] + t, arbitration_id=100 if label == "CH1" else 200,
+                                  data=bytes(8))
+                engine.add_can_messages([msg], 1, label, dequeue_time=host_base + t + 0.0005)
+        aligned = dict(engine.last_rx_timestamp)
+        engine.end_logging(wait=True)
+        engine.shutdown()
+
+        path = glob.glob(os.path.join(tmp, "*.canrec"))[0]
+        with SessionReader(path) as reader:
+            ticks = {"CH1": 0, "CH2": 0}
+            last = {}
+            for label, msg in reader.frames():
+                # 원시 하드웨어 시각이 아니라 공통 기준 시계 시각 (송신 시각 ~ 꺼낸 시각 사이)
+                expected = host_base + ticks[label] * 0.01
+                assert expected - 1e-6 <= msg.timestamp <= expected + 0.0005 + 1e-6, (label, msg.timestamp - expected)
+                ticks[label] += 1
+                last[label] = msg.timestamp
+            assert ticks == {"CH1": 200, "CH2": 200}
+            # 벽시계 기준: 첫 프레임 시각을 epoch 초로 변환 가능
+            print(f"첫 프레임 벽시계 시각: {reader.start_epoch:.3f} (기록 시작 {wall_base:.3f})")
+            assert abs(reader.start_epoch - wall_base) < 0.01
+        print(f"채널별 마지막 시각 (기준 시계 대비): { {k: v - host_base for k, v in last.items()} }")
+        for label in ("CH1", "CH2"):
+            assert abs(last[label] - aligned[label]) < 1e-6
+        assert abs(last["CH1"] - last["CH2"]) < 0.001
+
+
+if __name__ == "__main__":
+    test_round_trip_and_seek()
+    test_size_against_csv()
+    test_engine_records_aligned_time()
+    print("\n=== 테스트 완료 ===")
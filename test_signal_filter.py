@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+컴파일된 신호 필터 테스트 스크립트
+부분 일치/와일드카드/정규식 패턴, 신규 슬롯 증분 해석, 링 버퍼 마스크 선택을 확인
+"""
+
+import re
+from message_ring import MessageRingBuffer
+from signal_filter import CompiledSignalFilter
+
+
+def _registry_with_signals():
+    ring = MessageRingBuffer(capacity=100)
+    registry = ring.registry
+    slots = {}
+    for ch in ("CH1", "CH2"):
+        for obj in range(1, 4):
+            for sig in ("RelPosX", "RelPosY"):
+                slots[(ch, obj, sig)] = registry.slot(ch, f"RadarObj{obj}", f"{sig}{obj}", "m", 199 + obj)
+        slots[(ch, 0, "Speed")] = registry.slot(ch, "VehicleStatus", "VehicleSpeed", "km/h", 100)
+    return ring, slots
+
+
+def test_pattern_modes():
+    """패턴 방식별 일치 테스트"""
+    print("=== 신호 필터 패턴 테스트 ===")
+    ring, slots = _registry_with_signals()
+    cases = [
+        (CompiledSignalFilter("radarobj", "", "substring"), 12),
+        (CompiledSignalFilter("RadarObj[12]", "RelPosX*", "wildcard"), 4),
+        (CompiledSignalFilter("", r"^RelPos[XY]3$", "regex"), 4),
+        (CompiledSignalFilter("Vehicle", "speed"), 2),
+    ]
+    for compiled, expected in cases:
+        compiled.resolve(ring.registry)
+        print(f"{compiled.mode:<9} msg='{compiled.message_pattern}' sig='{compiled.signal_pattern}' "
+              f"-> {len(compiled.matched)}개 슬롯")
+        assert len(compiled.matched) == expected
+        assert all(frame_id == ring.registry.frame_ids[slot] for frame_id, slot in compiled.keys)
+
+    try:
+        CompiledSignalFilter("(", "", "regex")
+        assert False, "잘못된 정규식은 예외 발생"
+    except re.error:
+        pass
+
+
+def test_incremental_resolve_and_mask():
+    """신규 슬롯 증분 해석 및 링 버퍼 선택 테스트"""
+    ring, slots = _registry_with_signals()
+    compiled = CompiledSignalFilter("", "RelPosX", "substring")
+    compiled.resolve(ring.registry)
+    before = len(compiled.matched)
+    new_slot = ring.registry.slot("CH1", "RadarObj9", "RelPosX9", "m", 208)
+    compiled.resolve(ring.registry)
+    assert len(compiled.matched) == before + 1 and compiled.allows(new_slot)
+
+    ch1 = ring.registry.channel_id("CH1")
+    for i in range(60):
+        slot = list(slots.values())[i % len(slots)]
+        ring.append(float(i), ring.registry.channel_id(ring.registry.keys[slot][0]), 0, slot, float(i))
+    indices = ring.select(50, slots=compiled.slot_array(), channel=ch1)
+    names = {ring.registry.keys[int(ring.slots[i])][2] for i in indices}
+    print(f"선택 행: {len(indices)}, 신호: {sorted(names)}")
+    assert names and all(name.startswith("RelPosX") for name in names)
+    assert all(ring.channels[i] == ch1 for i in indices)
+    assert list(compiled.mask(ring.slots[:5])) == [ring.slots[i] in compiled.matched for i in range(5)]
+
+
+if __name__ == "__main__":
+    test_pattern_modes()
+    test_incremental_resolve_and_mask()
+    print("\n=== 테스트 완료 ===")
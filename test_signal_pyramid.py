@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+다중 해상도 시계열 저장소 테스트 스크립트
+16x/256x 구간 최소/최대/평균이 원시 값과 일치하는지, 확대/축소 배율과 관계없이 조회 점 수가
+제한되는지, 용량 초과 시 상위 레벨로 긴 구간을 유지하는지 확인
+"""
+
+import time
+import numpy as np
+from signal_pyramid import SignalPyramid, SignalPyramidStore, decimate_to_pixels
+
+
+def _brute(t, v, start, end, size):
+    """원시 배열을 size개씩 묶은 (t_start, min, max, mean)"""
+    count = len(t) // size * size
+    return (t[:count:size], v[:count].reshape(-1, size).min(1), v[:count].reshape(-1, size).max(1),
+            v[:count].reshape(-1, size).mean(1))
+
+
+def test_levels_match_raw():
+    """구간 통계 == 원시 값 직접 계산, 덜 찬 마지막 구간 포함"""
+    print("=== 구간 통계 테스트 ===")
+    rng = np.random.default_rng(3)
+    count = 100000 + 123  # 256의 배수가 아닌 길이 (덜 찬 마지막 구간)
+    t = np.arange(count) * 0.001
+    v = np.sin(t) * 50 + rng.normal(0, 3, count)
+    pyramid = SignalPyramid()
+    started = time.perf_counter()
+    for timestamp, value in zip(t.tolist(), v.tolist()):
+        pyramid.append(timestamp, value)
+    per_sample = (time.perf_counter() - started) / count
+    print(f"추가 비용: {per_sample * 1e6:.2f}us/샘플, 레벨 크기: {[level.size for level in pyramid.levels]}")
+
+    for level, size in ((1, 16), (2, 256)):
+        series = pyramid.query(None, None, max_points=len(t) // size + 1)
+        assert series.level == level and series.factor == size
+        t_start, vmin, vmax, vmean = _brute(t, v, None, None, size)
+        closed = len(t_start)
+        assert np.array_equal(series.t_start[:closed], t_start)
+        assert np.array_equal(series.vmin[:closed], vmin) and np.array_equal(series.vmax[:closed], vmax)
+        assert np.allclose(series.vmean[:closed], vmean)
+        # 덜 찬 마지막 구간 = 나머지 원시 샘플
+        rest = v[closed * size:]
+        assert len(series) == closed + 1
+        assert series.vmin[-1] == rest.min() and series.vmax[-1] == rest.max()
+        assert np.isclose(series.vmean[-1], rest.mean()) and series.t_end[-1] == t[-1]
+
+
+def test_query_point_budget():
+    """확대/축소 배율과 관계없이 max_points 이하, 범위 밖 값 없음"""
+    pyramid = SignalPyramid()
+    # 원시 레벨 용량(262144)을 넘겨 앞쪽 원시 값은 버려지고 16x 레벨에서 조회됨
+    count = 400000
+    t = np.arange(count) * 0.01
+    for timestamp in t.tolist():
+        pyramid.append(timestamp, timestamp % 7.0)
+    for start, end, expected_level in ((3900.0, 3910.0, 0), (100.0, 110.0, 1), (0.0, 300.0, 1), (None, None, 2)):
+        series = pyramid.query(start, end, max_points=2000)
+        print(f"구간 {start}~{end}: 레벨 {series.level}, {len(series)}점")
+        assert series.level == expected_level and len(series) <= 2001
+        if start is not None:
+            assert series.t_end[0] >= start and series.t_start[-1] <= end
+        assert series.vmin.min() >= 0.0 and series.vmax.max() < 7.0
+
+
+def test_pixel_decimation():
+    """1kHz 60초 -> 픽셀 열별 최소/최대 (열마다 원시 값 구간의 최소/최대와 일치)"""
+    rng = np.random.default_rng(5)
+    t = np.arange(60000) * 0.001
+    v = rng.normal(0, 1, len(t))
+    pyramid = SignalPyramid()
+    for timestamp, value in zip(t.tolist(), v.tolist()):
+        pyramid.append(timestamp, value)
+    width = 1500
+    x0, x1 = float(t[0]), float(t[-1])
+    series = pyramid.query(x0, x1, max_points=width * 4)
+    started = time.perf_counter()
+    columns, lows, highs = decimate_to_pixels(series, x0, x1, width)
+    elapsed = time.perf_counter() - started
+    print(f"60000점 -> 레벨 {series.level} {len(series)}구간 -> {len(columns)}열 ({elapsed * 1000:.2f}ms)")
+    assert series.level == 1 and len(columns) == width
+    # 16x 구간 경계 단위로 픽셀 열에 들어간 원시 값 범위와 비교
+    raw_columns = np.clip(np.floor((t[::16] - x0) * width / (x1 - x0)).astype(int), 0, width - 1)
+    for column in (0, 700, width - 1):
+        buckets = np.flatnonzero(raw_columns == column)
+        values = np.concatenate([v[b * 16:(b + 1) * 16] for b in buckets])
+        index = int(np.searchsorted(columns, column))
+        assert lows[index] == values.min() and highs[index] == values.max()
+
+
+def test_capacity_and_store():
+    """원시 레벨이 오래된 값을 버려도 전체 구간은 상위 레벨로 조회, 저장소는 구독 슬롯만 쌓고 NaN 건너뜀"""
+    pyramid = SignalPyramid(capacity=4096)
+    for i in range(50000):
+        pyramid.append(i * 0.01, float(i))
+    assert pyramid.raw.dropped > 0 and pyramid.levels[1].dropped == 0
+    assert pyramid.time_range() == (0.0, 499.99)
+    whole = pyramid.query(None, None, max_points=1000)
+    assert whole.level == 2 and whole.t_start[0] == 0.0 and whole.vmax[-1] == 49999.0
+    recent = pyramid.query(490.0, 499.99, max_points=2000)
+    assert recent.level == 0 and recent.vmin[0] == 49000.0
+
+    store = SignalPyramidStore()
+    store.update_frame(0.0, [3, 4], [1.0, 1.0])
+    assert store.keys() == [] and store.version == 0  # 구독 없음 -> 락 없이 반환
+    store.subscribe(3)
+    store.subscribe(4)
+    store.subscribe(4)
+    store.update_frame(0.0, [3, 4, 5], [1.0, float("nan"), 7.0])
+    store.update_frame(0.1, [3, 4, 5], [2.0, 5.0, 8.0])
+    store.update_rows([0.2], [5], [9.0])
+    assert store.keys() == [3, 4] and store.tail(3) == [(0.0, 1.0), (0.1, 2.0)]
+    assert len(store.query(4)) == 1 and store.query(5) is None
+    # 구독이 모두 해제되면 해당 시계열 삭제
+    store.unsubscribe(4)
+    assert store.keys() == [3, 4]
+    store.unsubscribe(4)
+    assert store.keys() == [3] and store.subscribed == {3}
+    store.clear()
+    assert store.keys() == [] and store.subscribed == {3}
+
+    store = SignalPyramidStore(track_all=True)
+    store.update_rows([0.0, 0.0], [1, 2], [1.0, 2.0])
+    assert store.keys() == [1, 2]
+
+
+if __name__ == "__main__":
+    test_levels_match_raw()
+    test_query_point_budget()
+    test_pixel_decimation()
+    test_capacity_and_store()
+    print("\n=== 테스트 완료 ===")
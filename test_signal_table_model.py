@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+신호 테이블 모델 테스트 스크립트
+링 버퍼 최신 행 표시, 역순 표시, 행 삽입/변경 알림 범위를 확인
+"""
+
+import os
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5 import QtCore
+from message_ring import MessageRingBuffer
+from signal_table_model import SignalTableModel
+
+app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+def _fill(ring, start, count):
+    ch = ring.registry.channel_id("CH1")
+    slot = ring.registry.slot("CH1", "VehicleStatus", "Speed", "km/h", 100, integer=True)
+    for i in range(start, start + count):
+        ring.append(i * 0.01, ch, 100, slot, float(i))
+
+
+def test_tail_model():
+    """최신 행 표시 및 알림 범위 테스트"""
+    print("=== 신호 테이블 모델 테스트 ===")
+    ring = MessageRingBuffer(capacity=1000)
+    model = SignalTableModel(ring)
+    inserted = []
+    changed = []
+    model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+    model.dataChanged.connect(lambda tl, br, roles: changed.append((tl.row(), br.row())))
+
+    _fill(ring, 0, 30)
+    model.show_tail(50)
+    assert model.rowCount() == 30
+    assert model.index(29, 4).data() == "29"
+    assert model.index(29, 0).data() == "0.290"
+
+    # limit 도달 전 추가는 삽입만 알림
+    _fill(ring, 30, 10)
+    model.show_tail(50)
+    assert inserted[-1] == (30, 39) and not changed
+
+    # limit 도달 후에는 행이 밀리므로 전체 범위 dataChanged
+    _fill(ring, 40, 20)
+    model.show_tail(50)
+    assert model.rowCount() == 50
+    assert model.index(0, 4).data() == "10"
+    assert inserted[-1] == (40, 49) and changed[-1] == (0, 39)
+
+    # 변경 없으면 알림 없음
+    count = len(changed)
+    model.show_tail(50)
+    assert len(changed) == count
+
+    # 역순: 최신 행이 맨 위
+    model.show_tail(50, reverse=True)
+    assert model.index(0, 4).data() == "59"
+    print(f"삽입 알림: {inserted}, 변경 알림: {changed}")
+
+
+def test_rows_model():
+    """튜플 행 표시 테스트"""
+    ring = MessageRingBuffer(capacity=10)
+    model = SignalTableModel(ring)
+    model.show_rows([("", "CH1", "LaneInfo", "LaneType", None, "")])
+    assert model.rowCount() == 1
+    assert model.index(0, 0).data() == ""
+    assert model.headerData(2, QtCore.Qt.Horizontal) == "Message"
+
+
+if __name__ == "__main__":
+    test_tail_model()
+    test_rows_model()
+    print("\n=== 테스트 완료 ===")
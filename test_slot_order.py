@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+슬롯 표시 순서 테스트 스크립트
+이름순 bisect 삽입, 행 번호 조회, 이름 순위 배열, 정렬/역순 전환 시 모델 행 매핑,
+표시 중 슬롯이 추가될 때 스냅샷 유지와 layoutChanged 알림을 확인
+"""
+
+import os
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import random
+import numpy as np
+from PyQt5 import QtCore
+from message_ring import MessageRingBuffer
+from latest_value_store import LatestValueStore
+from signal_table_model import SignalTableModel
+from slot_order import NameOrder
+
+app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+def test_name_order_insert():
+    """무작위 순서로 추가해도 이름순이 유지되는지 테스트"""
+    print("=== 이름순 슬롯 순서 테스트 ===")
+    ring = MessageRingBuffer(capacity=10)
+    registry = ring.registry
+    names = [(f"Msg{m:02d}", f"Sig{s:02d}") for m in range(20) for s in range(10)]
+    slots = [registry.slot("CH1", msg, sig) for msg, sig in names]
+    order = NameOrder(registry)
+    random.seed(3)
+    for slot in random.sample(slots, len(slots)):
+        order.add(slot)
+    assert order.slots() == slots
+    assert all(order.row_of(slot) == row for row, slot in enumerate(slots))
+
+    ranks = registry.name_ranks()
+    shuffled = np.array(random.sample(slots, len(slots)))
+    assert list(shuffled[np.argsort(ranks[shuffled])]) == slots
+
+
+def test_model_sort_toggle():
+    """정렬/역순 전환 시 저장소가 유지하는 순서를 그대로 표시하는지 테스트"""
+    ring = MessageRingBuffer(capacity=10)
+    store = LatestValueStore(ring.registry)
+    model = SignalTableModel(ring)
+    for msg in ("Zeta", "Alpha", "Mid"):
+        store.update(ring.registry.slot("CH1", msg, "Value"), 1.0, 1.0)
+    store.take_dirty()
+
+    model.show_slots(store, store.order_slots(by_name=False))
+    assert [model.index(r, 2).data() for r in range(3)] == ["Zeta", "Alpha", "Mid"]
+    model.show_slots(store, store.order(by_name=True))
+    assert [model.index(r, 2).data() for r in range(3)] == ["Alpha", "Mid", "Zeta"]
+    model.show_slots(store, store.order_slots(by_name=True), reverse=True)
+    assert [model.index(r, 2).data() for r in range(3)] == ["Zeta", "Mid", "Alpha"]
+
+    changed = []
+    model.dataChanged.connect(lambda tl, br, roles: changed.append((tl.row(), br.row())))
+    store.update(ring.registry.find("CH1", "Alpha", "Value"), 2.0, 5.0)
+    model.update_slots(store.take_dirty())
+    print(f"역순 이름순에서 Alpha 변경 알림 행: {changed}")
+    assert changed == [(2, 2)]
+
+
+def test_model_snapshot_layout():
+    """표시 중 수신 스레드가 슬롯을 추가해도 행이 밀리지 않고, 다음 스냅샷에서 layoutChanged로 알림"""
+    ring = MessageRingBuffer(capacity=10)
+    registry = ring.registry
+    store = LatestValueStore(registry)
+    model = SignalTableModel(ring)
+    for msg in ("Alpha", "Zeta"):
+        store.update(registry.slot("CH1", msg, "Value"), 1.0, 1.0)
+    model.show_slots(store, store.order_slots(by_name=True))
+    zeta = model.index(1, 2)
+    selected = QtCore.QPersistentModelIndex(zeta)
+
+    # 이름순 중간에 새 슬롯 추가 (수신 스레드) -> 다음 스냅샷 전까지 표시 행 유지
+    store.update(registry.slot("CH1", "Mid", "Value"), 2.0, 2.0)
+    assert model.rowCount() == 2 and [model.index(r, 2).data() for r in range(2)] == ["Alpha", "Zeta"]
+    model.update_slots(store.take_dirty())  # 스냅샷에 없는 슬롯은 무시
+
+    events = []
+    model.layoutAboutToBeChanged.connect(lambda *args: events.append("about"))
+    model.layoutChanged.connect(lambda *args: events.append("changed"))
+    model.rowsInserted.connect(lambda parent, first, last: events.append(("inserted", first, last)))
+    model.show_slots(store, store.order_slots(by_name=True))
+    print(f"중간 삽입 알림: {events}, 선택 행: {selected.row()}")
+    assert events == ["about", "changed"]
+    assert [model.index(r, 2).data() for r in range(3)] == ["Alpha", "Mid", "Zeta"]
+    assert selected.row() == 2 and selected.data() == "Zeta"
+
+    # 도착 순 역순(최신이 위): 앞에만 추가되면 삽입으로 알림
+    model.show_slots(store, store.order_slots(), reverse=True)
+    events.clear()
+    store.update(registry.slot("CH1", "Beta", "Value"), 3.0, 3.0)
+    model.show_slots(store, store.order_slots(), reverse=True)
+    assert events == [("inserted", 0, 0)] and model.index(0, 2).data() == "Beta"
+
+
+if __name__ == "__main__":
+    test_name_order_insert()
+    test_model_sort_toggle()
+    test_model_snapshot_layout()
+    print("\n=== 테스트 완료 ===")
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+스트리밍 CSV 로거 테스트 스크립트
+sample-and-hold 행 형식, 고정 주기 리샘플링, 크기 기준 파일 교체, 즉시 종료,
+정수 열 형식, 로깅 중 열 추가, 기록 실패 청크 집계를 확인
+"""
+
+import os
+import tempfile
+import time
+import pandas as pd
+from stream_logger import ChunkedCsvWriter, EventRowLogger, ResampledRowLogger
+
+
+def test_event_rows():
+    """이벤트 기반 와이드 행 기록 테스트"""
+    print("=== 스트리밍 로거 행 형식 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "log.csv")
+        writer = ChunkedCsvWriter(path, ["Speed", "Gear", "AccelX"], fsync_interval=0)
+        writer.start()
+        rows = EventRowLogger(writer, chunk_rows=4)
+        rows.log_frame(0.0, {"Speed": 10, "Gear": "Drive"})
+        rows.log_frame(0.1, {"AccelX": 0.5})
+        rows.log_frame(0.1, {"Speed": 11})  # 같은 시각은 행을 만들지 않음
+        for i in range(2, 12):
+            rows.log_frame(i * 0.1, {"Speed": 10 + i})
+        rows.close(wait=True)
+
+        df = pd.read_csv(path)
+        print(df.head(3))
+        assert list(df.columns) == ["Timestamp", "Speed", "Gear", "AccelX"]
+        # 행은 해당 시각 직전까지의 유지값
+        assert df.iloc[0].tolist()[:3] == [0.1, 10.0, "Drive"] and pd.isna(df.iloc[0]["AccelX"])
+        assert df.iloc[1]["Speed"] == 11 and df.iloc[1]["AccelX"] == 0.5
+        assert len(df) == 12 and df.iloc[-1]["Speed"] == 21
+        assert writer.rows_written == 12 and writer.dropped_rows == 0
+
+
+class FailingWriter(ChunkedCsvWriter):
+    """두 번째 청크 기록에서 한 번 실패하는 기록기"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = 0
+
+    def format_chunk(self, chunk, width=None):
+        self.calls += 1
+        if self.calls == 2:
+            raise OSError("disk full")
+        return super().format_chunk(chunk, width)
+
+
+def test_columns_and_failures():
+    """정수 신호는 정수 형식, 목록에 없던 신호는 열 추가(새 파일), 기록 실패 청크는 집계"""
+    print("=== 정수 열/열 추가/기록 실패 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "log.csv")
+        writer = FailingWriter(path, ["Count", "Speed"], fsync_interval=None, integer_columns=["Count"])
+        writer.start()
+        rows = EventRowLogger(writer, chunk_rows=2)
+        for i in range(6):
+            rows.log_frame(i * 0.1, {"Count": i, "Speed": i * 0.5})
+        while writer.rows_written + writer.dropped_rows < 4:
+            time.sleep(0.01)
+        rows.log_frame(0.6, {"Extra": 7})  # DBC 교체 등으로 새로 등장한 신호
+        rows.log_frame(0.7, {"Count": 9})
+        rows.log_frame(0.8, {"Count": 10})
+        rows.close(wait=True)
+
+        with open(writer.files[0], encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        print(lines[:3], writer.files, writer.failed_chunks, writer.dropped_rows)
+        assert lines[0] == "Timestamp,Count,Speed" and lines[1] == "0.1,0,0.0"
+        assert writer.failed_chunks == 1 and writer.dropped_chunks == 1 and writer.dropped_rows == 2
+        assert len(writer.files) == 2
+        extended = pd.read_csv(writer.files[1])
+        assert list(extended.columns) == ["Timestamp", "Count", "Speed", "Extra"]
+        assert extended["Count"].tolist() == [5, 9, 10] and extended["Extra"].tolist() == [7, 7, 7]
+        assert writer.rows_written + writer.dropped_rows == 8 + 1
+
+        # 리샘플링: 선형 보간 모드에서도 정수 신호는 유지값
+        path = os.path.join(tmp, "linear.csv")
+        writer = ChunkedCsvWriter(path, ["Count"], fsync_interval=None, integer_columns=["Count"])
+        writer.start()
+        rows = ResampledRowLogger(writer, rate_hz=10, method="linear")
+        for i in range(21):
+            rows.log_frame(i * 0.15, {"Count": i})
+        rows.close(wait=True)
+        frame = pd.read_csv(path)
+        assert frame["Count"].dtype.kind == "i" and frame["Count"].iloc[1] == 0  # 0.1초: 0 유지
+
+
+def test_rotation_and_instant_stop():
+    """크기 기준 파일 교체 및 종료 지연 테스트"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "log.csv")
+        columns = [f"Sig{i}" for i in range(50)]
+        writer = ChunkedCsvWriter(path, columns, fsync_interval=None, max_bytes=200_000, queue_chunks=1000)
+        writer.start()
+        rows = EventRowLogger(writer, chunk_rows=512)
+        signals = {name: 1.25 for name in columns}
+        for i in range(20000):
+            rows.log_frame(i * 0.001, signals)
+        started = time.perf_counter()
+        rows.close()
+        stop_time = time.perf_counter() - started
+        writer.join(30)
+        total = sum(len(pd.read_csv(f)) for f in writer.files)
+        print(f"종료 호출 시간: {stop_time*1000:.2f}ms, 파일 수: {len(writer.files)}, 행: {total}")
+        assert stop_time < 0.05
+        assert len(writer.files) > 1 and writer.files[1].endswith("log_001.csv")
+        assert total == writer.rows_written == 20000
+
+
+def test_resampled_rows():
+    """고정 주기 리샘플링 (유지/선형 보간) 테스트"""
+    print("=== 고정 주기 리샘플링 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for method in ("hold", "linear"):
+            path = os.path.join(tmp, f"{method}.csv")
+            writer = ChunkedCsvWriter(path, ["Fast", "Slow", "Gear"], fsync_interval=None)
+            writer.start()
+            rows = ResampledRowLogger(writer, rate_hz=10, method=method, flush_interval=0.5)
+            # Fast: 1kHz 램프, Slow: 0.25s 주기, Gear: 열거형 텍스트
+            for i in range(3001):
+                t = 0.05 + i * 0.001
+                signals = {"Fast": t}
+                if i % 250 == 0:
+                    signals["Slow"] = float(i // 250)
+                    signals["Gear"] = "Drive" if i // 250 % 2 else "Park"
+                rows.log_frame(t, signals)
+            rows.close(wait=True)
+            results[method] = pd.read_csv(path)
+
+        hold, linear = results["hold"], results["linear"]
+        print(hold.head(4))
+        # 격자: 0.1 ~ 3.0초, 10Hz -> 30행 (이벤트 방식이면 3000행)
+        assert len(hold) == len(linear) == 30
+        assert abs(hold["Timestamp"].iloc[0] - 0.1) < 1e-9 and abs(hold["Timestamp"].iloc[-1] - 3.0) < 1e-9
+        # Fast: 유지값은 한 샘플 주기 이내, 선형 보간은 격자 시각과 일치
+        assert (abs(hold["Fast"] - hold["Timestamp"]) <= 0.001 + 1e-9).all()
+        assert (abs(linear["Fast"] - linear["Timestamp"]) < 1e-9).all()
+        # Slow는 0.05 + 0.25k 시각에 k -> 0.4초 격자에서 유지값 1, 선형 보간 1.4
+        row = hold.index[abs(hold["Timestamp"] - 0.4) < 1e-9][0]
+        assert hold["Slow"].iloc[row] == 1.0
+        assert abs(linear["Slow"].iloc[row] - 1.4) < 1e-9
+        # 텍스트 값은 선형 모드에서도 유지
+        assert hold["Gear"].iloc[row] == linear["Gear"].iloc[row] == "Drive"
+
+
+def test_resample_lateness():
+    """한 채널이 반 주기 늦게 도착해도 허용 지연(기본 한 주기) 안이면 빠지지 않고, 넘으면 집계"""
+    print("=== 리샘플링 허용 지연 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for lateness in (None, 0.0):
+            path = os.path.join(tmp, f"late_{lateness}.csv")
+            writer = ChunkedCsvWriter(path, ["A", "B"], fsync_interval=None)
+            writer.start()
+            rows = ResampledRowLogger(writer, rate_hz=10, flush_interval=0.0, lateness=lateness)
+            # A는 바로 도착, B(같은 시각 샘플)는 50ms 늦게 도착 -> 도착 순서로 기록
+            arrivals = []
+            for i in range(1, 101):
+                t = i * 0.01
+                arrivals.append((t, t, "A"))
+                arrivals.append((t + 0.05, t, "B"))
+            for _, t, name in sorted(arrivals):
+                rows.log_frame(t, {name: t})
+            rows.close(wait=True)
+            results[lateness] = (pd.read_csv(path), rows.late_samples)
+
+        frame, late = results[None]
+        print(f"허용 지연 100ms: 늦은 샘플 {late}개, 허용 지연 0: 늦은 샘플 {results[0.0][1]}개")
+        assert late == 0 and len(frame) == 10
+        assert (abs(frame["B"] - frame["Timestamp"]) <= 0.01 + 1e-9).all() and frame["B"].notna().all()
+        assert results[0.0][1] > 0
+
+
+if __name__ == "__main__":
+    test_event_rows()
+    test_columns_and_failures()
+    test_resampled_rows()
+    test_resample_lateness()
+    test_rotation_and_instant_stop()
+    print("\n=== 테스트 완료 ===")
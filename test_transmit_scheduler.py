@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+DBC 기반 주기 송신 스케줄러 테스트 스크립트
+미리 계산한 인코더가 cantools와 같은 페이로드를 만드는지(인텔/모토로라/부호/멀티플렉스),
+DBC 주기대로 메시지별 주기가 밀리지 않는지, 수백 개 ID에서도 송신 지연이 1ms 미만인지,
+백엔드 주기 송신(send_periodic)으로 고정 페이로드를 넘기는지,
+송신/값 생성 예외가 난 메시지만 건너뛰고 나머지 송신은 계속되는지,
+sleep 해상도가 거친 환경(Windows Python 3.11 미만 등)에서도 바쁜 대기 구간을 늘려 지연을 유지하는지 확인
+"""
+
+import math
+import random
+import time
+from types import SimpleNamespace
+import can
+import cantools
+import transmit_scheduler
+from transmit_scheduler import MessageEncoder, TransmitScheduler
+
+DBC_TEXT = """VERSION ""
+BS_:
+BU_: ECU
+BO_ 300 Mixed: 8 ECU
+ SG_ IntelSigned : 0|8@1- (0.5,-10) [-74|53] "" ECU
+ SG_ MotorolaWide : 15|16@0+ (0.01,0) [0|655] "" ECU
+ SG_ MotorolaSmall : 35|5@0- (1,0) [-16|15] "" ECU
+ SG_ Flag : 63|1@1+ (1,0) [0|1] "" ECU
+BO_ 301 Muxed: 8 ECU
+ SG_ Mux M : 0|8@1+ (1,0) [0|255] "" ECU
+ SG_ A m0 : 8|16@1+ (1,0) [0|1000] "" ECU
+ SG_ B m1 : 8|16@1+ (1,0) [0|1000] "" ECU
+BO_ 302 Fast: 8 ECU
+ SG_ Counter : 0|8@1+ (1,0) [0|255] "" ECU
+BA_DEF_ BO_ "GenMsgCycleTime" INT 0 10000;
+BA_DEF_DEF_ "GenMsgCycleTime" 0;
+BA_ "GenMsgCycleTime" BO_ 302 20;
+"""
+
+
+class NullBus:
+    """송신만 기록하는 버스 (백엔드 주기 송신 미지원)"""
+
+    def __init__(self):
+        self.count = 0
+
+    def send(self, message, timeout=None):
+        self.count += 1
+
+
+class NativeTask:
+    def __init__(self, message, period):
+        self.message, self.period, self.stopped = message, period, False
+
+    def modify_data(self, message):
+        self.message = message
+
+    def stop(self):
+        self.stopped = True
+
+
+class NativePeriodicBus(NullBus):
+    """백엔드 주기 송신을 지원하는 버스"""
+
+    def __init__(self):
+        super().__init__()
+        self.tasks = []
+
+    def _send_periodic_internal(self, msgs, period, duration=None, autostart=True, modifier_callback=None):
+        raise AssertionError("send_periodic을 통해서만 호출")
+
+    def send_periodic(self, message, period, duration=None, store_task=True, autostart=True,
+                      modifier_callback=None):
+        task = NativeTask(message, period)
+        self.tasks.append(task)
+        return task
+
+
+class FlakyBus(NullBus):
+    """특정 ID 송신 시 CAN 오류가 아닌 예외를 내는 버스"""
+
+    def send(self, message, timeout=None):
+        if message.arbitration_id == 300:
+            raise OSError("No buffer space available")
+        super().send(message, timeout)
+
+
+def test_encoder_matches_cantools():
+    """인코딩 -> cantools 디코딩이 양자화 오차 안에서 일치"""
+    print("=== 인코더 테스트 ===")
+    db = cantools.database.load_string(DBC_TEXT, "dbc")
+    mixed = MessageEncoder(db.get_message_by_name("Mixed"))
+    assert mixed.compiled
+    rng = random.Random(7)
+    for _ in range(200):
+        values = [rng.uniform(packer.low, packer.high) for packer in mixed.packers]
+        values[3] = rng.randint(0, 1)
+        decoded = mixed.message.decode(mixed.encode(values))
+        for packer, value in zip(mixed.packers, values):
+            assert abs(decoded[packer.name] - value) <= packer.scale / 2 + 1e-9, (packer.name, value, decoded)
+    # 범위를 넘는 값은 raw 범위로 제한
+    decoded = mixed.message.decode(mixed.encode_dict({"MotorolaSmall": -100, "MotorolaWide": 1e6}))
+    assert decoded["MotorolaSmall"] == -16 and decoded["MotorolaWide"] == 655.35
+
+    # 멀티플렉스 메시지는 cantools로 인코딩
+    muxed = MessageEncoder(db.get_message_by_name("Muxed"))
+    assert not muxed.compiled
+    assert muxed.message.decode(muxed.encode_dict({"Mux": 1, "B": 123}))["B"] == 123
+
+    # candb_ex.dbc: 기존 send_can.py 메시지
+    candb = cantools.database.load_file("candb_ex.dbc")
+    radar = MessageEncoder(candb.get_message_by_frame_id(200))
+    decoded = radar.message.decode(radar.encode_dict({"RelPosX1": -12.3, "RelPosY1": 45.6,
+                                                      "RelVelX1": -7.0, "RelAccX1": 1.5}))
+    assert abs(decoded["RelPosX1"] + 12.3) < 0.051 and abs(decoded["RelVelX1"] + 7.0) < 0.051
+
+
+def test_virtual_bus_periods():
+    """Virtual CAN: DBC 주기/지정 주기대로 송신, 주기 누적 오차 없음, 수신 측 DBC 디코딩"""
+    print("=== 주기 송신 테스트 ===")
+    db = cantools.database.load_file("candb_ex.dbc")
+    tx = can.interface.Bus(channel="test_transmit", interface="virtual")
+    rx = can.interface.Bus(channel="test_transmit", interface="virtual")
+    scheduler = TransmitScheduler(tx, db=db, frame_ids=[100, 101, 200],
+                                  cycle_overrides={100: 10, 101: 20})
+    assert scheduler.entries[200].period == 0.1  # DBC에 주기 없음 -> 기본 주기
+    received = {100: [], 101: [], 200: []}
+    try:
+        scheduler.start()
+        deadline = time.monotonic() + 1.05
+        while time.monotonic() < deadline:
+            message = rx.recv(0.05)
+            if message is not None:
+                received[message.arbitration_id].append(message)
+        scheduler.stop()
+        stats = scheduler.get_statistics()
+    finally:
+        tx.shutdown()
+        rx.shutdown()
+
+    lateness = stats['lateness']
+    print(f"수신: { {k: len(v) for k, v in received.items()} }, 지연 p50 {lateness['p50'] * 1000:.3f}ms "
+          f"p99 {lateness['p99'] * 1000:.3f}ms max {lateness['max'] * 1000:.3f}ms, 건너뜀 {stats['missed']}")
+    for frame_id, period in ((100, 0.01), (101, 0.02), (200, 0.1)):
+        messages = received[frame_id]
+        assert len(messages) >= int(1.0 / period) - 1, (frame_id, len(messages))
+        # 절대 시각 스케줄링: 평균 주기가 지정 주기와 일치 (sleep 누적 지연 없음)
+        mean_period = (messages[-1].timestamp - messages[0].timestamp) / (len(messages) - 1)
+        assert abs(mean_period - period) < period * 0.02, (frame_id, mean_period)
+    assert stats['messages'][100]['sent'] == len(received[100])
+    speed = db.decode_message(100, received[100][-1].data)["VehicleSpeed"]
+    assert 0 <= speed <= 250
+    assert lateness['p50'] < 0.001
+
+
+def test_many_ids_jitter():
+    """300개 ID (10/20/50/100ms 혼합): 송신 지연 1ms 미만, 예정 송신 수 유지"""
+    print("=== 다수 ID 지터 테스트 ===")
+    lines = ['VERSION ""', "BS_:", "BU_: ECU"]
+    for index in range(300):
+        lines.append(f"BO_ {0x400 + index} Msg{index}: 8 ECU")
+        for slot in range(4):
+            lines.append(f' SG_ S{index}_{slot} : {slot * 16}|16@1- (0.1,0) [-100|100] "" ECU')
+    lines += ['BA_DEF_ BO_ "GenMsgCycleTime" INT 0 10000;', 'BA_DEF_DEF_ "GenMsgCycleTime" 0;']
+    cycles = (10, 20, 50, 100)
+    lines += [f'BA_ "GenMsgCycleTime" BO_ {0x400 + index} {cycles[index % 4]};' for index in range(300)]
+    db = cantools.database.load_string("\n".join(lines) + "\n", "dbc")
+
+    bus = NullBus()
+    scheduler = TransmitScheduler(bus, db=db)
+    scheduler.start()
+    time.sleep(1.0)
+    scheduler.stop()
+    stats = scheduler.get_statistics()
+    lateness = stats['lateness']
+    # 초당 예정 송신 수: 75 * (100 + 50 + 20 + 10) = 13500
+    print(f"{stats['sent']}개 송신, 지연 p50 {lateness['p50'] * 1000:.3f}ms p99 {lateness['p99'] * 1000:.3f}ms "
+          f"max {lateness['max'] * 1000:.3f}ms, 건너뜀 {stats['missed']}")
+    assert stats['messages'][0x400]['period'] == 0.01 and stats['messages'][0x403]['period'] == 0.1
+    assert bus.count == stats['sent'] and stats['sent'] >= 13500 * 0.95
+    # OS가 프로세스를 수 ms 멈추는 경우(공유 CPU)는 전체 송신의 1% 미만이므로 p90으로 판정
+    assert lateness['p90'] < 0.001
+
+
+def test_native_periodic():
+    """고정 페이로드 + 백엔드 주기 송신 지원: send_periodic 사용, 값 변경은 modify_data로 반영"""
+    db = cantools.database.load_string(DBC_TEXT, "dbc")
+    bus = NativePeriodicBus()
+    scheduler = TransmitScheduler(bus, db=db, frame_ids=[300, 302], value_source=None)
+    scheduler.start()
+    try:
+        assert scheduler._thread is None and len(bus.tasks) == 2
+        assert {task.period for task in bus.tasks} == {0.1, 0.02}
+        scheduler.set_signals(302, {"Counter": 42})
+        task = next(task for task in bus.tasks if task.message.arbitration_id == 302)
+        assert db.decode_message(302, task.message.data)["Counter"] == 42
+        assert scheduler.get_statistics()['native'] == 2
+    finally:
+        scheduler.stop()
+    assert all(task.stopped for task in bus.tasks) and not scheduler.running
+
+
+def test_send_errors_isolated():
+    """송신 예외(OSError)와 값 생성 예외는 해당 메시지만 실패로 집계, 스케줄러는 계속 송신"""
+    db = cantools.database.load_string(DBC_TEXT, "dbc")
+
+    def source(encoder, deadline):
+        if encoder.frame_id == 302:
+            raise ValueError("sensor offline")
+        return encoder.defaults()
+
+    bus = FlakyBus()
+    scheduler = TransmitScheduler(bus, db=db, frame_ids=[300, 301, 302],
+                                  cycle_overrides={300: 10, 301: 10, 302: 10}, value_source=source)
+    scheduler.start()
+    time.sleep(0.3)
+    running = scheduler._thread is not None and scheduler._thread.is_alive()
+    scheduler.stop()
+    stats = scheduler.get_statistics()
+    messages = stats['messages']
+    print(f"송신 {stats['sent']}, 오류 {stats['send_errors']}, 메시지별 오류 "
+          f"{ {k: v['errors'] for k, v in messages.items()} }")
+    assert running
+    assert messages[301]['sent'] >= 20 and messages[301]['errors'] == 0 and bus.count == messages[301]['sent']
+    assert messages[300]['sent'] == 0 and messages[300]['errors'] >= 20
+    assert messages[302]['sent'] == 0 and messages[302]['errors'] >= 20
+    assert stats['send_errors'] == messages[300]['errors'] + messages[302]['errors']
+
+
+def test_coarse_sleep_resolution():
+    """sleep이 8ms 단위로만 깨어나는 환경: 측정한 초과 시간만큼 바쁜 대기를 일찍 시작해 지연 1ms 미만"""
+    granularity = 0.008
+
+    def coarse_sleep(seconds):
+        time.sleep(math.ceil(seconds / granularity) * granularity)
+
+    db = cantools.database.load_string(DBC_TEXT, "dbc")
+    bus = NullBus()
+    scheduler = TransmitScheduler(bus, db=db, frame_ids=[300, 302], cycle_overrides={300: 20, 302: 50})
+    original = transmit_scheduler.time
+    transmit_scheduler.time = SimpleNamespace(perf_counter=time.perf_counter, sleep=coarse_sleep)
+    try:
+        scheduler.start()
+        time.sleep(1.0)
+        scheduler.stop()
+    finally:
+        transmit_scheduler.time = original
+    stats = scheduler.get_statistics()
+    lateness = stats['lateness']
+    print(f"거친 sleep: 바쁜 대기 {stats['spin_margin'] * 1000:.1f}ms, 지연 p50 {lateness['p50'] * 1000:.3f}ms "
+          f"p90 {lateness['p90'] * 1000:.3f}ms, 송신 {stats['sent']}")
+    assert stats['spin_margin'] > 2 * transmit_scheduler.SPIN_SECONDS and stats['sent'] >= 60
+    assert lateness['p90'] < 0.001
+
+
+if __name__ == "__main__":
+    test_encoder_matches_cantools()
+    test_virtual_bus_periods()
+    test_many_ids_jitter()
+    test_native_periodic()
+    test_send_errors_isolated()
+    test_coarse_sleep_resolution()
+    print("\n=== 테스트 완료 ===")
@@ -0,0 +1,494 @@
+"""
+DBC 기반 주기 송신 스케줄러
+DBC의 메시지 주기(GenMsgCycleTime)와 신호 배치로 메시지를 만들어 메시지마다 자기 주기로 송신.
+
+- 신호 배치(비트 위치/배율/오프셋/부호)는 시작할 때 한 번 계산해 두고, 송신할 때는 정수 연산만으로 페이로드 생성
+- 다음 송신 시각은 "이번 송신 시각 + 주기"가 아닌 절대 시각(시작 시각 + n * 주기)으로 계산하므로
+  파이썬 처리 시간이 쌓여 주기가 밀리지 않음
+- 같은 주기의 메시지는 주기 안에서 위상을 고르게 나누어 한 시각에 몰리지 않게 하고,
+  같은 시각이 된 메시지는 한 번 깨어나서 이어서 송신
+- 대기는 sleep으로 하다가 송신 시각 직전부터는 바쁜 대기로 맞춰 지터를 1ms 미만으로 유지.
+  바쁜 대기 구간은 SPIN_SECONDS + 측정한 sleep 초과 시간(최대 MAX_SPIN)으로 조정되므로 sleep 해상도가
+  거친 환경에서도 송신 시각을 넘겨 깨어나지 않음. Windows에서는 송신 스레드 동안 timeBeginPeriod(1)로
+  타이머 해상도를 1ms로 올림 (Python 3.11 미만의 time.sleep은 기본 약 15.6ms 단위이며,
+  timeBeginPeriod를 쓸 수 없으면 바쁜 대기 구간이 길어져 CPU 사용량이 늘어남)
+- 값이 바뀌지 않는 메시지는 백엔드가 주기 송신을 지원하면(socketcan BCM, Vector 등) bus.send_periodic에 맡김
+- 송신 지연(예정 시각 대비 실제 송신 시각)은 LatencyHistogram으로 집계
+
+사용 예:
+  python transmit_scheduler.py candb_ex.dbc --interface virtual --channel vcan0 --cycle 100=10 --duration 10
+"""
+
+import argparse
+import ctypes
+import heapq
+import logging
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import can
+import cantools
+
+from channel_config import INTERFACE_CANDIDATES, ChannelConfig
+from interface_probe import probe_interfaces
+from latency_histogram import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CYCLE_TIME = 100  # DBC에 주기가 없는 메시지의 송신 주기 (ms)
+SPIN_SECONDS = 0.001      # 송신 시각 직전 바쁜 대기 구간 최솟값 (초)
+MAX_SPIN = 0.02           # sleep 초과 시간에 맞춰 늘리는 바쁜 대기 구간 상한 (초, Windows 기본 해상도 15.6ms 포함)
+OVERSHOOT_DECAY = 0.99    # sleep 초과 시간 최댓값 추정의 sleep당 감쇠율
+MAX_SLEEP = 0.05          # 한 번에 잠드는 최대 시간 (정지 요청 응답성)
+
+
+class SignalPacker:
+    """신호 하나의 비트 배치 (bulk_decode.SignalExtractor의 역방향)"""
+
+    def __init__(self, signal, length: int):
+        self.name = signal.name
+        self.scale = float(signal.scale)
+        self.offset = float(signal.offset)
+        self.mask = (1 << signal.length) - 1
+        if signal.is_signed:
+            self.raw_min, self.raw_max = -(1 << (signal.length - 1)), (1 << (signal.length - 1)) - 1
+        else:
+            self.raw_min, self.raw_max = 0, self.mask
+        self.big_endian = signal.byte_order != "little_endian"
+        if self.big_endian:
+            # 모토로라: 페이로드 전체를 빅엔디안 정수로 보고 LSB 위치만큼 이동
+            msb = (signal.start // 8) * 8 + (7 - signal.start % 8)
+            self.shift = length * 8 - 1 - (msb + signal.length - 1)
+        else:
+            self.shift = signal.start
+        self.supported = not signal.is_float and self.shift >= 0
+
+        # 임의 값 범위: DBC 최소/최대, 없으면 raw 범위의 물리값
+        low = signal.minimum if signal.minimum is not None else self.raw_min * self.scale + self.offset
+        high = signal.maximum if signal.maximum is not None else self.raw_max * self.scale + self.offset
+        self.low, self.high = float(min(low, high)), float(max(low, high))
+        initial = getattr(signal, "initial", None)
+        self.initial = float(initial) if isinstance(initial, (int, float)) else min(max(0.0, self.low), self.high)
+
+    def raw(self, value: float) -> int:
+        raw = int(round((value - self.offset) / self.scale))
+        if raw < self.raw_min:
+            raw = self.raw_min
+        elif raw > self.raw_max:
+            raw = self.raw_max
+        return (raw & self.mask) << self.shift
+
+
+class MessageEncoder:
+    """메시지 하나의 페이로드 인코더 (멀티플렉스/float 신호가 있으면 cantools로 인코딩)"""
+
+    def __init__(self, message):
+        self.message = message
+        self.name = message.name
+        self.frame_id = message.frame_id
+        self.length = message.length
+        self.is_extended_id = message.is_extended_frame
+        self.is_fd = bool(getattr(message, "is_fd", False)) or self.length > 8
+        self.packers = [SignalPacker(signal, self.length) for signal in message.signals]
+        self.signal_names = [packer.name for packer in self.packers]
+        self.compiled = not message.is_multiplexed() and all(packer.supported for packer in self.packers)
+
+    def defaults(self) -> List[float]:
+        return [packer.initial for packer in self.packers]
+
+    def encode(self, values: Sequence[float]) -> bytes:
+        """신호 값 (signal_names 순서) -> 페이로드"""
+        if not self.compiled:
+            return self.message.encode(dict(zip(self.signal_names, values)), strict=False)
+        little = big = 0
+        for packer, value in zip(self.packers, values):
+            if packer.big_endian:
+                big |= packer.raw(value)
+            else:
+                little |= packer.raw(value)
+        if big:
+            little |= int.from_bytes(big.to_bytes(self.length, "big"), "little")
+        return little.to_bytes(self.length, "little")
+
+    def encode_dict(self, values: Dict[str, float]) -> bytes:
+        """신호 이름 -> 값 (빠진 신호는 초기값)"""
+        return self.encode([values.get(packer.name, packer.initial) for packer in self.packers])
+
+    def to_message(self, payload: bytes) -> can.Message:
+        return can.Message(arbitration_id=self.frame_id, data=payload, is_extended_id=self.is_extended_id,
+                           is_fd=self.is_fd, bitrate_switch=self.is_fd)
+
+
+# 송신 시점의 신호 값 생성 (encoder, 예정 시각) -> signal_names 순서의 값
+ValueSource = Callable[[MessageEncoder, float], Sequence[float]]
+
+
+def random_values(encoder: MessageEncoder, deadline: float) -> List[float]:
+    """신호 범위 안의 임의 값 (기존 send_can.py 동작)"""
+    uniform = random.uniform
+    return [uniform(packer.low, packer.high) for packer in encoder.packers]
+
+
+@dataclass
+class PeriodicMessage:
+    encoder: MessageEncoder
+    period: float                   # 초
+    source: Optional[ValueSource]   # None이면 고정 페이로드 (set_signals로 변경)
+    values: List[float]
+    payload: bytes
+    origin: float = 0.0             # 위상이 반영된 첫 송신 시각
+    count: int = 0                  # 예정된 송신 횟수 (다음 시각 = origin + count * period)
+    sent: int = 0
+    missed: int = 0                 # 늦어서 건너뛴 주기 수
+    max_lateness: float = 0.0
+    errors: int = 0                 # 값 생성/인코딩/송신 실패 횟수
+    task: Optional[can.broadcastmanager.CyclicSendTaskABC] = field(default=None, repr=False)  # 백엔드 주기 송신
+
+
+def supports_native_periodic(bus) -> bool:
+    """백엔드가 자체 주기 송신(send_periodic)을 구현하는지 (기본 구현은 파이썬 스레드)"""
+    method = getattr(type(bus), "_send_periodic_internal", None)
+    return method is not None and method is not can.BusABC._send_periodic_internal
+
+
+@contextmanager
+def high_resolution_timer(period_ms: int = 1):
+    """Windows에서 블록 동안 시스템 타이머 해상도를 period_ms로 올림 (다른 플랫폼은 변경 없음)"""
+    winmm = None
+    if sys.platform == "win32":
+        try:
+            winmm = ctypes.WinDLL("winmm")
+            if winmm.timeBeginPeriod(period_ms) != 0:
+                winmm = None
+        except (OSError, AttributeError) as e:
+            logger.warning(f"타이머 해상도 변경 실패 ({e}), sleep 초과 시간만큼 바쁜 대기로 보정합니다")
+            winmm = None
+    try:
+        yield
+    finally:
+        if winmm is not None:
+            winmm.timeEndPeriod(period_ms)
+
+
+def load_database(dbc_path: str):
+    return cantools.database.load_file(dbc_path, strict=False)
+
+
+class TransmitScheduler:
+    """DBC 메시지 주기 송신 (절대 시각 스케줄링, 메시지별 주기)"""
+
+    def __init__(self, bus, db=None, dbc_path: Optional[str] = None,
+                 default_cycle: float = DEFAULT_CYCLE_TIME, cycle_overrides: Optional[Dict[int, float]] = None,
+                 frame_ids: Optional[Iterable[int]] = None, value_source: Optional[ValueSource] = random_values,
+                 use_native_periodic: bool = True, spin: float = SPIN_SECONDS):
+        if db is None:
+            if dbc_path is None:
+                raise ValueError("DBC 데이터베이스 또는 파일 경로가 필요합니다")
+            db = load_database(dbc_path)
+        self.bus = bus
+        self.db = db
+        self.default_cycle = default_cycle
+        self.spin = spin
+        self.spin_margin = spin  # 현재 바쁜 대기 구간 (spin + 측정한 sleep 초과 시간)
+        self.sleep_overshoot = 0.0  # sleep이 요청보다 늦게 깨어난 시간의 감쇠 최댓값
+        self.native_periodic = use_native_periodic and supports_native_periodic(bus)
+        self.entries: Dict[int, PeriodicMessage] = {}
+        self.lateness = LatencyHistogram()
+        self.send_errors = 0  # 스케줄러 송신 실패 합계 (값 생성/인코딩 실패 포함)
+        self._heap: List[tuple] = []
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._started = 0.0
+
+        overrides = cycle_overrides or {}
+        selected = set(frame_ids) if frame_ids is not None else None
+        for message in db.messages:
+            if selected is not None and message.frame_id not in selected:
+                continue
+            self.add_message(message, overrides.get(message.frame_id), value_source)
+
+    def cycle_time(self, message) -> float:
+        """DBC 주기 (ms), 없으면 기본 주기"""
+        return message.cycle_time or self.default_cycle
+
+    def add_message(self, message, cycle_ms: Optional[float] = None,
+                    value_source: Optional[ValueSource] = random_values) -> PeriodicMessage:
+        """송신 목록에 메시지 추가 (시작 전에만)"""
+        if self._thread is not None:
+            raise RuntimeError("송신 중에는 메시지를 추가할 수 없습니다")
+        if not isinstance(message, cantools.database.can.Message):
+            message = self.db.get_message_by_frame_id(message)
+        encoder = MessageEncoder(message)
+        period = (cycle_ms or self.cycle_time(message)) / 1000.0
+        if period <= 0:
+            raise ValueError(f"{message.name}: 송신 주기는 0보다 커야 합니다")
+        values = encoder.defaults()
+        entry = PeriodicMessage(encoder, period, value_source, values, encoder.encode(values))
+        self.entries[encoder.frame_id] = entry
+        return entry
+
+    def set_signals(self, frame_id: int, values: Dict[str, float]):
+        """고정 페이로드 메시지의 신호 값 변경 (다음 주기부터 반영)"""
+        entry = self.entries[frame_id]
+        unknown = set(values) - set(entry.encoder.signal_names)
+        if unknown:
+            raise KeyError(f"{entry.encoder.name}에 없는 신호: {sorted(unknown)}")
+        current = dict(zip(entry.encoder.signal_names, entry.values))
+        current.update(values)
+        entry.values = [current[name] for name in entry.encoder.signal_names]
+        entry.payload = entry.encoder.encode(entry.values)
+        if entry.task is not None:
+            entry.task.modify_data(entry.encoder.to_message(entry.payload))
+
+    # ------------------------------------------------------------------
+    # 시작/정지
+    # ------------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None or any(entry.task is not None for entry in self.entries.values())
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._started = time.perf_counter()
+        scheduled = []
+        for entry in self.entries.values():
+            entry.count = entry.sent = entry.missed = entry.errors = 0
+            entry.max_lateness = 0.0
+            if entry.source is None and self.native_periodic:
+                try:
+                    entry.task = self.bus.send_periodic(entry.encoder.to_message(entry.payload), entry.period,
+                                                        store_task=False)
+                    continue
+                except (can.CanError, NotImplementedError) as e:
+                    logger.warning(f"{entry.encoder.name}: 백엔드 주기 송신 실패, 스케줄러로 송신 ({e})")
+            scheduled.append(entry)
+
+        # 같은 주기의 메시지는 주기 안에서 위상을 고르게 분산
+        by_period: Dict[float, List[PeriodicMessage]] = {}
+        for entry in scheduled:
+            by_period.setdefault(entry.period, []).append(entry)
+        start = self._started + self.spin
+        self._heap = []
+        for period, group in by_period.items():
+            for index, entry in enumerate(group):
+                entry.origin = start + period * index / len(group)
+                self._heap.append((entry.origin, entry.encoder.frame_id, entry))
+        heapq.heapify(self._heap)
+
+        native = len(self.entries) - len(scheduled)
+        logger.info(f"주기 송신 시작: {len(scheduled)}개 메시지 스케줄러, {native}개 백엔드 주기 송신")
+        if self._heap:
+            self._thread = threading.Thread(target=self._run, name="can-transmit", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+        for entry in self.entries.values():
+            if entry.task is not None:
+                try:
+                    entry.task.stop()
+                except Exception as e:
+                    logger.debug(f"{entry.encoder.name}: 주기 송신 정지 실패 ({e})")
+                entry.task = None
+
+    def _run(self):
+        with high_resolution_timer():
+            self._schedule_loop()
+
+    def _schedule_loop(self):
+        heap = self._heap
+        perf_counter = time.perf_counter
+        sleep = time.sleep
+        send = self.bus.send
+        record = self.lateness.record_us
+        overshoot = self.sleep_overshoot
+        margin = self.spin_margin
+        while not self._stop.is_set():
+            deadline = heap[0][0]
+            now = perf_counter()
+            wait = deadline - now
+            if wait > margin:
+                request = min(wait - margin, MAX_SLEEP)
+                sleep(request)
+                # sleep 해상도만큼 늦게 깨어나므로 측정한 초과 시간만큼 바쁜 대기를 일찍 시작
+                overshoot = max(perf_counter() - now - request, overshoot * OVERSHOOT_DECAY)
+                margin = min(self.spin + overshoot, MAX_SPIN)
+                self.sleep_overshoot, self.spin_margin = overshoot, margin
+                continue
+            while perf_counter() < deadline:
+                pass
+            now = perf_counter()
+            # 예정 시각이 된 메시지를 한 번에 송신
+            while heap[0][0] <= now:
+                deadline, frame_id, entry = heap[0]
+                encoder = entry.encoder
+                lateness = None
+                try:
+                    # 값 생성/인코딩/송신 중 어느 예외든 이 메시지만 건너뛰고 스케줄은 계속
+                    if entry.source is not None:
+                        entry.payload = encoder.encode(entry.source(encoder, deadline))
+                    message = can.Message(arbitration_id=frame_id, data=entry.payload,
+                                          is_extended_id=encoder.is_extended_id, is_fd=encoder.is_fd,
+                                          bitrate_switch=encoder.is_fd)
+                    lateness = perf_counter() - deadline
+                    send(message)
+                    entry.sent += 1
+                except Exception as e:
+                    self._send_failed(entry, e)
+                if lateness is None:
+                    lateness = perf_counter() - deadline
+                record(int(lateness * 1_000_000))
+                if lateness > entry.max_lateness:
+                    entry.max_lateness = lateness
+
+                entry.count += 1
+                next_deadline = entry.origin + entry.count * entry.period
+                now = perf_counter()
+                if next_deadline <= now:
+                    # 한 주기 이상 밀림: 몰아서 보내지 않고 다음 예정 시각으로 건너뜀
+                    skipped = int((now - next_deadline) / entry.period) + 1
+                    entry.missed += skipped
+                    entry.count += skipped
+                    next_deadline = entry.origin + entry.count * entry.period
+                heapq.heapreplace(heap, (next_deadline, frame_id, entry))
+
+    def _send_failed(self, entry: PeriodicMessage, error: Exception):
+        """송신 실패 집계 (메시지별 첫 실패만 경고, 이후는 debug로 남겨 로그 폭주 방지)"""
+        self.send_errors += 1
+        entry.errors += 1
+        if entry.errors == 1:
+            logger.warning(f"{entry.encoder.name} 송신 실패 ({type(error).__name__}: {error}), 다음 주기에 다시 시도")
+        else:
+            logger.debug(f"{entry.encoder.name} 송신 실패 {entry.errors}회: {error}")
+
+    # ------------------------------------------------------------------
+    # 통계
+    # ------------------------------------------------------------------
+
+    def get_statistics(self) -> Dict[str, object]:
+        messages = {}
+        for frame_id, entry in self.entries.items():
+            messages[frame_id] = {
+                'name': entry.encoder.name,
+                'period': entry.period,
+                'native': entry.task is not None,
+                'sent': entry.sent,
+                'missed': entry.missed,
+                'errors': entry.errors,
+                'max_lateness': entry.max_lateness,
+            }
+        return {
+            'messages': messages,
+            'sent': sum(info['sent'] for info in messages.values()),
+            'missed': sum(info['missed'] for info in messages.values()),
+            'native': sum(1 for info in messages.values() if info['native']),
+            'send_errors': self.send_errors,
+            'lateness': self.lateness.copy().snapshot(),
+            'spin_margin': self.spin_margin,
+            'sleep_overshoot': self.sleep_overshoot,
+            'elapsed': time.perf_counter() - self._started if self._started else 0.0,
+        }
+
+
+def _format_stats(stats: Dict[str, object]) -> str:
+    lateness = stats['lateness']
+    return (f"{stats['elapsed']:.1f}s: {stats['sent']}개 송신 ({len(stats['messages'])}개 메시지, "
+            f"백엔드 주기 송신 {stats['native']}개), 건너뜀 {stats['missed']}, 오류 {stats['send_errors']}, "
+            f"지연 p50 {lateness['p50'] * 1000:.3f}ms / p99 {lateness['p99'] * 1000:.3f}ms / "
+            f"max {lateness['max'] * 1000:.3f}ms")
+
+
+def _parse_ids(text: str) -> List[int]:
+    """'100,101,200-209' -> [100, 101, 200, ..., 209] (0x 접두사 허용)"""
+    ids = []
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            first, last = (int(value, 0) for value in part.split("-", 1))
+            ids.extend(range(first, last + 1))
+        else:
+            ids.append(int(part, 0))
+    return ids
+
+
+def _parse_cycle(text: str):
+    """'100=10' -> (100, 10.0)"""
+    frame_id, cycle = text.split("=", 1)
+    return int(frame_id, 0), float(cycle)
+
+
+def open_bus(interface: Optional[str], channel: Optional[str], fd: bool = False, bitrate: int = 500000):
+    """송신 버스 열기 (interface 생략 시 수신 프로그램과 같은 후보 목록 탐색)"""
+    config = ChannelConfig("TX", interface=interface, channel=channel, fd=fd, bitrate=bitrate)
+    candidates = config.candidates() if interface else [
+        candidate for candidate in INTERFACE_CANDIDATES if candidate[2] == fd or candidate[0] == "virtual"]
+    result = probe_interfaces(candidates, lambda c: can.interface.Bus(channel=c[1], interface=c[0],
+                                                                      **config.bus_kwargs(c[2])))
+    for candidate, error in result.errors.items():
+        print(f"CAN 인터페이스 연결 실패: {candidate[0]} - {candidate[1]}, 오류: {error}")
+    if result.bus is not None:
+        print(f"CAN 인터페이스 연결 성공: {result.candidate[0]} - {result.candidate[1]} "
+              f"({result.elapsed * 1000:.0f}ms)")
+    return result.bus
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="DBC 기반 CAN 주기 송신 (메시지별 주기, 임의 신호 값)")
+    parser.add_argument("dbc", nargs="?", default="candb_ex.dbc", help="DBC 파일 경로")
+    parser.add_argument("--interface", default=None, help="python-can 인터페이스 (생략 시 자동 탐색)")
+    parser.add_argument("--channel", default=None, help="인터페이스 채널")
+    parser.add_argument("--fd", action="store_true", help="CAN FD로 연결")
+    parser.add_argument("--bitrate", type=int, default=500000, help="비트레이트")
+    parser.add_argument("--ids", type=_parse_ids, default=None, help="송신할 메시지 ID (예: 100,101,200-209)")
+    parser.add_argument("--default-cycle", type=float, default=DEFAULT_CYCLE_TIME,
+                        help="DBC에 주기가 없는 메시지의 주기 (ms)")
+    parser.add_argument("--cycle", type=_parse_cycle, action="append", default=[],
+                        help="메시지별 주기 지정 ID=ms (여러 번 지정 가능)")
+    parser.add_argument("--static", action="store_true",
+                        help="신호 초기값으로 고정 송신 (백엔드 주기 송신 지원 시 send_periodic 사용)")
+    parser.add_argument("--duration", type=float, default=None, help="송신 시간 (초, 생략 시 Ctrl+C까지)")
+    parser.add_argument("--stats-interval", type=float, default=5.0, help="통계 출력 주기 (초)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    bus = open_bus(args.interface, args.channel, args.fd, args.bitrate)
+    if bus is None:
+        print("사용 가능한 CAN 인터페이스를 찾을 수 없습니다.")
+        raise SystemExit(1)
+
+    scheduler = TransmitScheduler(bus, dbc_path=args.dbc, default_cycle=args.default_cycle,
+                                  cycle_overrides=dict(args.cycle), frame_ids=args.ids,
+                                  value_source=None if args.static else random_values)
+    for frame_id, entry in sorted(scheduler.entries.items()):
+        print(f"  0x{frame_id:X} {entry.encoder.name}: {entry.period * 1000:g}ms")
+    scheduler.start()
+    deadline = None if args.duration is None else time.monotonic() + args.duration
+    try:
+        while deadline is None or time.monotonic() < deadline:
+            remaining = args.stats_interval if deadline is None else min(args.stats_interval,
+                                                                         deadline - time.monotonic())
+            time.sleep(max(0.0, remaining))
+            print(_format_stats(scheduler.get_statistics()))
+    except KeyboardInterrupt:
+        print("\n송신을 종료합니다.")
+    finally:
+        scheduler.stop()
+        print(_format_stats(scheduler.get_statistics()))
+        bus.shutdown()
+
+
+if __name__ == "__main__":
+    main()
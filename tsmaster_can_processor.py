@@ -15,6 +15,7 @@ import logging
 import json
 from collections import defaultdict, deque
 import numpy as np
+from latency_histogram import LatencyHistogram, RollingLatencyHistogram
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -48,6 +49,10 @@ class AdvancedCanMessage:
     retry_count: int = 0
     processing_time: float = 0.0
     
+    # 종단 지연 추적: 드라이버 수신 시각(msg.timestamp)과 단계별 도달 시각 (time.perf_counter 기준)
+    rx_timestamp: float = 0.0
+    stage_times: Dict[str, float] = field(default_factory=dict)
+    
     # 메타데이터
     source: str = "unknown"
     cycle_time: float = 0.0
@@ -97,7 +102,15 @@ class TSMasterCanProcessor:
         # 실시간 모니터링
         self.message_frequency = defaultdict(int)
         self.last_frequency_reset = time.time()
-        self.processing_times = deque(maxlen=1000)
+        # 프레임 ID별 사전 집계 카운터 (메트릭 수집 시 히스토리를 순회하지 않도록)
+        self.id_frame_counts = defaultdict(int)
+        self.id_frame_rates = {}
+        self.id_dlc_mismatches = defaultdict(int)
+        self.id_decoding_errors = defaultdict(int)
+        # 처리 지연 분포 (프로세서 전체 / 프레임 ID별, 롤링 윈도우)
+        latency_window = self.config.get('latency_window_seconds', 60.0)
+        self.processing_latency = RollingLatencyHistogram(latency_window)
+        self.id_processing_latency = defaultdict(lambda: RollingLatencyHistogram(latency_window))
         
         # 스레드 관리
         self.processing_thread = None
@@ -128,7 +141,8 @@ class TSMasterCanProcessor:
             'cycle_time_tracking': True,
             'tolerant_decoding': True,  # 관대한 디코딩 모드
             'use_default_on_decode_error': False,  # 디코딩 실패 시 기본값 사용 여부
-            'unknown_id_basic_signals': True  # 미정의 ID에 RawBytes/Length 표시
+            'unknown_id_basic_signals': True,  # 미정의 ID에 RawBytes/Length 표시
+            'latency_window_seconds': 60.0  # 처리 지연 백분위 롤링 윈도우 (초)
         }
     
     def _load_dbc(self):
@@ -238,7 +252,7 @@ class TSMasterCanProcessor:
     
     def process_message(self, can_message: can.Message) -> AdvancedCanMessage:
         """CAN 메시지 처리 (TSMaster 스타일)"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         # 기본 메시지 생성
         advanced_msg = AdvancedCanMessage(
@@ -249,6 +263,7 @@ class TSMasterCanProcessor:
             dlc=len(can_message.data),
             source="can_interface"
         )
+        advanced_msg.rx_timestamp = advanced_msg.timestamp
         
         # 메시지 검증
         if not self._validate_message(can_message):
@@ -294,11 +309,13 @@ class TSMasterCanProcessor:
                         advanced_msg.status = MessageStatus.ERROR
                         advanced_msg.error_message = f"Complete decoding failure: {e2}"
                         self.stats['decoding_errors'] += 1
+                        self.id_decoding_errors[advanced_msg.message_id] += 1
                         logger.error(f"완전한 디코딩 실패 - ID: {advanced_msg.message_id}, 오류: {e2}")
                 else:
                     advanced_msg.status = MessageStatus.ERROR
                     advanced_msg.error_message = str(e)
                     self.stats['decoding_errors'] += 1
+                    self.id_decoding_errors[advanced_msg.message_id] += 1
         
         else:
             # DBC에 정의가 없는 메시지: 최소 표시용 폴백 (옵션)
@@ -315,12 +332,17 @@ class TSMasterCanProcessor:
                     advanced_msg.error_message = f"Unknown ID handling failed: {e}"
 
         # 처리 시간 기록
-        processing_time = time.time() - start_time
+        end_time = time.perf_counter()
+        processing_time = end_time - start_time
         advanced_msg.processing_time = processing_time
-        self.processing_times.append(processing_time)
+        advanced_msg.stage_times['decode'] = end_time
+        self.processing_latency.record(processing_time, end_time)
+        self.id_processing_latency[advanced_msg.message_id].record(processing_time, end_time)
         
         # 통계 업데이트
         self.stats['total_messages'] += 1
+        self.message_frequency[advanced_msg.message_id] += 1
+        self.id_frame_counts[advanced_msg.message_id] += 1
         if advanced_msg.status == MessageStatus.VALID:
             self.stats['valid_messages'] += 1
         else:
@@ -334,6 +356,48 @@ class TSMasterCanProcessor:
         
         return advanced_msg
     
+    def process_messages(self, can_messages: List[can.Message], count: Optional[int] = None) -> List[AdvancedCanMessage]:
+        """수신 배치 일괄 처리 (앞의 count개). 배치 버퍼는 호출자가 재사용할 수 있음
+
+        한 프레임 처리 중 예외(잘못된 프레임, 콜백 오류 등)가 나도 배치 전체를 버리지 않도록
+        해당 프레임만 ERROR 상태 메시지로 돌려주고 processing_errors에 집계
+        """
+        if count is None:
+            count = len(can_messages)
+        process = self.process_message
+        processed = []
+        append = processed.append
+        for i in range(count):
+            can_message = can_messages[i]
+            try:
+                append(process(can_message))
+            except Exception as e:
+                self.stats['processing_errors'] += 1
+                logger.error(f"배치 내 메시지 처리 오류 - ID: {getattr(can_message, 'arbitration_id', None)}, 오류: {e}")
+                append(self._error_message(can_message, e))
+        return processed
+
+    def _error_message(self, can_message, error: Exception) -> AdvancedCanMessage:
+        """처리 중 예외가 난 프레임의 ERROR 상태 메시지"""
+        message_id = getattr(can_message, 'arbitration_id', 0) or 0
+        try:
+            raw_data = bytes(can_message.data)
+        except Exception:
+            raw_data = b""
+        timestamp = getattr(can_message, 'timestamp', 0.0) or time.time()
+        advanced_msg = AdvancedCanMessage(
+            message_id=message_id,
+            message_name=f"Unknown_{message_id}",
+            raw_data=raw_data,
+            timestamp=timestamp,
+            dlc=len(raw_data),
+            status=MessageStatus.ERROR,
+            error_message=f"Processing failed: {error}",
+            source="can_interface"
+        )
+        advanced_msg.rx_timestamp = timestamp
+        return advanced_msg
+    
     def _validate_message(self, can_message: can.Message) -> bool:
         """메시지 기본 검증"""
         # DLC 범위 검사
@@ -354,6 +418,7 @@ class TSMasterCanProcessor:
         
         if actual_bytes != expected_dlc:
             self.stats['dlc_mismatches'] += 1
+            self.id_dlc_mismatches[advanced_msg.message_id] += 1
             logger.warning(f"DLC 불일치 감지 - ID: {advanced_msg.message_id}, 예상: {expected_dlc}바이트, 실제: {actual_bytes}바이트 (수신길이 기준)")
             
             # 강제로 DLC 조정하여 디코딩 성공 보장
@@ -496,17 +561,25 @@ class TSMasterCanProcessor:
             self.stats['success_rate'] = (self.stats['valid_messages'] / total) * 100
             self.stats['error_rate'] = (self.stats['invalid_messages'] / total) * 100
         
-        # 평균 처리 시간 계산
-        if self.processing_times:
-            self.stats['average_processing_time'] = np.mean(list(self.processing_times))
+        # 처리 시간 분포 (롤링 윈도우 백분위)
+        if self.processing_latency.total_count:
+            latency = self.processing_latency.snapshot(time.perf_counter())
+            self.stats['average_processing_time'] = latency['mean']
+            self.stats['processing_time_p50'] = latency['p50']
+            self.stats['processing_time_p90'] = latency['p90']
+            self.stats['processing_time_p99'] = latency['p99']
+            self.stats['processing_time_p999'] = latency['p999']
+            self.stats['processing_time_max'] = latency['max']
     
     def _update_frequency_monitoring(self):
         """주파수 모니터링 업데이트"""
         if self.config['frequency_monitoring']:
             current_time = time.time()
             if current_time - self.last_frequency_reset >= 1.0:
-                self.stats['messages_per_second'] = sum(self.message_frequency.values())
-                self.message_frequency.clear()
+                # 카운터를 교체하여 수신 스레드와 경합 없이 1초 구간 집계
+                frequency, self.message_frequency = self.message_frequency, defaultdict(int)
+                self.id_frame_rates = dict(frequency)
+                self.stats['messages_per_second'] = sum(frequency.values())
                 self.last_frequency_reset = current_time
     
     def register_callback(self, message_id: int, callback: Callable[[AdvancedCanMessage], None]):
@@ -537,8 +610,34 @@ class TSMasterCanProcessor:
     
     def get_statistics(self) -> Dict:
         """통계 정보 반환"""
-        return self.stats.copy()
+        stats = self.stats.copy()
+        stats['queue_depth'] = self.message_queue.qsize()
+        return stats
+
+    def get_id_counters(self) -> Dict[str, Dict[int, float]]:
+        """프레임 ID별 사전 집계 카운터 반환 (프레임 수, 초당 프레임, DLC 불일치, 디코딩 오류)"""
+        return {
+            'frames': dict(self.id_frame_counts),
+            'frame_rates': dict(self.id_frame_rates),
+            'dlc_mismatches': dict(self.id_dlc_mismatches),
+            'decoding_errors': dict(self.id_decoding_errors),
+        }
     
+    def get_latency_snapshot(self, message_id: Optional[int] = None) -> Dict[str, float]:
+        """처리 지연 백분위 조회 (message_id 지정 시 해당 프레임 ID만)"""
+        now = time.perf_counter()
+        if message_id is None:
+            return self.processing_latency.snapshot(now)
+        histogram = self.id_processing_latency.get(message_id)
+        if histogram is None:
+            return LatencyHistogram().snapshot()
+        return histogram.snapshot(now)
+
+    def get_id_latency_snapshots(self) -> Dict[int, Dict[str, float]]:
+        """프레임 ID별 처리 지연 백분위 조회"""
+        now = time.perf_counter()
+        return {msg_id: hist.snapshot(now) for msg_id, hist in list(self.id_processing_latency.items())}
+
     def get_message_definitions(self) -> Dict:
         """메시지 정의 반환"""
         return self.message_definitions.copy()